@@ -1,10 +1,22 @@
 import bpy
-import bmesh
-import mathutils
 import math
-import random
-import json
-from mathutils import Vector, noise
+import os
+import zlib
+import numpy as np
+
+from crater_field import CraterField
+from procedural_noise import GradientNoise
+from material_system import material_library, object_attribute_node, set_object_attribute
+from lod_switcher import lod_switcher
+from asteroid_rotation import rotation_animator
+from mesh_cache import mesh_cache
+from scene_builder import scene_builder
+from shape_model_loader import ShapeModelLoader
+from surface_bake import SurfaceBaker
+
+# Şekil algoritması değiştiğinde artırılır, eski önbellek girdileri kullanılmaz
+GENERATOR_VERSION = 1
+MESH_KEY_PROPERTY = 'impactsim_mesh_key'
 
 class AsteroidGenerator:
     """
@@ -19,6 +31,34 @@ class AsteroidGenerator:
             'X': {'albedo': 0.08, 'color': (0.3, 0.3, 0.3), 'roughness': 0.7},
             'B': {'albedo': 0.05, 'color': (0.15, 0.15, 0.2), 'roughness': 0.95},
         }
+        
+        # Gövde yarıçapının %5'inden büyük krater sayısı (spectral type'a göre)
+        self.crater_densities = {
+            'C': 120,  # Carbonaceous - çok krater
+            'S': 80,   # Stony - orta
+            'M': 40,   # Metallic - az krater
+            'X': 100,
+            'B': 150   # Very cratered
+        }
+        
+        # Spectral type'a göre surface roughness (gövde yarıçapı oranı)
+        self.surface_roughness = {
+            'C': 0.3,  # Carbonaceous - pürüzlü
+            'S': 0.2,  # Stony - orta
+            'M': 0.1,  # Metallic - düz
+            'X': 0.25, # Mixed
+            'B': 0.35  # Very rough
+        }
+        self.noise_scale = 2.0
+        self.noise_octaves = 5
+        self.crater_field = CraterField()
+        # LOD zinciri: kabadan inceye ico sphere subdivision seviyeleri
+        self.lod_levels = (2, 4, 6)
+        self.shape_model_loader = ShapeModelLoader()
+        # Procedurel yüzey detayı haritalara bake edilir, geometri kaba seviyelerde kalır
+        self.bake_surface_detail = True
+        self.baked_lod_levels = (2, 3, 4)
+        self.surface_baker = SurfaceBaker(height=1024)
     
     def create_asteroid_from_nasa_data(self, asteroid_data):
         """
@@ -38,222 +78,416 @@ class AsteroidGenerator:
         print(f"Spectral Type: {spectral_type}")
         print(f"Rotation Period: {rotation_period} hours")
         
-        # Mesh oluştur
-        asteroid_obj = self._create_asteroid_mesh(name, radius, spectral_type)
+        # Seed asteroid kimliğinden türetilir: aynı asteroid her çalıştırmada aynı kaya
+        asteroid_id = str(asteroid_data.get('id') or name)
+        seed = zlib.crc32(asteroid_id.encode('utf-8'))
+        
+        # Yayınlanmış şekil modeli varsa procedurel ico sphere yerine o kullanılır
+        shape_model_path = self.shape_model_loader.find_model(asteroid_data)
+        bake = self.bake_surface_detail and not shape_model_path
+        lod_levels = sorted(asteroid_data.get('lod_levels', self.baked_lod_levels if bake else self.lod_levels))
+        finest_subdivisions = lod_levels[-1]
+        if shape_model_path:
+            stat = os.stat(shape_model_path)
+            source = ('shape_model', os.path.basename(shape_model_path), stat.st_size, int(stat.st_mtime))
+            print(f"Using shape model: {shape_model_path}")
+        elif bake:
+            # Yüzey planı haritanın çözebildiği kraterlere kadar iner
+            finest_subdivisions = max(finest_subdivisions, self.surface_baker.texel_subdivisions())
+            source = ('procedural', 'baked', finest_subdivisions)
+        else:
+            source = ('procedural',)
+        
+        # Tüm LOD seviyeleri aynı kaynaktan üretilir (silüetler eşleşir)
+        # Yüzey planı / şekil modeli sadece önbellekte olmayan bir seviye varsa hesaplanır
+        surface = None
+        shape_model = None
+        meshes = []
+        for subdivisions in lod_levels:
+            key = mesh_cache.key(asteroid_id, round(diameter_km, 6), spectral_type, subdivisions, source, GENERATOR_VERSION)
+            mesh_name = f"Asteroid_{name}_LOD{subdivisions}"
+            mesh = self._load_cached_mesh(key, mesh_name)
+            if mesh is None:
+                if shape_model_path:
+                    if shape_model is None:
+                        shape_model = self._load_shape_model(shape_model_path, diameter_km)
+                    mesh = self._create_shape_model_mesh(mesh_name, shape_model, subdivisions)
+                else:
+                    if surface is None:
+                        surface = self._plan_surface(radius, spectral_type, finest_subdivisions, seed)
+                    mesh = self._create_asteroid_mesh(name, radius, subdivisions, surface)
+                self._store_cached_mesh(key, mesh)
+            meshes.append(mesh)
+        
+        # Geometrinin taşımadığı detay displacement / normal haritalarında
+        bake_maps = None
+        if bake:
+            key = mesh_cache.key(asteroid_id, round(diameter_km, 6), spectral_type, 'bake',
+                                 self.surface_baker.height, lod_levels[-1], source, GENERATOR_VERSION)
+            bake_maps = self.surface_baker.cached(key)
+            if bake_maps is None:
+                if surface is None:
+                    surface = self._plan_surface(radius, spectral_type, finest_subdivisions, seed)
+                bake_maps = self._bake_surface_maps(key, radius, lod_levels[-1], surface)
+        
+        asteroid_obj = scene_builder.mesh_object(f"Asteroid_{name}", meshes[-1])
         
         # Materyal uygula
-        self._apply_asteroid_material(asteroid_obj, spectral_type)
+        self._apply_asteroid_material(asteroid_obj, spectral_type, meshes, bake_maps, radius)
+        
+        # Kamera mesafesine göre seviye seçimi
+        lod_switcher.register(asteroid_obj, meshes, lod_levels, radius)
         
         # Rotasyon animasyonu ekle
-        self._add_rotation_animation(asteroid_obj, rotation_period)
+        self._add_rotation_animation(asteroid_obj, rotation_period, asteroid_data.get('tumbling'))
         
         return asteroid_obj
     
-    def _create_asteroid_mesh(self, name, radius, spectral_type):
+    def _load_shape_model(self, path, diameter_km):
         """
-        Procedurel asteroid mesh'i oluşturur
+        Şekil modelini okur ve hacim eşdeğeri çapa ölçekler (Blender units)
         """
-        # Yeni mesh oluştur
-        bpy.ops.mesh.primitive_ico_sphere_add(
-            subdivisions=4, 
-            radius=radius,
-            location=(0, 0, 0)
-        )
+        vertices, faces = self.shape_model_loader.load(path)
+        vertices = self.shape_model_loader.scale_to_diameter(vertices, faces, diameter_km)
+        print(f"Shape model loaded: {len(vertices)} vertices, {len(faces)} faces")
+        return vertices, faces
+    
+    def _create_shape_model_mesh(self, mesh_name, shape_model, subdivisions):
+        """
+        Şekil modelini LOD seviyesine karşılık gelen ico sphere üçgen sayısına indirger
+        """
+        vertices, faces = shape_model
+        target_faces = 20 * 4 ** subdivisions
+        vertices, faces = self.shape_model_loader.decimate(vertices, faces, target_faces)
+        return scene_builder.mesh_from_arrays(mesh_name, vertices, faces)
+    
+    def _load_cached_mesh(self, key, mesh_name):
+        """
+        Önce bu oturumdaki mesh'lere, sonra disk önbelleğine bakar
+        """
+        for mesh in bpy.data.meshes:
+            if mesh.get(MESH_KEY_PROPERTY) == key:
+                return mesh
         
-        asteroid_obj = bpy.context.active_object
-        asteroid_obj.name = f"Asteroid_{name}"
+        arrays = mesh_cache.load(key)
+        if arrays is None:
+            return None
         
-        # Edit mode'a geç ve mesh'i düzenle
-        bpy.context.view_layer.objects.active = asteroid_obj
-        bpy.ops.object.mode_set(mode='EDIT')
+        mesh = scene_builder.mesh_from_arrays(mesh_name, arrays['vertices'], arrays['faces'])
+        mesh[MESH_KEY_PROPERTY] = key
+        return mesh
+    
+    def _store_cached_mesh(self, key, mesh):
+        """
+        Mesh'in vertex ve üçgen indekslerini disk önbelleğine yazar
+        """
+        vertices = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get('co', vertices)
+        faces = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get('vertex_index', faces)
         
-        # Bmesh ile detaylar ekle
-        bm = bmesh.from_mesh(asteroid_obj.data)
+        mesh_cache.store(key, vertices=vertices.reshape(-1, 3), faces=faces.reshape(-1, 3))
+        mesh[MESH_KEY_PROPERTY] = key
+    
+    def _plan_surface(self, radius, spectral_type, finest_subdivisions, seed):
+        """
+        Tüm LOD seviyelerinin paylaştığı yüzey tanımı: noise seed'i ve krater listesi
+        Kraterler en ince seviyenin çözebildiği boyuta kadar bir kez örneklenir
+        """
+        surface = {
+            'seed': seed,
+            'roughness': self.surface_roughness.get(spectral_type, 0.2),
+            'finest_subdivisions': finest_subdivisions,
+            'crater_directions': np.zeros((0, 3)),
+            'crater_radii': np.zeros(0),
+        }
         
-        # Crater ve surface detayları ekle
-        self._add_surface_details(bm, spectral_type)
+        min_radius = self._min_crater_radius(radius, finest_subdivisions)
+        max_radius = 0.35 * radius
+        if min_radius < max_radius:
+            density = self.crater_densities.get(spectral_type, 80)
+            count = self.crater_field.crater_count(density, min_radius, radius)
+            rng = np.random.default_rng(seed)
+            directions, radii = self.crater_field.sample_craters(count, min_radius, max_radius, rng)
+            surface['crater_directions'] = directions
+            surface['crater_radii'] = radii
+        
+        return surface
+    
+    def _min_crater_radius(self, radius, subdivisions):
+        """
+        Mesh'in çözebileceği en küçük krater: ~1.5 kenar uzunluğu
+        """
+        edge_length = 1.05 * radius / (2 ** subdivisions)
+        return 1.5 * edge_length
+    
+    def _create_asteroid_mesh(self, name, radius, subdivisions, surface):
+        """
+        Procedurel asteroid mesh'i oluşturur
+        Koordinatlar foreach_get ile NumPy'a alınır, deplase edilip foreach_set ile yazılır (object mode)
+        """
+        # Yeni mesh oluştur (deforme edileceği için paylaşılmaz)
+        mesh = scene_builder.primitive_mesh('ico_sphere', shared=False, subdivisions=subdivisions, radius=radius)
+        mesh.name = f"Asteroid_{name}_LOD{subdivisions}"
         
-        # Mesh'i güncelle
-        bm.to_mesh(asteroid_obj.data)
-        bm.free()
+        vertex_count = len(mesh.vertices)
+        coords = np.empty(vertex_count * 3, dtype=np.float32)
+        normals = np.empty(vertex_count * 3, dtype=np.float32)
+        mesh.vertices.foreach_get('co', coords)
+        mesh.vertices.foreach_get('normal', normals)
         
-        bpy.ops.object.mode_set(mode='OBJECT')
+        # Crater ve surface detayları ekle
+        coords = self._add_surface_details(
+            coords.reshape(-1, 3).astype(np.float64),
+            normals.reshape(-1, 3).astype(np.float64),
+            radius,
+            subdivisions,
+            surface
+        )
         
-        return asteroid_obj
+        # Mesh'i güncelle (normaller update ile yeniden hesaplanır)
+        mesh.vertices.foreach_set('co', coords.astype(np.float32).ravel())
+        mesh.update()
+        
+        return mesh
     
-    def _add_surface_details(self, bm, spectral_type):
+    def _add_surface_details(self, coords, normals, radius, subdivisions, surface):
         """
         Asteroid yüzeyine gerçekçi detaylar ekler
         """
-        # Vertex'leri random deplase et (çukurlar, tümsekler)
-        for vert in bm.verts:
-            # Noise tabanlı displacement
-            noise_scale = 2.0
-            noise_value = noise.noise(vert.co * noise_scale)
-            
-            # Spectral type'a göre surface roughness
-            roughness_factor = {
-                'C': 0.3,  # Carbonaceous - pürüzlü
-                'S': 0.2,  # Stony - orta
-                'M': 0.1,  # Metallic - düz
-                'X': 0.25, # Mixed
-                'B': 0.35  # Very rough
-            }.get(spectral_type, 0.2)
-            
-            displacement = noise_value * roughness_factor
-            vert.co += vert.normal * displacement
-            
-        # Kraterler ekle (random lokasyonlarda)
-        self._add_craters(bm, spectral_type)
-        
-        # Mesh'i düzelt
-        bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
+        displacement = self._surface_displacement(coords, normals, radius, subdivisions, surface)
+        return coords + normals * displacement[:, None]
     
-    def _add_craters(self, bm, spectral_type):
+    def _surface_displacement(self, coords, normals, radius, subdivisions, surface):
         """
-        Asteroid yüzeyine kraterler ekler
+        Seviyenin çözebildiği noise ve kraterlerin normal boyunca displacement'ı (mesh vertex'leri ya da bake texel'leri)
         """
-        # Krater sayısı spectral type'a göre
-        crater_count = {
-            'C': 8,   # Carbonaceous - çok krater
-            'S': 5,   # Stony - orta
-            'M': 3,   # Metallic - az krater
-            'X': 6,
-            'B': 10   # Very cratered
-        }.get(spectral_type, 5)
-        
-        for i in range(crater_count):
-            # Random lokasyon seç
-            if bm.faces:
-                face = random.choice(bm.faces)
-                center = face.calc_center_median()
-                normal = face.normal
-                
-                # Küçük krater oluştur
-                crater_radius = random.uniform(0.1, 0.3)
-                crater_depth = random.uniform(0.05, 0.15)
-                
-                self._create_crater(bm, center, normal, crater_radius, crater_depth)
-    
-    def _create_crater(self, bm, center, normal, radius, depth):
-        """
-        Belirli bir noktada krater oluşturur
-        """
-        # Kratere yakın vertex'leri bul
-        affected_verts = []
-        for vert in bm.verts:
-            dist = (vert.co - center).length
-            if dist <= radius:
-                affected_verts.append((vert, dist))
-        
-        # Vertex'leri krater şeklinde deplase et
-        for vert, dist in affected_verts:
-            # Smooth falloff için
-            falloff = 1.0 - (dist / radius)
-            falloff = falloff * falloff  # Quadratic falloff
-            
-            # İçe doğru deplase et
-            displacement = -normal * depth * falloff
-            vert.co += displacement
+        # Çok oktavlı noise ile çukurlar, tümsekler (birim küre yönünde, boyuttan bağımsız)
+        # Kaba seviyeler çözemedikleri ince oktavları atlar; hepsi en ince seviyenin genlik toplamıyla
+        # normalize edilir, kaba oktavlar tüm seviyelerde aynı
+        noise_field = GradientNoise(seed=surface['seed'])
+        octaves = max(2, self.noise_octaves - (surface['finest_subdivisions'] - subdivisions))
+        directions = normals / np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+        noise_value = noise_field.fbm(
+            directions * self.noise_scale, octaves=octaves, normalize_octaves=self.noise_octaves
+        )
+        
+        displacement = noise_value * surface['roughness'] * radius
+        
+        # Kraterler ekle (power-law boyut dağılımı)
+        displacement += self._add_craters(coords, normals, radius, subdivisions, surface)
+        
+        return displacement
     
-    def _apply_asteroid_material(self, obj, spectral_type):
+    def _bake_surface_maps(self, key, radius, base_subdivisions, surface):
         """
-        Spectral type'a göre gerçekçi materyal uygular
+        Tüm yüzey detayını normal haritasına, en ince LOD'un çözemediği kısmını displacement haritasına bake eder
         """
-        # Materyal oluştur
-        mat_name = f"Asteroid_Material_{spectral_type}"
-        
-        # Eğer materyal zaten varsa kullan
-        if mat_name in bpy.data.materials:
-            material = bpy.data.materials[mat_name]
-        else:
-            material = bpy.data.materials.new(name=mat_name)
-            material.use_nodes = True
-            
-            # Node setup
-            self._setup_material_nodes(material, spectral_type)
-        
-        # Objeye materyal ata
-        obj.data.materials.append(material)
+        def height_at(subdivisions):
+            # Birim yönler -> gövde yarıçapı oranında yükseklik
+            return lambda directions: self._surface_displacement(
+                directions * radius, directions, radius, subdivisions, surface) / radius
+        
+        return self.surface_baker.bake(
+            key,
+            height_at(surface['finest_subdivisions']),
+            height_at(base_subdivisions)
+        )
     
-    def _setup_material_nodes(self, material, spectral_type):
+    def _add_craters(self, coords, normals, radius, subdivisions, surface):
         """
-        Materyal node'larını kurar
+        Asteroid yüzeyine kraterler ekler
+        Kraterler KD-tree range sorgusu ile basılır, sadece etki alanındaki vertex'ler işlenir
+        Seviyenin çözemediği küçük kraterler atlanır, vertex normali boyunca displacement döndürür
         """
-        nodes = material.node_tree.nodes
-        links = material.node_tree.links
-        
-        # Tüm node'ları temizle
-        nodes.clear()
+        resolvable = surface['crater_radii'] >= self._min_crater_radius(radius, subdivisions)
+        directions = surface['crater_directions'][resolvable]
+        radii = surface['crater_radii'][resolvable]
+        if len(radii) == 0:
+            return np.zeros(len(coords))
         
-        # Output node
-        output_node = nodes.new('ShaderNodeOutputMaterial')
-        output_node.location = (400, 0)
+        displacement = self.crater_field.stamp(coords, normals, directions, radii, radius)
         
-        # Principled BSDF
-        principled = nodes.new('ShaderNodeBsdfPrincipled')
-        principled.location = (0, 0)
+        print(f"Stamped {len(radii)} craters on LOD{subdivisions} ({len(coords)} vertices)")
+        return displacement
+    
+    def _apply_asteroid_material(self, obj, spectral_type, lod_meshes=(), bake_maps=None, radius=1.0):
+        """
+        Spectral type'a göre gerçekçi materyal uygular
+        Tüm spectral type'lar tek materyali paylaşır, renk ve pürüzlülük obje attribute'larından okunur
+        Bake haritaları asteroide özeldir, bu durumda materyal asteroid başına oluşur
+        """
+        if bake_maps:
+            material = material_library.get_material(
+                f"Asteroid_Material_{obj.name}",
+                self._setup_material_nodes(bake_maps, radius),
+                {'cycles.displacement_method': 'DISPLACEMENT'}
+            )
+        else:
+            material = material_library.get_material("Asteroid_Material", self._setup_material_nodes())
         
         # Spectral properties
         props = self.spectral_materials.get(spectral_type, self.spectral_materials['S'])
-        
-        # Base color
-        principled.inputs['Base Color'].default_value = (*props['color'], 1.0)
-        principled.inputs['Roughness'].default_value = props['roughness']
-        principled.inputs['Metallic'].default_value = 1.0 if spectral_type == 'M' else 0.0
-        
-        # Noise texture for surface variation
-        noise_tex = nodes.new('ShaderNodeTexNoise')
-        noise_tex.location = (-400, 200)
-        noise_tex.inputs['Scale'].default_value = 15.0
-        noise_tex.inputs['Detail'].default_value = 10.0
-        
-        # ColorRamp for contrast
-        color_ramp = nodes.new('ShaderNodeValToRGB')
-        color_ramp.location = (-200, 200)
-        
-        # Musgrave texture for larger features
-        musgrave = nodes.new('ShaderNodeTexMusgrave')
-        musgrave.location = (-400, 0)
-        musgrave.inputs['Scale'].default_value = 5.0
-        
-        # Mix node
-        mix_node = nodes.new('ShaderNodeMixRGB')
-        mix_node.location = (-200, 0)
-        mix_node.blend_type = 'MULTIPLY'
-        
-        # Bağlantılar
-        links.new(noise_tex.outputs['Fac'], color_ramp.inputs['Fac'])
-        links.new(color_ramp.outputs['Color'], mix_node.inputs['Color1'])
-        links.new(musgrave.outputs['Fac'], mix_node.inputs['Color2'])
-        links.new(mix_node.outputs['Color'], principled.inputs['Base Color'])
-        links.new(principled.outputs['BSDF'], output_node.inputs['Surface'])
+        set_object_attribute(obj, 'impactsim_base_color', (*props['color'], 1.0))
+        set_object_attribute(obj, 'impactsim_roughness', props['roughness'])
+        set_object_attribute(obj, 'impactsim_metallic', 1.0 if spectral_type == 'M' else 0.0)
+        
+        # Objeye materyal ata (LOD seviyeleri aynı slotu taşır)
+        material_library.assign(obj, material)
+        for mesh in lod_meshes:
+            if material.name not in mesh.materials:
+                mesh.materials.append(material)
     
-    def _add_rotation_animation(self, obj, rotation_period_hours):
+    def _setup_material_nodes(self, bake_maps=None, radius=1.0):
         """
-        Gerçek rotasyon periyoduna göre animasyon ekler
+        Asteroid materyalinin node grafiğini döndürür
         """
-        # Animation data oluştur
-        if obj.animation_data is None:
-            obj.animation_data_create()
-        
-        # Keyframe'ler
-        bpy.context.scene.frame_set(1)
-        obj.rotation_euler = (0, 0, 0)
-        obj.keyframe_insert(data_path="rotation_euler", index=2)
-        
-        # Rotasyon periyodunu frame'e çevir (24 fps varsayım)
-        frames_per_rotation = int(rotation_period_hours * 3600 / 24)  # 1 saniye = 24 frame
+        graph = {
+            'nodes': {
+                'output': {'type': 'ShaderNodeOutputMaterial', 'location': (400, 0)},
+                'principled': {'type': 'ShaderNodeBsdfPrincipled', 'location': (0, 0)},
+                # Noise texture for surface variation
+                'noise': {
+                    'type': 'ShaderNodeTexNoise',
+                    'location': (-600, 200),
+                    'inputs': {'Scale': 15.0, 'Detail': 10.0},
+                },
+                # ColorRamp for contrast
+                'color_ramp': {'type': 'ShaderNodeValToRGB', 'location': (-400, 200)},
+                # Musgrave texture for larger features
+                'musgrave': {
+                    'type': 'ShaderNodeTexMusgrave',
+                    'location': (-600, 0),
+                    'inputs': {'Scale': 5.0},
+                },
+                'pattern': {
+                    'type': 'ShaderNodeMixRGB',
+                    'location': (-400, 0),
+                    'properties': {'blend_type': 'MULTIPLY'},
+                },
+                # Spectral renk ile çarpım
+                'tint': {
+                    'type': 'ShaderNodeMixRGB',
+                    'location': (-200, 0),
+                    'properties': {'blend_type': 'MULTIPLY'},
+                    'inputs': {'Fac': 1.0},
+                },
+                'base_color': object_attribute_node('impactsim_base_color', (-400, -200)),
+                'roughness': object_attribute_node('impactsim_roughness', (-200, -300)),
+                'metallic': object_attribute_node('impactsim_metallic', (-200, -450)),
+            },
+            'links': [
+                ('noise', 'Fac', 'color_ramp', 'Fac'),
+                ('color_ramp', 'Color', 'pattern', 'Color1'),
+                ('musgrave', 'Fac', 'pattern', 'Color2'),
+                ('pattern', 'Color', 'tint', 'Color1'),
+                ('base_color', 'Color', 'tint', 'Color2'),
+                ('tint', 'Color', 'principled', 'Base Color'),
+                ('roughness', 'Fac', 'principled', 'Roughness'),
+                ('metallic', 'Fac', 'principled', 'Metallic'),
+                ('principled', 'BSDF', 'output', 'Surface'),
+            ],
+        }
         
-        bpy.context.scene.frame_set(frames_per_rotation)
-        obj.rotation_euler = (0, 0, math.radians(360))
-        obj.keyframe_insert(data_path="rotation_euler", index=2)
+        if bake_maps:
+            self._add_baked_map_nodes(graph, bake_maps, radius)
         
-        # Linear interpolation
-        if obj.animation_data and obj.animation_data.action:
-            for fcurve in obj.animation_data.action.fcurves:
-                for keyframe in fcurve.keyframe_points:
-                    keyframe.interpolation = 'LINEAR'
+        return graph
+    
+    def _add_baked_map_nodes(self, graph, bake_maps, radius):
+        """
+        Bake haritalarını grafiğe ekler: object koordinatından equirect UV, object-space normal ve displacement
+        """
+        nodes = graph['nodes']
+        nodes.update({
+            'texcoord': {'type': 'ShaderNodeTexCoord', 'location': (-1400, -600)},
+            'direction': {
+                'type': 'ShaderNodeVectorMath',
+                'location': (-1200, -600),
+                'properties': {'operation': 'NORMALIZE'},
+            },
+            'separate': {'type': 'ShaderNodeSeparateXYZ', 'location': (-1000, -600)},
+            # u = atan2(y, x) / 2pi + 0.5, v = asin(z) / pi + 0.5
+            'longitude': {
+                'type': 'ShaderNodeMath',
+                'location': (-800, -500),
+                'properties': {'operation': 'ARCTAN2'},
+            },
+            'u': {
+                'type': 'ShaderNodeMath',
+                'location': (-600, -500),
+                'properties': {'operation': 'MULTIPLY_ADD'},
+                'inputs': {1: 1.0 / (2.0 * math.pi), 2: 0.5},
+            },
+            'latitude': {
+                'type': 'ShaderNodeMath',
+                'location': (-800, -700),
+                'properties': {'operation': 'ARCSINE'},
+            },
+            'v': {
+                'type': 'ShaderNodeMath',
+                'location': (-600, -700),
+                'properties': {'operation': 'MULTIPLY_ADD'},
+                'inputs': {1: 1.0 / math.pi, 2: 0.5},
+            },
+            'uv': {'type': 'ShaderNodeCombineXYZ', 'location': (-400, -600)},
+            'normal_texture': {
+                'type': 'ShaderNodeTexImage',
+                'location': (-200, -600),
+                'properties': {'interpolation': 'Linear'},
+                'image': {'path': bake_maps['normal_path'], 'colorspace': 'Non-Color'},
+            },
+            'normal_map': {
+                'type': 'ShaderNodeNormalMap',
+                'location': (100, -600),
+                'properties': {'space': 'OBJECT'},
+            },
+            'height_texture': {
+                'type': 'ShaderNodeTexImage',
+                'location': (-200, -900),
+                'properties': {'interpolation': 'Cubic'},
+                'image': {'path': bake_maps['height_path'], 'colorspace': 'Non-Color'},
+            },
+            # Harita 0.5 orta seviyeli, [-1, 1] aralığı residual_scale x yarıçapa karşılık gelir
+            'displacement': {
+                'type': 'ShaderNodeDisplacement',
+                'location': (100, -900),
+                'properties': {'space': 'OBJECT'},
+                'inputs': {'Midlevel': 0.5, 'Scale': 2.0 * bake_maps['residual_scale'] * radius},
+            },
+        })
+        graph['links'].extend([
+            ('texcoord', 'Object', 'direction', 0),
+            ('direction', 'Vector', 'separate', 'Vector'),
+            ('separate', 'Y', 'longitude', 0),
+            ('separate', 'X', 'longitude', 1),
+            ('longitude', 'Value', 'u', 0),
+            ('separate', 'Z', 'latitude', 0),
+            ('latitude', 'Value', 'v', 0),
+            ('u', 'Value', 'uv', 'X'),
+            ('v', 'Value', 'uv', 'Y'),
+            ('uv', 'Vector', 'normal_texture', 'Vector'),
+            ('uv', 'Vector', 'height_texture', 'Vector'),
+            ('normal_texture', 'Color', 'normal_map', 'Color'),
+            ('normal_map', 'Normal', 'principled', 'Normal'),
+            ('height_texture', 'Color', 'displacement', 'Height'),
+            ('displacement', 'Displacement', 'output', 'Displacement'),
+        ])
+    
+    def _add_rotation_animation(self, obj, rotation_period_hours, tumbling=None):
+        """
+        Gerçek rotasyon periyoduna göre animasyon ekler
+        tumbling = {'precession_period', 'rotation_period' (saat), 'nutation_deg'} verilirse non-principal-axis dönüş
+        """
+        if tumbling:
+            rotation_animator.tumble(
+                obj,
+                tumbling['precession_period'],
+                tumbling.get('rotation_period', rotation_period_hours),
+                tumbling.get('nutation_deg', 30.0)
+            )
+        else:
+            rotation_animator.spin(obj, rotation_period_hours)
     
     def create_predefined_asteroids(self):
         """
@@ -264,7 +498,9 @@ class AsteroidGenerator:
             'name': 'Apophis',
             'diameter_km': 0.370,
             'spec_B': 'Sq',
-            'rot_per': 30.56
+            'rot_per': 30.56,
+            # Tumbling: presesyon 27.38 sa, gövde dönüşü 263 sa (Pravec et al. 2014)
+            'tumbling': {'precession_period': 27.38, 'rotation_period': 263.0, 'nutation_deg': 30.0}
         }
         apophis = self.create_asteroid_from_nasa_data(apophis_data)
         apophis.location = (5, 0, 0)
@@ -308,8 +544,7 @@ def main():
     Ana fonksiyon - Blender'da çalıştırılacak
     """
     # Scene'i temizle
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete(use_global=False)
+    scene_builder.clear_scene()
     
     # Generator oluştur
     generator = AsteroidGenerator()
@@ -318,14 +553,14 @@ def main():
     asteroids = generator.create_predefined_asteroids()
     
     # Kamera ayarla
-    bpy.ops.object.camera_add(location=(10, -10, 5))
-    camera = bpy.context.active_object
-    camera.rotation_euler = (math.radians(60), 0, math.radians(45))
+    camera = scene_builder.camera(
+        "Camera",
+        location=(10, -10, 5),
+        rotation=(math.radians(60), 0, math.radians(45))
+    )
     
     # Işık ekle
-    bpy.ops.object.light_add(type='SUN', location=(5, 5, 10))
-    sun = bpy.context.active_object
-    sun.data.energy = 5.0
+    sun = scene_builder.light("Sun", 'SUN', location=(5, 5, 10), energy=5.0)
     
     # HDRI environment (eğer varsa)
     world = bpy.context.scene.world
@@ -0,0 +1,139 @@
+import bpy
+import math
+import numpy as np
+
+TUMBLE_PROPERTY = 'impactsim_tumble'
+
+def quaternion_multiply(a, b):
+    """
+    (N, 4) wxyz quaternion dizilerinin satır satır çarpımı
+    """
+    aw, ax, ay, az = a[:, 0], a[:, 1], a[:, 2], a[:, 3]
+    bw, bx, by, bz = b[:, 0], b[:, 1], b[:, 2], b[:, 3]
+    return np.column_stack((
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+    ))
+
+def axis_quaternions(axis, angles):
+    """
+    Sabit eksen (0=x, 1=y, 2=z) etrafında açı dizisi için quaternion'lar
+    """
+    angles = np.asarray(angles, dtype=np.float64)
+    quaternions = np.zeros((len(angles), 4))
+    quaternions[:, 0] = np.cos(angles / 2.0)
+    quaternions[:, axis + 1] = np.sin(angles / 2.0)
+    return quaternions
+
+def tumbling_quaternions(times_s, precession_period_s, rotation_period_s, nutation_rad):
+    """
+    Non-principal-axis (tumbling) dönüş için quaternion tablosu, (N, 4) wxyz
+    Kuvvetsiz simetrik topaç yaklaşımı: gövde ekseni açısal momentum (dünya z) etrafında presesyon yapar,
+    nütasyon açısı sabit, gövde kendi ekseni etrafında döner: q = Rz(phi) * Rx(theta) * Rz(psi)
+    """
+    times_s = np.asarray(times_s, dtype=np.float64)
+    phi = 2.0 * math.pi * times_s / precession_period_s
+    psi = 2.0 * math.pi * times_s / rotation_period_s
+
+    quaternions = quaternion_multiply(
+        quaternion_multiply(axis_quaternions(2, phi), axis_quaternions(0, np.full(len(times_s), nutation_rad))),
+        axis_quaternions(2, psi)
+    )
+
+    # q ve -q aynı yönelim: ardışık anahtarlar arası interpolasyon kısa yoldan gitsin
+    if len(quaternions) > 1:
+        dots = np.einsum('ij,ij->i', quaternions[1:], quaternions[:-1])
+        signs = np.concatenate(([1.0], np.cumprod(np.where(dots < 0.0, -1.0, 1.0))))
+        quaternions *= signs[:, None]
+
+    return quaternions
+
+class RotationAnimator:
+    """
+    Asteroid dönüş animasyonları, frame_set çağrısı ve sahne değerlendirmesi olmadan
+    Principal-axis spin: keyframe'siz doğrusal Generator F-modifier (açı = w * frame), periyot uzunluğundan bağımsız
+    Tumbling: render aralığı için vektörel quaternion tablosu, keyframe'ler foreach_set ile toplu yazılır
+    """
+
+    def __init__(self, seconds_per_frame=24.0):
+        self.seconds_per_frame = seconds_per_frame  # Bir frame'e karşılık gelen simülasyon süresi
+
+    def spin(self, obj, period_hours, axis=2):
+        """
+        Tek eksen etrafında sabit hızlı dönüş (frame 1'de açı 0)
+        """
+        obj.rotation_mode = 'XYZ'
+        radians_per_frame = 2.0 * math.pi * self.seconds_per_frame / (period_hours * 3600.0)
+
+        fcurve = self._new_fcurve(obj, 'rotation_euler', axis)
+        modifier = fcurve.modifiers.new('GENERATOR')
+        modifier.mode = 'POLYNOMIAL'
+        modifier.poly_order = 1
+        modifier.coefficients = (-radians_per_frame, radians_per_frame)
+        return fcurve
+
+    def tumble(self, obj, precession_period_hours, rotation_period_hours, nutation_deg, frame_range=None):
+        """
+        Tumbling dönüşü kaydeder ve verilen (yoksa sahnenin) frame aralığı için quaternion tablosunu yazar
+        """
+        obj[TUMBLE_PROPERTY] = [precession_period_hours, rotation_period_hours, nutation_deg]
+
+        if frame_range is None:
+            scene = bpy.context.scene
+            frame_range = (scene.frame_start, scene.frame_end)
+        self._write_tumble_keys(obj, *frame_range)
+
+    def update_scene(self, scene):
+        """
+        Frame aralığı değiştiğinde tumbling tablolarını yeni render aralığına göre yeniden yazar
+        """
+        for obj in scene.objects:
+            if TUMBLE_PROPERTY in obj:
+                self._write_tumble_keys(obj, scene.frame_start, scene.frame_end)
+
+    def _write_tumble_keys(self, obj, frame_start, frame_end):
+        """
+        Frame başına bir quaternion anahtarı (lineer interpolasyon)
+        """
+        precession_hours, rotation_hours, nutation_deg = obj[TUMBLE_PROPERTY]
+        frames = np.arange(frame_start, frame_end + 1, dtype=np.float64)
+        times_s = (frames - 1.0) * self.seconds_per_frame
+        quaternions = tumbling_quaternions(
+            times_s,
+            precession_hours * 3600.0,
+            rotation_hours * 3600.0,
+            math.radians(nutation_deg)
+        )
+
+        obj.rotation_mode = 'QUATERNION'
+        linear = bpy.types.Keyframe.bl_rna.properties['interpolation'].enum_items['LINEAR'].value
+        for index in range(4):
+            fcurve = self._new_fcurve(obj, 'rotation_quaternion', index)
+            keyframes = fcurve.keyframe_points
+            keyframes.add(len(frames))
+            keyframes.foreach_set('co', np.column_stack((frames, quaternions[:, index])).ravel())
+            keyframes.foreach_set('interpolation', [linear] * len(frames))
+            fcurve.update()
+
+        print(f"Tumbling rotation keyed for {obj.name}: frames {frame_start}-{frame_end}")
+
+    def _new_fcurve(self, obj, data_path, index):
+        """
+        Objenin action'ında (gerekirse oluşturur) eski eğriyi silip boş bir F-curve döndürür
+        """
+        if obj.animation_data is None:
+            obj.animation_data_create()
+        action = obj.animation_data.action
+        if action is None:
+            action = bpy.data.actions.new(name=f"{obj.name}_Action")
+            obj.animation_data.action = action
+
+        existing = action.fcurves.find(data_path, index=index)
+        if existing is not None:
+            action.fcurves.remove(existing)
+        return action.fcurves.new(data_path, index=index, action_group='Rotation')
+
+# Tüm script'lerin paylaştığı animator
+rotation_animator = RotationAnimator()
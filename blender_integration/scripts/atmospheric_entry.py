@@ -0,0 +1,312 @@
+import math
+import numpy as np
+
+class AtmosphericEntryModel:
+    """
+    Küçük çarpıcılar için atmosferik giriş ve airburst modeli
+    Pancake ablasyon modeli (Chyba et al. 1993, Collins et al. 2005) çok sayıda giriş koşulu üzerinde vektörel integre edilir
+    bpy kullanmaz, risk tabloları için Blender dışında da çalışır
+    """
+
+    def __init__(self, atmosphere_table=None):
+        self.surface_density = 1.225  # kg/m^3
+        self.scale_height_m = 8000.0
+        self.earth_radius_m = 6371000.0
+        self.gravity = 9.81  # m/s^2
+
+        self.drag_coefficient = 2.0
+        self.ablation_coefficient = 1.4e-8  # sigma (s^2/m^2), taş göktaşları
+        self.pancake_factor = 7.0  # Kırılma sonrası maksimum yarıçap oranı (Collins et al. 2005)
+
+        self.entry_altitude_m = 100000.0
+        self.height_step_m = 50.0  # Dikey integrasyon adımı
+        self.path_step_m = 2000.0  # Sığ açılarda yol boyunca maksimum adım
+        self.min_velocity_ms = 100.0
+        self.airburst_energy_fraction = 0.5  # Enerjinin bu kadarı havada kalırsa airburst
+        self.bin_size_m = 1000.0  # Enerji depozisyon profili çözünürlüğü
+
+        # (altitudes_m, densities_kgm3) verilirse üstel atmosfer yerine kullanılır
+        self.atmosphere_table = None
+        if atmosphere_table is not None:
+            altitudes, densities = atmosphere_table
+            order = np.argsort(altitudes)
+            self.atmosphere_table = (
+                np.asarray(altitudes, dtype=float)[order],
+                np.log(np.asarray(densities, dtype=float)[order])
+            )
+
+    def air_density(self, altitude_m):
+        """
+        Verilen yükseklik(ler)de hava yoğunluğu (kg/m^3)
+        """
+        altitude_m = np.maximum(altitude_m, 0.0)
+        if self.atmosphere_table is not None:
+            altitudes, log_densities = self.atmosphere_table
+            return np.exp(np.interp(altitude_m, altitudes, log_densities))
+        return self.surface_density * np.exp(-altitude_m / self.scale_height_m)
+
+    def default_strength(self, density_kgm3):
+        """
+        Yoğunluktan yaklaşık kırılma dayanımı (Pa), Y = 10^(2.107 + 0.0624 sqrt(rho))
+        """
+        return 10.0 ** (2.107 + 0.0624 * np.sqrt(density_kgm3))
+
+    def simulate(self, diameter_m, velocity_ms, density_kgm3, angle_deg, strength_pa=None):
+        """
+        Giriş koşullarını (broadcast edilebilir diziler) birlikte integre eder
+
+        Dönen sözlükteki her değer giriş koşullarının broadcast şeklindedir,
+        'deposition_kt_per_km' ek olarak son eksende yükseklik bin'leri taşır
+        """
+        density_kgm3 = np.asarray(density_kgm3, dtype=float)
+        if strength_pa is None:
+            strength_pa = self.default_strength(density_kgm3)
+
+        diameter_m, velocity_ms, density_kgm3, angle_deg, strength_pa = np.broadcast_arrays(
+            *[np.asarray(value, dtype=float) for value in
+              (diameter_m, velocity_ms, density_kgm3, angle_deg, strength_pa)]
+        )
+        shape = diameter_m.shape
+        count = diameter_m.size
+
+        rho_i = density_kgm3.ravel()
+        strength = strength_pa.ravel()
+        radius0 = diameter_m.ravel() / 2.0
+        mass0 = 4.0 / 3.0 * math.pi * radius0 ** 3 * rho_i
+
+        # Durum: hız, kütle, yörünge açısı (yataydan), yükseklik, yarıçap
+        state = np.empty((5, count))
+        state[0] = velocity_ms.ravel()
+        state[1] = mass0
+        state[2] = np.radians(np.clip(angle_deg.ravel(), 1.0, 90.0))
+        state[3] = self.entry_altitude_m
+        state[4] = radius0
+
+        initial_energy = 0.5 * mass0 * state[0] ** 2
+        broken = np.zeros(count, dtype=bool)
+        breakup_altitude = np.zeros(count)
+        # Yayılma hızının bağlı olduğu kırılma anı değerleri
+        dispersion_length = np.ones(count)
+        scale_height = np.full(count, self.scale_height_m)
+        # Pancake'in pancake_factor'e ulaştığı yükseklik (Collins et al. 2005 airburst tanımı)
+        spread_altitude = np.full(count, np.nan)
+
+        bin_count = int(math.ceil(self.entry_altitude_m / self.bin_size_m))
+        deposition = np.zeros(count * bin_count)
+        bin_offsets = np.arange(count) * bin_count
+
+        active = np.ones(count, dtype=bool)
+        max_steps = int(4 * self.entry_altitude_m / self.height_step_m)
+
+        for _ in range(max_steps):
+            if not active.any():
+                break
+
+            indices = np.nonzero(active)[0]
+            current = state[:, indices]
+            velocity, _, angle, altitude = current[0], current[1], current[2], current[3]
+
+            # Dikey adım sabit, sığ açılarda yol adımı sınırlanır, son adım yere oturur
+            vertical_speed = np.maximum(velocity * np.sin(angle), 1e-3)
+            dt = np.minimum(
+                np.minimum(self.height_step_m, altitude) / vertical_speed,
+                self.path_step_m / np.maximum(velocity, 1e-3)
+            )
+
+            # Kırılma: ram basıncı dayanımı aşınca pancake yayılması başlar
+            ram_pressure = self.air_density(altitude) * velocity ** 2
+            newly_broken = ~broken[indices] & (ram_pressure > strength[indices])
+            if newly_broken.any():
+                new = indices[newly_broken]
+                broken[new] = True
+                breakup_altitude[new] = altitude[newly_broken]
+                scale_height[new] = self._scale_height(altitude[newly_broken])
+                # Dağılma uzunluğu l = L0 sin(theta) sqrt(rho_i / (C_D rho_a(z*))) (Collins et al. 2005, denklem 18)
+                dispersion_length[new] = 2.0 * radius0[new] * np.sin(angle[newly_broken]) * np.sqrt(
+                    rho_i[new] / (self.drag_coefficient * self.air_density(altitude[newly_broken]))
+                )
+
+            spreading = broken[indices] & (current[4] < self.pancake_factor * radius0[indices])
+            energy_before = 0.5 * current[1] * velocity ** 2
+
+            spread = (spreading, radius0[indices], breakup_altitude[indices],
+                      dispersion_length[indices], scale_height[indices])
+            updated = self._rk4_step(current, dt, spread)
+            updated[3] = np.maximum(updated[3], 0.0)
+            updated[4] = np.minimum(updated[4], self.pancake_factor * radius0[indices])
+            state[:, indices] = updated
+
+            fully_spread = spreading & (updated[4] >= self.pancake_factor * radius0[indices])
+            spread_altitude[indices[fully_spread]] = updated[3][fully_spread]
+
+            # Adımda kaybedilen kinetik enerji orta yükseklikteki bin'e yazılır
+            energy_after = 0.5 * updated[1] * updated[0] ** 2
+            mid_altitude = 0.5 * (altitude + updated[3])
+            bins = np.clip((mid_altitude / self.bin_size_m).astype(int), 0, bin_count - 1)
+            deposition += np.bincount(
+                bin_offsets[indices] + bins,
+                weights=np.maximum(energy_before - energy_after, 0.0),
+                minlength=count * bin_count
+            )
+
+            finished = (
+                (updated[3] <= 1.0) |
+                (updated[0] < self.min_velocity_ms) |
+                (updated[1] < mass0[indices] * 1e-6)
+            )
+            active[indices[finished]] = False
+
+        deposition = deposition.reshape(count, bin_count)
+
+        # Yere ulaşan enerji
+        grounded = state[3] <= 1.0
+        ground_energy = np.where(grounded, 0.5 * state[1] * state[0] ** 2, 0.0)
+        ground_fraction = ground_energy / np.maximum(initial_energy, 1e-30)
+
+        # Burst yüksekliği: pancake'in tam yayıldığı yükseklik
+        # Gövde o yüksekliğe inmeden yavaşladıysa yayılma yasasının analitik sonucu kullanılır:
+        #   z_b = z* - 2H ln(1 + l/(2H) sqrt(f_p^2 - 1))   (Collins et al. 2005, denklem 20)
+        # z_b <= 0 ise gövde yere yayılmasını tamamlamadan ulaşır: yüzey çarpması (Collins: sadece z_b > 0 airburst)
+        # Yere ulaşmadan havada duran gövdelerde (z_b <= 0 ya da kırılmamış) depozisyonun maksimum olduğu bin'in merkezi
+        analytic_altitude = breakup_altitude - 2.0 * scale_height * np.log1p(
+            dispersion_length / (2.0 * scale_height) * math.sqrt(self.pancake_factor ** 2 - 1.0)
+        )
+        peak_altitude = (deposition.argmax(axis=1) + 0.5) * self.bin_size_m
+        stopped_altitude = np.where(broken & (analytic_altitude > 0.0), analytic_altitude, peak_altitude)
+        burst_altitude = np.where(
+            np.isnan(spread_altitude),
+            np.where(grounded, 0.0, stopped_altitude),
+            spread_altitude
+        )
+        airburst = (
+            (burst_altitude > 0.0) &
+            (ground_fraction < self.airburst_energy_fraction) &
+            (deposition.sum(axis=1) > 0)
+        )
+        burst_altitude = np.where(airburst, burst_altitude, 0.0)
+
+        joules_per_kt = 4.184e12
+        bin_km = self.bin_size_m / 1000.0
+
+        return {
+            'airburst': airburst.reshape(shape),
+            'burst_altitude_m': burst_altitude.reshape(shape),
+            'breakup_altitude_m': np.where(broken, breakup_altitude, 0.0).reshape(shape),
+            'initial_energy_kt': (initial_energy / joules_per_kt).reshape(shape),
+            'ground_energy_kt': (ground_energy / joules_per_kt).reshape(shape),
+            'ground_energy_fraction': ground_fraction.reshape(shape),
+            'ground_velocity_ms': np.where(grounded, state[0], 0.0).reshape(shape),
+            'deposition_kt_per_km': (deposition / joules_per_kt / bin_km).reshape(shape + (bin_count,)),
+            'altitude_bins_m': (np.arange(bin_count) + 0.5) * self.bin_size_m,
+        }
+
+    def sweep(self, diameter_m, velocity_ms, density_kgm3, angles_deg, strengths_pa):
+        """
+        Tek çarpıcı için açı x dayanım ızgarası (risk tabloları)
+        Sonuç dizileri (len(angles_deg), len(strengths_pa)) şeklindedir
+        """
+        angles, strengths = np.meshgrid(
+            np.asarray(angles_deg, dtype=float),
+            np.asarray(strengths_pa, dtype=float),
+            indexing='ij'
+        )
+        return self.simulate(diameter_m, velocity_ms, density_kgm3, angles, strengths)
+
+    def simulate_single(self, diameter_m, velocity_ms, density_kgm3, angle_deg, strength_pa=None):
+        """
+        Tek giriş koşulu için skaler sonuç sözlüğü
+        """
+        result = self.simulate(diameter_m, velocity_ms, density_kgm3, angle_deg, strength_pa)
+        single = {}
+        for key, value in result.items():
+            if key in ('deposition_kt_per_km', 'altitude_bins_m'):
+                single[key] = value.tolist()
+            else:
+                single[key] = value.item()
+        return single
+
+    def _scale_height(self, altitude_m):
+        """
+        Yükseklikteki yerel atmosfer ölçek yüksekliği (tablodan sonlu farkla)
+        """
+        if self.atmosphere_table is None:
+            return np.full(np.shape(altitude_m), self.scale_height_m)
+        step = 500.0
+        upper = np.log(self.air_density(altitude_m + step))
+        lower = np.log(self.air_density(np.maximum(altitude_m - step, 0.0)))
+        return np.where(upper < lower, (altitude_m + step - np.maximum(altitude_m - step, 0.0)) / np.maximum(lower - upper, 1e-12),
+                        self.scale_height_m)
+
+    def _derivatives(self, state, spread):
+        """
+        Pancake modelinin zaman türevleri
+        Yayılma, Chyba / Collins denkleminin (d2L/dt2 = C_D rho_a v^2 / (rho_i L)) üstel atmosferdeki çözümünden
+        yarıçap değişim hızı olarak alınır:
+          r(z) = r0 sqrt(1 + (2H/l)^2 (e^((z*-z)/2H) - 1)^2)   (Collins et al. 2005, denklem 19)
+        dr/dt = dr/dz * dz/dt, yavaşlayan gövdede yayılma kat edilen yüksekliğe bağlı kalır
+        """
+        spreading, radius0, breakup_altitude, dispersion_length, scale_height = spread
+        velocity, mass, angle, altitude, radius = state
+        rho_a = self.air_density(altitude)
+        area = math.pi * radius ** 2
+        mass = np.maximum(mass, 1e-12)
+        velocity = np.maximum(velocity, 1e-3)
+
+        dv = -self.drag_coefficient * rho_a * area * velocity ** 2 / (2.0 * mass) + self.gravity * np.sin(angle)
+        dm = -0.5 * self.ablation_coefficient * self.drag_coefficient * rho_a * area * velocity ** 3
+        dtheta = self.gravity * np.cos(angle) / velocity - velocity * np.cos(angle) / (self.earth_radius_m + altitude)
+        dh = -velocity * np.sin(angle)
+
+        growth = np.exp(np.minimum((breakup_altitude - altitude) / (2.0 * scale_height), 50.0))
+        spread_ratio = (2.0 * scale_height / dispersion_length) ** 2
+        dr_dz = -radius0 ** 2 / np.maximum(radius, 1e-12) * spread_ratio * (growth - 1.0) * growth / (2.0 * scale_height)
+        dr = np.where(spreading, dr_dz * dh, 0.0)
+
+        return np.stack((dv, dm, dtheta, dh, dr))
+
+    def _rk4_step(self, state, dt, spread):
+        """
+        Her giriş koşulu için kendi dt'si ile RK4 adımı
+        """
+        k1 = self._derivatives(state, spread)
+        k2 = self._derivatives(state + 0.5 * dt * k1, spread)
+        k3 = self._derivatives(state + 0.5 * dt * k2, spread)
+        k4 = self._derivatives(state + dt * k3, spread)
+        updated = state + dt / 6.0 * (k1 + 2.0 * k2 + 2.0 * k3 + k4)
+        updated[1] = np.maximum(updated[1], 0.0)
+        return updated
+
+# Yayımlanmış vakalar: (ad, giriş koşulları, beklenen burst yüksekliği aralığı (m), None = yüzey çarpması)
+REFERENCE_CASES = (
+    # Gözlenen Chelyabinsk airburst'ü, ~27-30 km (Popova et al. 2013), ana kırılma dayanımı ~2 MPa
+    ('chelyabinsk', {'diameter_m': 19.0, 'velocity_ms': 19160.0, 'density_kgm3': 3300.0,
+                     'angle_deg': 18.3, 'strength_pa': 2.0e6}, (27000.0, 31000.0)),
+    # Collins et al. 2005 analitik modeli, 60 m taş gövde ~6 km
+    ('collins_60m_stony', {'diameter_m': 60.0, 'velocity_ms': 17000.0, 'density_kgm3': 3000.0,
+                           'angle_deg': 45.0}, (4000.0, 8000.0)),
+    # z_b < 0: pancake yayılmasını tamamlamadan yere ulaşır, yüzey çarpması (burst yüksekliği 0)
+    ('surface_200m_stony', {'diameter_m': 200.0, 'velocity_ms': 20000.0, 'density_kgm3': 3000.0,
+                            'angle_deg': 45.0}, None),
+    ('surface_300m_porous', {'diameter_m': 300.0, 'velocity_ms': 20000.0, 'density_kgm3': 2600.0,
+                             'angle_deg': 45.0}, None),
+)
+
+def check_reference_cases(model=None):
+    """
+    Modeli yayımlanmış vakalarla karşılaştırır, aralık dışındaki vakalar için AssertionError
+    """
+    model = model or AtmosphericEntryModel()
+    for name, conditions, expected in REFERENCE_CASES:
+        result = model.simulate_single(**conditions)
+        burst_altitude = result['burst_altitude_m']
+        if expected is None:
+            print(f"{name}: surface impact, {result['ground_energy_kt']:.0f} kt at "
+                  f"{result['ground_velocity_ms'] / 1000.0:.1f} km/s")
+            assert not result['airburst'] and result['ground_energy_kt'] > 0, f"{name} should reach the surface"
+            continue
+        low, high = expected
+        print(f"{name}: burst at {burst_altitude / 1000.0:.1f} km (expected {low / 1000.0:.0f}-{high / 1000.0:.0f} km)")
+        assert result['airburst'] and low <= burst_altitude <= high, f"{name} burst altitude out of range"
+
+if __name__ == "__main__":
+    check_reference_cases()
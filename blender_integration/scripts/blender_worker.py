@@ -0,0 +1,222 @@
+import os
+import json
+import time
+import signal
+import threading
+
+import bpy
+
+
+SPOOL_ROOT = "blender_integration/spool"
+
+# Bu süreden eski heartbeat'li worker ölü kabul edilir (Flutter tarafıyla aynı değer)
+HEARTBEAT_TIMEOUT_S = 5.0
+
+class BlenderWorker:
+    """
+    Uzun ömürlü Blender süreci: spool dizinine bırakılan iş dosyalarını sırayla çalıştırır
+    Yüklenmiş modüller, materyal kütüphanesi, primitive mesh'ler ve görüntüler işler arasında bellekte kalır;
+    her iş sahneyi hazırlayıp (sıfırlama ya da incremental koruma) kurar, Blender açılışı ve import maliyeti bir kez ödenir
+
+    Spool düzeni:
+      jobs/<id>.json    bekleyen işler ({'simulation_id', 'config_path'} ya da {'simulation_id', 'config'})
+      active/<id>.json  çalışan iş (rename ile sahiplenilir)
+      worker.json       heartbeat (pid, durum, son güncelleme zamanı)
+      stop              varsa worker mevcut işi bitirip kapanır
+    """
+
+    def __init__(self, simulator, root=SPOOL_ROOT, poll_interval=0.05, heartbeat_interval=1.0, idle_timeout=None):
+        self.simulator = simulator
+        self.root = root
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.idle_timeout = idle_timeout
+        self.jobs_dir = os.path.join(root, 'jobs')
+        self.active_dir = os.path.join(root, 'active')
+        self.heartbeat_path = os.path.join(root, 'worker.json')
+        self.stop_path = os.path.join(root, 'stop')
+        self.blender_version = bpy.app.version_string
+        self.jobs_completed = 0
+        self._started_at = None
+        self._state = 'starting'
+        self._current_job = None
+        self._heartbeat_lock = threading.Lock()
+        self._stop_requested = False
+        self._stopped = threading.Event()
+
+    def run(self):
+        """
+        Durdurulana kadar (stop dosyası, SIGTERM / SIGINT ya da idle_timeout) işleri çalıştırır
+        """
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        os.makedirs(self.active_dir, exist_ok=True)
+
+        if self._other_worker_alive():
+            print(f"Another worker is already serving {self.root}, exiting")
+            return
+
+        if os.path.exists(self.stop_path):
+            os.remove(self.stop_path)
+        self._requeue_abandoned()
+
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        self._started_at = time.time()
+        last_activity = time.time()
+        self._set_state('idle')
+
+        # Uzun sahne kurulumlarında da heartbeat güncel kalsın diye ayrı thread (bpy'a dokunmaz)
+        heartbeat_thread = threading.Thread(target=self._heartbeat_loop, daemon=True)
+        heartbeat_thread.start()
+        print(f"Blender worker ready (pid {os.getpid()}), watching {self.jobs_dir}")
+
+        try:
+            while not self._stopping():
+                job_path = self._claim_next()
+                if job_path is None:
+                    if self.idle_timeout and time.time() - last_activity > self.idle_timeout:
+                        print(f"Worker idle for {self.idle_timeout}s, exiting")
+                        break
+                    time.sleep(self.poll_interval)
+                    continue
+
+                self._run_job(job_path)
+                last_activity = time.time()
+        finally:
+            self._stopped.set()
+            heartbeat_thread.join()
+            with self._heartbeat_lock:
+                if os.path.exists(self.heartbeat_path):
+                    os.remove(self.heartbeat_path)
+            print(f"Blender worker stopped after {self.jobs_completed} jobs")
+
+    def _run_job(self, job_path):
+        """
+        Tek işi çalıştırır; durum dosyası simülatör tarafından yazılır, hata işi değil worker'ı düşürmez
+        """
+        simulation_id = os.path.splitext(os.path.basename(job_path))[0]
+        self._set_state('busy', simulation_id)
+        started = time.perf_counter()
+        simulation_started = False
+
+        try:
+            with open(job_path, 'r') as f:
+                job = json.load(f)
+            simulation_id = job.get('simulation_id', simulation_id)
+
+            config_data = job.get('config')
+            if config_data is None:
+                with open(job['config_path'], 'r') as f:
+                    config_data = json.load(f)
+            config_data['output_id'] = simulation_id
+            self.simulator.start_progress(simulation_id)
+
+            # Aynı türde önceki sahne korunur, sadece değişen bileşenler yeniden kurulur
+            self.simulator.prepare_scene(config_data)
+            self.simulator._create_status_file(simulation_id, 'running', {
+                'config_loaded': True,
+                'worker_pid': os.getpid()
+            })
+            simulation_started = True
+            self.simulator.create_complete_simulation(config_data)
+            print(f"Job {simulation_id} built in {time.perf_counter() - started:.2f}s")
+
+        except Exception as e:
+            # create_complete_simulation kendi hatasını zaten yazar (ve kanalı kapatır); sadece ondan önceki
+            # config okuma / sahne hazırlama hataları burada yazılır
+            print(f"Job {simulation_id} failed: {e}")
+            if not simulation_started:
+                self.simulator._create_status_file(simulation_id, 'failed', {'error': str(e)})
+
+        finally:
+            if os.path.exists(job_path):
+                os.remove(job_path)
+            self.jobs_completed += 1
+            self._set_state('idle')
+
+    def _claim_next(self):
+        """
+        En eski bekleyen işi active/ altına taşıyarak sahiplenir (yoksa None)
+        Yazımı tamamlanmamış işler '.tmp' uzantılıdır ve atlanır
+        """
+        try:
+            names = [name for name in os.listdir(self.jobs_dir) if name.endswith('.json')]
+        except FileNotFoundError:
+            return None
+
+        def submitted(name):
+            try:
+                return os.path.getmtime(os.path.join(self.jobs_dir, name))
+            except OSError:
+                return float('inf')
+
+        for name in sorted(names, key=submitted):
+            target = os.path.join(self.active_dir, name)
+            try:
+                os.rename(os.path.join(self.jobs_dir, name), target)
+            except FileNotFoundError:
+                # İstemci geri çekti
+                continue
+            return target
+        return None
+
+    def _requeue_abandoned(self):
+        """
+        Önceki worker çalışırken kapandıysa yarım kalan işleri kuyruğa geri koyar
+        """
+        for name in os.listdir(self.active_dir):
+            if name.endswith('.json'):
+                print(f"Requeueing abandoned job {name}")
+                os.replace(os.path.join(self.active_dir, name), os.path.join(self.jobs_dir, name))
+
+    def _set_state(self, state, current_job=None):
+        """
+        Durumu değiştirir ve heartbeat'i hemen yazar
+        """
+        self._state = state
+        self._current_job = current_job
+        self._write_heartbeat()
+
+    def _heartbeat_loop(self):
+        while not self._stopped.wait(self.heartbeat_interval):
+            self._write_heartbeat()
+
+    def _write_heartbeat(self):
+        """
+        worker.json'ı atomik olarak günceller (istemciler worker'ın canlı olduğunu buradan anlar)
+        """
+        data = {
+            'pid': os.getpid(),
+            'state': self._state,
+            'current_job': self._current_job,
+            'jobs_completed': self.jobs_completed,
+            'started_at': self._started_at,
+            'heartbeat': time.time(),
+            'blender_version': self.blender_version
+        }
+        with self._heartbeat_lock:
+            if self._stopped.is_set():
+                return
+            temp_path = self.heartbeat_path + '.tmp'
+            with open(temp_path, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(temp_path, self.heartbeat_path)
+
+    def _other_worker_alive(self):
+        """
+        Spool'u taze heartbeat'li başka bir worker'ın kullanıp kullanmadığı
+        """
+        try:
+            with open(self.heartbeat_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return data.get('pid') != os.getpid() and time.time() - data.get('heartbeat', 0) < HEARTBEAT_TIMEOUT_S
+
+    def _stopping(self):
+        return self._stop_requested or os.path.exists(self.stop_path)
+
+    def _request_stop(self, signum, frame):
+        print(f"Worker received signal {signum}, finishing current job")
+        self._stop_requested = True
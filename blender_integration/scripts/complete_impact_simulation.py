@@ -2,13 +2,34 @@ import bpy
 import json
 import sys
 import os
+import hashlib
 from pathlib import Path
 
+import mathutils
+
 # Import our modules
 from asteroid_generator import AsteroidGenerator
 from earth_setup import EarthModelGenerator
 from impact_simulation import ImpactSimulation
 from orbital_mechanics import OrbitalMechanicsVisualizer
+from scene_builder import scene_builder
+from asteroid_rotation import rotation_animator
+from blender_worker import BlenderWorker, SPOOL_ROOT
+from progress_channel import ProgressChannel, FINAL_STATUSES, attach_render_handlers, render_follows
+
+BUILD_STATE_PROPERTY = 'impactsim_build_state'
+SCENE_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cache', 'scenes', 'last_scene.blend')
+
+# Bileşen kurulumlarını bölüm bölüm izleyen simülasyon türleri
+INCREMENTAL_TYPES = ('impact',)
+
+# Impact sahnesinin bileşenleri (kurulum sırasıyla) ve bağlı oldukları config bölümleri
+IMPACT_COMPONENTS = (
+    ('earth_system', ('impact_site',)),
+    ('impact_marker', ('impact_site', 'asteroid')),
+    ('sun', ('impact_date',)),
+    ('impact_simulation', ('asteroid', 'impact_site', 'frame_budget')),
+)
 
 class CompleteImpactSimulation:
     """
@@ -21,6 +42,9 @@ class CompleteImpactSimulation:
         self.earth_generator = EarthModelGenerator()
         self.impact_simulator = ImpactSimulation()
         self.orbital_visualizer = OrbitalMechanicsVisualizer()
+        # Girdileri değişmeyen bileşenler önceki sahneden korunur
+        self.incremental = True
+        self._progress = {}
     
     def create_complete_simulation(self, config_data):
         """
@@ -37,8 +61,15 @@ class CompleteImpactSimulation:
             'components': {},
             'render_info': {}
         }
+        progress = self.progress(result['simulation_id'])
+        # Komut satırında -a / -f varsa render bu süreçte sahneden sonra çalışır, son durumu o yazar
+        render_pending = render_follows(sys.argv)
+        if render_pending:
+            progress.expect_render()
         
         try:
+            progress.phase(simulation_type, 0)
+            
             if simulation_type == 'impact':
                 result = self._create_impact_simulation(config_data)
             elif simulation_type == 'orbital':
@@ -52,10 +83,14 @@ class CompleteImpactSimulation:
                 result = self._create_comprehensive_simulation(config_data)
             
             # Setup rendering
-            self._setup_render_pipeline(render_settings, result['simulation_id'])
+            progress.phase('render_setup', 95)
+            self._setup_render_pipeline(render_settings, result['simulation_id'], result.get('render_info'))
             
-            # Create status file
-            self._create_status_file(result['simulation_id'], 'completed', result)
+            # Create status file (render bekleniyorsa son durum değil, render handler'ları bitirir)
+            if render_pending:
+                progress.scene_built(_freeze(result))
+            else:
+                self._create_status_file(result['simulation_id'], 'completed', result)
             
             print("=== Simulation Creation Completed Successfully ===")
             
@@ -69,50 +104,169 @@ class CompleteImpactSimulation:
     def _create_impact_simulation(self, config_data):
         """
         Asteroid impact simülasyonu oluşturur
+        Bileşenler kendi collection'larına kurulur; önceki sahnede girdileri değişmeyen bileşenler korunur
         """
         print("Creating Impact Simulation...")
         
         asteroid_data = config_data['asteroid']
         impact_coords = config_data['impact_coordinates']
+        frame_budget, fps = self._get_frame_budget(config_data.get('render_settings', {}))
         
-        # 1. Dünya sistemi oluştur
-        print("- Setting up Earth system...")
-        earth_system = self.earth_generator.create_complete_earth_system()
-        
-        # Impact marker ekle
-        impact_marker = self.earth_generator.add_impact_location_marker(
-            impact_coords['latitude'],
-            impact_coords['longitude'],
-            f"Impact_{asteroid_data.get('name', 'Unknown')}"
-        )
-        
-        # Lighting setup
-        sun = self.earth_generator.setup_earth_lighting()
+        def build_impact(components):
+            earth = components['earth_system']['earth']
+            # Dünya korunduysa önceki çarpmanın displacement'ı temizlenir
+            self.impact_simulator.clear_crater_displacement(earth)
+            return self.impact_simulator.simulate_asteroid_impact(
+                asteroid_data,
+                impact_coords,
+                earth,
+                frame_budget=frame_budget,
+                fps=fps
+            )
         
-        # 2. Impact simülasyonu
-        print("- Creating impact simulation...")
-        simulation_objects = self.impact_simulator.simulate_asteroid_impact(
-            asteroid_data,
-            impact_coords,
-            earth_system['earth']
-        )
+        components = self._build_components('impact', IMPACT_COMPONENTS, config_data, {
+            # 1. Dünya sistemi oluştur
+            'earth_system': lambda components: self.earth_generator.create_complete_earth_system(
+                focus=(impact_coords['latitude'], impact_coords['longitude'])
+            ),
+            # Impact marker ekle
+            'impact_marker': lambda components: self.earth_generator.add_impact_location_marker(
+                impact_coords['latitude'],
+                impact_coords['longitude'],
+                f"Impact_{asteroid_data.get('name', 'Unknown')}"
+            ),
+            # Lighting setup (çarpma anı verilirse Güneş gerçek konumunda)
+            'sun': lambda components: self.earth_generator.setup_earth_lighting(impact_coords.get('date')),
+            # 2. Impact simülasyonu
+            'impact_simulation': build_impact,
+        })
+        simulation_objects = components['impact_simulation']
+        timeline = simulation_objects['timeline']
         
         return {
             'simulation_id': config_data.get('output_id', 'unknown'),
             'simulation_type': 'impact',
-            'components': {
-                'earth_system': earth_system,
-                'impact_marker': impact_marker,
-                'sun': sun,
-                'impact_simulation': simulation_objects
-            },
+            'components': components,
             'render_info': {
                 'primary_camera': 'Main_Camera',
-                'animation_frames': (1, 300),
-                'focus_object': 'Earth'
+                'animation_frames': (timeline['approach_start'], timeline['simulation_end']),
+                'focus_object': 'Earth',
+                'airburst': simulation_objects['entry']['airburst'],
+                'burst_altitude_km': simulation_objects['entry']['burst_altitude_m'] / 1000.0,
+                'damage_radii_km': simulation_objects['damage_radii_km'],
+                'exposure': simulation_objects['exposure']
             }
         }
     
+    def _build_components(self, simulation_type, dependencies, config_data, builders):
+        """
+        Bileşenleri sırayla kurar: bağlı olduğu config bölümlerinin hash'i önceki kurulumla aynı olan
+        bileşen sahnede bırakılır, değişenin collection'ı silinip yeniden kurulur
+        builders: bileşen adı -> fonksiyon(o ana kadarki bileşen sonuçları) -> sonuç
+        Kurulum durumu (hash'ler ve JSON uyumlu sonuçlar) sahneye yazılır, .blend ile birlikte saklanır
+        Durumda işin kendi türü tutulur: bileşenleri başka türde bir işin (deflection, comprehensive) parçası
+        olarak kuruluyorsa sahne incremental değildir, durum yazılmaz
+        """
+        scene = bpy.context.scene
+        progress = self.progress(config_data.get('output_id', 'unknown'))
+        sections = self._section_hashes(config_data)
+        job_type = config_data.get('simulation_type', 'impact')
+        persistent = job_type == simulation_type and job_type in INCREMENTAL_TYPES
+        state = self._load_build_state(scene)
+        if not persistent or state is None or state.get('simulation_type') != job_type:
+            state = {'simulation_type': job_type, 'components': {}}
+        if not persistent and BUILD_STATE_PROPERTY in scene:
+            del scene[BUILD_STATE_PROPERTY]
+        
+        components = {}
+        rebuilt = []
+        for name, depends_on in dependencies:
+            digest = _digest([sections[section] for section in depends_on])
+            previous = state['components'].get(name)
+            collection = bpy.data.collections.get(f"Component_{name}")
+            
+            if previous is not None and previous['hash'] == digest and collection is not None:
+                components[name] = _thaw(previous['result'])
+                continue
+            
+            # Kurulum yarıda kalırsa yeni collection eski hash'le eşleşmesin: kayıt collection'dan önce silinir
+            if previous is not None and persistent:
+                del state['components'][name]
+                scene[BUILD_STATE_PROPERTY] = json.dumps(state)
+            if collection is not None:
+                scene_builder.remove_collection(collection)
+            progress.phase(name, 5 + 85 * len(components) / len(dependencies))
+            collection = scene_builder.new_collection(f"Component_{name}")
+            with scene_builder.building_into(collection):
+                components[name] = builders[name](components)
+            state['components'][name] = {'hash': digest, 'result': _freeze(components[name])}
+            if persistent:
+                scene[BUILD_STATE_PROPERTY] = json.dumps(state)
+            rebuilt.append(name)
+        
+        kept = [name for name, _ in dependencies if name not in rebuilt]
+        print(f"- Rebuilt components: {', '.join(rebuilt) or 'none'}; kept: {', '.join(kept) or 'none'}")
+        return components
+    
+    def _section_hashes(self, config_data):
+        """
+        Config bölümlerinin hash'leri; render çözünürlüğü gibi sadece render ayarını etkileyen değişiklikler
+        sahne bileşenlerini bayatlatmasın diye frame bütçesi render ayarlarından ayrı tutulur
+        """
+        impact_coords = config_data.get('impact_coordinates', {})
+        render_settings = config_data.get('render_settings', {})
+        sections = {
+            'asteroid': config_data.get('asteroid'),
+            'orbital_elements': config_data.get('orbital_elements'),
+            'impact_site': [impact_coords.get('latitude'), impact_coords.get('longitude')],
+            'impact_date': impact_coords.get('date'),
+            'frame_budget': list(self._get_frame_budget(render_settings)),
+            'render_settings': render_settings,
+        }
+        return {name: _digest(value) for name, value in sections.items()}
+    
+    def _load_build_state(self, scene=None):
+        scene = scene or bpy.context.scene
+        if BUILD_STATE_PROPERTY not in scene:
+            return None
+        return json.loads(scene[BUILD_STATE_PROPERTY])
+    
+    def prepare_scene(self, config_data):
+        """
+        Yeni iş için sahneyi hazırlar: önceki sahne aynı türde incremental bir kurulumsa korunur
+        (bayat bileşenler kurulumda değiştirilir), değilse tamamen boşaltılır
+        """
+        scene = bpy.context.scene
+        simulation_type = config_data.get('simulation_type', 'impact')
+        state = self._load_build_state(scene)
+        
+        if self.incremental and state is not None and state.get('simulation_type') == simulation_type:
+            print("Reusing previous scene for incremental rebuild")
+            return
+        
+        scene_builder.reset_scene(scene)
+        if BUILD_STATE_PROPERTY in scene:
+            del scene[BUILD_STATE_PROPERTY]
+    
+    def open_previous_scene(self, config_data):
+        """
+        Tek seferlik çalıştırmada önceki incremental sahneyi .blend'den açar (worker'da sahne zaten bellekte)
+        """
+        if not self.incremental or config_data.get('simulation_type', 'impact') not in INCREMENTAL_TYPES:
+            return
+        if os.path.exists(SCENE_CACHE_PATH):
+            print(f"Opening previous scene: {SCENE_CACHE_PATH}")
+            bpy.ops.wm.open_mainfile(filepath=SCENE_CACHE_PATH, load_ui=False)
+    
+    def save_scene(self, config_data):
+        """
+        Kurulan incremental sahneyi bir sonraki tek seferlik çalıştırma için saklar
+        """
+        if not self.incremental or config_data.get('simulation_type', 'impact') not in INCREMENTAL_TYPES:
+            return
+        os.makedirs(os.path.dirname(SCENE_CACHE_PATH), exist_ok=True)
+        bpy.ops.wm.save_as_mainfile(filepath=SCENE_CACHE_PATH, copy=True)
+    
     def _create_orbital_simulation(self, config_data):
         """
         Orbital mechanics simülasyonu oluşturur
@@ -135,11 +289,14 @@ class CompleteImpactSimulation:
     def _create_comparison_simulation(self, config_data):
         """
         Çoklu asteroid karşılaştırma simülasyonu
+        Dünya sistemi bir kez gizli bir collection'a kurulur, her hücreye collection instance olarak yerleşir;
+        hücreye özgü olan sadece çarpma efektleri ve arazi yamasıdır (kendi collection'ında, hücre empty'sine bağlı)
         """
         print("Creating Comparison Simulation...")
         
         asteroids = config_data.get('asteroids', [])
         impact_coords = config_data['impact_coordinates']
+        frame_budget, fps = self._get_frame_budget(config_data.get('render_settings', {}))
         
         # Layout ayarları
         grid_size = int(len(asteroids) ** 0.5) + 1
@@ -150,6 +307,18 @@ class CompleteImpactSimulation:
             'impact_simulations': [],
             'cameras': []
         }
+        animation_end = 1
+        
+        # Paylaşılan Dünya sistemi (mesh, doku ve materyaller bir kez)
+        earth_collection = scene_builder.new_collection("Comparison_Earth", hidden=True)
+        with scene_builder.building_into(earth_collection):
+            earth_system = self.earth_generator.create_complete_earth_system(
+                focus=(impact_coords['latitude'], impact_coords['longitude'])
+            )
+        
+        # Tüm hücreler aynı noktaya çarpar: paylaşılan Dünya orada bir kez kesilir,
+        # her hücre deliği kendi (ortak boyutlu) arazi yamasıyla kapatır, düzlem küre içinde kalmaz
+        terrain_half_size_km = self.impact_simulator.cut_shared_earth(earth_system['earth'], asteroids, impact_coords)
         
         for i, asteroid_data in enumerate(asteroids):
             print(f"- Creating simulation {i+1}/{len(asteroids)} for {asteroid_data.get('name', 'Unknown')}...")
@@ -158,34 +327,47 @@ class CompleteImpactSimulation:
             x_pos = (i % grid_size) * spacing - (grid_size * spacing / 2)
             z_pos = (i // grid_size) * spacing - (grid_size * spacing / 2)
             
-            # Earth system
-            earth_system = self.earth_generator.create_complete_earth_system()
+            # Hücre: Dünya instance'ı + bu çarpmanın efektleri, Dünya merkezli kurulup hücre empty'siyle taşınır
+            name = asteroid_data.get('name', f'Asteroid_{i}')
+            cell_collection = scene_builder.new_collection(f"Comparison_Cell_{name}")
+            with scene_builder.building_into(cell_collection):
+                cell = scene_builder.empty(f"Cell_{name}", location=(x_pos, 0, z_pos))
+                earth_instance = scene_builder.collection_instance(f"Earth_{name}", earth_collection)
+                
+                impact_sim = self.impact_simulator.simulate_asteroid_impact(
+                    asteroid_data,
+                    impact_coords,
+                    earth_system['earth'],
+                    frame_budget=frame_budget,
+                    fps=fps,
+                    shared_earth=True,
+                    terrain_half_size_km=terrain_half_size_km
+                )
+            animation_end = max(animation_end, impact_sim['timeline']['simulation_end'])
             
-            # Position earth system
-            earth_system['earth'].location = (x_pos, 0, z_pos)
-            earth_system['atmosphere'].location = (x_pos, 0, z_pos)
-            earth_system['clouds'].location = (x_pos, 0, z_pos)
-            
-            # Impact simulation
-            impact_sim = self.impact_simulator.simulate_asteroid_impact(
-                asteroid_data,
-                impact_coords,
-                earth_system['earth']
-            )
+            for obj in cell_collection.objects:
+                if obj.parent is None and obj is not cell:
+                    obj.parent = cell
             
             # Individual camera
-            bpy.ops.object.camera_add(location=(x_pos + 15, -15, z_pos + 10))
-            camera = bpy.context.active_object
-            camera.name = f"Camera_{asteroid_data.get('name', f'Asteroid_{i}')}"
+            camera = scene_builder.camera(
+                f"Camera_{name}",
+                location=(x_pos + 15, -15, z_pos + 10)
+            )
             
-            components['earth_systems'].append(earth_system)
+            components['earth_systems'].append(earth_instance)
             components['impact_simulations'].append(impact_sim)
             components['cameras'].append(camera)
         
         # Master overview camera
-        bpy.ops.object.camera_add(location=(0, -grid_size * spacing * 1.5, grid_size * spacing))
-        master_camera = bpy.context.active_object
-        master_camera.name = "Master_Overview_Camera"
+        master_camera = scene_builder.camera(
+            "Master_Overview_Camera",
+            location=(0, -grid_size * spacing * 1.5, grid_size * spacing)
+        )
+        
+        # Her impact kendi frame aralığını kurar, en uzun olanı kullan
+        bpy.context.scene.frame_start = 1
+        bpy.context.scene.frame_end = animation_end
         
         return {
             'simulation_id': config_data.get('output_id', 'unknown'),
@@ -193,7 +375,7 @@ class CompleteImpactSimulation:
             'components': components,
             'render_info': {
                 'primary_camera': 'Master_Overview_Camera',
-                'animation_frames': (1, 300),
+                'animation_frames': (1, animation_end),
                 'grid_size': grid_size,
                 'asteroid_count': len(asteroids)
             }
@@ -217,7 +399,8 @@ class CompleteImpactSimulation:
             'asteroid': asteroid_data,
             'impact_coordinates': {
                 'latitude': original_impact['latitude'],
-                'longitude': original_impact['longitude']
+                'longitude': original_impact['longitude'],
+                'date': original_impact.get('date')
             }
         })
         
@@ -303,6 +486,7 @@ class CompleteImpactSimulation:
         impact_components = self._create_impact_simulation({
             'asteroid': asteroid_data,
             'impact_coordinates': impact_coords,
+            'render_settings': config_data.get('render_settings', {}),
             'output_id': config_data.get('output_id')
         })
         
@@ -328,24 +512,16 @@ class CompleteImpactSimulation:
         Multi-camera sistem kurar
         """
         # Master camera (overview)
-        bpy.ops.object.camera_add(location=(50, -50, 30))
-        master_cam = bpy.context.active_object
-        master_cam.name = "Master_Camera"
+        master_cam = scene_builder.camera("Master_Camera", location=(50, -50, 30))
         
         # Orbital phase camera  
-        bpy.ops.object.camera_add(location=(0, -40, 20))
-        orbital_cam = bpy.context.active_object
-        orbital_cam.name = "Orbital_Phase_Camera"
+        orbital_cam = scene_builder.camera("Orbital_Phase_Camera", location=(0, -40, 20))
         
         # Impact close-up camera
-        bpy.ops.object.camera_add(location=(10, -10, 5))
-        impact_cam = bpy.context.active_object
-        impact_cam.name = "Impact_Closeup_Camera"
+        impact_cam = scene_builder.camera("Impact_Closeup_Camera", location=(10, -10, 5))
         
         # Side view camera
-        bpy.ops.object.camera_add(location=(0, 30, 0))
-        side_cam = bpy.context.active_object
-        side_cam.name = "Side_View_Camera"
+        side_cam = scene_builder.camera("Side_View_Camera", location=(0, 30, 0))
         
         # Camera switching animation
         scene = bpy.context.scene
@@ -369,9 +545,22 @@ class CompleteImpactSimulation:
             camera.hide_viewport = True
             camera.keyframe_insert(data_path="hide_viewport", frame=end_frame+1)
     
-    def _setup_render_pipeline(self, render_settings, simulation_id):
+    def _get_frame_budget(self, render_settings):
+        """
+        Render ayarlarından frame bütçesini ve fps'i okur
+        """
+        frame_start = render_settings.get('frame_start', 1)
+        frame_end = render_settings.get('frame_end')
+        fps = int(render_settings.get('frame_rate', 24))
+        
+        if frame_end is None:
+            return None, fps
+        return max(frame_end - frame_start + 1, 1), fps
+    
+    def _setup_render_pipeline(self, render_settings, simulation_id, render_info=None):
         """
         Render pipeline'ı kurar
+        Frame aralığı simülasyon planından gelir, render ayarlarındaki frame_end üst sınırdır
         """
         print("Setting up render pipeline...")
         
@@ -388,8 +577,17 @@ class CompleteImpactSimulation:
         scene.render.resolution_percentage = 100
         
         # Frame range
-        scene.frame_start = render_settings.get('frame_start', 1)
-        scene.frame_end = render_settings.get('frame_end', 250)
+        if render_info and render_info.get('animation_frames'):
+            frame_start, frame_end = render_info['animation_frames']
+            if 'frame_end' in render_settings:
+                frame_end = min(frame_end, frame_start + render_settings['frame_end'] - render_settings.get('frame_start', 1))
+            scene.frame_start = frame_start
+            scene.frame_end = frame_end
+        else:
+            scene.frame_start = render_settings.get('frame_start', 1)
+            scene.frame_end = render_settings.get('frame_end', 250)
+        # Tumbling tabloları kesinleşen render aralığına göre yeniden yazılır
+        rotation_animator.update_scene(scene)
         scene.frame_set(scene.frame_start)
         
         # Output settings
@@ -423,26 +621,73 @@ class CompleteImpactSimulation:
         print(f"- Resolution: {scene.render.resolution_x}x{scene.render.resolution_y}")
         print(f"- Frames: {scene.frame_start}-{scene.frame_end}")
         print(f"- Output: {scene.render.filepath}")
+        
+        # Render bu süreçte çalıştırılırsa frame ilerlemesi aynı kanala akar
+        attach_render_handlers(self.progress(simulation_id))
+    
+    def start_progress(self, simulation_id):
+        """
+        Yeni çalıştırmanın ilerleme kanalı: aynı id'nin önceki olay dosyası boşaltılır
+        """
+        self._progress[simulation_id] = ProgressChannel(simulation_id, blender_version=bpy.app.version_string)
+        self._progress[simulation_id].restart()
+        return self._progress[simulation_id]
+    
+    def progress(self, simulation_id):
+        """
+        Simülasyonun ilerleme kanalı (iş boyunca aynı kanal)
+        """
+        if simulation_id not in self._progress:
+            self._progress[simulation_id] = ProgressChannel(simulation_id, blender_version=bpy.app.version_string)
+        return self._progress[simulation_id]
     
     def _create_status_file(self, simulation_id, status, data=None):
         """
-        Simülasyon durumu için JSON dosyası oluşturur
+        Simülasyon durumunu ilerleme kanalına yazar (status_<id>.json atomik, olay progress_<id>.ndjson'a)
+        Sonuçtaki Blender objeleri adlarıyla yazılır
         """
-        status_data = {
-            'simulation_id': simulation_id,
-            'status': status,
-            'timestamp': str(bpy.context.scene.frame_current),
-            'blender_version': bpy.app.version_string,
-            'data': data or {}
-        }
-        
-        status_path = f"blender_integration/output/status_{simulation_id}.json"
-        os.makedirs(os.path.dirname(status_path), exist_ok=True)
-        
-        with open(status_path, 'w') as f:
-            json.dump(status_data, f, indent=2)
+        self.progress(simulation_id).status(status, _freeze(data) if data is not None else None)
+        if status in FINAL_STATUSES:
+            # Kalıcı worker'da bitmiş işlerin kanalları birikmez (render handler'ı kendi referansını tutar)
+            self._progress.pop(simulation_id, None)
         
-        print(f"Status file created: {status_path}")
+        print(f"Status updated: {simulation_id} -> {status}")
+
+def _digest(value):
+    payload = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def _freeze(value):
+    """
+    Bileşen sonucunu JSON uyumlu hale getirir: objeler adlarıyla, vektörler liste olarak saklanır
+    """
+    if isinstance(value, bpy.types.Object):
+        return {'__object__': value.name}
+    if isinstance(value, dict):
+        return {str(key): _freeze(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_freeze(item) for item in value]
+    if isinstance(value, (mathutils.Vector, mathutils.Euler, mathutils.Quaternion, mathutils.Color)):
+        return list(value)
+    if hasattr(value, 'tolist'):
+        # NumPy skaler / dizileri
+        return value.tolist()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    # Modifier gibi objeye bağlı veriler sadece adıyla
+    return getattr(value, 'name', str(value))
+
+def _thaw(value):
+    """
+    _freeze sonucundaki obje adlarını sahnedeki objelere çevirir
+    """
+    if isinstance(value, dict):
+        if set(value) == {'__object__'}:
+            return bpy.data.objects.get(value['__object__'])
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_thaw(item) for item in value]
+    return value
 
 def main():
     """
@@ -450,7 +695,21 @@ def main():
     """
     print("=== Blender Complete Impact Simulation ===")
     
-    if '--' in sys.argv:
+    if '--' in sys.argv and '--worker' in sys.argv[sys.argv.index('--') + 1:]:
+        # Kalıcı worker: işler spool dizininden alınır, Blender ve modüller bir kez yüklenir
+        argv = sys.argv[sys.argv.index('--') + 1:]
+        idle_timeout = None
+        spool_root = SPOOL_ROOT
+        for i, arg in enumerate(argv):
+            if arg == '--idle-timeout' and i + 1 < len(argv):
+                idle_timeout = float(argv[i + 1])
+            elif arg == '--spool' and i + 1 < len(argv):
+                # Scheduler havuzundaki worker'lar kendi spool dizinini kullanır
+                spool_root = argv[i + 1]
+        
+        BlenderWorker(CompleteImpactSimulation(), root=spool_root, idle_timeout=idle_timeout).run()
+    
+    elif '--' in sys.argv:
         argv = sys.argv[sys.argv.index('--') + 1:]
         
         config_path = None
@@ -463,6 +722,7 @@ def main():
                 output_id = argv[i + 1]
         
         if config_path and os.path.exists(config_path):
+            simulation_started = False
             try:
                 print(f"Loading config from: {config_path}")
                 
@@ -473,12 +733,19 @@ def main():
                 if output_id:
                     config_data['output_id'] = output_id
                 
-                # Create status file
+                # Önceki impact sahnesi varsa sadece değişen bileşenler yeniden kurulur
                 simulator = CompleteImpactSimulation()
+                simulator.open_previous_scene(config_data)
+                simulator.prepare_scene(config_data)
+                
+                # Create status file
+                simulator.start_progress(output_id or 'unknown')
                 simulator._create_status_file(output_id or 'unknown', 'running', {'config_loaded': True})
                 
-                # Run simulation
+                # Run simulation (hata durumunu kendisi yazar)
+                simulation_started = True
                 result = simulator.create_complete_simulation(config_data)
+                simulator.save_scene(config_data)
                 
                 print("=== SIMULATION COMPLETED SUCCESSFULLY ===")
                 print(f"Simulation ID: {result['simulation_id']}")
@@ -489,7 +756,7 @@ def main():
                 print(f"=== SIMULATION FAILED ===")
                 print(f"Error: {e}")
                 
-                if output_id:
+                if output_id and not simulation_started:
                     simulator = CompleteImpactSimulation()
                     simulator._create_status_file(output_id, 'failed', {'error': str(e)})
                 
@@ -526,6 +793,7 @@ def main():
         }
         
         simulator = CompleteImpactSimulation()
+        simulator.start_progress(test_config['output_id'])
         result = simulator.create_complete_simulation(test_config)
         
         print("=== TEST SIMULATION COMPLETED ===")
@@ -0,0 +1,100 @@
+import numpy as np
+from mathutils import kdtree
+
+class CraterField:
+    """
+    Asteroid yüzeyi için power-law boyut dağılımlı krater alanı
+    Vertex'ler bir kez KD-tree'ye eklenir, her krater sadece etki yarıçapındaki vertex'leri sorgular
+    Krater başına maliyet O(log V + k), tüm vertex taraması yok
+    """
+
+    def __init__(self, slope=2.0, depth_ratio=0.2, rim_ratio=0.04, rim_extent=1.5):
+        self.slope = slope  # Kümülatif SFD üssü, N(>r) ~ r^-slope
+        self.depth_ratio = depth_ratio  # Derinlik / çap (basit kraterler ~0.2)
+        self.rim_ratio = rim_ratio  # Kenar yüksekliği / çap
+        self.rim_extent = rim_extent  # Kenar ejectasının uzandığı yarıçap oranı
+        self.reference_radius = 0.05  # Yoğunluk bu yarıçaptan (gövde yarıçapı oranı) büyük kraterler için
+        self.max_craters = 20000
+
+    def crater_count(self, density, min_radius, body_radius):
+        """
+        Referans yoğunluktan çözünürlüğe bağlı krater sayısı
+        Küçük kraterler çözülebildikçe (yüksek subdivision) sayı power-law ile artar
+        """
+        relative = max(min_radius / body_radius, 1e-6)
+        count = density * (relative / self.reference_radius) ** (-self.slope)
+        return int(min(max(count, 0), self.max_craters))
+
+    def sample_craters(self, count, min_radius, max_radius, rng):
+        """
+        Küre üzerinde düzgün dağılmış yönler ve kesik power-law yarıçaplar üretir
+        """
+        directions = rng.normal(size=(count, 3))
+        directions /= np.maximum(np.linalg.norm(directions, axis=1, keepdims=True), 1e-12)
+
+        # Kesik Pareto dağılımından ters CDF örnekleme
+        low = min_radius ** -self.slope
+        high = max_radius ** -self.slope
+        u = rng.random(count)
+        radii = (low - u * (low - high)) ** (-1.0 / self.slope)
+
+        # Büyükten küçüğe: genç küçük kraterler eskilerin üzerine basılır
+        order = np.argsort(radii)[::-1]
+        return directions[order], radii[order]
+
+    def build_index(self, coords):
+        """
+        Vertex koordinatlarından KD-tree oluşturur
+        """
+        tree = kdtree.KDTree(len(coords))
+        for index, co in enumerate(coords):
+            tree.insert(co, index)
+        tree.balance()
+        return tree
+
+    def stamp(self, coords, normals, directions, radii, body_radius, tree=None):
+        """
+        Kraterleri basar ve vertex normali boyunca displacement dizisini döndürür
+        coords, normals: (N, 3) NumPy dizileri
+        """
+        coords = np.asarray(coords, dtype=np.float64)
+        normals = np.asarray(normals, dtype=np.float64)
+        if tree is None:
+            tree = self.build_index(coords)
+        displacement = np.zeros(len(coords))
+
+        for direction, radius in zip(directions, radii):
+            # Krater merkezi: yöne en yakın yüzey vertex'i
+            _, center_index, _ = tree.find(direction * body_radius)
+            if center_index is None:
+                continue
+
+            hits = tree.find_range(coords[center_index], radius * self.rim_extent)
+            if not hits:
+                continue
+
+            indices = np.fromiter((hit[1] for hit in hits), dtype=np.int64, count=len(hits))
+            offsets = coords[indices] - coords[center_index]
+
+            # Krater eksenine dik mesafe (eğri yüzeyde derinlik eksen boyunca değil normal boyunca)
+            axis = normals[center_index]
+            along = offsets @ axis
+            lateral = np.sqrt(np.maximum(np.einsum('ij,ij->i', offsets, offsets) - along ** 2, 0.0))
+
+            displacement[indices] += self.profile(lateral / radius, radius)
+
+        return displacement
+
+    def profile(self, x, radius):
+        """
+        Çanak + yükseltilmiş kenar profili, x = mesafe / krater yarıçapı
+        """
+        diameter = 2.0 * radius
+        depth = self.depth_ratio * diameter
+        rim = self.rim_ratio * diameter
+
+        inner = rim - (depth + rim) * (1.0 - x ** 2)
+        outer_span = self.rim_extent - 1.0
+        outer = rim * np.clip((self.rim_extent - x) / outer_span, 0.0, 1.0) ** 3
+
+        return np.where(x < 1.0, inner, outer)
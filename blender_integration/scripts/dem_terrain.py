@@ -0,0 +1,289 @@
+import os
+import re
+import math
+import struct
+import numpy as np
+
+from geodesy import enu_to_geodetic
+
+DEM_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'assets', 'dem')
+
+# TIFF etiketleri
+TAG_WIDTH = 256
+TAG_HEIGHT = 257
+TAG_BITS_PER_SAMPLE = 258
+TAG_COMPRESSION = 259
+TAG_STRIP_OFFSETS = 273
+TAG_SAMPLES_PER_PIXEL = 277
+TAG_ROWS_PER_STRIP = 278
+TAG_TILE_WIDTH = 322
+TAG_TILE_LENGTH = 323
+TAG_TILE_OFFSETS = 324
+TAG_SAMPLE_FORMAT = 339
+TAG_PIXEL_SCALE = 33550
+TAG_TIEPOINT = 33922
+TAG_GEO_KEYS = 34735
+TAG_GDAL_NODATA = 42113
+
+# TIFF alan tipi -> struct formatı
+TIFF_TYPES = {1: 'B', 2: 's', 3: 'H', 4: 'I', 6: 'b', 8: 'h', 9: 'i', 11: 'f', 12: 'd'}
+
+class DEMReader:
+    """
+    Diskteki yerel yükseklik karolarından (SRTM .hgt, sıkıştırılmamış GeoTIFF) pencere okur
+    Karolar memmap ile açılır, sadece istenen pencerenin satır / strip / tile baytlarına dokunulur
+    Global bir DEM seti belleğe alınmadan diskte durabilir
+    bpy kullanmaz
+    """
+
+    def __init__(self, root=DEM_ROOT):
+        self.root = os.path.normpath(root)
+        self._index = None
+
+    def rasters(self):
+        """
+        Klasördeki karoların listesi (başlıklar bir kez okunur)
+        """
+        if self._index is None:
+            self._index = []
+            if os.path.isdir(self.root):
+                for filename in sorted(os.listdir(self.root)):
+                    path = os.path.join(self.root, filename)
+                    extension = os.path.splitext(filename)[1].lower()
+                    try:
+                        if extension == '.hgt':
+                            self._index.append(_HGTRaster(path))
+                        elif extension in ('.tif', '.tiff'):
+                            self._index.append(GeoTIFFRaster(path))
+                    except ValueError as e:
+                        print(f"Skipping DEM tile {filename}: {e}")
+        return self._index
+
+    def sample(self, latitudes, longitudes):
+        """
+        Noktalarda bilineer yükseklik (metre), veri yoksa NaN
+        Her karodan sadece noktaları kapsayan satır / sütun penceresi okunur
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        heights = np.full(latitudes.shape, np.nan)
+
+        for raster in self.rasters():
+            rows, cols = raster.pixel_coordinates(latitudes, longitudes)
+            inside = np.isnan(heights) & (rows >= 0) & (rows <= raster.rows - 1) & (cols >= 0) & (cols <= raster.cols - 1)
+            if not inside.any():
+                continue
+
+            row0 = int(np.floor(rows[inside].min()))
+            col0 = int(np.floor(cols[inside].min()))
+            row1 = min(int(np.floor(rows[inside].max())) + 2, raster.rows)
+            col1 = min(int(np.floor(cols[inside].max())) + 2, raster.cols)
+            window = raster.read(row0, row1, col0, col1)
+
+            heights[inside] = _bilinear(window, rows[inside] - row0, cols[inside] - col0)
+
+        return heights
+
+    def window(self, latitude, longitude, half_size_km, resolution, require_data=True):
+        """
+        Çarpma noktası etrafında yerel doğu / kuzey ızgarası, (resolution + 1)^2 örnek
+        Döndürür: {'latitudes', 'longitudes', 'heights', 'east_km', 'north_km'} ya da veri yoksa None
+        require_data=False ise veri olmayan pencere düz (deniz seviyesi) döner
+        """
+        offsets = np.linspace(-half_size_km, half_size_km, resolution + 1)
+        east_km, north_km = np.meshgrid(offsets, offsets, indexing='xy')
+
+        # Teğet düzlem ofsetleri WGS84 üzerinden enlem / boylama (yüksek enlemlerde de doğru)
+        latitudes, longitudes, _ = enu_to_geodetic(latitude, longitude, east_km * 1000.0, north_km * 1000.0)
+
+        heights = self.sample(latitudes, longitudes)
+        if np.isnan(heights).all() and require_data:
+            return None
+
+        # Boşluklar (SRTM void, deniz) deniz seviyesi kabul edilir
+        heights = np.nan_to_num(heights, nan=0.0)
+        print(f"DEM window: {resolution + 1}x{resolution + 1} samples, "
+              f"{heights.min():.0f}..{heights.max():.0f} m")
+        return {
+            'latitudes': latitudes,
+            'longitudes': longitudes,
+            'heights': heights,
+            'east_km': east_km,
+            'north_km': north_km,
+        }
+
+class _Raster:
+    """
+    Coğrafi (enlem / boylam) ızgara: ilk satır kuzey, piksel merkezleri (north - row * dlat, west + col * dlon)
+    """
+
+    nodata = None
+
+    def pixel_coordinates(self, latitudes, longitudes):
+        """
+        Kesirli (satır, sütun) koordinatları
+        """
+        rows = (self.north - latitudes) / self.dlat
+        cols = (longitudes - self.west) / self.dlon
+        return rows, cols
+
+    def read(self, row0, row1, col0, col1):
+        """
+        Pencereyi float olarak okur, nodata -> NaN
+        """
+        values = self._read_window(row0, row1, col0, col1).astype(np.float64)
+        if self.nodata is not None:
+            values[values == self.nodata] = np.nan
+        return values
+
+class _HGTRaster(_Raster):
+    """
+    SRTM .hgt: 1201 / 3601 kare, big-endian int16, isimdeki köşe güneybatı (N41E028), void -32768
+    """
+
+    def __init__(self, path):
+        match = re.match(r'([NS])(\d{2})([EW])(\d{3})', os.path.basename(path).upper())
+        if not match:
+            raise ValueError("HGT file name must encode its corner (e.g. N41E028.hgt)")
+
+        samples = int(round(math.sqrt(os.path.getsize(path) / 2)))
+        if samples * samples * 2 != os.path.getsize(path):
+            raise ValueError("HGT file is not a square int16 grid")
+
+        south = int(match.group(2)) * (1 if match.group(1) == 'N' else -1)
+        west = int(match.group(4)) * (1 if match.group(3) == 'E' else -1)
+
+        self.path = path
+        self.rows = self.cols = samples
+        self.dlat = self.dlon = 1.0 / (samples - 1)
+        self.north = south + 1.0  # Piksel noktası: ilk satır tam kuzey kenarında
+        self.west = float(west)
+        self.nodata = -32768
+        self._data = np.memmap(path, dtype='>i2', mode='r', shape=(samples, samples))
+
+    def _read_window(self, row0, row1, col0, col1):
+        return np.asarray(self._data[row0:row1, col0:col1])
+
+class GeoTIFFRaster(_Raster):
+    """
+    Sıkıştırılmamış, tek bantlı, coğrafi koordinatlı (EPSG:4326) GeoTIFF; strip veya tile düzeni
+    Strip / tile'lar ofsetlerinden ayrı memmap'lenir, sadece pencereyle kesişenler okunur
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            byte_order = f.read(2)
+            if byte_order not in (b'II', b'MM'):
+                raise ValueError("not a TIFF file")
+            self._endian = '<' if byte_order == b'II' else '>'
+            magic, ifd_offset = struct.unpack(self._endian + 'HI', f.read(6))
+            if magic != 42:
+                raise ValueError("BigTIFF is not supported")
+            tags = self._read_tags(f, ifd_offset)
+
+        if tags.get(TAG_COMPRESSION, (1,))[0] != 1:
+            raise ValueError("compressed GeoTIFF is not supported (use gdal_translate -co COMPRESS=NONE)")
+        if tags.get(TAG_SAMPLES_PER_PIXEL, (1,))[0] != 1:
+            raise ValueError("only single-band GeoTIFF is supported")
+        if TAG_PIXEL_SCALE not in tags or TAG_TIEPOINT not in tags:
+            raise ValueError("missing GeoTIFF georeferencing tags")
+
+        self.cols = tags[TAG_WIDTH][0]
+        self.rows = tags[TAG_HEIGHT][0]
+        bits = tags[TAG_BITS_PER_SAMPLE][0]
+        sample_format = tags.get(TAG_SAMPLE_FORMAT, (1,))[0]
+        kind = {1: 'u', 2: 'i', 3: 'f'}[sample_format]
+        self._dtype = np.dtype(f"{self._endian}{kind}{bits // 8}")
+
+        scale_x, scale_y = tags[TAG_PIXEL_SCALE][:2]
+        tie_i, tie_j, _, tie_x, tie_y, _ = tags[TAG_TIEPOINT][:6]
+        self.dlon = scale_x
+        self.dlat = scale_y
+        self.west = tie_x - tie_i * scale_x
+        self.north = tie_y + tie_j * scale_y
+
+        # GTRasterTypeGeoKey (1025): 1 = PixelIsArea (varsayılan), 2 = PixelIsPoint
+        geo_keys = tags.get(TAG_GEO_KEYS, ())
+        raster_type = 1
+        for index in range(4, len(geo_keys) - 3, 4):
+            if geo_keys[index] == 1025:
+                raster_type = geo_keys[index + 3]
+        if raster_type == 1:
+            self.west += 0.5 * scale_x
+            self.north -= 0.5 * scale_y
+
+        if TAG_GDAL_NODATA in tags:
+            self.nodata = float(tags[TAG_GDAL_NODATA].strip(b'\x00 ').decode('ascii'))
+
+        if TAG_TILE_OFFSETS in tags:
+            self._block_width = tags[TAG_TILE_WIDTH][0]
+            self._block_height = tags[TAG_TILE_LENGTH][0]
+            self._offsets = tags[TAG_TILE_OFFSETS]
+        else:
+            self._block_width = self.cols
+            self._block_height = tags.get(TAG_ROWS_PER_STRIP, (self.rows,))[0]
+            self._offsets = tags[TAG_STRIP_OFFSETS]
+        self._blocks_across = -(-self.cols // self._block_width)
+
+    def _read_window(self, row0, row1, col0, col1):
+        """
+        Pencereyle kesişen strip / tile'ları tek tek memmap'leyip birleştirir
+        """
+        window = np.empty((row1 - row0, col1 - col0), dtype=self._dtype.newbyteorder('='))
+        block_h, block_w = self._block_height, self._block_width
+
+        for block_row in range(row0 // block_h, (row1 - 1) // block_h + 1):
+            for block_col in range(col0 // block_w, (col1 - 1) // block_w + 1):
+                offset = self._offsets[block_row * self._blocks_across + block_col]
+                # Son strip kısa olabilir, tile'lar her zaman tam boy
+                height = block_h if block_w != self.cols else min(block_h, self.rows - block_row * block_h)
+                block = np.memmap(self.path, dtype=self._dtype, mode='r', offset=offset, shape=(height, block_w))
+
+                top, left = block_row * block_h, block_col * block_w
+                r0, r1 = max(row0, top), min(row1, top + height)
+                c0, c1 = max(col0, left), min(col1, left + block_w)
+                window[r0 - row0:r1 - row0, c0 - col0:c1 - col0] = block[r0 - top:r1 - top, c0 - left:c1 - left]
+
+        return window
+
+    def _read_tags(self, f, ifd_offset):
+        """
+        İlk IFD'nin etiketlerini okur: {etiket: değerler tuple'ı (ASCII için bytes)}
+        """
+        f.seek(ifd_offset)
+        count = struct.unpack(self._endian + 'H', f.read(2))[0]
+        entries = [struct.unpack(self._endian + 'HHII', f.read(12)) for _ in range(count)]
+
+        tags = {}
+        for tag, field_type, value_count, value in entries:
+            code = TIFF_TYPES.get(field_type)
+            if code is None:
+                continue
+            size = struct.calcsize(code) * value_count
+            if size <= 4:
+                # Değer IFD girdisinin içinde (sola hizalı)
+                raw = struct.pack(self._endian + 'I', value)[:size]
+            else:
+                f.seek(value)
+                raw = f.read(size)
+            if code == 's':
+                tags[tag] = raw
+            else:
+                tags[tag] = struct.unpack(f"{self._endian}{value_count}{code}", raw)
+        return tags
+
+def _bilinear(grid, rows, cols):
+    """
+    Kesirli indekslerde bilineer örnekleme (kenarda son satır / sütun kullanılır)
+    """
+    r0 = np.clip(np.floor(rows).astype(int), 0, grid.shape[0] - 1)
+    c0 = np.clip(np.floor(cols).astype(int), 0, grid.shape[1] - 1)
+    r1 = np.minimum(r0 + 1, grid.shape[0] - 1)
+    c1 = np.minimum(c0 + 1, grid.shape[1] - 1)
+    fr = rows - r0
+    fc = cols - c0
+
+    top = grid[r0, c0] * (1.0 - fc) + grid[r0, c1] * fc
+    bottom = grid[r1, c0] * (1.0 - fc) + grid[r1, c1] * fc
+    return top * (1.0 - fr) + bottom * fr
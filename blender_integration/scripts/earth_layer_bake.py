@@ -0,0 +1,97 @@
+import os
+import json
+import math
+import hashlib
+import numpy as np
+
+from image_io import write_png8, write_png16
+from procedural_noise import GradientNoise
+from surface_bake import BAKE_ROOT, SurfaceBaker
+
+class EarthLayerBaker:
+    """
+    Bulut yoğunluğunu ve atmosfer opaklık gradyanını bir kez görüntü dokularına yazar
+    Materyaller shading örneği başına noise / ColorRamp / volume yerine tek doku okuması yapar
+    Dokular seed ve çözünürlük anahtarıyla diskte önbelleğe alınır
+    bpy kullanmaz
+    """
+
+    def __init__(self, root=BAKE_ROOT, height=1024, gradient_samples=256):
+        self.root = os.path.normpath(root)
+        self.height = height  # Bulut haritası genişliği = 2 x yükseklik
+        self.gradient_samples = gradient_samples
+
+    def bake_clouds(self, seed=0, scale=8.0, detail=12, coverage=0.8):
+        """
+        Equirect bulut alfa haritası (8-bit gri, ilk satır kuzey); önceki procedurel bulutun karşılığı:
+        Generated koordinatlarda fBm, [0, 1] faktörü doğrusal olarak [0, coverage] alfaya
+        Haritada görünmeyecek kadar küçük oktavlar atlanır
+        """
+        key = f"clouds_{seed}_{2 * self.height}x{self.height}_{self._digest(scale, detail, coverage)}"
+        path = os.path.join(self.root, f"{key}.png")
+        if os.path.exists(path):
+            return path
+
+        octaves = max(1, min(detail, int(math.log2(self.height / scale)) + 1))
+        directions = SurfaceBaker(self.root, self.height).equirect_directions()
+
+        # Generated koordinat: sınır kutusunda [0, 1]
+        points = (directions.reshape(-1, 3) * 0.5 + 0.5) * scale
+        factor = np.clip(0.5 + 0.75 * GradientNoise(seed).fbm(points, octaves=octaves), 0.0, 1.0)
+        alpha = (factor * coverage).reshape(directions.shape[:2])
+
+        self._write(path, alpha, write_png8)
+        print(f"Baked clouds: {2 * self.height}x{self.height}, {octaves} octaves")
+        return path
+
+    def bake_atmosphere_gradient(self, planet_radius, shell_height, scale_height, vertical_opacity=0.1):
+        """
+        Atmosfer kabuğunun bakış açısına göre opaklığı, (1, N) 16-bit gri LUT
+        x = Layer Weight 'Facing' (0: dik bakış, 1: ufuk); üstel yoğunluklu kabuktan geçen optik derinlik
+        """
+        key = f"atmosphere_{self.gradient_samples}_" + self._digest(
+            planet_radius, shell_height, scale_height, vertical_opacity
+        )
+        path = os.path.join(self.root, f"{key}.png")
+        if os.path.exists(path):
+            return path
+
+        outer = planet_radius + shell_height
+        facing = (np.arange(self.gradient_samples) + 0.5) / self.gradient_samples
+        mu = 1.0 - facing
+
+        # Kabuğa giriş noktasından ışın: en yakın yaklaşma mesafesi ve gezegene çarpma
+        impact = outer * np.sqrt(1.0 - mu ** 2)
+        closest = outer * mu
+        hits_planet = impact < planet_radius
+        length = np.where(
+            hits_planet,
+            closest - np.sqrt(np.maximum(planet_radius ** 2 - impact ** 2, 0.0)),
+            2.0 * closest
+        )
+
+        steps = (np.arange(1024) + 0.5) / 1024
+        distance = length[:, None] * steps[None, :]
+        radius = np.sqrt(impact[:, None] ** 2 + (distance - closest[:, None]) ** 2)
+        depth = (np.exp(-(radius - planet_radius) / scale_height)).mean(axis=1) * length
+
+        # Dik bakışta vertical_opacity olacak şekilde ölçeklenir
+        vertical_depth = scale_height * (1.0 - math.exp(-shell_height / scale_height))
+        extinction = -math.log(1.0 - vertical_opacity) / vertical_depth
+        opacity = 1.0 - np.exp(-extinction * depth)
+
+        self._write(path, opacity[None, :], write_png16)
+        print(f"Baked atmosphere gradient: {self.gradient_samples} samples")
+        return path
+
+    def _write(self, path, pixels, writer):
+        """
+        Geçici dosyaya yazıp taşır: yarım kalan bake önbellekte görünmez
+        """
+        os.makedirs(self.root, exist_ok=True)
+        temp_path = path + '.tmp.png'
+        writer(temp_path, pixels)
+        os.replace(temp_path, path)
+
+    def _digest(self, *params):
+        return hashlib.sha1(json.dumps(params).encode('utf-8')).hexdigest()[:10]
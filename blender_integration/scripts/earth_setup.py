@@ -3,8 +3,17 @@ import bmesh
 import mathutils
 import math
 import random
+import sys
+from datetime import datetime
 from mathutils import Vector
 
+from material_system import material_library
+from scene_builder import scene_builder
+from earth_texture_tiles import EarthTextureTiles, focus_view
+from earth_layer_bake import EarthLayerBaker
+from scene_templates import scene_templates, directory_signature
+from geodesy import geodetic_to_scene, julian_date, sun_direction_ecef
+
 class EarthModelGenerator:
     """
     Gerçekçi Dünya modeli oluşturan Blender script'i
@@ -14,30 +23,68 @@ class EarthModelGenerator:
     def __init__(self):
         self.earth_radius = 6.371  # Blender units (6371 km)
         self.atmosphere_height = 0.1  # 100 km in scale
-        
-    def create_complete_earth_system(self):
+        # Quadtree derinlikleri: yüzey çarpma yakın çekimleri için, ince katmanlar daha kaba
+        self.surface_max_depth = 11  # ~5 km düğüm
+        self.atmosphere_max_depth = 7
+        self.cloud_max_depth = 8
+        # Büyük Dünya görüntüleri karolardan, sadece görünen bölge tam çözünürlükte yüklenir
+        self.texture_tiles = EarthTextureTiles()
+        self.close_up_altitude = 0.3  # Odak için sanal yakın çekim yüksekliği (300 km)
+        # Bulut ve atmosfer bir kez dokuya bake edilir (shot boyunca değişmezler)
+        self.bake_sky_layers = True
+        self.layer_baker = EarthLayerBaker()
+        self.cloud_seed = 0
+        self.atmosphere_scale_height = 0.0085  # 8.5 km
+        # Kamerasız (sadece odaklı) Dünya sistemi .blend şablonundan yüklenir
+        self.use_scene_templates = True
+        
+    def create_complete_earth_system(self, focus=None, cameras=()):
         """
         Komplet Dünya sistemi oluşturur: Dünya, Atmosfer, Bulutlar
+        focus: (lat, lon) çarpma yeri, cameras: görüş alanı inceltilecek kameralar (Dünya merkezi orijinde)
+        Kamera verilmezse sonuç sadece odağa ve ayarlara bağlıdır: şablon varsa mesh / doku / materyal kurulmaz
+        """
+        if cameras or not self.use_scene_templates:
+            return self._build_earth_system(focus, cameras)
+        
+        params = {
+            'focus': list(focus) if focus is not None else None,
+            'settings': {
+                key: value for key, value in vars(self).items()
+                if isinstance(value, (bool, int, float, str))
+            },
+            'textures': directory_signature(self.texture_tiles.source_root),
+        }
+        return scene_templates.instantiate(
+            'earth_system', lambda: self._build_earth_system(focus), params, modules=(sys.modules[__name__],)
+        )
+    
+    def _build_earth_system(self, focus=None, cameras=()):
+        """
+        Dünya, atmosfer ve bulut katmanlarını sıfırdan kurar
         """
         print("Creating complete Earth system...")
         
         # Ana Dünya objesi
-        earth_obj = self._create_earth_sphere()
+        earth_obj = self._create_earth_sphere(focus, cameras)
         
         # Atmosfer
-        atmosphere_obj = self._create_atmosphere(earth_obj)
+        atmosphere_obj = self._create_atmosphere(earth_obj, focus, cameras)
         
         # Bulut katmanı
-        clouds_obj = self._create_cloud_layer(earth_obj)
+        clouds_obj = self._create_cloud_layer(earth_obj, focus, cameras)
+        
+        # Kameraların (ve odağın) gördüğü doku karoları
+        textures = self._stream_earth_textures(focus, cameras)
         
         # Dünya malzemeleri
-        self._setup_earth_materials(earth_obj)
+        self._setup_earth_materials(earth_obj, textures)
         
         # Atmosfer malzemeleri
         self._setup_atmosphere_materials(atmosphere_obj)
         
         # Bulut malzemeleri
-        self._setup_cloud_materials(clouds_obj)
+        self._setup_cloud_materials(clouds_obj, textures.get('clouds'))
         
         # Parent relationship
         atmosphere_obj.parent = earth_obj
@@ -51,319 +98,371 @@ class EarthModelGenerator:
             'clouds': clouds_obj
         }
     
-    def _create_earth_sphere(self):
+    def _create_earth_sphere(self, focus=None, cameras=()):
         """
         Ana Dünya küresini oluşturur
         """
-        # UV Sphere oluştur
-        bpy.ops.mesh.primitive_uv_sphere_add(
-            radius=self.earth_radius,
-            location=(0, 0, 0),
-            segments=64,
-            rings=32
+        # Cube-sphere: çarpma yeri ve kamera görüşü ince, geri kalan kaba (smooth shading)
+        earth_mesh = scene_builder.planet_mesh(
+            "Earth", self.earth_radius, focus=focus, cameras=cameras, max_depth=self.surface_max_depth
         )
-        
-        earth_obj = bpy.context.active_object
-        earth_obj.name = "Earth"
-        
-        # Smooth shading
-        bpy.ops.object.shade_smooth()
+        earth_obj = scene_builder.mesh_object("Earth", earth_mesh)
         
         return earth_obj
     
-    def _create_atmosphere(self, earth_obj):
+    def _create_atmosphere(self, earth_obj, focus=None, cameras=()):
         """
         Atmosfer katmanı oluşturur
         """
         atmosphere_radius = self.earth_radius + self.atmosphere_height
         
-        bpy.ops.mesh.primitive_uv_sphere_add(
-            radius=atmosphere_radius,
-            location=(0, 0, 0),
-            segments=32,
-            rings=16
+        atmosphere_mesh = scene_builder.planet_mesh(
+            "Earth_Atmosphere", atmosphere_radius, focus=focus, cameras=cameras, max_depth=self.atmosphere_max_depth
         )
-        
-        atmosphere_obj = bpy.context.active_object
-        atmosphere_obj.name = "Earth_Atmosphere"
-        
-        # Smooth shading
-        bpy.ops.object.shade_smooth()
+        atmosphere_obj = scene_builder.mesh_object("Earth_Atmosphere", atmosphere_mesh)
         
         return atmosphere_obj
     
-    def _create_cloud_layer(self, earth_obj):
+    def _create_cloud_layer(self, earth_obj, focus=None, cameras=()):
         """
         Bulut katmanı oluşturur
         """
         cloud_radius = self.earth_radius + 0.02  # 20 km yükseklik
         
-        bpy.ops.mesh.primitive_uv_sphere_add(
-            radius=cloud_radius,
-            location=(0, 0, 0),
-            segments=32,
-            rings=16
+        clouds_mesh = scene_builder.planet_mesh(
+            "Earth_Clouds", cloud_radius, focus=focus, cameras=cameras, max_depth=self.cloud_max_depth
         )
+        clouds_obj = scene_builder.mesh_object("Earth_Clouds", clouds_mesh)
         
-        clouds_obj = bpy.context.active_object
-        clouds_obj.name = "Earth_Clouds"
+        return clouds_obj
+    
+    def _stream_earth_textures(self, focus=None, cameras=()):
+        """
+        Gündüz, gece ve bulut görüntülerinden frame aralığında görünen karoları dokulara birleştirir
+        Görüntüsü olmayan katmanlar None döner (procedurel doku kullanılır)
+        """
+        scene = bpy.context.scene
+        step = max(1, (scene.frame_end - scene.frame_start + 1) // 32)
+        frames = range(scene.frame_start, scene.frame_end + 1, step)
         
-        # Smooth shading
-        bpy.ops.object.shade_smooth()
+        views = []
+        for camera in cameras:
+            views.extend(scene_builder.camera_views(camera, frames))
+        if focus is not None:
+            views.append(focus_view(focus[0], focus[1], self.earth_radius, self.close_up_altitude))
         
-        return clouds_obj
+        return {
+            layer: self.texture_tiles.assemble(layer, views, self.earth_radius)
+            for layer in ('day', 'night', 'clouds')
+        }
+    
+    def _add_streamed_texture(self, graph, key, texture, target, location, colorspace='sRGB'):
+        """
+        Taban + inset doku node'larını ekler ve target=(node, socket) girişine bağlar
+        Inset CLIP uzantılı: kutu dışında ve görünmeyen karolarda alfa 0, taban doku görünür
+        """
+        x, y = location
+        nodes = graph['nodes']
+        nodes[f'{key}_uv'] = {'type': 'ShaderNodeUVMap', 'location': (x - 400, y), 'properties': {'uv_map': 'UVMap'}}
+        nodes[f'{key}_base'] = {
+            'type': 'ShaderNodeTexImage',
+            'location': (x, y),
+            'image': {'path': texture['base_path'], 'colorspace': colorspace},
+        }
+        graph['links'].append((f'{key}_uv', 'UV', f'{key}_base', 'Vector'))
+        output = (f'{key}_base', 'Color')
+        
+        if texture['inset_path']:
+            u0, v0, u1, v1 = texture['inset_box']
+            nodes[f'{key}_inset_mapping'] = {
+                'type': 'ShaderNodeMapping',
+                'location': (x - 200, y - 300),
+                'inputs': {
+                    'Location': (-u0 / (u1 - u0), -v0 / (v1 - v0), 0.0),
+                    'Scale': (1.0 / (u1 - u0), 1.0 / (v1 - v0), 1.0),
+                },
+            }
+            nodes[f'{key}_inset'] = {
+                'type': 'ShaderNodeTexImage',
+                'location': (x, y - 300),
+                'properties': {'extension': 'CLIP'},
+                'image': {'path': texture['inset_path'], 'colorspace': colorspace},
+            }
+            nodes[f'{key}_mix'] = {'type': 'ShaderNodeMixRGB', 'location': (x + 300, y)}
+            graph['links'].extend([
+                (f'{key}_uv', 'UV', f'{key}_inset_mapping', 'Vector'),
+                (f'{key}_inset_mapping', 'Vector', f'{key}_inset', 'Vector'),
+                (f'{key}_inset', 'Alpha', f'{key}_mix', 'Fac'),
+                (f'{key}_base', 'Color', f'{key}_mix', 'Color1'),
+                (f'{key}_inset', 'Color', f'{key}_mix', 'Color2'),
+            ])
+            output = (f'{key}_mix', 'Color')
+        
+        # Hedef girişe önceden bağlanan node çıkarılır
+        to_key, to_socket = target
+        replaced = {link[0] for link in graph['links'] if link[2] == to_key and link[3] == to_socket}
+        graph['links'] = [
+            link for link in graph['links']
+            if link[0] not in replaced and link[2] not in replaced
+        ]
+        for node_key in replaced:
+            del nodes[node_key]
+        graph['links'].append((*output, to_key, to_socket))
     
-    def _setup_earth_materials(self, earth_obj):
+    def _setup_earth_materials(self, earth_obj, textures=None):
         """
         Dünya için gerçekçi materyal sistemi
+        Gündüz / gece görüntüleri varsa karo dokuları, yoksa procedurel doku kullanılır
         """
-        # Materyal oluştur
-        earth_mat = bpy.data.materials.new(name="Earth_Material")
-        earth_mat.use_nodes = True
-        
-        nodes = earth_mat.node_tree.nodes
-        links = earth_mat.node_tree.links
-        
-        # Temizle
-        nodes.clear()
-        
-        # Output
-        output = nodes.new('ShaderNodeOutputMaterial')
-        output.location = (800, 0)
-        
-        # Principled BSDF
-        principled = nodes.new('ShaderNodeBsdfPrincipled')
-        principled.location = (400, 0)
-        
-        # Earth Day Texture (Diffuse)
-        day_tex = nodes.new('ShaderNodeTexImage')
-        day_tex.location = (-400, 200)
-        day_tex.label = "Day Texture"
-        
-        # Earth Night Texture (Emission)
-        night_tex = nodes.new('ShaderNodeTexImage')
-        night_tex.location = (-400, -200)
-        night_tex.label = "Night Texture"
-        
-        # Normal Map
-        normal_tex = nodes.new('ShaderNodeTexImage')
-        normal_tex.location = (-400, -500)
-        normal_tex.label = "Normal Map"
-        normal_tex.image.colorspace_settings.name = 'Non-Color'
-        
-        # Normal Map Node
-        normal_map = nodes.new('ShaderNodeNormalMap')
-        normal_map.location = (0, -400)
-        
-        # Day/Night Mix için Light Path
-        light_path = nodes.new('ShaderNodeLightPath')
-        light_path.location = (-600, 0)
-        
-        # Fresnel için kamera açısı
-        fresnel = nodes.new('ShaderNodeFresnel')
-        fresnel.location = (-200, 0)
-        
-        # Mix shader for day/night
-        mix_shader = nodes.new('ShaderNodeMixShader')
-        mix_shader.location = (600, 0)
-        
-        # Emission shader for night side
-        emission = nodes.new('ShaderNodeEmission')
-        emission.location = (200, -200)
-        emission.inputs['Strength'].default_value = 0.5
-        
-        # Bağlantılar
-        links.new(day_tex.outputs['Color'], principled.inputs['Base Color'])
-        links.new(normal_tex.outputs['Color'], normal_map.inputs['Color'])
-        links.new(normal_map.outputs['Normal'], principled.inputs['Normal'])
-        links.new(night_tex.outputs['Color'], emission.inputs['Color'])
-        
-        # Mix day/night
-        links.new(principled.outputs['BSDF'], mix_shader.inputs[2])
-        links.new(emission.outputs['Emission'], mix_shader.inputs[1])
-        links.new(fresnel.outputs['Fac'], mix_shader.inputs['Fac'])
-        links.new(mix_shader.outputs['Shader'], output.inputs['Surface'])
-        
-        # Materyal ata
-        earth_obj.data.materials.append(earth_mat)
+        textures = textures or {}
+        graph = {
+            'nodes': {
+                'output': {'type': 'ShaderNodeOutputMaterial', 'location': (800, 0)},
+                'principled': {'type': 'ShaderNodeBsdfPrincipled', 'location': (400, 0)},
+                # Earth Day Texture (Diffuse)
+                'day_texture': {'type': 'ShaderNodeTexImage', 'location': (-400, 200), 'label': "Day Texture"},
+                # Earth Night Texture (Emission)
+                'night_texture': {'type': 'ShaderNodeTexImage', 'location': (-400, -200), 'label': "Night Texture"},
+                # Normal Map (image atanınca Non-Color yapılır)
+                'normal_texture': {'type': 'ShaderNodeTexImage', 'location': (-400, -500), 'label': "Normal Map"},
+                'normal_map': {'type': 'ShaderNodeNormalMap', 'location': (0, -400)},
+                # Day/Night Mix için Light Path
+                'light_path': {'type': 'ShaderNodeLightPath', 'location': (-600, 0)},
+                # Fresnel için kamera açısı
+                'fresnel': {'type': 'ShaderNodeFresnel', 'location': (-200, 0)},
+                # Mix shader for day/night
+                'mix_shader': {'type': 'ShaderNodeMixShader', 'location': (600, 0)},
+                # Emission shader for night side
+                'emission': {'type': 'ShaderNodeEmission', 'location': (200, -200), 'inputs': {'Strength': 0.5}},
+            },
+            'links': [
+                ('day_texture', 'Color', 'principled', 'Base Color'),
+                ('normal_texture', 'Color', 'normal_map', 'Color'),
+                ('normal_map', 'Normal', 'principled', 'Normal'),
+                ('night_texture', 'Color', 'emission', 'Color'),
+                # Mix day/night
+                ('principled', 'BSDF', 'mix_shader', 2),
+                ('emission', 'Emission', 'mix_shader', 1),
+                ('fresnel', 'Fac', 'mix_shader', 'Fac'),
+                ('mix_shader', 'Shader', 'output', 'Surface'),
+            ],
+        }
         
         # Procedurel texture'lar ekle (gerçek texture yoksa)
-        self._add_procedural_earth_textures(earth_mat)
+        if textures.get('day'):
+            self._add_streamed_texture(graph, 'day', textures['day'], ('principled', 'Base Color'), (-400, 600))
+        else:
+            self._add_procedural_earth_textures(graph)
+        if textures.get('night'):
+            self._add_streamed_texture(graph, 'night', textures['night'], ('emission', 'Color'), (-400, -800))
+        
+        earth_mat = material_library.get_material("Earth_Material", graph)
+        
+        # Materyal ata
+        material_library.assign(earth_obj, earth_mat)
     
-    def _add_procedural_earth_textures(self, material):
+    def _add_procedural_earth_textures(self, graph):
         """
-        Procedurel Dünya dokuları ekler
+        Procedurel Dünya dokularını materyal grafiğine ekler
         """
-        nodes = material.node_tree.nodes
-        links = material.node_tree.links
-        
-        # Koordinat sistemi
-        tex_coord = nodes.new('ShaderNodeTexCoord')
-        tex_coord.location = (-800, 0)
-        
-        # Mapping node
-        mapping = nodes.new('ShaderNodeMapping')
-        mapping.location = (-600, 0)
-        
-        # Land/Ocean mask için Noise
-        noise_land = nodes.new('ShaderNodeTexNoise')
-        noise_land.location = (-600, 200)
-        noise_land.inputs['Scale'].default_value = 3.0
-        noise_land.inputs['Detail'].default_value = 8.0
-        
-        # ColorRamp for land/ocean separation
-        land_ramp = nodes.new('ShaderNodeValToRGB')
-        land_ramp.location = (-400, 300)
-        
-        # Land color
-        land_ramp.color_ramp.elements[0].color = (0.1, 0.3, 0.8, 1.0)  # Ocean blue
-        land_ramp.color_ramp.elements[1].color = (0.3, 0.6, 0.2, 1.0)  # Land green
-        
-        # Bağlantılar
-        links.new(tex_coord.outputs['Generated'], mapping.inputs['Vector'])
-        links.new(mapping.outputs['Vector'], noise_land.inputs['Vector'])
-        links.new(noise_land.outputs['Fac'], land_ramp.inputs['Fac'])
-        
-        # Day texture'ı bul ve bağla
-        if 'Day Texture' in [node.label for node in nodes]:
-            day_tex = next(node for node in nodes if node.label == 'Day Texture')
-            links.new(land_ramp.outputs['Color'], day_tex.inputs['Vector'])
+        graph['nodes'].update({
+            # Koordinat sistemi
+            'tex_coord': {'type': 'ShaderNodeTexCoord', 'location': (-800, 0)},
+            # Mapping node
+            'mapping': {'type': 'ShaderNodeMapping', 'location': (-600, 0)},
+            # Land/Ocean mask için Noise
+            'noise_land': {
+                'type': 'ShaderNodeTexNoise',
+                'location': (-600, 200),
+                'inputs': {'Scale': 3.0, 'Detail': 8.0},
+            },
+            # ColorRamp for land/ocean separation
+            'land_ramp': {
+                'type': 'ShaderNodeValToRGB',
+                'location': (-400, 300),
+                'ramp': [
+                    (0.0, (0.1, 0.3, 0.8, 1.0)),  # Ocean blue
+                    (1.0, (0.3, 0.6, 0.2, 1.0)),  # Land green
+                ],
+            },
+        })
+        
+        graph['links'].extend([
+            ('tex_coord', 'Generated', 'mapping', 'Vector'),
+            ('mapping', 'Vector', 'noise_land', 'Vector'),
+            ('noise_land', 'Fac', 'land_ramp', 'Fac'),
+            # Day texture'a bağla
+            ('land_ramp', 'Color', 'day_texture', 'Vector'),
+        ])
     
     def _setup_atmosphere_materials(self, atmosphere_obj):
         """
         Atmosfer malzemesi
+        Bake açıksa volume yerine bakış açısına göre opaklık LUT'u okuyan yüzey shader'ı
         """
-        atmos_mat = bpy.data.materials.new(name="Atmosphere_Material")
-        atmos_mat.use_nodes = True
-        atmos_mat.blend_method = 'BLEND'
-        
-        nodes = atmos_mat.node_tree.nodes
-        links = atmos_mat.node_tree.links
-        
-        nodes.clear()
-        
-        # Output
-        output = nodes.new('ShaderNodeOutputMaterial')
-        output.location = (400, 0)
-        
-        # Volume Scatter
-        volume_scatter = nodes.new('ShaderNodeVolumeScatter')
-        volume_scatter.location = (0, -200)
-        volume_scatter.inputs['Density'].default_value = 0.01
-        volume_scatter.inputs['Color'].default_value = (0.4, 0.7, 1.0, 1.0)  # Sky blue
-        
-        # Transparent BSDF for surface
-        transparent = nodes.new('ShaderNodeBsdfTransparent')
-        transparent.location = (0, 0)
-        
-        # Fresnel for atmosphere thickness
-        fresnel = nodes.new('ShaderNodeFresnel')
-        fresnel.location = (-200, 0)
-        fresnel.inputs['IOR'].default_value = 1.33
-        
-        # Bağlantılar
-        links.new(transparent.outputs['BSDF'], output.inputs['Surface'])
-        links.new(volume_scatter.outputs['Volume'], output.inputs['Volume'])
-        
-        atmosphere_obj.data.materials.append(atmos_mat)
+        if self.bake_sky_layers:
+            gradient_path = self.layer_baker.bake_atmosphere_gradient(
+                self.earth_radius, self.atmosphere_height, self.atmosphere_scale_height
+            )
+            atmos_mat = material_library.get_material("Atmosphere_Material", {
+                'nodes': {
+                    'output': {'type': 'ShaderNodeOutputMaterial', 'location': (400, 0)},
+                    'transparent': {'type': 'ShaderNodeBsdfTransparent', 'location': (0, 100)},
+                    'scatter': {
+                        'type': 'ShaderNodeBsdfDiffuse',
+                        'location': (0, -100),
+                        'inputs': {'Color': (0.4, 0.7, 1.0, 1.0)},  # Sky blue
+                    },
+                    'mix': {'type': 'ShaderNodeMixShader', 'location': (200, 0)},
+                    # LUT koordinatı: x = Facing (0 dik bakış, 1 ufuk)
+                    'layer_weight': {'type': 'ShaderNodeLayerWeight', 'location': (-600, 0), 'inputs': {'Blend': 0.5}},
+                    'lut_coord': {'type': 'ShaderNodeCombineXYZ', 'location': (-400, 0), 'inputs': {'Y': 0.5}},
+                    'gradient': {
+                        'type': 'ShaderNodeTexImage',
+                        'location': (-200, 0),
+                        'properties': {'extension': 'EXTEND'},
+                        'image': {'path': gradient_path, 'colorspace': 'Non-Color'},
+                    },
+                },
+                'links': [
+                    ('layer_weight', 'Facing', 'lut_coord', 'X'),
+                    ('lut_coord', 'Vector', 'gradient', 'Vector'),
+                    ('gradient', 'Color', 'mix', 'Fac'),
+                    ('transparent', 'BSDF', 'mix', 1),
+                    ('scatter', 'BSDF', 'mix', 2),
+                    ('mix', 'Shader', 'output', 'Surface'),
+                ],
+            }, settings={'blend_method': 'BLEND'})
+            material_library.assign(atmosphere_obj, atmos_mat)
+            return
+        
+        atmos_mat = material_library.get_material("Atmosphere_Material", {
+            'nodes': {
+                'output': {'type': 'ShaderNodeOutputMaterial', 'location': (400, 0)},
+                # Volume Scatter
+                'volume_scatter': {
+                    'type': 'ShaderNodeVolumeScatter',
+                    'location': (0, -200),
+                    'inputs': {'Density': 0.01, 'Color': (0.4, 0.7, 1.0, 1.0)},  # Sky blue
+                },
+                # Transparent BSDF for surface
+                'transparent': {'type': 'ShaderNodeBsdfTransparent', 'location': (0, 0)},
+                # Fresnel for atmosphere thickness
+                'fresnel': {'type': 'ShaderNodeFresnel', 'location': (-200, 0), 'inputs': {'IOR': 1.33}},
+            },
+            'links': [
+                ('transparent', 'BSDF', 'output', 'Surface'),
+                ('volume_scatter', 'Volume', 'output', 'Volume'),
+            ],
+        }, settings={'blend_method': 'BLEND'})
+        
+        material_library.assign(atmosphere_obj, atmos_mat)
     
-    def _setup_cloud_materials(self, clouds_obj):
+    def _setup_cloud_materials(self, clouds_obj, texture=None):
         """
         Bulut malzemesi
+        Bulut görüntüsü varsa yoğunluk (alfa) ondan, yoksa bake edilmiş bulut haritasından okunur
         """
-        cloud_mat = bpy.data.materials.new(name="Cloud_Material")
-        cloud_mat.use_nodes = True
-        cloud_mat.blend_method = 'BLEND'
-        
-        nodes = cloud_mat.node_tree.nodes
-        links = cloud_mat.node_tree.links
-        
-        nodes.clear()
-        
-        # Output
-        output = nodes.new('ShaderNodeOutputMaterial')
-        output.location = (600, 0)
-        
-        # Principled BSDF
-        principled = nodes.new('ShaderNodeBsdfPrincipled')
-        principled.location = (200, 0)
-        principled.inputs['Base Color'].default_value = (1.0, 1.0, 1.0, 1.0)
-        principled.inputs['Transmission'].default_value = 0.8
-        principled.inputs['Alpha'].default_value = 0.3
-        
-        # Noise texture for clouds
-        noise = nodes.new('ShaderNodeTexNoise')
-        noise.location = (-400, 0)
-        noise.inputs['Scale'].default_value = 8.0
-        noise.inputs['Detail'].default_value = 12.0
-        
-        # ColorRamp for cloud density
-        ramp = nodes.new('ShaderNodeValToRGB')
-        ramp.location = (-200, 0)
-        ramp.color_ramp.elements[0].color = (0, 0, 0, 0)  # Transparent
-        ramp.color_ramp.elements[1].color = (1, 1, 1, 0.8)  # White clouds
-        
-        # Texture coordinate
-        tex_coord = nodes.new('ShaderNodeTexCoord')
-        tex_coord.location = (-600, 0)
-        
-        # Bağlantılar
-        links.new(tex_coord.outputs['Generated'], noise.inputs['Vector'])
-        links.new(noise.outputs['Fac'], ramp.inputs['Fac'])
-        links.new(ramp.outputs['Alpha'], principled.inputs['Alpha'])
-        links.new(principled.outputs['BSDF'], output.inputs['Surface'])
-        
-        clouds_obj.data.materials.append(cloud_mat)
+        if texture is None and self.bake_sky_layers:
+            texture = {
+                'base_path': self.layer_baker.bake_clouds(self.cloud_seed),
+                'inset_path': None,
+                'inset_box': None,
+            }
+
+        graph = {
+            'nodes': {
+                'output': {'type': 'ShaderNodeOutputMaterial', 'location': (600, 0)},
+                'principled': {
+                    'type': 'ShaderNodeBsdfPrincipled',
+                    'location': (200, 0),
+                    'inputs': {'Base Color': (1.0, 1.0, 1.0, 1.0), 'Transmission': 0.8, 'Alpha': 0.3},
+                },
+                # Noise texture for clouds
+                'noise': {
+                    'type': 'ShaderNodeTexNoise',
+                    'location': (-400, 0),
+                    'inputs': {'Scale': 8.0, 'Detail': 12.0},
+                },
+                # ColorRamp for cloud density
+                'ramp': {
+                    'type': 'ShaderNodeValToRGB',
+                    'location': (-200, 0),
+                    'ramp': [
+                        (0.0, (0, 0, 0, 0)),  # Transparent
+                        (1.0, (1, 1, 1, 0.8)),  # White clouds
+                    ],
+                },
+                # Texture coordinate
+                'tex_coord': {'type': 'ShaderNodeTexCoord', 'location': (-600, 0)},
+            },
+            'links': [
+                ('tex_coord', 'Generated', 'noise', 'Vector'),
+                ('noise', 'Fac', 'ramp', 'Fac'),
+                ('ramp', 'Alpha', 'principled', 'Alpha'),
+                ('principled', 'BSDF', 'output', 'Surface'),
+            ],
+        }
+        
+        if texture:
+            self._add_streamed_texture(graph, 'clouds', texture, ('principled', 'Alpha'), (-400, -400), 'Non-Color')
+        
+        cloud_mat = material_library.get_material("Cloud_Material", graph, settings={'blend_method': 'BLEND'})
+        
+        material_library.assign(clouds_obj, cloud_mat)
     
     def add_impact_location_marker(self, latitude, longitude, name="Impact_Site"):
         """
         Çarpma lokasyonu için marker ekler
         """
         # Coğrafi koordinatları Cartesian'a çevir
-        lat_rad = math.radians(latitude)
-        lon_rad = math.radians(longitude)
-        
-        x = self.earth_radius * math.cos(lat_rad) * math.cos(lon_rad)
-        y = self.earth_radius * math.cos(lat_rad) * math.sin(lon_rad)
-        z = self.earth_radius * math.sin(lat_rad)
-        
-        # Marker objesi oluştur
-        bpy.ops.mesh.primitive_ico_sphere_add(
-            radius=0.1,
-            location=(x, y, z)
+        location = tuple(geodetic_to_scene(latitude, longitude, radius=self.earth_radius))
+        
+        # Marker objesi oluştur (ortak ico-sphere mesh)
+        marker = scene_builder.mesh_object(
+            name,
+            scene_builder.primitive_mesh('ico_sphere'),
+            location=location,
+            scale=0.1
         )
         
-        marker = bpy.context.active_object
-        marker.name = name
-        
-        # Kırmızı materyal
-        marker_mat = bpy.data.materials.new(name=f"{name}_Material")
-        marker_mat.use_nodes = True
-        
-        principled = marker_mat.node_tree.nodes['Principled BSDF']
-        principled.inputs['Base Color'].default_value = (1.0, 0.0, 0.0, 1.0)  # Red
-        principled.inputs['Emission'].default_value = (1.0, 0.2, 0.2, 1.0)  # Glowing red
-        principled.inputs['Emission Strength'].default_value = 2.0
+        # Kırmızı materyal (tüm marker'lar paylaşır)
+        marker_mat = material_library.principled_material(
+            "Impact_Marker_Material",
+            base_color=(1.0, 0.0, 0.0, 1.0),  # Red
+            emission=(1.0, 0.2, 0.2, 1.0),  # Glowing red
+            emission_strength=2.0
+        )
         
-        marker.data.materials.append(marker_mat)
+        material_library.assign(marker, marker_mat)
         
         return marker
     
-    def setup_earth_lighting(self):
+    def setup_earth_lighting(self, moment=None):
         """
         Dünya için ışık sistemi kurar
+        moment (datetime ya da ISO metin, UTC) verilirse Güneş o andaki gerçek yönüne yerleşir:
+        sahne Dünya sabit çerçevede olduğundan yıldız zamanı ile gündüz / gece tarafı doğru düşer
         """
         # Ana güneş ışığı
-        bpy.ops.object.light_add(
-            type='SUN',
-            location=(20, 0, 0)
+        sun = scene_builder.light(
+            "Sun",
+            'SUN',
+            location=(20, 0, 0),
+            energy=5.0,
+            color=(1.0, 0.95, 0.8)  # Güneş rengi
         )
-        sun = bpy.context.active_object
-        sun.name = "Sun"
-        sun.data.energy = 5.0
-        sun.data.color = (1.0, 0.95, 0.8)  # Güneş rengi
         sun.data.angle = math.radians(0.53)  # Güneş'in açısal boyutu
         
+        if moment is not None:
+            if isinstance(moment, str):
+                moment = datetime.fromisoformat(moment.replace('Z', '+00:00'))
+            direction = Vector(sun_direction_ecef(julian_date(moment)))
+            # Sun ışığı lokal -Z yönünde yayılır, +Z Güneş'e bakar
+            sun.location = direction * 20.0
+            sun.rotation_mode = 'QUATERNION'
+            sun.rotation_quaternion = direction.to_track_quat('Z', 'Y')
+        
         # HDRI world environment
         world = bpy.context.scene.world
         world.use_nodes = True
@@ -385,14 +484,13 @@ def create_earth_impact_scene():
     Impact simülasyonu için komplet sahne oluşturur
     """
     # Scene'i temizle
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete(use_global=False)
+    scene_builder.clear_scene()
     
     # Earth generator
     earth_gen = EarthModelGenerator()
     
-    # Dünya sistemi oluştur
-    earth_system = earth_gen.create_complete_earth_system()
+    # Dünya sistemi oluştur (mesh çarpma yerine odaklı)
+    earth_system = earth_gen.create_complete_earth_system(focus=(41.0082, 28.9784))
     
     # Işık sistemi
     sun = earth_gen.setup_earth_lighting()
@@ -405,9 +503,7 @@ def create_earth_impact_scene():
     )
     
     # Kamera ayarla
-    bpy.ops.object.camera_add(location=(15, -15, 10))
-    camera = bpy.context.active_object
-    camera.name = "Main_Camera"
+    camera = scene_builder.camera("Main_Camera", location=(15, -15, 10))
     
     # Kamerayı Dünya'ya odakla
     constraint = camera.constraints.new('TRACK_TO')
@@ -0,0 +1,349 @@
+import os
+import json
+import math
+import hashlib
+import numpy as np
+
+from image_io import open_pnm, write_png8
+from geodesy import unit_vectors
+
+TEXTURE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'assets', 'earth_textures')
+TILE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cache', 'earth_tiles')
+SOURCE_EXTENSIONS = ('.npy', '.ppm', '.pgm')
+
+class EarthTextureTiles:
+    """
+    Büyük equirectangular Dünya görüntüleri (gündüz, gece, bulut) için mipmap'li karo deposu
+    Kaynak bir kez karolara bölünür (seviye başına tile-major .npy, memmap ile açılır)
+    Kameraların frame aralığında gördüğü karolar ışın örneklemesiyle bulunur, Blender'a sadece
+    global kaba taban doku ve görünen bölgenin tam çözünürlüklü inset dokusu verilir
+    bpy kullanmaz
+    """
+
+    def __init__(self, source_root=TEXTURE_ROOT, root=TILE_ROOT, tile_size=1024,
+                 base_width=8192, max_inset_px=16384):
+        self.source_root = os.path.normpath(source_root)
+        self.root = os.path.normpath(root)
+        self.tile_size = tile_size
+        self.base_width = base_width  # Tüm gezegeni kaplayan taban dokunun genişliği
+        self.max_inset_px = max_inset_px  # Inset dokunun en uzun kenarı
+
+    def find_source(self, layer):
+        """
+        assets/earth_textures/<layer>.npy|ppm|pgm (yoksa None)
+        Kaynak ilk satırı kuzey, ilk sütunu -180° boylam olan (H, W, C) uint8 görüntü
+        """
+        for extension in SOURCE_EXTENSIONS:
+            path = os.path.join(self.source_root, layer + extension)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def build_pyramid(self, layer, source_path):
+        """
+        Kaynağı karolara bölüp mip seviyelerini üretir, kaynak değişmediyse mevcut depo kullanılır
+        Her adımda sadece bir karo satırı bandı bellekte tutulur
+        """
+        stat = os.stat(source_path)
+        signature = [os.path.basename(source_path), stat.st_size, int(stat.st_mtime), self.tile_size]
+        meta = self._read_meta(layer)
+        if meta is not None and meta['signature'] == signature:
+            return meta
+
+        source = self._open_source(source_path)
+        height, width, channels = source.shape
+        layer_dir = os.path.join(self.root, layer)
+        os.makedirs(layer_dir, exist_ok=True)
+
+        levels = []
+        level_source = source
+        level = 0
+        while True:
+            level_height, level_width = level_source.shape[:2]
+            rows = -(-level_height // self.tile_size)
+            cols = -(-level_width // self.tile_size)
+            path = os.path.join(layer_dir, f"level_{level}.npy")
+            tiles = np.lib.format.open_memmap(
+                path, mode='w+', dtype=np.uint8, shape=(rows, cols, self.tile_size, self.tile_size, channels)
+            )
+
+            for row in range(rows):
+                band = np.zeros((self.tile_size, cols * self.tile_size, channels), dtype=np.uint8)
+                band_rows = level_source[row * self.tile_size:(row + 1) * self.tile_size]
+                band[:len(band_rows), :level_width] = band_rows
+                tiles[row] = band.reshape(self.tile_size, cols, self.tile_size, channels).swapaxes(0, 1)
+            tiles.flush()
+
+            levels.append({'width': level_width, 'height': level_height, 'rows': rows, 'cols': cols})
+            print(f"Tiled {layer} level {level}: {level_width}x{level_height} ({rows * cols} tiles)")
+
+            if level_width <= self.tile_size:
+                break
+            level_source = _DownsampledLevel(tiles, level_width, level_height)
+            level += 1
+
+        meta = {
+            'signature': signature,
+            'channels': channels,
+            'tile_size': self.tile_size,
+            'levels': levels,
+        }
+        temp_path = os.path.join(layer_dir, 'meta.json.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(temp_path, os.path.join(layer_dir, 'meta.json'))
+        return meta
+
+    def view_samples(self, views, radius, grid=64, aspect=9.0 / 16.0):
+        """
+        Her görüşün koni içindeki ışınlarını küreyle kesiştirir
+        Döndürür: isabet eden örneklerin enlem, boylam (radyan) ve piksel ayak izinin küre üzerindeki açısı
+        """
+        latitudes, longitudes, footprints = [], [], []
+        for location, forward, fov, width_px in views:
+            location = np.asarray(location, dtype=np.float64)
+            forward = np.asarray(forward, dtype=np.float64)
+            forward = forward / np.linalg.norm(forward)
+
+            # Çerçeveyi kapsayan koni: köşegen yarı açısı
+            half_width = math.tan(0.5 * fov)
+            half_diagonal = half_width * math.sqrt(1.0 + aspect ** 2)
+            helper = np.array((0.0, 0.0, 1.0)) if abs(forward[2]) < 0.9 else np.array((1.0, 0.0, 0.0))
+            right = np.cross(forward, helper)
+            right /= np.linalg.norm(right)
+            up = np.cross(right, forward)
+
+            offsets = np.linspace(-half_diagonal, half_diagonal, grid)
+            sx, sy = np.meshgrid(offsets, offsets)
+            inside = sx ** 2 + sy ** 2 <= half_diagonal ** 2
+            rays = forward + sx[inside, None] * right + sy[inside, None] * up
+            rays /= np.linalg.norm(rays, axis=1, keepdims=True)
+
+            # Işın-küre kesişimi: |o + t d| = R
+            b = rays @ location
+            c = location @ location - radius ** 2
+            discriminant = b ** 2 - c
+            t = -b - np.sqrt(np.maximum(discriminant, 0.0))
+            hit = (discriminant >= 0.0) & (t > 0.0)
+            if not hit.any():
+                continue
+
+            points = location + rays[hit] * t[hit, None]
+            normals = points / radius
+            incidence = np.maximum(-np.einsum('ij,ij->i', rays[hit], normals), 0.1)
+            pixel_angle = fov / width_px
+            footprints.append(t[hit] * pixel_angle / incidence / radius)
+            latitudes.append(np.arcsin(np.clip(normals[:, 2], -1.0, 1.0)))
+            longitudes.append(np.arctan2(normals[:, 1], normals[:, 0]))
+
+        if not latitudes:
+            return np.zeros(0), np.zeros(0), np.zeros(0)
+        return np.concatenate(latitudes), np.concatenate(longitudes), np.concatenate(footprints)
+
+    def visible_tiles(self, meta, latitudes, longitudes, footprints):
+        """
+        Örneklerin gerektirdiği mip seviyesi ve karolar: {seviye: set((satır, sütun))}
+        Seviye, texel açısı piksel ayak izini geçmeyen en kaba seviyedir
+        """
+        levels = meta['levels']
+        finest_width = levels[0]['width']
+        level_index = np.floor(np.log2(np.maximum(footprints * finest_width / (2.0 * math.pi), 1.0)))
+        level_index = np.clip(level_index, 0, len(levels) - 1).astype(int)
+
+        visible = {}
+        for level in np.unique(level_index):
+            mask = level_index == level
+            info = levels[level]
+            x = (longitudes[mask] / (2.0 * math.pi) + 0.5) * info['width']
+            y = (0.5 - latitudes[mask] / math.pi) * info['height']
+            rows = np.clip(y // self.tile_size, 0, info['rows'] - 1).astype(int)
+            cols = np.clip(x // self.tile_size, 0, info['cols'] - 1).astype(int)
+            visible[int(level)] = set(zip(rows.tolist(), cols.tolist()))
+        return visible
+
+    def assemble(self, layer, views, radius):
+        """
+        Blender'ın yükleyeceği dokuları üretir
+        Döndürür: {'base_path', 'inset_path', 'inset_box': (u0, v0, u1, v1)} (inset yoksa None alanlar), kaynak yoksa None
+        """
+        source_path = self.find_source(layer)
+        if source_path is None:
+            return None
+
+        meta = self.build_pyramid(layer, source_path)
+        levels = meta['levels']
+        base_level = min(
+            (index for index, info in enumerate(levels) if info['width'] <= self.base_width),
+            default=len(levels) - 1
+        )
+
+        result = {
+            'base_path': self._write_level_window(layer, meta, base_level, None),
+            'inset_path': None,
+            'inset_box': None,
+        }
+
+        visible = self.visible_tiles(meta, *self.view_samples(views, radius))
+        detailed = {level: tiles for level, tiles in visible.items() if level < base_level}
+        if not detailed:
+            return result
+
+        # Inset: görünen ayrıntılı karoların kutusu, sığmazsa bir seviye kabalaşır
+        level = min(detailed)
+        while True:
+            tiles = self._tiles_at_level(detailed, level)
+            box = self._tile_box(tiles, levels[level])
+            box_px = max(box[1] - box[0], box[3] - box[2]) * self.tile_size
+            if box_px <= self.max_inset_px or level + 1 >= base_level:
+                break
+            level += 1
+
+        result['inset_path'] = self._write_level_window(layer, meta, level, (box, tiles))
+        info = levels[level]
+        row0, row1, col0, col1 = box
+        result['inset_box'] = (
+            col0 * self.tile_size / info['width'],
+            1.0 - min(row1 * self.tile_size, info['height']) / info['height'],
+            min(col1 * self.tile_size, info['width']) / info['width'],
+            1.0 - row0 * self.tile_size / info['height'],
+        )
+        print(f"Earth {layer} inset: level {level}, {len(tiles)} of {info['rows'] * info['cols']} tiles")
+        return result
+
+    def _tiles_at_level(self, visible, level):
+        """
+        Farklı seviyelerdeki karoları tek seviyeye taşır (ince karolar üst karolarına, kaba karolar alt karolarına)
+        """
+        tiles = set()
+        for tile_level, level_tiles in visible.items():
+            for row, col in level_tiles:
+                if tile_level <= level:
+                    scale = 2 ** (level - tile_level)
+                    tiles.add((row // scale, col // scale))
+                else:
+                    scale = 2 ** (tile_level - level)
+                    tiles.update(
+                        (row * scale + r, col * scale + c) for r in range(scale) for c in range(scale)
+                    )
+        return tiles
+
+    def _tile_box(self, tiles, info):
+        """
+        Karo kümesini kaplayan (satır0, satır1, sütun0, sütun1), boylam dikişini geçen kutular tam genişliğe çıkar
+        """
+        rows = [row for row, _ in tiles]
+        cols = sorted({col for _, col in tiles})
+
+        # Dikişi geçen küme (en büyük boşluk küme içinde) sarmalı kutu yerine tam genişlik alır,
+        # dikişi geçen yakın çekimler nadir
+        gaps = [b - a for a, b in zip(cols, cols[1:])]
+        wrap_gap = cols[0] + info['cols'] - cols[-1]
+        if not gaps or wrap_gap >= max(gaps):
+            return min(rows), max(rows) + 1, cols[0], cols[-1] + 1
+        return min(rows), max(rows) + 1, 0, info['cols']
+
+    def _write_level_window(self, layer, meta, level, window):
+        """
+        Seviyenin tamamını ya da bir karo penceresini PNG'ye yazar (görünmeyen karolar şeffaf)
+        Aynı içerik tekrar yazılmaz
+        """
+        info = meta['levels'][level]
+        tiles_memmap = np.load(os.path.join(self.root, layer, f"level_{level}.npy"), mmap_mode='r')
+
+        if window is None:
+            box = (0, info['rows'], 0, info['cols'])
+            tiles = None
+        else:
+            box, tiles = window
+        row0, row1, col0, col1 = box
+
+        digest = hashlib.sha1(json.dumps(
+            [meta['signature'], level, box, sorted(tiles) if tiles is not None else None]
+        ).encode('utf-8')).hexdigest()[:16]
+        path = os.path.join(self.root, layer, f"{layer}_L{level}_{digest}.png")
+        if os.path.exists(path):
+            return path
+
+        size = self.tile_size
+        channels = meta['channels']
+        out_channels = channels if tiles is None else channels + 1
+        image = np.zeros(((row1 - row0) * size, (col1 - col0) * size, out_channels), dtype=np.uint8)
+        for row in range(row0, row1):
+            for col in range(col0, col1):
+                if tiles is not None and (row, col) not in tiles:
+                    continue
+                target = image[(row - row0) * size:(row - row0 + 1) * size, (col - col0) * size:(col - col0 + 1) * size]
+                target[..., :channels] = tiles_memmap[row, col]
+                if tiles is not None:
+                    target[..., channels] = 255
+
+        # Son satır / sütundaki dolgu kırpılır
+        height = min(row1 * size, info['height']) - row0 * size
+        width = min(col1 * size, info['width']) - col0 * size
+        temp_path = path + '.tmp'
+        write_png8(temp_path, image[:height, :width], compression=1)
+        os.replace(temp_path, path)
+        return path
+
+    def _open_source(self, source_path):
+        """
+        Kaynağı belleğe almadan (H, W, C) uint8 olarak açar
+        """
+        if source_path.lower().endswith('.npy'):
+            source = np.load(source_path, mmap_mode='r')
+        else:
+            source = open_pnm(source_path)
+        if source.ndim == 2:
+            source = source[:, :, None]
+        if source.dtype != np.uint8:
+            raise ValueError(f"Earth texture source must be 8-bit: {source_path}")
+        return source
+
+    def _read_meta(self, layer):
+        path = os.path.join(self.root, layer, 'meta.json')
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as f:
+            return json.load(f)
+
+class _DownsampledLevel:
+    """
+    Tile-major seviye dizisini bir sonraki seviye için satır bandı halinde 2x2 kutu ortalamasıyla okur
+    """
+
+    def __init__(self, tiles, width, height):
+        self.tiles = tiles
+        self.width = width
+        self.height = height
+        self.shape = ((height + 1) // 2, (width + 1) // 2, tiles.shape[-1])
+
+    def __getitem__(self, rows):
+        """
+        Sadece satır dilimi desteklenir (build_pyramid bant okuması)
+        """
+        start, stop, _ = rows.indices(self.shape[0])
+        size = self.tiles.shape[2]
+        source_start, source_stop = 2 * start, min(2 * stop, self.height)
+
+        # İlgili karo satırlarını birleştirip kaynak satırlarını çıkar
+        tile_row0, tile_row1 = source_start // size, -(-source_stop // size)
+        band = np.concatenate([
+            self.tiles[row].swapaxes(0, 1).reshape(size, -1, self.tiles.shape[-1])
+            for row in range(tile_row0, tile_row1)
+        ], axis=0)
+        band = band[source_start - tile_row0 * size:source_stop - tile_row0 * size, :self.width].astype(np.uint16)
+
+        # Tek sayılı kenarlar son satır / sütunu tekrarlar
+        if len(band) % 2:
+            band = np.concatenate((band, band[-1:]), axis=0)
+        if band.shape[1] % 2:
+            band = np.concatenate((band, band[:, -1:]), axis=1)
+        averaged = (band[0::2, 0::2] + band[1::2, 0::2] + band[0::2, 1::2] + band[1::2, 1::2] + 2) // 4
+        return averaged.astype(np.uint8)
+
+def focus_view(latitude, longitude, radius, altitude, fov=math.radians(40.0), width_px=1920):
+    """
+    Odak noktasına tepeden bakan sanal görüş (kamera yokken yakın çekim çözünürlüğü için)
+    """
+    normal = unit_vectors(latitude, longitude)
+    return tuple(normal * (radius + altitude)), tuple(-normal), fov, width_px
@@ -0,0 +1,226 @@
+import math
+import numpy as np
+from datetime import datetime, timezone
+
+# WGS84 elipsoidi
+WGS84_A = 6378137.0
+WGS84_F = 1.0 / 298.257223563
+WGS84_B = WGS84_A * (1.0 - WGS84_F)
+WGS84_E2 = WGS84_F * (2.0 - WGS84_F)
+WGS84_EP2 = WGS84_E2 / (1.0 - WGS84_E2)
+
+# Küresel yaklaşımlar (büyük daire hesapları ve sahne küresi)
+MEAN_EARTH_RADIUS_M = 6371008.8
+SCENE_UNITS_PER_M = 1e-6  # 1 Blender unit = 1000 km
+SCENE_EARTH_RADIUS = 6.371
+
+J2000_JD = 2451545.0
+
+def geodetic_to_ecef(latitude, longitude, height_m=0.0):
+    """
+    WGS84 geodetic (derece, metre) -> ECEF (metre), (..., 3)
+    """
+    lat = np.radians(np.asarray(latitude, dtype=np.float64))
+    lon = np.radians(np.asarray(longitude, dtype=np.float64))
+    height_m = np.asarray(height_m, dtype=np.float64)
+
+    sin_lat = np.sin(lat)
+    cos_lat = np.cos(lat)
+    prime_vertical = WGS84_A / np.sqrt(1.0 - WGS84_E2 * sin_lat ** 2)
+
+    return np.stack(np.broadcast_arrays(
+        (prime_vertical + height_m) * cos_lat * np.cos(lon),
+        (prime_vertical + height_m) * cos_lat * np.sin(lon),
+        (prime_vertical * (1.0 - WGS84_E2) + height_m) * sin_lat
+    ), axis=-1)
+
+def ecef_to_geodetic(ecef):
+    """
+    ECEF (metre), (..., 3) -> WGS84 enlem, boylam (derece), yükseklik (metre)
+    Bowring başlangıcı + iki Newton adımı (mm altı hata)
+    """
+    ecef = np.asarray(ecef, dtype=np.float64)
+    x, y, z = ecef[..., 0], ecef[..., 1], ecef[..., 2]
+    p = np.hypot(x, y)
+    lon = np.arctan2(y, x)
+
+    theta = np.arctan2(z * WGS84_A, p * WGS84_B)
+    lat = np.arctan2(
+        z + WGS84_EP2 * WGS84_B * np.sin(theta) ** 3,
+        p - WGS84_E2 * WGS84_A * np.cos(theta) ** 3
+    )
+    for _ in range(2):
+        sin_lat = np.sin(lat)
+        prime_vertical = WGS84_A / np.sqrt(1.0 - WGS84_E2 * sin_lat ** 2)
+        height = _geodetic_height(p, z, lat, prime_vertical)
+        lat = np.arctan2(z, p * (1.0 - WGS84_E2 * prime_vertical / (prime_vertical + height)))
+
+    sin_lat = np.sin(lat)
+    prime_vertical = WGS84_A / np.sqrt(1.0 - WGS84_E2 * sin_lat ** 2)
+    height = _geodetic_height(p, z, lat, prime_vertical)
+    return np.degrees(lat), np.degrees(lon), height
+
+def _geodetic_height(p, z, lat, prime_vertical):
+    """
+    Kutuplara yakın cos(lat) -> 0 bölmesinden kaçınan yükseklik
+    """
+    cos_lat = np.cos(lat)
+    sin_lat = np.sin(lat)
+    return np.where(
+        np.abs(cos_lat) > 1e-3,
+        p / np.maximum(np.abs(cos_lat), 1e-12) - prime_vertical,
+        np.abs(z) / np.maximum(np.abs(sin_lat), 1e-12) - prime_vertical * (1.0 - WGS84_E2)
+    )
+
+def geodetic_to_scene(latitude, longitude, height_m=0.0, ellipsoid=False, radius=SCENE_EARTH_RADIUS):
+    """
+    Geodetic -> sahne koordinatı (Blender units, Dünya merkezi orijinde, z kuzey kutbu, x 0° boylam)
+    ellipsoid=False: sahnedeki küresel Dünya mesh'inin yüzeyine (enlem küresel kabul edilir)
+    ellipsoid=True: gerçek WGS84 ECEF konumu ölçeklenir
+    """
+    if ellipsoid:
+        return geodetic_to_ecef(latitude, longitude, height_m) * SCENE_UNITS_PER_M
+
+    height_m = np.asarray(height_m, dtype=np.float64)
+    return unit_vectors(latitude, longitude) * (radius + height_m * SCENE_UNITS_PER_M)[..., None]
+
+def scene_to_geodetic(points, ellipsoid=False, radius=SCENE_EARTH_RADIUS):
+    """
+    Sahne koordinatı -> enlem, boylam (derece), yükseklik (metre); geodetic_to_scene'in tersi
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if ellipsoid:
+        return ecef_to_geodetic(points / SCENE_UNITS_PER_M)
+
+    distance = np.linalg.norm(points, axis=-1)
+    lat = np.degrees(np.arcsin(np.clip(points[..., 2] / np.maximum(distance, 1e-12), -1.0, 1.0)))
+    lon = np.degrees(np.arctan2(points[..., 1], points[..., 0]))
+    return lat, lon, (distance - radius) / SCENE_UNITS_PER_M
+
+def unit_vectors(latitude, longitude):
+    """
+    Küresel enlem / boylam (derece) -> birim yön, (..., 3)
+    """
+    lat = np.radians(np.asarray(latitude, dtype=np.float64))
+    lon = np.radians(np.asarray(longitude, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.stack(np.broadcast_arrays(cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)), axis=-1)
+
+def enu_to_geodetic(latitude, longitude, east_m, north_m, up_m=0.0, height_m=0.0):
+    """
+    Referans noktası etrafındaki yerel doğu / kuzey / yukarı ofsetleri (metre) -> geodetic
+    Yerel arazi ve hasar ızgaraları için (düz yaklaşım yok, ECEF üzerinden)
+    """
+    lat = math.radians(latitude)
+    lon = math.radians(longitude)
+    east = np.array((-math.sin(lon), math.cos(lon), 0.0))
+    north = np.array((-math.sin(lat) * math.cos(lon), -math.sin(lat) * math.sin(lon), math.cos(lat)))
+    up = np.array((math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat)))
+
+    east_m, north_m, up_m = np.broadcast_arrays(
+        np.asarray(east_m, dtype=np.float64), np.asarray(north_m, dtype=np.float64), np.asarray(up_m, dtype=np.float64)
+    )
+    origin = geodetic_to_ecef(latitude, longitude, height_m)
+    ecef = origin + east_m[..., None] * east + north_m[..., None] * north + up_m[..., None] * up
+    return ecef_to_geodetic(ecef)
+
+def haversine_distance(lat1, lon1, lat2, lon2, radius_m=MEAN_EARTH_RADIUS_M):
+    """
+    Büyük daire mesafesi (metre), derece girdiler, yayınlanabilir diziler
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=np.float64)) for value in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2.0) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2.0) ** 2
+    return 2.0 * radius_m * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+def initial_bearing(lat1, lon1, lat2, lon2):
+    """
+    Başlangıç azimutu (derece, kuzeyden saat yönünde)
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=np.float64)) for value in (lat1, lon1, lat2, lon2))
+    dlon = lon2 - lon1
+    bearing = np.arctan2(
+        np.sin(dlon) * np.cos(lat2),
+        np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(dlon)
+    )
+    return np.degrees(bearing) % 360.0
+
+def destination_point(latitude, longitude, bearing_deg, distance_m, radius_m=MEAN_EARTH_RADIUS_M):
+    """
+    Başlangıç noktasından azimut ve mesafe ile varılan nokta (küresel), enlem / boylam derece
+    """
+    lat = np.radians(np.asarray(latitude, dtype=np.float64))
+    lon = np.radians(np.asarray(longitude, dtype=np.float64))
+    bearing = np.radians(np.asarray(bearing_deg, dtype=np.float64))
+    angular = np.asarray(distance_m, dtype=np.float64) / radius_m
+
+    sin_lat2 = np.sin(lat) * np.cos(angular) + np.cos(lat) * np.sin(angular) * np.cos(bearing)
+    lat2 = np.arcsin(np.clip(sin_lat2, -1.0, 1.0))
+    lon2 = lon + np.arctan2(
+        np.sin(bearing) * np.sin(angular) * np.cos(lat),
+        np.cos(angular) - np.sin(lat) * sin_lat2
+    )
+    return np.degrees(lat2), (np.degrees(lon2) + 180.0) % 360.0 - 180.0
+
+def julian_date(moment):
+    """
+    datetime (naive ise UTC kabul edilir) -> Julian tarih
+    """
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = moment - datetime(2000, 1, 1, 12, 0, 0)
+    return J2000_JD + delta.total_seconds() / 86400.0
+
+def gmst(julian_dates):
+    """
+    Greenwich ortalama yıldız zamanı (radyan), IAU 1982 (UT1 ~ UTC)
+    """
+    julian_dates = np.asarray(julian_dates, dtype=np.float64)
+    days = julian_dates - J2000_JD
+    centuries = days / 36525.0
+    seconds = (67310.54841 + (876600.0 * 3600.0 + 8640184.812866) * centuries
+               + 0.093104 * centuries ** 2 - 6.2e-6 * centuries ** 3)
+    return np.radians((seconds % 86400.0) / 240.0)
+
+def eci_to_ecef(vectors, julian_dates):
+    """
+    Ekvator ataletsel (ECI, J2000 yaklaşık) -> Dünya sabit (ECEF): z etrafında -GMST döndürme
+    """
+    vectors = np.asarray(vectors, dtype=np.float64)
+    theta = gmst(julian_dates)
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+    return np.stack((
+        cos_t * vectors[..., 0] + sin_t * vectors[..., 1],
+        -sin_t * vectors[..., 0] + cos_t * vectors[..., 1],
+        vectors[..., 2]
+    ), axis=-1)
+
+def ecef_to_eci(vectors, julian_dates):
+    """
+    ECEF -> ECI: z etrafında +GMST döndürme
+    """
+    vectors = np.asarray(vectors, dtype=np.float64)
+    theta = gmst(julian_dates)
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+    return np.stack((
+        cos_t * vectors[..., 0] - sin_t * vectors[..., 1],
+        sin_t * vectors[..., 0] + cos_t * vectors[..., 1],
+        vectors[..., 2]
+    ), axis=-1)
+
+def sun_direction_ecef(julian_dates):
+    """
+    Güneş'in Dünya sabit çerçevedeki birim yönü (Astronomical Almanac düşük hassasiyet, ~0.01°)
+    """
+    days = np.asarray(julian_dates, dtype=np.float64) - J2000_JD
+    mean_longitude = np.radians((280.460 + 0.9856474 * days) % 360.0)
+    mean_anomaly = np.radians((357.528 + 0.9856003 * days) % 360.0)
+    ecliptic_longitude = (mean_longitude + np.radians(1.915) * np.sin(mean_anomaly)
+                          + np.radians(0.020) * np.sin(2.0 * mean_anomaly))
+    obliquity = np.radians(23.439 - 4e-7 * days)
+
+    eci = np.stack((
+        np.cos(ecliptic_longitude),
+        np.cos(obliquity) * np.sin(ecliptic_longitude),
+        np.sin(obliquity) * np.sin(ecliptic_longitude)
+    ), axis=-1)
+    return eci_to_ecef(eci, julian_dates)
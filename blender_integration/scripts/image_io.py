@@ -0,0 +1,83 @@
+import struct
+import zlib
+import numpy as np
+
+# PNG color type: kanal sayısına göre
+PNG_COLOR_TYPES = {1: 0, 2: 4, 3: 2, 4: 6}
+
+def write_png16(path, pixels):
+    """
+    16-bit PNG yazar (sadece standart kütüphane + NumPy)
+    pixels: (H, W) gri veya (H, W, 3) RGB, [0, 1] aralığında float ya da uint16, ilk satır üst
+    """
+    pixels = np.asarray(pixels)
+    if pixels.dtype != np.uint16:
+        pixels = np.round(np.clip(pixels, 0.0, 1.0) * 65535).astype(np.uint16)
+
+    rows = pixels.astype('>u2').reshape(pixels.shape[0], -1).view(np.uint8)
+    _write_png(path, rows, pixels, 16)
+
+def write_png8(path, pixels, compression=6):
+    """
+    8-bit PNG yazar
+    pixels: (H, W) gri veya (H, W, 1-4) kanal, [0, 1] aralığında float ya da uint8, ilk satır üst
+    """
+    pixels = np.asarray(pixels)
+    if pixels.dtype != np.uint8:
+        pixels = np.round(np.clip(pixels, 0.0, 1.0) * 255).astype(np.uint8)
+
+    rows = pixels.reshape(pixels.shape[0], -1)
+    _write_png(path, rows, pixels, 8, compression)
+
+def open_pnm(path):
+    """
+    Binary PGM (P5) / PPM (P6) dosyasını belleğe almadan memmap olarak açar, (H, W, C)
+    Çok büyük görüntüler için (gdal_translate -of PNM, vips) tüm dosya okunmaz
+    """
+    with open(path, 'rb') as f:
+        magic = f.read(2)
+        if magic not in (b'P5', b'P6'):
+            raise ValueError(f"Unsupported PNM format: {magic!r}")
+
+        # Başlık: genişlik, yükseklik, maksimum değer (yorum satırları atlanır)
+        fields = []
+        token = b''
+        while len(fields) < 3:
+            char = f.read(1)
+            if char == b'#':
+                f.readline()
+            elif char.isspace():
+                if token:
+                    fields.append(int(token))
+                    token = b''
+            elif char:
+                token += char
+            else:
+                raise ValueError(f"Truncated PNM header: {path}")
+        offset = f.tell()
+
+    width, height, max_value = fields
+    channels = 1 if magic == b'P5' else 3
+    dtype = np.uint8 if max_value < 256 else np.dtype('>u2')
+    return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(height, width, channels))
+
+def _write_png(path, rows, pixels, bit_depth, compression=6):
+    """
+    Satır baytlarını tek IDAT chunk'ı ile PNG olarak yazar
+    """
+    height, width = pixels.shape[:2]
+    channels = pixels.shape[2] if pixels.ndim == 3 else 1
+    color_type = PNG_COLOR_TYPES[channels]
+
+    # Her satır başında filtre baytı (0 = None)
+    raw = np.concatenate((np.zeros((height, 1), dtype=np.uint8), rows), axis=1).tobytes()
+
+    def chunk(tag, data):
+        body = tag + data
+        return struct.pack('>I', len(data)) + body + struct.pack('>I', zlib.crc32(body) & 0xffffffff)
+
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, bit_depth, color_type, 0, 0, 0)))
+        f.write(chunk(b'IDAT', zlib.compress(raw, compression)))
+        f.write(chunk(b'IEND', b''))
@@ -2,9 +2,21 @@ import bpy
 import bmesh
 import mathutils
 import math
+import os
 import random
+import numpy as np
 from mathutils import Vector, noise
 
+from atmospheric_entry import AtmosphericEntryModel
+from impact_timeline import ImpactTimelinePlanner
+from tsunami_solver import TsunamiSolver, load_bathymetry, write_height_frames
+from dem_terrain import DEMReader
+from population_exposure import PopulationExposure, damage_radii_km
+from geodesy import geodetic_to_scene
+from crater_field import CraterField
+from material_system import material_library, object_attribute_node, set_object_attribute
+from scene_builder import scene_builder
+
 class ImpactSimulation:
     """
     Asteroid çarpması için gerçekçi fizik simülasyonu
@@ -13,10 +25,33 @@ class ImpactSimulation:
     
     def __init__(self):
         self.earth_radius = 6.371  # Blender units
-        
-    def simulate_asteroid_impact(self, asteroid_data, impact_coords, earth_obj):
+        self.entry_model = AtmosphericEntryModel()
+        
+        # Tsunami çözücü ayarları
+        self.tsunami_extent_deg = 20.0
+        self.tsunami_cell_arcmin = 4.0
+        self.tsunami_height_exaggeration = 50.0  # Dalga yüksekliği görünür olsun diye
+        self.tsunami_patch_resolution = 256
+        
+        # Yerel DEM arazi yaması ayarları
+        self.dem_reader = DEMReader()
+        self.terrain_resolution = 256
+        self.terrain_min_half_size_km = 25.0
+        self.terrain_vertical_exaggeration = 1.0
+        # Maskelenmemiş küre yüzlerinin altında kalan yama kenarı bu kadar batırılır (z-fighting olmaz)
+        self.terrain_skirt_m = 100.0
+        
+        # Hasar halkalarındaki nüfus (yerel nüfus rasterı varsa)
+        self.population = PopulationExposure()
+        
+    def simulate_asteroid_impact(self, asteroid_data, impact_coords, earth_obj, frame_budget=None, fps=24,
+                                 shared_earth=False, terrain_half_size_km=None):
         """
         Komplet asteroid impact simülasyonu
+        frame_budget verilirse timeline bu frame sayısına sığdırılır
+        shared_earth=True: Dünya birden çok çarpmada instance olarak paylaşılır, earth_obj değiştirilmez
+        (krater DEM yoksa düz bir yerel arazi yamasına oyulur; Dünya'yı cut_shared_earth keser,
+        terrain_half_size_km ortak kesimin yama boyutudur)
         """
         print(f"Simulating impact for {asteroid_data.get('name', 'Unknown')}")
         
@@ -30,30 +65,74 @@ class ImpactSimulation:
         )
         
         # Impact timeline oluştur
-        timeline = self._create_impact_timeline(impact_params)
+        timeline = self._create_impact_timeline(impact_params, frame_budget, fps)
         
         # Ana simülasyon bileşenleri
-        simulation_objects = {}
-        
-        # 1. Asteroid approach trajectory
-        trajectory = self._create_approach_trajectory(asteroid_data, impact_pos)
-        simulation_objects['trajectory'] = trajectory
-        
-        # 2. Krater oluşumu
-        crater = self._create_crater_formation(earth_obj, impact_pos, impact_params)
-        simulation_objects['crater'] = crater
-        
-        # 3. Şok dalgası
-        shockwave = self._create_shockwave_animation(impact_pos, impact_params)
-        simulation_objects['shockwave'] = shockwave
-        
-        # 4. Debris ve Ejecta
-        debris = self._create_debris_system(impact_pos, impact_params)
-        simulation_objects['debris'] = debris
+        simulation_objects = {'timeline': timeline, 'entry': impact_params['entry']}
         
-        # 5. Atmosfer efektleri
-        atmosphere_fx = self._create_atmosphere_effects(impact_pos, impact_params)
-        simulation_objects['atmosphere'] = atmosphere_fx
+        # Hasar halkalarındaki nüfus
+        simulation_objects['damage_radii_km'] = impact_params['damage_radii_km']
+        simulation_objects['exposure'] = self.population.exposure(
+            impact_coords['latitude'], impact_coords['longitude'], impact_params['damage_radii_km']
+        )
+        if simulation_objects['exposure'] is not None:
+            for ring, population in simulation_objects['exposure'].items():
+                print(f"Exposure {ring} ({impact_params['damage_radii_km'][ring]:.1f} km): {population:,.0f} people")
+        
+        if impact_params['airburst']:
+            # Airburst: enerji havada açığa çıkar, krater ve debris yok
+            burst_altitude_units = impact_params['entry']['burst_altitude_m'] / 1e6  # m to blender units
+            burst_pos = impact_pos.normalized() * (self.earth_radius + burst_altitude_units)
+            print(f"Airburst at {impact_params['entry']['burst_altitude_m'] / 1000.0:.1f} km altitude")
+            
+            simulation_objects['trajectory'] = self._create_approach_trajectory(asteroid_data, burst_pos)
+            simulation_objects['crater'] = None
+            simulation_objects['shockwave'] = self._create_shockwave_animation(impact_pos, impact_params, timeline)
+            simulation_objects['debris'] = []
+            simulation_objects['atmosphere'] = self._create_atmosphere_effects(burst_pos, impact_params, timeline)
+            
+            # Paylaşılan Dünya kesildiyse delik kratersiz yama ile kapatılır
+            if shared_earth and terrain_half_size_km is not None:
+                patch = self._create_terrain_patch(
+                    earth_obj, impact_coords, terrain_half_size_km, require_dem=False, cut_earth=False
+                )
+                simulation_objects['terrain'] = patch['terrain'] if patch is not None else None
+        else:
+            print(f"Surface impact: {impact_params['entry']['ground_energy_kt']:,.0f} kt reaches the ground "
+                  f"at {impact_params['entry']['ground_velocity_ms'] / 1000.0:.1f} km/s")
+            
+            # 1. Asteroid approach trajectory
+            trajectory = self._create_approach_trajectory(asteroid_data, impact_pos)
+            simulation_objects['trajectory'] = trajectory
+            
+            # 2. Krater oluşumu (okyanusta krater yerine tsunami)
+            bathymetry = self._load_bathymetry(impact_coords)
+            if self._is_ocean_impact(impact_coords, bathymetry):
+                simulation_objects['crater'] = None
+                simulation_objects['tsunami'] = self._create_tsunami(
+                    asteroid_data, impact_coords, impact_params, timeline, bathymetry
+                )
+            else:
+                # Yerel DEM varsa krater gerçek araziye oyulur
+                crater = self._create_terrain_crater(
+                    earth_obj, impact_coords, impact_pos, impact_params, timeline,
+                    require_dem=not shared_earth, cut_earth=not shared_earth, half_size_km=terrain_half_size_km
+                )
+                if crater is None:
+                    crater = self._create_crater_formation(earth_obj, impact_pos, impact_params, timeline)
+                simulation_objects['crater'] = crater
+            
+            # 3. Şok dalgası
+            shockwave = self._create_shockwave_animation(impact_pos, impact_params, timeline)
+            simulation_objects['shockwave'] = shockwave
+            
+            # 4. Debris ve Ejecta
+            debris = self._create_debris_system(impact_pos, impact_params, timeline)
+            simulation_objects['debris'] = debris
+            
+            # 5. Atmosfer efektleri
+            atmosphere_fx = self._create_atmosphere_effects(impact_pos, impact_params, timeline)
+            simulation_objects['atmosphere'] = atmosphere_fx
         
         # 6. Animasyon kurulumu
         self._setup_impact_animation(simulation_objects, timeline)
@@ -82,8 +161,24 @@ class ImpactSimulation:
         # TNT eşdeğeri (ton)
         tnt_equivalent = kinetic_energy / 4.184e9
         
-        # Krater çapı (Collins et al. 2005 scaling law)
-        crater_diameter_km = 1.161 * (tnt_equivalent ** 0.22) * (math.sin(math.radians(angle_deg)) ** (1/3))
+        # Atmosferik giriş: kırılma, ablasyon ve airburst
+        entry = self.entry_model.simulate_single(
+            diameter_km * 1000,
+            velocity_ms,
+            density_gcm3 * 1000,
+            angle_deg,
+            asteroid_data.get('strength_pa')
+        )
+        airburst = entry['airburst']
+        
+        # Krater çapı (Collins et al. 2005 scaling law), yere ulaşan enerjiyle
+        # Yavaşlamış / kısmen dağılmış gövdede bu, toplam enerjiden küçük bir packager verir
+        angle_factor = math.sin(math.radians(angle_deg)) ** (1/3)
+        ground_tnt = entry['ground_energy_kt'] * 1000.0
+        crater_diameter_km = 0.0 if airburst else 1.161 * (ground_tnt ** 0.22) * angle_factor
+        
+        # Efekt ölçeği (şok dalgası, fireball): havada ya da yerde açığa çıkan toplam enerjinin eşdeğer krateri
+        effect_diameter_km = max(1.161 * (tnt_equivalent ** 0.22) * angle_factor, crater_diameter_km)
         
         # Blender ölçeği
         crater_radius_units = crater_diameter_km / 2000.0  # km to blender units
@@ -94,35 +189,35 @@ class ImpactSimulation:
             'kinetic_energy': kinetic_energy,
             'tnt_equivalent': tnt_equivalent,
             'crater_radius': crater_radius_units,
+            'crater_diameter_km': crater_diameter_km,
+            'effect_radius': effect_diameter_km / 2000.0,
+            'airburst': airburst,
+            'entry': entry,
             'impact_angle': angle_deg,
-            'diameter_km': diameter_km
+            'diameter_km': diameter_km,
+            'damage_radii_km': damage_radii_km(tnt_equivalent, crater_diameter_km)
         }
     
     def _geo_to_cartesian(self, latitude, longitude):
         """
         Coğrafi koordinatları Cartesian'a çevirir
         """
-        lat_rad = math.radians(latitude)
-        lon_rad = math.radians(longitude)
-        
-        x = self.earth_radius * math.cos(lat_rad) * math.cos(lon_rad)
-        y = self.earth_radius * math.cos(lat_rad) * math.sin(lon_rad)
-        z = self.earth_radius * math.sin(lat_rad)
-        
-        return Vector((x, y, z))
+        return Vector(geodetic_to_scene(latitude, longitude, radius=self.earth_radius))
     
-    def _create_impact_timeline(self, impact_params):
+    def _create_impact_timeline(self, impact_params, frame_budget=None, fps=24):
         """
         Impact animasyon timeline'ı oluşturur
+        Faz süreleri impact fiziğinden türetilir, tüm efekt keyframe'leri bu plandan okunur
         """
-        return {
-            'approach_start': 1,
-            'impact_moment': 120,
-            'crater_formation': 150,
-            'shockwave_start': 160,
-            'debris_peak': 200,
-            'simulation_end': 300
-        }
+        planner = ImpactTimelinePlanner(fps=fps)
+        timeline = planner.plan(impact_params, frame_budget=frame_budget)
+        
+        print(f"Impact timeline: frames {timeline['approach_start']}-{timeline['simulation_end']}")
+        for phase, info in timeline['phases'].items():
+            print(f"- {phase}: {info['duration_s']:.2f} s -> frames {info['start']}-{info['end']} "
+                  f"(x{info['time_scale']:.2f})")
+        
+        return timeline
     
     def _create_approach_trajectory(self, asteroid_data, impact_pos):
         """
@@ -132,14 +227,13 @@ class ImpactSimulation:
         diameter_km = asteroid_data.get('diameter_km', 1.0)
         asteroid_radius = diameter_km / 2000.0
         
-        bpy.ops.mesh.primitive_ico_sphere_add(
-            radius=asteroid_radius,
-            location=(0, 0, 50)  # Başlangıç pozisyonu (uzayda)
+        asteroid_obj = scene_builder.mesh_object(
+            f"Asteroid_{asteroid_data.get('name', 'Impact')}",
+            scene_builder.primitive_mesh('ico_sphere'),
+            location=(0, 0, 50),  # Başlangıç pozisyonu (uzayda)
+            scale=asteroid_radius
         )
         
-        asteroid_obj = bpy.context.active_object
-        asteroid_obj.name = f"Asteroid_{asteroid_data.get('name', 'Impact')}"
-        
         # Materyal ekle
         self._add_asteroid_approach_material(asteroid_obj)
         
@@ -189,17 +283,14 @@ class ImpactSimulation:
         spline.bezier_points[1].handle_right_type = 'AUTO'
         
         # Curve objesi oluştur
-        curve_obj = bpy.data.objects.new('Trajectory_Trail', curve_data)
-        bpy.context.collection.objects.link(curve_obj)
-        
-        # Trail material
-        trail_mat = bpy.data.materials.new(name="Trajectory_Material")
-        trail_mat.use_nodes = True
+        curve_obj = scene_builder.curve_object('Trajectory_Trail', curve_data)
         
-        # Glowing trail effect
-        principled = trail_mat.node_tree.nodes['Principled BSDF']
-        principled.inputs['Emission'].default_value = (1.0, 0.5, 0.0, 1.0)  # Orange glow
-        principled.inputs['Emission Strength'].default_value = 5.0
+        # Trail material (glowing orange)
+        trail_mat = material_library.principled_material(
+            "Trajectory_Material",
+            emission=(1.0, 0.5, 0.0, 1.0),
+            emission_strength=5.0
+        )
         
         curve_data.materials.append(trail_mat)
         curve_data.bevel_depth = 0.01  # Trail thickness
@@ -210,18 +301,241 @@ class ImpactSimulation:
         """
         Yaklaşan asteroid için glowing material
         """
-        mat = bpy.data.materials.new(name="Approaching_Asteroid")
-        mat.use_nodes = True
+        mat = material_library.principled_material(
+            "Approaching_Asteroid",
+            base_color=(0.7, 0.4, 0.2, 1.0),  # Rocky color
+            emission=(1.0, 0.3, 0.0, 1.0),  # Hot glow
+            emission_strength=2.0,
+            roughness=0.9
+        )
+        
+        material_library.assign(asteroid_obj, mat)
+    
+    def _load_bathymetry(self, impact_coords):
+        """
+        Config'te verilmişse yerel bathymetry raster'ını yükler
+        """
+        path = impact_coords.get('bathymetry_path')
+        if not path or not os.path.exists(path):
+            return None
+        return load_bathymetry(path, bounds=impact_coords.get('bathymetry_bounds'))
+    
+    def _is_ocean_impact(self, impact_coords, bathymetry=None):
+        """
+        Çarpma noktası okyanusta mı: açık bayrak, bathymetry derinliği veya konum adı
+        """
+        if 'ocean' in impact_coords:
+            return bool(impact_coords['ocean'])
+        
+        if bathymetry is not None:
+            latitude, longitude = impact_coords['latitude'], impact_coords['longitude']
+            lats, lons = bathymetry['lat'], bathymetry['lon']
+            if lats[0] <= latitude <= lats[-1] and lons[0] <= longitude <= lons[-1]:
+                row = int(np.abs(lats - latitude).argmin())
+                col = int(np.abs(lons - longitude).argmin())
+                return bathymetry['depth'][row, col] > 0
+        
+        return impact_coords.get('location_name') in ('Ocean', 'Okyanus')
+    
+    def _create_tsunami(self, asteroid_data, impact_coords, impact_params, timeline, bathymetry=None):
+        """
+        Shallow-water çözücüsünü çalıştırır, dalga frame'leri okyanus yamasında displacement olur
+        """
+        solver = TsunamiSolver(
+            impact_coords['latitude'],
+            impact_coords['longitude'],
+            extent_deg=self.tsunami_extent_deg,
+            cell_arcmin=self.tsunami_cell_arcmin,
+            bathymetry=bathymetry
+        )
+        
+        # Tsunami çarpma anından simülasyon sonuna kadar oynar
+        frame_start = timeline['impact_moment']
+        frame_count = timeline['simulation_end'] - frame_start + 1
+        result = solver.run(impact_params, frame_count=frame_count, workers=impact_coords.get('tsunami_workers'))
+        
+        duration_s = float(result['frame_times_s'][-1])
+        print(f"- tsunami: {duration_s:.0f} s -> frames {frame_start}-{timeline['simulation_end']} "
+              f"(x{duration_s * timeline['fps'] / max(frame_count, 1):.0f})")
+        
+        name = asteroid_data.get('name', 'Impact')
+        frame_dir = os.path.join("blender_integration", "output", "tsunami", name)
+        paths, max_height = write_height_frames(result['frames'], frame_dir)
+        
+        ocean = self._create_ocean_patch(f"Tsunami_Ocean_{name}", result['lat_edges'], result['lon_edges'])
+        
+        # Image sequence -> displacement texture
+        image = bpy.data.images.load(os.path.abspath(paths[0]), check_existing=True)
+        image.source = 'SEQUENCE'
+        image.colorspace_settings.name = 'Non-Color'
+        
+        texture = bpy.data.textures.new(name=f"Tsunami_Height_{name}", type='IMAGE')
+        texture.image = image
+        texture.extension = 'EXTEND'
+        texture.image_user.frame_duration = len(paths)
+        texture.image_user.frame_start = frame_start
+        texture.image_user.use_auto_refresh = True
+        
+        displace_mod = ocean.modifiers.new(name="Tsunami_Displacement", type='DISPLACE')
+        displace_mod.texture = texture
+        displace_mod.texture_coords = 'UV'
+        displace_mod.direction = 'NORMAL'
+        displace_mod.mid_level = 0.5
+        # Kodlanmış [0, 1] aralığı [-max, +max] metreye karşılık gelir
+        displace_mod.strength = 2.0 * max_height / 1e6 * self.tsunami_height_exaggeration  # m to blender units
+        
+        return {
+            'ocean': ocean,
+            'displacement': displace_mod,
+            'frame_paths': paths,
+            'max_height_m': float(result['max_height'].max()),
+        }
+    
+    def _create_ocean_patch(self, name, lat_edges, lon_edges):
+        """
+        Çözücü grid penceresini kaplayan küresel okyanus yaması (UV = grid koordinatları)
+        """
+        resolution = self.tsunami_patch_resolution
+        lat = np.linspace(lat_edges[0], lat_edges[-1], resolution + 1)
+        lon = np.linspace(lon_edges[0], lon_edges[-1], resolution + 1)
+        lat_grid, lon_grid = np.meshgrid(lat, lon, indexing='ij')
+        
+        radius = self.earth_radius * 1.0005  # Dünya yüzeyinin hemen üstü
+        vertices = geodetic_to_scene(lat_grid, lon_grid, radius=radius).reshape(-1, 3)
+        
+        # Quad indeksleri ve loop başına UV
+        row_stride = resolution + 1
+        corner = (np.arange(resolution)[:, None] * row_stride + np.arange(resolution)[None, :]).ravel()
+        faces = np.stack((corner, corner + 1, corner + row_stride + 1, corner + row_stride), axis=1)
+        
+        grid_uv = np.stack(np.meshgrid(
+            np.linspace(0.0, 1.0, resolution + 1),
+            np.linspace(0.0, 1.0, resolution + 1),
+            indexing='xy'
+        ), axis=-1).reshape(-1, 2)
+        uvs = grid_uv[faces.ravel()]
+        
+        mesh = scene_builder.mesh_from_arrays(name, vertices, faces, uvs)
+        ocean = scene_builder.mesh_object(name, mesh)
+        
+        ocean_mat = material_library.principled_material(
+            "Tsunami_Ocean_Material",
+            base_color=(0.02, 0.12, 0.3, 1.0),
+            roughness=0.15
+        )
+        material_library.assign(ocean, ocean_mat)
+        
+        return ocean
+    
+    def terrain_half_size_km(self, crater_diameter_km):
+        """
+        Arazi yaması penceresinin yarı genişliği (km): krater çapının 3 katı, en az terrain_min_half_size_km
+        """
+        return max(self.terrain_min_half_size_km, 3.0 * crater_diameter_km)
+    
+    def _create_terrain_patch(self, earth_obj, impact_coords, half_size_km, require_dem=True, cut_earth=True):
+        """
+        Çarpma noktası etrafındaki DEM penceresinden arazi yaması oluşturur
+        DEM karosu yoksa None; require_dem=False ise düz yama
+        cut_earth=True: yamanın altındaki Dünya yüzleri maskelenir (paylaşılan Dünya'yı cut_shared_earth keser)
+        """
+        window = self.dem_reader.window(
+            impact_coords['latitude'], impact_coords['longitude'], half_size_km, self.terrain_resolution,
+            require_data=require_dem
+        )
+        if window is None:
+            return None
+        
+        resolution = self.terrain_resolution
+        
+        # Çanak opak kürenin içinde kalmasın, düz bölgeler küreyle z-fighting yapmasın
+        if cut_earth:
+            margin_km = self.cut_terrain_window(
+                earth_obj, impact_coords['latitude'], impact_coords['longitude'], half_size_km
+            )
+        else:
+            margin_km = earth_obj.get("terrain_cutout_margin_km", 0.0)
+        
+        # Kenarlara doğru yükseklik sıfıra iner, küre yüzeyiyle basamak oluşmaz
+        edge_km = np.maximum(np.abs(window['east_km']), np.abs(window['north_km']))
+        band_km = max(0.1 * half_size_km, margin_km)
+        taper = np.clip((half_size_km - edge_km) / band_km, 0.0, 1.0)
+        taper = taper * taper * (3.0 - 2.0 * taper)
+        heights_m = window['heights'] * taper * self.terrain_vertical_exaggeration
+        
+        # Maskelenmemiş küre yüzlerinin uzandığı kenar bandında yama kürenin altına iner
+        if margin_km > 0.0:
+            skirt = np.clip((edge_km - (half_size_km - 2.0 * margin_km)) / margin_km, 0.0, 1.0)
+            heights_m = heights_m - self.terrain_skirt_m * skirt * skirt * (3.0 - 2.0 * skirt)
+        
+        lat = window['latitudes'].reshape(-1)
+        lon = window['longitudes'].reshape(-1)
+        heights_m = heights_m.reshape(-1)
+        vertices = geodetic_to_scene(lat, lon, heights_m, radius=self.earth_radius)
+        
+        row_stride = resolution + 1
+        corner = (np.arange(resolution)[:, None] * row_stride + np.arange(resolution)[None, :]).ravel()
+        faces = np.stack((corner, corner + 1, corner + row_stride + 1, corner + row_stride), axis=1)
+        
+        # Dünya materyali equirect UV ile aynı dokuyu kullanır
+        uv = np.stack((lon / 360.0 + 0.5, lat / 180.0 + 0.5), axis=-1)
+        mesh = scene_builder.mesh_from_arrays("Impact_Terrain", vertices, faces, uv[faces.ravel()], smooth=True)
+        terrain = scene_builder.mesh_object("Impact_Terrain", mesh)
+        if earth_obj.active_material is not None:
+            material_library.assign(terrain, earth_obj.active_material)
+        
+        return {
+            'terrain': terrain,
+            'window': window,
+            'heights_m': heights_m
+        }
+    
+    def _create_terrain_crater(self, earth_obj, impact_coords, impact_pos, impact_params, timeline, require_dem=True,
+                               cut_earth=True, half_size_km=None):
+        """
+        Arazi yamasını kurar, krater shape key ile oyulur
+        DEM karosu yoksa None (küresel displacement krateri kullanılır); require_dem=False ise düz yama
+        half_size_km verilmezse yama krater çapından boyutlanır
+        """
+        crater_diameter_km = impact_params['crater_diameter_km']
+        half_size_km = half_size_km or self.terrain_half_size_km(crater_diameter_km)
+        patch = self._create_terrain_patch(earth_obj, impact_coords, half_size_km, require_dem, cut_earth)
+        if patch is None:
+            return None
+        
+        terrain = patch['terrain']
+        window = patch['window']
+        heights_m = patch['heights_m']
+        lat = window['latitudes'].reshape(-1)
+        lon = window['longitudes'].reshape(-1)
+        
+        # Krater: radyal yönde çanak + kenar profili (metre), shape key olarak
+        crater_radius_km = crater_diameter_km / 2.0
+        distance_km = np.hypot(window['east_km'], window['north_km']).reshape(-1)
+        profile_m = CraterField().profile(distance_km / max(crater_radius_km, 1e-6), crater_radius_km * 1000.0)
+        crater_vertices = geodetic_to_scene(
+            lat, lon, heights_m + profile_m * self.terrain_vertical_exaggeration, radius=self.earth_radius
+        )
+        
+        terrain.shape_key_add(name="Basis", from_mix=False)
+        crater_key = terrain.shape_key_add(name="Crater", from_mix=False)
+        crater_key.data.foreach_set('co', crater_vertices.astype(np.float32).ravel())
         
-        principled = mat.node_tree.nodes['Principled BSDF']
-        principled.inputs['Base Color'].default_value = (0.7, 0.4, 0.2, 1.0)  # Rocky color
-        principled.inputs['Emission'].default_value = (1.0, 0.3, 0.0, 1.0)  # Hot glow
-        principled.inputs['Emission Strength'].default_value = 2.0
-        principled.inputs['Roughness'].default_value = 0.9
+        crater_key.value = 0.0
+        crater_key.keyframe_insert(data_path="value", frame=timeline['impact_moment'])
+        crater_key.value = 1.0
+        crater_key.keyframe_insert(data_path="value", frame=timeline['crater_formation'])
         
-        asteroid_obj.data.materials.append(mat)
+        rim_particles = self._create_crater_rim_particles(impact_pos, impact_params['crater_radius'], timeline)
+        
+        print(f"Terrain crater: {crater_diameter_km:.2f} km in {2 * half_size_km:.0f} km DEM patch")
+        return {
+            'terrain': terrain,
+            'shape_key': crater_key,
+            'rim_particles': rim_particles
+        }
     
-    def _create_crater_formation(self, earth_obj, impact_pos, impact_params):
+    def _create_crater_formation(self, earth_obj, impact_pos, impact_params, timeline):
         """
         Krater oluşumu animasyonu
         """
@@ -241,40 +555,145 @@ class ImpactSimulation:
         
         # Keyframe animation
         displace_mod.strength = 0.0
-        displace_mod.keyframe_insert(data_path="strength", frame=120)  # Impact moment
+        displace_mod.keyframe_insert(data_path="strength", frame=timeline['impact_moment'])
         
         displace_mod.strength = -crater_radius * 0.1
-        displace_mod.keyframe_insert(data_path="strength", frame=150)  # Crater formed
+        displace_mod.keyframe_insert(data_path="strength", frame=timeline['crater_formation'])
         
         # Crater rim (elevated edge)
-        rim_particles = self._create_crater_rim_particles(impact_pos, crater_radius)
+        rim_particles = self._create_crater_rim_particles(impact_pos, crater_radius, timeline)
         
         return {
             'displacement': displace_mod,
             'rim_particles': rim_particles
         }
     
-    def _create_crater_rim_particles(self, impact_pos, crater_radius):
+    def cut_shared_earth(self, earth_obj, asteroids, impact_coords):
+        """
+        Karşılaştırmada paylaşılan Dünya'yı ortak çarpma noktasında bir kez keser
+        Pencere en büyük krater yamasına göre boyutlanır, tüm hücreler bu boyutta yama kurar
+        Döndürür: ortak yama yarı genişliği (km) ya da kesim gerekmiyorsa None (okyanus / sadece airburst)
+        """
+        if self._is_ocean_impact(impact_coords, self._load_bathymetry(impact_coords)):
+            return None
+        
+        crater_diameters = []
+        for asteroid_data in asteroids:
+            impact_params = self._calculate_impact_parameters(asteroid_data)
+            if not impact_params['airburst']:
+                crater_diameters.append(impact_params['crater_diameter_km'])
+        if not crater_diameters:
+            return None
+        
+        half_size_km = self.terrain_half_size_km(max(crater_diameters))
+        self.cut_terrain_window(earth_obj, impact_coords['latitude'], impact_coords['longitude'], half_size_km)
+        return half_size_km
+    
+    def cut_terrain_window(self, earth_obj, latitude, longitude, half_size_km):
+        """
+        Arazi yaması penceresinin altındaki Dünya yüzlerini Mask modifier'ı ile gizler (mesh değişmez)
+        Maskelenen bölge yamadan en uzun yerel kenarın 1.5 katı küçüktür, delik her zaman yamanın içinde kalır
+        Döndürür: kenar payı (km); yama bu bantta kalan küre yüzlerinin altına batırılır
+        """
+        self.clear_terrain_cutout(earth_obj)
+        mesh = earth_obj.data
+        
+        coordinates = np.empty(len(mesh.vertices) * 3)
+        mesh.vertices.foreach_get('co', coordinates)
+        directions = coordinates.reshape(-1, 3)
+        directions = directions / np.maximum(np.linalg.norm(directions, axis=1), 1e-12)[:, None]
+        
+        # Yerel doğu / kuzey düzlemine izdüşüm (km), pencere ile aynı eksenler
+        lat = math.radians(latitude)
+        lon = math.radians(longitude)
+        east = np.array((-math.sin(lon), math.cos(lon), 0.0))
+        north = np.array((-math.sin(lat) * math.cos(lon), -math.sin(lat) * math.sin(lon), math.cos(lat)))
+        up = np.array((math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat)))
+        radius_km = self.earth_radius * 1000.0
+        east_km = directions @ east * radius_km
+        north_km = directions @ north * radius_km
+        inside_window = (directions @ up > 0.0) & (np.maximum(np.abs(east_km), np.abs(north_km)) < half_size_km)
+        
+        edges = np.empty(len(mesh.edges) * 2, dtype=np.int64)
+        mesh.edges.foreach_get('vertices', edges)
+        edges = edges.reshape(-1, 2)
+        local_edges = edges[inside_window[edges].all(axis=1)]
+        if len(local_edges) == 0:
+            return 0.0
+        margin_km = 1.5 * np.linalg.norm(
+            coordinates.reshape(-1, 3)[local_edges[:, 0]] - coordinates.reshape(-1, 3)[local_edges[:, 1]], axis=1
+        ).max() * 1000.0
+        
+        masked = np.nonzero(
+            inside_window & (np.maximum(np.abs(east_km), np.abs(north_km)) < half_size_km - margin_km)
+        )[0]
+        if len(masked) == 0:
+            return 0.0
+        
+        group = earth_obj.vertex_groups.new(name="Terrain_Cutout")
+        group.add(masked.tolist(), 1.0, 'REPLACE')
+        modifier = earth_obj.modifiers.new(name="Terrain_Cutout", type='MASK')
+        modifier.vertex_group = group.name
+        modifier.invert_vertex_group = True
+        earth_obj["terrain_cutout_margin_km"] = float(margin_km)
+        
+        print(f"Earth cut under terrain patch: {len(masked)} vertices masked, {margin_km:.1f} km margin")
+        return float(margin_km)
+    
+    def clear_terrain_cutout(self, earth_obj):
+        """
+        Önceki arazi yamasının Dünya maskesini kaldırır
+        """
+        modifier = earth_obj.modifiers.get("Terrain_Cutout")
+        if modifier is not None:
+            earth_obj.modifiers.remove(modifier)
+        group = earth_obj.vertex_groups.get("Terrain_Cutout")
+        if group is not None:
+            earth_obj.vertex_groups.remove(group)
+        if "terrain_cutout_margin_km" in earth_obj:
+            del earth_obj["terrain_cutout_margin_km"]
+    
+    def clear_crater_displacement(self, earth_obj):
+        """
+        Önceki çarpmanın Dünya objesine eklediği displacement modifier'ını, animasyonunu ve arazi maskesini kaldırır
+        (Dünya korunup sadece çarpma yeniden kurulurken)
+        """
+        self.clear_terrain_cutout(earth_obj)
+        modifier = earth_obj.modifiers.get("Crater_Displacement")
+        if modifier is None:
+            return
+
+        action = earth_obj.animation_data.action if earth_obj.animation_data else None
+        if action is not None:
+            for fcurve in list(action.fcurves):
+                if fcurve.data_path.startswith('modifiers["Crater_Displacement"]'):
+                    action.fcurves.remove(fcurve)
+
+        texture = modifier.texture
+        earth_obj.modifiers.remove(modifier)
+        if texture is not None and texture.users == 0:
+            bpy.data.textures.remove(texture)
+
+    def _create_crater_rim_particles(self, impact_pos, crater_radius, timeline):
         """
         Krater kenarı için yükselen toprak parçacıkları
         """
         # Particle system
-        bpy.ops.mesh.primitive_ico_sphere_add(
-            radius=0.01,
-            location=impact_pos
+        emitter = scene_builder.mesh_object(
+            "Crater_Rim_Emitter",
+            scene_builder.primitive_mesh('ico_sphere'),
+            location=impact_pos,
+            scale=0.01
         )
         
-        emitter = bpy.context.active_object
-        emitter.name = "Crater_Rim_Emitter"
-        
         # Particle system ekle
         particle_sys = emitter.modifiers.new(name="Crater_Rim_Particles", type='PARTICLE_SYSTEM')
         psettings = particle_sys.particle_system.settings
         
         # Particle ayarları
         psettings.count = 500
-        psettings.frame_start = 155
-        psettings.frame_end = 180
+        psettings.frame_start = timeline['rim_start']
+        psettings.frame_end = timeline['rim_end']
         psettings.emit_from = 'FACE'
         psettings.distribution = 'RAND'
         
@@ -284,96 +703,91 @@ class ImpactSimulation:
         psettings.factor_random = 0.5
         
         # Life settings
-        psettings.lifetime = 100
+        psettings.lifetime = timeline['simulation_end'] - timeline['rim_start']
         psettings.lifetime_random = 0.3
         
         return emitter
     
-    def _create_shockwave_animation(self, impact_pos, impact_params):
+    def _create_shockwave_animation(self, impact_pos, impact_params, timeline):
         """
         Şok dalgası animasyonu
         """
         # Shockwave ring
-        bpy.ops.mesh.primitive_uv_sphere_add(
-            radius=0.1,
-            location=impact_pos
+        base_radius = 0.1
+        shockwave = scene_builder.mesh_object(
+            "Shockwave",
+            scene_builder.primitive_mesh('uv_sphere'),
+            location=impact_pos,
+            scale=base_radius
         )
         
-        shockwave = bpy.context.active_object
-        shockwave.name = "Shockwave"
-        
-        # Material
-        shock_mat = bpy.data.materials.new(name="Shockwave_Material")
-        shock_mat.use_nodes = True
-        shock_mat.blend_method = 'BLEND'
-        
-        nodes = shock_mat.node_tree.nodes
-        links = shock_mat.node_tree.links
-        nodes.clear()
-        
-        # Output
-        output = nodes.new('ShaderNodeOutputMaterial')
-        output.location = (400, 0)
-        
-        # Emission shader
-        emission = nodes.new('ShaderNodeEmission')
-        emission.location = (0, 0)
-        emission.inputs['Color'].default_value = (1.0, 0.8, 0.3, 1.0)  # Explosion color
-        emission.inputs['Strength'].default_value = 10.0
-        
-        # Fresnel for ring effect
-        fresnel = nodes.new('ShaderNodeFresnel')
-        fresnel.location = (-200, 0)
-        fresnel.inputs['IOR'].default_value = 5.0
-        
-        links.new(fresnel.outputs['Fac'], emission.inputs['Strength'])
-        links.new(emission.outputs['Emission'], output.inputs['Surface'])
-        
-        shockwave.data.materials.append(shock_mat)
+        # Material: Fresnel ring, güç obje attribute'undan (tüm şok dalgaları aynı materyali paylaşır)
+        shock_mat = material_library.get_material("Shockwave_Material", {
+            'nodes': {
+                'output': {'type': 'ShaderNodeOutputMaterial', 'location': (400, 0)},
+                'emission': {
+                    'type': 'ShaderNodeEmission',
+                    'location': (200, 0),
+                    'inputs': {'Color': (1.0, 0.8, 0.3, 1.0)},  # Explosion color
+                },
+                'fresnel': {'type': 'ShaderNodeFresnel', 'location': (-200, 0), 'inputs': {'IOR': 5.0}},
+                'strength': object_attribute_node('impactsim_emission_strength', (-200, -200)),
+                'multiply': {
+                    'type': 'ShaderNodeMath',
+                    'location': (0, 0),
+                    'properties': {'operation': 'MULTIPLY'},
+                },
+            },
+            'links': [
+                ('fresnel', 'Fac', 'multiply', 0),
+                ('strength', 'Fac', 'multiply', 1),
+                ('multiply', 'Value', 'emission', 'Strength'),
+                ('emission', 'Emission', 'output', 'Surface'),
+            ],
+        }, settings={'blend_method': 'BLEND'})
+        
+        material_library.assign(shockwave, shock_mat)
         
         # Animasyon
-        max_radius = impact_params['crater_radius'] * 10  # Shockwave extends beyond crater
+        max_radius = impact_params['effect_radius'] * 10  # Shockwave extends beyond crater
         
         # Start small
-        shockwave.scale = (0.01, 0.01, 0.01)
-        shockwave.keyframe_insert(data_path="scale", frame=160)
+        shockwave.scale = (base_radius * 0.01, base_radius * 0.01, base_radius * 0.01)
+        shockwave.keyframe_insert(data_path="scale", frame=timeline['shockwave_start'])
         
         # Expand rapidly
-        shockwave.scale = (max_radius, max_radius, max_radius * 0.1)  # Flattened sphere
-        shockwave.keyframe_insert(data_path="scale", frame=200)
+        expanded = base_radius * max_radius
+        shockwave.scale = (expanded, expanded, expanded * 0.1)  # Flattened sphere
+        shockwave.keyframe_insert(data_path="scale", frame=timeline['shockwave_peak'])
         
         # Alpha fade out
-        emission.inputs['Strength'].default_value = 10.0
-        emission.keyframe_insert(data_path='inputs[1].default_value', frame=160)
-        
-        emission.inputs['Strength'].default_value = 0.0
-        emission.keyframe_insert(data_path='inputs[1].default_value', frame=220)
+        set_object_attribute(shockwave, 'impactsim_emission_strength', 10.0, frame=timeline['shockwave_start'])
+        set_object_attribute(shockwave, 'impactsim_emission_strength', 0.0, frame=timeline['shockwave_end'])
         
         return shockwave
     
-    def _create_debris_system(self, impact_pos, impact_params):
+    def _create_debris_system(self, impact_pos, impact_params, timeline):
         """
         Debris ve ejecta sistemi
         """
         debris_objects = []
         
         # Ana debris emitter
-        bpy.ops.mesh.primitive_ico_sphere_add(
-            radius=0.01,
-            location=impact_pos
+        main_emitter = scene_builder.mesh_object(
+            "Main_Debris_Emitter",
+            scene_builder.primitive_mesh('ico_sphere'),
+            location=impact_pos,
+            scale=0.01
         )
         
-        main_emitter = bpy.context.active_object
-        main_emitter.name = "Main_Debris_Emitter"
-        
         # Particle system
         particle_sys = main_emitter.modifiers.new(name="Debris_Particles", type='PARTICLE_SYSTEM')
         psettings = particle_sys.particle_system.settings
         
         # Debris ayarları
         psettings.count = 1000
-        psettings.frame_start = 120  # Impact anında
-        psettings.frame_end = 140
+        psettings.frame_start = timeline['debris_start']  # Impact anında
+        psettings.frame_end = timeline['debris_end']
         psettings.emit_from = 'FACE'
         
         # Physics
@@ -383,17 +797,19 @@ class ImpactSimulation:
         psettings.object_align_factor = (0, 0, 1)  # Mostly upward
         
         # Life
-        psettings.lifetime = 200
+        psettings.lifetime = timeline['simulation_end'] - timeline['debris_start']
         psettings.lifetime_random = 0.5
         
         # Render as objects
         psettings.render_type = 'OBJECT'
         
         # Debris chunk mesh
-        bpy.ops.mesh.primitive_cube_add(radius=0.02)
-        debris_mesh = bpy.context.active_object
-        debris_mesh.name = "Debris_Chunk"
-        debris_mesh.location = (100, 100, 100)  # Hide it
+        debris_mesh = scene_builder.mesh_object(
+            "Debris_Chunk",
+            scene_builder.primitive_mesh('cube'),
+            location=(100, 100, 100),  # Hide it
+            scale=0.02
+        )
         
         psettings.instance_object = debris_mesh
         psettings.use_rotation_instance = True
@@ -402,30 +818,29 @@ class ImpactSimulation:
         debris_objects.append(debris_mesh)
         
         # Ejecta plume (high-speed particles)
-        self._create_ejecta_plume(impact_pos, impact_params, debris_objects)
+        self._create_ejecta_plume(impact_pos, impact_params, debris_objects, timeline)
         
         return debris_objects
     
-    def _create_ejecta_plume(self, impact_pos, impact_params, debris_objects):
+    def _create_ejecta_plume(self, impact_pos, impact_params, debris_objects, timeline):
         """
         Yüksek hızlı ejecta plume
         """
-        bpy.ops.mesh.primitive_ico_sphere_add(
-            radius=0.005,
-            location=impact_pos
+        ejecta_emitter = scene_builder.mesh_object(
+            "Ejecta_Emitter",
+            scene_builder.primitive_mesh('ico_sphere'),
+            location=impact_pos,
+            scale=0.005
         )
         
-        ejecta_emitter = bpy.context.active_object
-        ejecta_emitter.name = "Ejecta_Emitter"
-        
         # Particle system
         particle_sys = ejecta_emitter.modifiers.new(name="Ejecta_Particles", type='PARTICLE_SYSTEM')
         psettings = particle_sys.particle_system.settings
         
         # High-velocity particles
         psettings.count = 2000
-        psettings.frame_start = 118
-        psettings.frame_end = 125
+        psettings.frame_start = timeline['ejecta_start']
+        psettings.frame_end = timeline['ejecta_end']
         
         # Physics
         psettings.physics_type = 'NEWTON'
@@ -433,7 +848,7 @@ class ImpactSimulation:
         psettings.factor_random = 0.9
         
         # Life
-        psettings.lifetime = 150
+        psettings.lifetime = timeline['simulation_end'] - timeline['ejecta_start']
         
         # Size variation
         psettings.particle_size = 0.001
@@ -441,65 +856,57 @@ class ImpactSimulation:
         
         debris_objects.append(ejecta_emitter)
     
-    def _create_atmosphere_effects(self, impact_pos, impact_params):
+    def _create_atmosphere_effects(self, impact_pos, impact_params, timeline):
         """
         Atmosfer efektleri (fireball, plasma plume)
         """
         atmosphere_fx = []
         
         # Fireball
-        bpy.ops.mesh.primitive_uv_sphere_add(
-            radius=impact_params['crater_radius'] * 2,
-            location=impact_pos
+        base_radius = impact_params['effect_radius'] * 2
+        fireball = scene_builder.mesh_object(
+            "Impact_Fireball",
+            scene_builder.primitive_mesh('uv_sphere'),
+            location=impact_pos,
+            scale=base_radius
         )
         
-        fireball = bpy.context.active_object
-        fireball.name = "Impact_Fireball"
-        
-        # Fireball material
-        fireball_mat = bpy.data.materials.new(name="Fireball_Material")
-        fireball_mat.use_nodes = True
-        
-        nodes = fireball_mat.node_tree.nodes
-        nodes.clear()
-        
-        # Output
-        output = nodes.new('ShaderNodeOutputMaterial')
-        output.location = (400, 0)
-        
-        # Volume shader
-        volume = nodes.new('ShaderNodeVolumeScatter')
-        volume.location = (0, 0)
-        volume.inputs['Color'].default_value = (1.0, 0.3, 0.1, 1.0)  # Fire color
-        volume.inputs['Density'].default_value = 0.5
-        
-        # Emission for glow
-        emission = nodes.new('ShaderNodeEmission')
-        emission.location = (0, 200)
-        emission.inputs['Color'].default_value = (1.0, 0.5, 0.0, 1.0)
-        emission.inputs['Strength'].default_value = 20.0
-        
-        nodes.new('ShaderNodeOutputMaterial').location = (400, 0)
-        
-        fireball_mat.node_tree.links.new(emission.outputs['Emission'], output.inputs['Surface'])
-        fireball_mat.node_tree.links.new(volume.outputs['Volume'], output.inputs['Volume'])
-        
-        fireball.data.materials.append(fireball_mat)
+        # Fireball material: volume scatter + glow, glow gücü obje attribute'undan
+        fireball_mat = material_library.get_material("Fireball_Material", {
+            'nodes': {
+                'output': {'type': 'ShaderNodeOutputMaterial', 'location': (400, 0)},
+                'volume': {
+                    'type': 'ShaderNodeVolumeScatter',
+                    'location': (0, 0),
+                    'inputs': {'Color': (1.0, 0.3, 0.1, 1.0), 'Density': 0.5},  # Fire color
+                },
+                'emission': {
+                    'type': 'ShaderNodeEmission',
+                    'location': (0, 200),
+                    'inputs': {'Color': (1.0, 0.5, 0.0, 1.0)},
+                },
+                'strength': object_attribute_node('impactsim_emission_strength', (-200, 200)),
+            },
+            'links': [
+                ('strength', 'Fac', 'emission', 'Strength'),
+                ('emission', 'Emission', 'output', 'Surface'),
+                ('volume', 'Volume', 'output', 'Volume'),
+            ],
+        })
+        
+        material_library.assign(fireball, fireball_mat)
         
         # Fireball expansion animation
-        fireball.scale = (0.01, 0.01, 0.01)
-        fireball.keyframe_insert(data_path="scale", frame=120)
+        fireball.scale = (base_radius * 0.01, base_radius * 0.01, base_radius * 0.01)
+        fireball.keyframe_insert(data_path="scale", frame=timeline['impact_moment'])
         
-        max_scale = impact_params['crater_radius'] * 5
+        max_scale = base_radius * impact_params['effect_radius'] * 5
         fireball.scale = (max_scale, max_scale, max_scale)
-        fireball.keyframe_insert(data_path="scale", frame=180)
+        fireball.keyframe_insert(data_path="scale", frame=timeline['fireball_peak'])
         
         # Fade out
-        emission.inputs['Strength'].default_value = 20.0
-        emission.keyframe_insert(data_path='inputs[1].default_value', frame=120)
-        
-        emission.inputs['Strength'].default_value = 0.0
-        emission.keyframe_insert(data_path='inputs[1].default_value', frame=250)
+        set_object_attribute(fireball, 'impactsim_emission_strength', 20.0, frame=timeline['impact_moment'])
+        set_object_attribute(fireball, 'impactsim_emission_strength', 0.0, frame=timeline['fireball_end'])
         
         atmosphere_fx.append(fireball)
         
@@ -0,0 +1,172 @@
+import math
+
+class ImpactTimelinePlanner:
+    """
+    Impact fiziğinden faz sürelerini türetir ve frame bütçesine eşler
+    Yaklaşma, kazı (excavation), fireball ve şok dalgası fazları ayrı zaman ölçeği alır
+    """
+
+    def __init__(self, fps=24):
+        self.fps = fps
+        self.gravity = 9.81  # m/s^2
+        self.atmosphere_thickness_m = 100000.0  # Karman hattı
+        self.sound_speed_ms = 343.0
+
+        # Faz başına frame sınırları (min, max) ve doygunluk süresi (saniye)
+        # Süre logaritmik olarak eşlenir: kısa fazlar yavaş çekim, uzun fazlar hızlandırılır
+        self.phase_limits = {
+            'approach': (24, 96, 60.0),
+            'excavation': (8, 72, 300.0),
+            'fireball': (8, 96, 600.0),
+            'shockwave': (12, 120, 3600.0),
+        }
+        self.tail_frames = 12
+        self.min_phase_frames = 4
+
+    def physical_durations(self, impact_params):
+        """
+        Impact parametrelerinden fazların fiziksel sürelerini (saniye) hesaplar
+        """
+        velocity_ms = max(impact_params['velocity_ms'], 1.0)
+        angle_rad = math.radians(max(impact_params.get('impact_angle', 45.0), 5.0))
+        energy_kt = max(impact_params['tnt_equivalent'] / 1000.0, 1e-6)
+
+        # Atmosferden geçiş süresi
+        approach_s = self.atmosphere_thickness_m / math.sin(angle_rad) / velocity_ms
+
+        # Geçici krater oluşum süresi, T ~ 0.8 * sqrt(D_tc / g) (Melosh 1989)
+        transient_diameter_m = impact_params.get('crater_diameter_km', 0.0) * 1000.0 / 1.25
+        excavation_s = 0.8 * math.sqrt(transient_diameter_m / self.gravity) if transient_diameter_m > 0 else 0.0
+
+        # Termal puls süresi, ikinci maksimuma kadar geçen sürenin ~10 katı (Glasstone & Dolan)
+        fireball_s = 10.0 * 0.0417 * energy_kt ** 0.44
+
+        # Hava şok dalgasının 1 psi yarıçapına ulaşma süresi
+        shock_radius_m = self.overpressure_radius_km(energy_kt, 1.0) * 1000.0
+        shockwave_s = shock_radius_m / self.sound_speed_ms
+
+        return {
+            'approach': approach_s,
+            'excavation': excavation_s,
+            'fireball': fireball_s,
+            'shockwave': shockwave_s,
+        }
+
+    def overpressure_radius_km(self, energy_kt, overpressure_psi):
+        """
+        Yüzey patlaması için aşırı basınç yarıçapı (kt^(1/3) ölçekleme)
+        """
+        # 1 kt referans yarıçapları (km)
+        reference_radii = {20.0: 0.28, 5.0: 0.60, 1.0: 1.60}
+        radius_1kt = reference_radii.get(overpressure_psi, 1.60)
+        return radius_1kt * energy_kt ** (1.0 / 3.0)
+
+    def plan(self, impact_params, frame_budget=None, frame_start=1):
+        """
+        Tüm efekt keyframe'lerinin okunduğu tek timeline planını oluşturur
+        """
+        durations = self.physical_durations(impact_params)
+
+        # Faz başına istenen frame sayısı
+        frames = {}
+        for phase, duration_s in durations.items():
+            frames[phase] = self._frames_for_duration(phase, duration_s)
+
+        # Bütçeye sığdır (fireball ve kazı çarpma anında paralel başlar)
+        tail_frames = self.tail_frames
+        if frame_budget and self._frame_count(frames, tail_frames) > frame_budget:
+            frames, tail_frames = self._fit_budget(frames, frame_budget)
+
+        approach_start = frame_start
+        impact_moment = approach_start + frames['approach']
+        excavation = frames['excavation']
+        fireball = frames['fireball']
+        shockwave = frames['shockwave']
+
+        crater_formation = impact_moment + excavation
+        shockwave_start = impact_moment + max(1, fireball // 6)
+        shockwave_end = shockwave_start + shockwave
+        fireball_end = impact_moment + fireball
+
+        timeline = {
+            'fps': self.fps,
+            'approach_start': approach_start,
+            'impact_moment': impact_moment,
+            'crater_formation': crater_formation,
+            'rim_start': crater_formation - max(1, excavation // 4),
+            'rim_end': crater_formation + max(1, excavation // 2),
+            'ejecta_start': max(approach_start, impact_moment - 2),
+            'ejecta_end': impact_moment + max(1, excavation // 4),
+            'debris_start': impact_moment,
+            'debris_end': impact_moment + max(1, excavation * 2 // 3),
+            'debris_peak': crater_formation + max(1, excavation // 2),
+            'fireball_peak': impact_moment + max(1, fireball * 2 // 5),
+            'fireball_end': fireball_end,
+            'shockwave_start': shockwave_start,
+            'shockwave_peak': shockwave_start + max(1, shockwave * 2 // 3),
+            'shockwave_end': shockwave_end,
+        }
+        timeline['simulation_end'] = max(
+            crater_formation, timeline['rim_end'], fireball_end, shockwave_end, timeline['debris_peak']
+        ) + tail_frames
+
+        # Faz özeti: fiziksel süre ve zaman ölçeği (simülasyon saniyesi / video saniyesi)
+        phase_ranges = {
+            'approach': (approach_start, impact_moment),
+            'excavation': (impact_moment, crater_formation),
+            'fireball': (impact_moment, fireball_end),
+            'shockwave': (shockwave_start, shockwave_end),
+        }
+        timeline['phases'] = {}
+        for phase, (start, end) in phase_ranges.items():
+            video_seconds = (end - start) / float(self.fps)
+            timeline['phases'][phase] = {
+                'start': start,
+                'end': end,
+                'duration_s': durations[phase],
+                'time_scale': durations[phase] / video_seconds if video_seconds > 0 else 0.0,
+            }
+
+        return timeline
+
+    def _frames_for_duration(self, phase, duration_s):
+        """
+        Fiziksel süreyi logaritmik ölçekle faz frame sayısına çevirir
+        """
+        min_frames, max_frames, saturation_s = self.phase_limits[phase]
+        if duration_s <= 0:
+            return self.min_phase_frames
+
+        weight = math.log1p(duration_s) / math.log1p(saturation_s)
+        weight = min(max(weight, 0.0), 1.0)
+        return int(round(min_frames + (max_frames - min_frames) * weight))
+
+    def _fit_budget(self, requested, frame_budget):
+        """
+        Faz frame'lerini (taban dahil) bütçeye sığacak şekilde küçültür
+        Taban ve kuyruk sadece bütçe hepsine yetmiyorsa daralır
+        """
+        tail_frames = min(self.tail_frames, frame_budget // 4)
+        available = frame_budget - tail_frames
+        floor = max(1, min(self.min_phase_frames, available // (2 * len(requested))))
+
+        # Tabana çekilen fazlar kalan bütçeyi daraltır: ölçek sığana kadar yeniden hesaplanır
+        scale = (available - 1) / float(self._frame_count(requested, 0) - 1)
+        while True:
+            frames = {phase: max(floor, int(count * scale)) for phase, count in requested.items()}
+            if self._frame_count(frames, tail_frames) <= frame_budget or all(f == floor for f in frames.values()):
+                return frames, tail_frames
+            scale *= 0.9
+
+    def _frame_count(self, frames, tail_frames):
+        """
+        Timeline'ın kapladığı frame sayısı (approach_start ve simulation_end dahil)
+        """
+        return frames['approach'] + self._post_impact_frames(frames) + tail_frames + 1
+
+    def _post_impact_frames(self, frames):
+        """
+        Çarpma sonrası en uzun faz zincirinin frame sayısı
+        """
+        shock_chain = max(1, frames['fireball'] // 6) + frames['shockwave']
+        return max(frames['excavation'] + max(1, frames['excavation'] // 2), frames['fireball'], shock_chain)
@@ -0,0 +1,522 @@
+import os
+import sys
+import json
+import time
+import heapq
+import shutil
+import signal
+import hashlib
+import subprocess
+
+from progress_channel import ProgressChannel, FINAL_STATUSES
+
+SPOOL_ROOT = "blender_integration/spool"
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'complete_impact_simulation.py')
+
+# Küçük sayı önce çalışır: etkileşimli önizlemeler final render'ların önüne geçer
+PRIORITIES = {'preview': 0, 'normal': 5, 'render': 10}
+
+# Aynı sahneyi üreten config'lerde değişen ama sonucu etkilemeyen alanlar
+VOLATILE_CONFIG_KEYS = ('timestamp', 'output_id')
+
+HEARTBEAT_TIMEOUT_S = 5.0
+
+class JobScheduler:
+    """
+    Blender worker havuzunun önündeki yerel iş zamanlayıcı
+    İşler spool/submit altına bırakılır, öncelik kuyruğundan boş worker'lara dağıtılır;
+    havuz boyutu çekirdek sayısı ve boş RAM ile sınırlıdır, patlamalı yükte Blender sayısı artmaz
+    Aynı config'li işler tek kez çalışır (kopyalar sonucu paylaşır), spool/cancel/<id> ile iptal edilir
+    Kuyruktaki işlerin sırası durum dosyalarına 'queued' olarak yazılır
+    Blender gerektirmez, sistem Python'u ile çalışır
+    """
+
+    def __init__(self, root=SPOOL_ROOT, blender='blender', pool_size=None, memory_per_worker_gb=2.5,
+                 threads_per_worker=2, worker_idle_timeout=300.0, poll_interval=0.05, heartbeat_interval=1.0):
+        self.root = root
+        self.blender = blender
+        self.pool_size = pool_size or default_pool_size(memory_per_worker_gb, threads_per_worker)
+        self.worker_idle_timeout = worker_idle_timeout
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.submit_dir = os.path.join(root, 'submit')
+        self.cancel_dir = os.path.join(root, 'cancel')
+        self.workers_dir = os.path.join(root, 'workers')
+        self.heartbeat_path = os.path.join(root, 'scheduler.json')
+        self.stop_path = os.path.join(root, 'stop_scheduler')
+
+        self._queue = []        # (öncelik, sıra, simulation_id) heap'i, geçersiz girdiler pop'ta atlanır
+        self._queued = {}       # simulation_id -> iş
+        self._keys = {}         # config anahtarı -> kuyruktaki / çalışan asıl iş
+        self._duplicates = {}   # asıl simulation_id -> aynı config'li kopyalar
+        self._sequence = 0
+        self._slots = [_WorkerSlot(i, os.path.join(self.workers_dir, f"{os.getpid()}-{i}"))
+                       for i in range(self.pool_size)]
+        self._queue_changed = False
+        self._published = {}    # simulation_id -> durum dosyasına son yazılan (sıra, öncelik)
+        self._last_heartbeat = 0.0
+        self._stop_requested = False
+
+    def run(self):
+        """
+        Durdurulana kadar (stop_scheduler dosyası, SIGTERM / SIGINT) gönderilen işleri dağıtır
+        """
+        for directory in (self.submit_dir, self.cancel_dir, self.workers_dir):
+            os.makedirs(directory, exist_ok=True)
+
+        if self._other_scheduler_alive():
+            print(f"Another scheduler is already serving {self.root}, exiting")
+            return
+
+        if os.path.exists(self.stop_path):
+            os.remove(self.stop_path)
+        self._remove_stale_worker_dirs()
+
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        print(f"Job scheduler ready (pid {os.getpid()}), pool of {self.pool_size} Blender workers")
+
+        try:
+            while not self._stop_requested and not os.path.exists(self.stop_path):
+                self._collect_submissions()
+                self._collect_cancellations()
+                self._reap_workers()
+                self._dispatch()
+
+                if self._queue_changed:
+                    self._publish_queue_positions()
+                    self._queue_changed = False
+                self._heartbeat()
+
+                time.sleep(self.poll_interval)
+        finally:
+            self._shutdown()
+
+    def _collect_submissions(self):
+        """
+        submit/<id>.json dosyalarını kuyruğa alır; aynı config çalışıyor / bekliyorsa kopya olarak bağlar
+        """
+        for name in sorted(os.listdir(self.submit_dir)):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.submit_dir, name)
+
+            try:
+                with open(path, 'r') as f:
+                    job = json.load(f)
+                simulation_id = job.get('simulation_id') or os.path.splitext(name)[0]
+                config_data = job.get('config')
+                if config_data is None:
+                    with open(job['config_path'], 'r') as f:
+                        config_data = json.load(f)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Rejected submission {name}: {e}")
+                write_status_file(os.path.splitext(name)[0], 'failed', {'error': f"Invalid job: {e}"})
+                os.remove(path)
+                continue
+            os.remove(path)
+
+            priority = job.get('priority', 'normal')
+            job = {
+                'simulation_id': simulation_id,
+                'config': config_data,
+                'priority': PRIORITIES.get(priority, PRIORITIES['normal']) if isinstance(priority, str) else int(priority),
+                'key': config_key(config_data),
+                'submitted_at': time.time()
+            }
+
+            # Aynı id yeniden gönderildiyse önceki çalıştırmanın olayları silinir
+            ProgressChannel(simulation_id).restart()
+
+            primary = self._keys.get(job['key'])
+            if primary is not None:
+                self._attach_duplicate(primary, job)
+            else:
+                self._enqueue(job)
+
+    def _attach_duplicate(self, primary_id, job):
+        """
+        Aynı config'li işi asıl işin sonucunu bekleyen kopya yapar
+        Kopyanın önceliği yüksekse kuyruktaki asıl iş öne alınır
+        """
+        self._duplicates.setdefault(primary_id, []).append(job)
+        print(f"Job {job['simulation_id']} duplicates {primary_id}")
+
+        primary = self._queued.get(primary_id)
+        if primary is not None and job['priority'] < primary['priority']:
+            primary['priority'] = job['priority']
+            self._push(primary)
+        self._queue_changed = True
+
+        slot = self._slot_running(primary_id)
+        if slot is not None:
+            write_status_file(job['simulation_id'], 'running', {'duplicate_of': primary_id})
+
+    def _enqueue(self, job):
+        self._queued[job['simulation_id']] = job
+        self._keys[job['key']] = job['simulation_id']
+        self._push(job)
+        self._queue_changed = True
+
+    def _push(self, job):
+        self._sequence += 1
+        heapq.heappush(self._queue, (job['priority'], self._sequence, job['simulation_id']))
+
+    def _pop(self):
+        """
+        En öncelikli geçerli işi kuyruktan çıkarır (iptal edilmiş / önceliği değişmiş eski girdiler atlanır)
+        """
+        while self._queue:
+            priority, _, simulation_id = heapq.heappop(self._queue)
+            job = self._queued.get(simulation_id)
+            if job is not None and job['priority'] == priority:
+                del self._queued[simulation_id]
+                self._queue_changed = True
+                return job
+        return None
+
+    def _ordered_queue(self):
+        """
+        Kuyruktaki işler çalışma sırasıyla
+        """
+        entries = sorted(entry for entry in self._queue
+                         if entry[2] in self._queued and self._queued[entry[2]]['priority'] == entry[0])
+        return [self._queued[simulation_id] for _, _, simulation_id in entries]
+
+    def _collect_cancellations(self):
+        """
+        cancel/<id> dosyalarını uygular: kuyruktaki iş çıkarılır, çalışan işin worker'ı sonlandırılır
+        Asıl iş iptal edilirse ilk kopyası onun yerine geçer
+        """
+        for simulation_id in sorted(os.listdir(self.cancel_dir)):
+            os.remove(os.path.join(self.cancel_dir, simulation_id))
+
+            if self._cancel_duplicate(simulation_id):
+                pass
+            elif simulation_id in self._queued:
+                job = self._queued.pop(simulation_id)
+                del self._keys[job['key']]
+                self._promote_duplicate(job)
+                self._queue_changed = True
+            else:
+                slot = self._slot_running(simulation_id)
+                if slot is None:
+                    continue
+                job = slot.job
+                slot.kill()
+                del self._keys[job['key']]
+                self._promote_duplicate(job)
+
+            print(f"Cancelled job {simulation_id}")
+            write_status_file(simulation_id, 'cancelled')
+
+    def _cancel_duplicate(self, simulation_id):
+        for primary_id, duplicates in self._duplicates.items():
+            for job in duplicates:
+                if job['simulation_id'] == simulation_id:
+                    duplicates.remove(job)
+                    if not duplicates:
+                        del self._duplicates[primary_id]
+                    return True
+        return False
+
+    def _promote_duplicate(self, job):
+        """
+        İptal edilen asıl işin ilk kopyasını (varsa) yeni asıl iş olarak kuyruğa alır
+        """
+        duplicates = self._duplicates.pop(job['simulation_id'], [])
+        if not duplicates:
+            return
+        primary = duplicates.pop(0)
+        primary['priority'] = min(duplicate['priority'] for duplicate in [primary] + duplicates)
+        self._enqueue(primary)
+        if duplicates:
+            self._duplicates[primary['simulation_id']] = duplicates
+
+    def _reap_workers(self):
+        """
+        Biten işleri kapatır, çöken worker'ların işini başarısız sayar
+        """
+        for slot in self._slots:
+            if slot.job is None:
+                if slot.process is not None and slot.process.poll() is not None:
+                    # Boşta kalma süresi dolan worker kendiliğinden kapandı
+                    slot.process = None
+                continue
+
+            simulation_id = slot.job['simulation_id']
+            pending_path = os.path.join(slot.root, 'jobs', f"{simulation_id}.json")
+            active_path = os.path.join(slot.root, 'active', f"{simulation_id}.json")
+
+            if os.path.exists(pending_path) or os.path.exists(active_path):
+                if slot.process is None or slot.process.poll() is None:
+                    continue
+                if os.path.exists(pending_path):
+                    # Worker iş teslim edilirken kapandı, iş bekliyor: yeniden başlat
+                    slot.process = None
+                    self._start_worker(slot)
+                    continue
+                print(f"Worker {slot.index} exited while running {simulation_id}")
+                slot.clear()
+                write_status_file(simulation_id, 'failed', {'error': 'Blender worker exited unexpectedly'})
+
+            self._finish(slot)
+
+    def _finish(self, slot):
+        """
+        Asıl işin durum dosyasını kopyalarına yansıtır ve slotu boşaltır
+        """
+        job = slot.job
+        slot.job = None
+        self._keys.pop(job['key'], None)
+
+        status = read_status_file(job['simulation_id']) or {'status': 'failed', 'data': {}}
+        for duplicate in self._duplicates.pop(job['simulation_id'], []):
+            data = dict(status.get('data') or {})
+            data['duplicate_of'] = job['simulation_id']
+            write_status_file(duplicate['simulation_id'], status['status'], data)
+
+        elapsed = time.time() - job['submitted_at']
+        print(f"Job {job['simulation_id']} {status['status']} ({elapsed:.1f}s since submission)")
+
+    def _dispatch(self):
+        """
+        Boş slotlara kuyruğun başındaki işleri verir, gerekirse worker başlatır
+        """
+        for slot in self._slots:
+            if slot.job is not None or not self._queued:
+                continue
+            job = self._pop()
+            if job is None:
+                return
+
+            slot.job = job
+            jobs_dir = os.path.join(slot.root, 'jobs')
+            os.makedirs(jobs_dir, exist_ok=True)
+            _write_json(os.path.join(jobs_dir, f"{job['simulation_id']}.json"), {
+                'simulation_id': job['simulation_id'],
+                'config': job['config']
+            })
+            for duplicate in self._duplicates.get(job['simulation_id'], []):
+                write_status_file(duplicate['simulation_id'], 'running', {'duplicate_of': job['simulation_id']})
+
+            if slot.process is None or slot.process.poll() is not None:
+                self._start_worker(slot)
+
+    def _start_worker(self, slot):
+        os.makedirs(slot.root, exist_ok=True)
+        args = [
+            self.blender, '--background',
+            '--python', WORKER_SCRIPT,
+            '--',
+            '--worker',
+            '--spool', slot.root,
+            '--idle-timeout', str(self.worker_idle_timeout)
+        ]
+        print(f"Starting Blender worker {slot.index}")
+        log = open(os.path.join(slot.root, 'worker.log'), 'ab')
+        slot.process = subprocess.Popen(args, stdout=log, stderr=subprocess.STDOUT)
+        log.close()
+
+    def _slot_running(self, simulation_id):
+        for slot in self._slots:
+            if slot.job is not None and slot.job['simulation_id'] == simulation_id:
+                return slot
+        return None
+
+    def _publish_queue_positions(self):
+        """
+        Kuyruktaki her iş (ve kopyaları) için sırasını durum dosyasına yazar (1 = sıradaki)
+        Sadece sırası / önceliği değişen işler yazılır: patlamalı gönderimde olay sayısı O(N^2) olmaz
+        """
+        published = {}
+        for position, job in enumerate(self._ordered_queue(), start=1):
+            data = {'queue_position': position, 'priority': job['priority']}
+            entry = (position, job['priority'])
+            for queued in [job] + self._duplicates.get(job['simulation_id'], []):
+                published[queued['simulation_id']] = entry
+                if self._published.get(queued['simulation_id']) == entry:
+                    continue
+                if queued is job:
+                    write_status_file(job['simulation_id'], 'queued', data)
+                else:
+                    write_status_file(queued['simulation_id'], 'queued', dict(data, duplicate_of=job['simulation_id']))
+        self._published = published
+
+    def _heartbeat(self):
+        now = time.time()
+        if now - self._last_heartbeat < self.heartbeat_interval:
+            return
+        self._last_heartbeat = now
+        _write_json(self.heartbeat_path, {
+            'pid': os.getpid(),
+            'heartbeat': now,
+            'pool_size': self.pool_size,
+            'workers_running': sum(1 for slot in self._slots if slot.process is not None),
+            'jobs_running': [slot.job['simulation_id'] for slot in self._slots if slot.job is not None],
+            'jobs_queued': len(self._queued)
+        })
+
+    def _other_scheduler_alive(self):
+        try:
+            with open(self.heartbeat_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return data.get('pid') != os.getpid() and time.time() - data.get('heartbeat', 0) < HEARTBEAT_TIMEOUT_S
+
+    def _remove_stale_worker_dirs(self):
+        """
+        Önceki scheduler'lardan kalan, heartbeat'i eskimiş worker dizinlerini siler
+        """
+        for name in os.listdir(self.workers_dir):
+            path = os.path.join(self.workers_dir, name)
+            try:
+                with open(os.path.join(path, 'worker.json'), 'r') as f:
+                    heartbeat = json.load(f).get('heartbeat', 0)
+            except (OSError, ValueError):
+                heartbeat = 0
+            if time.time() - heartbeat > HEARTBEAT_TIMEOUT_S:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _shutdown(self):
+        """
+        Worker'lara mevcut işlerini bitirip kapanmalarını söyler, kuyruktakileri iptal edilmiş işaretler
+        """
+        for slot in self._slots:
+            if slot.process is not None and slot.process.poll() is None:
+                open(os.path.join(slot.root, 'stop'), 'w').close()
+        for slot in self._slots:
+            if slot.process is not None:
+                slot.process.wait()
+            if slot.job is not None:
+                # Worker kapanmadan önce işi bitirdiyse sonucu kopyalara yansıtılır
+                simulation_id = slot.job['simulation_id']
+                status = read_status_file(simulation_id) or {}
+                if os.path.exists(os.path.join(slot.root, 'jobs', f"{simulation_id}.json")):
+                    write_status_file(simulation_id, 'cancelled', {'error': 'Scheduler stopped'})
+                elif status.get('status') not in FINAL_STATUSES:
+                    write_status_file(simulation_id, 'failed', {'error': 'Blender worker exited unexpectedly'})
+                self._finish(slot)
+            shutil.rmtree(slot.root, ignore_errors=True)
+
+        for job in self._ordered_queue():
+            for queued in [job] + self._duplicates.get(job['simulation_id'], []):
+                write_status_file(queued['simulation_id'], 'cancelled', {'error': 'Scheduler stopped'})
+
+        if os.path.exists(self.heartbeat_path):
+            os.remove(self.heartbeat_path)
+        print("Job scheduler stopped")
+
+    def _request_stop(self, signum, frame):
+        print(f"Scheduler received signal {signum}, stopping")
+        self._stop_requested = True
+
+class _WorkerSlot:
+    """
+    Havuzdaki bir Blender worker'ı: kendi spool dizini, süreci ve üzerindeki iş
+    """
+
+    def __init__(self, index, root):
+        self.index = index
+        self.root = root
+        self.process = None
+        self.job = None
+
+    def kill(self):
+        """
+        Çalışan işi yarıda keser (sahne kurulumu kesilebilir değil, süreç sonlandırılır)
+        """
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+        self.job = None
+        self.clear()
+
+    def clear(self):
+        """
+        Yarım kalan iş ve heartbeat dosyalarını siler: yeni worker işi tekrar almaz ve hemen başlayabilir
+        """
+        for directory in ('jobs', 'active'):
+            path = os.path.join(self.root, directory)
+            if os.path.isdir(path):
+                for name in os.listdir(path):
+                    os.remove(os.path.join(path, name))
+        heartbeat_path = os.path.join(self.root, 'worker.json')
+        if os.path.exists(heartbeat_path):
+            os.remove(heartbeat_path)
+
+def default_pool_size(memory_per_worker_gb=2.5, threads_per_worker=2):
+    """
+    Çekirdek sayısı ve kullanılabilir RAM'e göre eşzamanlı Blender sayısı (en az 1)
+    """
+    by_cores = max(1, (os.cpu_count() or 1) // threads_per_worker)
+    memory = available_memory_bytes()
+    if memory is None:
+        return by_cores
+    by_memory = max(1, int(memory // (memory_per_worker_gb * 1024 ** 3)))
+    return min(by_cores, by_memory)
+
+def available_memory_bytes():
+    """
+    Kullanılabilir RAM (Linux'ta MemAvailable, diğer POSIX sistemlerde toplam fiziksel bellek), bilinmiyorsa None
+    """
+    try:
+        with open('/proc/meminfo', 'r') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+def config_key(config_data):
+    """
+    Sahneyi belirleyen config içeriğinin kararlı hash'i (zaman damgası / çıktı kimliği hariç)
+    """
+    stable = {key: value for key, value in config_data.items() if key not in VOLATILE_CONFIG_KEYS}
+    payload = json.dumps(stable, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def write_status_file(simulation_id, status, data=None):
+    """
+    Worker'ın yazdığıyla aynı biçimde durum dosyası ve ilerleme olayı (atomik)
+    """
+    ProgressChannel(simulation_id).status(status, data or {})
+
+def read_status_file(simulation_id):
+    try:
+        with open(f"blender_integration/output/status_{simulation_id}.json", 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(temp_path, path)
+
+def main():
+    """
+    python job_scheduler.py [--blender PATH] [--workers N] [--idle-timeout S]
+    """
+    argv = sys.argv[1:]
+    options = {}
+    for i, arg in enumerate(argv):
+        if arg in ('--blender', '--workers', '--idle-timeout') and i + 1 < len(argv):
+            options[arg] = argv[i + 1]
+
+    JobScheduler(
+        blender=options.get('--blender', 'blender'),
+        pool_size=int(options['--workers']) if '--workers' in options else None,
+        worker_idle_timeout=float(options.get('--idle-timeout', 300.0))
+    ).run()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import bpy
+import math
+from bpy.app.handlers import persistent
+
+LOD_MESHES_PROPERTY = 'impactsim_lod_meshes'
+LOD_SUBDIVISIONS_PROPERTY = 'impactsim_lod_subdivisions'
+LOD_RADIUS_PROPERTY = 'impactsim_lod_radius'
+LOD_LEVEL_PROPERTY = 'impactsim_lod_level'
+
+class LODSwitcher:
+    """
+    Kamera mesafesine göre obje mesh'ini LOD zincirinden seçer
+    Her frame'de aktif sahne kamerasına göre ekrandaki boyut hesaplanır, kenar uzunluğu piksel hedefine en yakın seviye kullanılır
+    """
+
+    def __init__(self):
+        self.target_edge_pixels = 4.0  # Bir üçgen kenarının ekranda kaplaması gereken piksel
+
+    def register(self, obj, meshes, subdivisions, radius):
+        """
+        Objeyi LOD zinciriyle kaydeder (meshes kabadan inceye sıralı)
+        """
+        for mesh in meshes:
+            # Objeye bağlı olmayan seviyeler kaydederken / purge sırasında silinmesin
+            # (obje silinince release_orphaned_levels bırakır)
+            mesh.use_fake_user = True
+            mesh[LOD_LEVEL_PROPERTY] = True
+
+        obj[LOD_MESHES_PROPERTY] = [mesh.name for mesh in meshes]
+        obj[LOD_SUBDIVISIONS_PROPERTY] = list(subdivisions)
+        obj[LOD_RADIUS_PROPERTY] = radius
+
+        register_lod_handler()
+        self.update_object(bpy.context.scene, obj)
+
+    def select_level(self, subdivisions, projected_diameter_px):
+        """
+        Kenar uzunluğu hedef piksele inen en kaba seviyenin indeksi
+        """
+        for index, level in enumerate(subdivisions):
+            # Ico sphere kenar uzunluğu ~ 1.05 R / 2^s
+            edge_px = projected_diameter_px * 0.525 / (2 ** level)
+            if edge_px <= self.target_edge_pixels:
+                return index
+        return len(subdivisions) - 1
+
+    def projected_diameter_px(self, scene, camera, obj, radius):
+        """
+        Objenin kameradaki yaklaşık çapı (piksel)
+        """
+        render = scene.render
+        width_px = render.resolution_x * render.resolution_percentage / 100.0
+        world_radius = radius * max(obj.matrix_world.to_scale())
+
+        if camera.data.type == 'ORTHO':
+            return 2.0 * world_radius / camera.data.ortho_scale * width_px
+
+        distance = (obj.matrix_world.translation - camera.matrix_world.translation).length
+        if distance <= world_radius:
+            return float('inf')
+
+        # Görünen açı / yatay görüş açısı
+        angular_size = 2.0 * math.asin(min(world_radius / distance, 1.0))
+        return angular_size / camera.data.angle * width_px
+
+    def update_object(self, scene, obj):
+        """
+        Tek obje için seviyeyi seçip mesh'i değiştirir
+        """
+        camera = scene.camera
+        if camera is None:
+            return
+
+        names = obj[LOD_MESHES_PROPERTY]
+        projected = self.projected_diameter_px(scene, camera, obj, obj[LOD_RADIUS_PROPERTY])
+        level = self.select_level(list(obj[LOD_SUBDIVISIONS_PROPERTY]), projected)
+
+        mesh = bpy.data.meshes.get(names[level])
+        if mesh is not None and obj.data != mesh:
+            obj.data = mesh
+
+    def release_orphaned_levels(self):
+        """
+        Artık hiçbir objenin LOD zincirinde olmayan seviyelerin fake user'ını kaldırır
+        Böylece purge_orphans kalıcı worker'da silinmiş asteroidlerin zincirlerini de siler
+        """
+        referenced = set()
+        for obj in bpy.data.objects:
+            if LOD_MESHES_PROPERTY in obj:
+                referenced.update(obj[LOD_MESHES_PROPERTY])
+
+        for mesh in bpy.data.meshes:
+            if mesh.get(LOD_LEVEL_PROPERTY) and mesh.name not in referenced:
+                mesh.use_fake_user = False
+
+    def update_scene(self, scene):
+        """
+        Sahnedeki tüm LOD objelerini günceller
+        """
+        for obj in scene.objects:
+            if LOD_MESHES_PROPERTY in obj:
+                self.update_object(scene, obj)
+
+@persistent
+def update_lods(scene, *args):
+    """
+    frame_change_pre handler: frame başına aktif kameraya göre LOD seçer
+    """
+    lod_switcher.update_scene(scene)
+
+def register_lod_handler():
+    """
+    Handler'ı bir kez kaydeder, render sırasında mesh değişimi için arayüz kilitlenir
+    """
+    handlers = bpy.app.handlers.frame_change_pre
+    if not any(getattr(handler, '__name__', '') == update_lods.__name__ for handler in handlers):
+        handlers.append(update_lods)
+    bpy.context.scene.render.use_lock_interface = True
+
+# Tüm script'lerin paylaştığı switcher
+lod_switcher = LODSwitcher()
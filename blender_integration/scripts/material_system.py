@@ -0,0 +1,221 @@
+import bpy
+import hashlib
+import json
+
+# Grafik formatı değiştiğinde artırılır, eski hash'lerle eşleşme olmaz
+MATERIAL_LIBRARY_VERSION = 1
+MATERIAL_HASH_PROPERTY = 'impactsim_material_hash'
+
+class MaterialLibrary:
+    """
+    İçerik adresli materyal kütüphanesi
+    Node grafiği ve parametreleri hash'lenir, aynı içerik için mevcut datablock tekrar kullanılır
+    Obje başına farklılıklar yeni materyal yerine obje attribute'ları ile verilir
+    """
+
+    def __init__(self):
+        self._materials = {}
+
+    def get_material(self, name, graph, settings=None):
+        """
+        Grafik tanımına karşılık gelen materyali döndürür, yoksa oluşturur
+
+        graph = {
+            'nodes': {key: {'type', 'location', 'inputs', 'properties', 'ramp', 'image'}},
+            'links': [(from_key, from_socket, to_key, to_socket), ...]
+        }
+        'image': {'path', 'colorspace'} image texture node'una dosyadan görüntü yükler
+        settings: blend_method gibi materyal seviyesindeki ayarlar ('cycles.displacement_method' gibi noktalı yollar dahil)
+        """
+        settings = settings or {}
+        digest = self.material_hash(graph, settings)
+
+        material = self._lookup(digest)
+        if material is None:
+            material = self._build_material(name, graph, settings)
+            material[MATERIAL_HASH_PROPERTY] = digest
+            self._materials[digest] = material
+
+        return material
+
+    def material_hash(self, graph, settings=None):
+        """
+        Node grafiği ve ayarların kanonik hash'i
+        """
+        spec = {
+            'version': MATERIAL_LIBRARY_VERSION,
+            'graph': self._canonical(graph),
+            'settings': self._canonical(settings or {}),
+        }
+        payload = json.dumps(spec, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def principled_material(self, name, base_color=None, emission=None, emission_strength=None,
+                            roughness=None, metallic=None, settings=None):
+        """
+        Tek Principled BSDF'li basit materyaller için kısayol
+        """
+        inputs = {}
+        if base_color is not None:
+            inputs['Base Color'] = base_color
+        if emission is not None:
+            inputs['Emission'] = emission
+        if emission_strength is not None:
+            inputs['Emission Strength'] = emission_strength
+        if roughness is not None:
+            inputs['Roughness'] = roughness
+        if metallic is not None:
+            inputs['Metallic'] = metallic
+
+        graph = {
+            'nodes': {
+                'output': {'type': 'ShaderNodeOutputMaterial', 'location': (300, 0)},
+                'principled': {'type': 'ShaderNodeBsdfPrincipled', 'location': (0, 0), 'inputs': inputs},
+            },
+            'links': [('principled', 'BSDF', 'output', 'Surface')],
+        }
+        return self.get_material(name, graph, settings)
+
+    def assign(self, obj, material):
+        """
+        Materyali objeye bağlar (aynı slot iki kez eklenmez)
+        Mesh objelerinde slot obje seviyesinde bağlanır: paylaşılan primitive mesh'in (linked duplicate)
+        her kullanıcısı kendi materyalini taşır, mesh'e sadece boş slot eklenir
+        """
+        if obj.type != 'MESH':
+            if material.name not in obj.data.materials:
+                obj.data.materials.append(material)
+            return material
+
+        for slot in obj.material_slots:
+            slot.link = 'OBJECT'
+            if slot.material == material:
+                return material
+
+        free_slots = [slot for slot in obj.material_slots if slot.material is None]
+        if not free_slots:
+            obj.data.materials.append(None)
+            free_slots = [obj.material_slots[-1]]
+            free_slots[0].link = 'OBJECT'
+        free_slots[0].material = material
+        return material
+
+    def _lookup(self, digest):
+        """
+        Hash'e karşılık gelen, hâlâ geçerli materyali bulur
+        """
+        material = self._materials.get(digest)
+        if material is not None:
+            try:
+                material.name
+                return material
+            except ReferenceError:
+                # Sahne sıfırlanırken silinmiş
+                del self._materials[digest]
+
+        # Dosyadan yüklenmiş / append edilmiş materyaller
+        for material in bpy.data.materials:
+            if material.get(MATERIAL_HASH_PROPERTY) == digest:
+                self._materials[digest] = material
+                return material
+
+        return None
+
+    def _build_material(self, name, graph, settings):
+        """
+        Grafik tanımından materyal datablock'u oluşturur
+        """
+        material = bpy.data.materials.new(name=name)
+        material.use_nodes = True
+
+        for attribute, value in settings.items():
+            target = material
+            *path, attribute = attribute.split('.')
+            for part in path:
+                target = getattr(target, part)
+            setattr(target, attribute, value)
+
+        nodes = material.node_tree.nodes
+        links = material.node_tree.links
+        nodes.clear()
+
+        created = {}
+        for key, node_spec in graph['nodes'].items():
+            node = nodes.new(node_spec['type'])
+            node.name = key
+            node.location = node_spec.get('location', (0, 0))
+            if 'label' in node_spec:
+                node.label = node_spec['label']
+
+            for attribute, value in node_spec.get('properties', {}).items():
+                setattr(node, attribute, value)
+
+            for socket, value in node_spec.get('inputs', {}).items():
+                node.inputs[socket].default_value = value
+
+            if 'ramp' in node_spec:
+                self._setup_color_ramp(node.color_ramp, node_spec['ramp'])
+
+            if 'image' in node_spec:
+                node.image = self._load_image(node_spec['image'])
+
+            created[key] = node
+
+        for from_key, from_socket, to_key, to_socket in graph.get('links', []):
+            links.new(created[from_key].outputs[from_socket], created[to_key].inputs[to_socket])
+
+        return material
+
+    def _load_image(self, image_spec):
+        """
+        Görüntüyü dosyadan yükler (aynı dosya tekrar yüklenmez)
+        """
+        image = bpy.data.images.load(image_spec['path'], check_existing=True)
+        if 'colorspace' in image_spec:
+            image.colorspace_settings.name = image_spec['colorspace']
+        return image
+
+    def _setup_color_ramp(self, color_ramp, stops):
+        """
+        ColorRamp elemanlarını (pozisyon, renk) listesine göre ayarlar
+        """
+        elements = color_ramp.elements
+        while len(elements) < len(stops):
+            elements.new(1.0)
+
+        for element, (position, color) in zip(elements, stops):
+            element.position = position
+            element.color = color
+
+    def _canonical(self, value):
+        """
+        Hash için tuple/float farklarını normalize eder
+        """
+        if isinstance(value, dict):
+            return {str(k): self._canonical(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._canonical(v) for v in value]
+        if isinstance(value, float):
+            return round(value, 6)
+        return value
+
+def object_attribute_node(attribute_name, location=(-400, 0)):
+    """
+    Obje custom property'sini okuyan Attribute node tanımı
+    """
+    return {
+        'type': 'ShaderNodeAttribute',
+        'location': location,
+        'properties': {'attribute_type': 'OBJECT', 'attribute_name': attribute_name},
+    }
+
+def set_object_attribute(obj, attribute_name, value, frame=None):
+    """
+    Materyalin okuduğu obje attribute'unu ayarlar, frame verilirse keyframe ekler
+    """
+    obj[attribute_name] = list(value) if isinstance(value, tuple) else value
+    if frame is not None:
+        obj.keyframe_insert(data_path=f'["{attribute_name}"]', frame=frame)
+
+# Tüm script'lerin paylaştığı kütüphane
+material_library = MaterialLibrary()
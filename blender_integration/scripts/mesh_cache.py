@@ -0,0 +1,98 @@
+import os
+import json
+import hashlib
+import tempfile
+import numpy as np
+
+CACHE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cache', 'meshes')
+
+class MeshCache:
+    """
+    Procedurel mesh'ler için diskte vertex/index önbelleği (.npz)
+    Anahtar parametrelerin hash'idir, toplam boyut sınırı aşılınca en eski kullanılan dosyalar silinir (LRU)
+    bpy kullanmaz
+    """
+
+    def __init__(self, root=CACHE_ROOT, max_bytes=512 * 1024 * 1024):
+        self.root = os.path.normpath(root)
+        self.max_bytes = max_bytes
+
+    def key(self, *parts):
+        """
+        Parametrelerden kararlı önbellek anahtarı
+        """
+        payload = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def load(self, key):
+        """
+        Önbellekteki dizileri döndürür, yoksa None
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with np.load(path) as data:
+                arrays = {name: data[name] for name in data.files}
+        except (OSError, ValueError):
+            # Yarım yazılmış / bozuk dosya
+            self._remove(path)
+            return None
+
+        # LRU için son kullanım zamanı
+        os.utime(path, None)
+        return arrays
+
+    def store(self, key, **arrays):
+        """
+        Dizileri atomik olarak yazar (geçici dosya + rename) ve gerekirse eski girdileri siler
+        """
+        os.makedirs(self.root, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            self._remove(temp_path)
+            raise
+
+        self.evict()
+
+    def evict(self):
+        """
+        Toplam boyut sınırın altına inene kadar en eski kullanılan girdileri siler
+        """
+        if not os.path.isdir(self.root):
+            return
+
+        entries = []
+        for filename in os.listdir(self.root):
+            if not filename.endswith('.npz'):
+                continue
+            path = os.path.join(self.root, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def _path(self, key):
+        return os.path.join(self.root, f"{key}.npz")
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+# Tüm script'lerin paylaştığı önbellek
+mesh_cache = MeshCache()
@@ -6,6 +6,10 @@ import json
 import sys
 from mathutils import Vector
 
+from material_system import material_library, object_attribute_node, set_object_attribute
+from scene_builder import scene_builder
+from starfield import starfield
+
 class OrbitalMechanicsVisualizer:
     """
     NASA Keplerian orbital elements ile gerçek asteroid yörünge simülasyonu
@@ -64,8 +68,7 @@ class OrbitalMechanicsVisualizer:
         Solar system sahnesini hazırlar
         """
         # Scene temizle
-        bpy.ops.object.select_all(action='SELECT')
-        bpy.ops.object.delete(use_global=False)
+        scene_builder.clear_scene()
         
         # Space environment
         world = bpy.context.scene.world
@@ -83,51 +86,49 @@ class OrbitalMechanicsVisualizer:
         world.node_tree.links.new(background.outputs['Background'], output.inputs['Surface'])
         
         # Camera setup
-        bpy.ops.object.camera_add(location=(0, -5, 2))
-        camera = bpy.context.active_object
-        camera.name = "Orbital_Camera"
+        camera = scene_builder.camera("Orbital_Camera", location=(0, -5, 2))
         
         # Track empty for camera target
-        bpy.ops.object.empty_add(location=(0, 0, 0))
-        target = bpy.context.active_object
-        target.name = "Camera_Target"
+        target = scene_builder.empty("Camera_Target", location=(0, 0, 0))
         
         # Camera constraint
         constraint = camera.constraints.new('TRACK_TO')
         constraint.target = target
         constraint.track_axis = 'TRACK_NEGATIVE_Z'
         constraint.up_axis = 'UP_Y'
+        
+        # Yıldız arka planı: yörünge düzlemi ekliptik, küre kamerayı izler
+        starfield.create(follow=camera, frame='ecliptic')
     
     def _create_sun(self):
         """
         Güneş objesi oluşturur
         """
-        bpy.ops.mesh.primitive_ico_sphere_add(
-            radius=0.05,  # Scaled sun
-            location=(0, 0, 0)
+        sun = scene_builder.mesh_object(
+            "Sun",
+            scene_builder.primitive_mesh('ico_sphere'),
+            location=(0, 0, 0),
+            scale=0.05  # Scaled sun
         )
         
-        sun = bpy.context.active_object
-        sun.name = "Sun"
-        
         # Sun material
-        sun_mat = bpy.data.materials.new(name="Sun_Material")
-        sun_mat.use_nodes = True
-        
-        nodes = sun_mat.node_tree.nodes
-        principled = nodes['Principled BSDF']
-        principled.inputs['Base Color'].default_value = (1.0, 0.8, 0.3, 1.0)
-        principled.inputs['Emission'].default_value = (1.0, 0.8, 0.2, 1.0)
-        principled.inputs['Emission Strength'].default_value = 10.0
+        sun_mat = material_library.principled_material(
+            "Sun_Material",
+            base_color=(1.0, 0.8, 0.3, 1.0),
+            emission=(1.0, 0.8, 0.2, 1.0),
+            emission_strength=10.0
+        )
         
-        sun.data.materials.append(sun_mat)
+        material_library.assign(sun, sun_mat)
         
         # Sun light
-        bpy.ops.object.light_add(type='POINT', location=(0, 0, 0))
-        sun_light = bpy.context.active_object
-        sun_light.name = "Sun_Light"
-        sun_light.data.energy = 100.0
-        sun_light.data.color = (1.0, 0.9, 0.7)
+        sun_light = scene_builder.light(
+            "Sun_Light",
+            'POINT',
+            location=(0, 0, 0),
+            energy=100.0,
+            color=(1.0, 0.9, 0.7)
+        )
         
         return sun
     
@@ -138,48 +139,35 @@ class OrbitalMechanicsVisualizer:
         # Dünya yörüngesi (1 AU radius)
         earth_orbit_radius = 1.0 * self.au_to_blender
         
-        # Earth orbit path
-        bpy.ops.mesh.primitive_circle_add(
-            radius=earth_orbit_radius,
-            vertices=64,
-            location=(0, 0, 0)
-        )
-        
-        orbit_path = bpy.context.active_object
-        orbit_path.name = "Earth_Orbit_Path"
-        
-        # Convert to curve
-        bpy.ops.object.convert(target='CURVE')
+        # Earth orbit path (doğrudan curve olarak)
+        orbit_path = scene_builder.circle_curve("Earth_Orbit_Path", earth_orbit_radius, vertices=64)
         orbit_path.data.bevel_depth = 0.001
         
         # Orbit material
-        orbit_mat = bpy.data.materials.new(name="Orbit_Path_Material")
-        orbit_mat.use_nodes = True
-        
-        principled = orbit_mat.node_tree.nodes['Principled BSDF']
-        principled.inputs['Base Color'].default_value = (0.3, 0.7, 1.0, 1.0)
-        principled.inputs['Emission'].default_value = (0.3, 0.7, 1.0, 1.0)
-        principled.inputs['Emission Strength'].default_value = 0.5
+        orbit_mat = material_library.principled_material(
+            "Orbit_Path_Material",
+            base_color=(0.3, 0.7, 1.0, 1.0),
+            emission=(0.3, 0.7, 1.0, 1.0),
+            emission_strength=0.5
+        )
         
-        orbit_path.data.materials.append(orbit_mat)
+        material_library.assign(orbit_path, orbit_mat)
         
         # Dünya objesi
-        bpy.ops.mesh.primitive_ico_sphere_add(
-            radius=0.02,  # Scaled Earth
-            location=(earth_orbit_radius, 0, 0)
+        earth = scene_builder.mesh_object(
+            "Earth",
+            scene_builder.primitive_mesh('ico_sphere'),
+            location=(earth_orbit_radius, 0, 0),
+            scale=0.02  # Scaled Earth
         )
         
-        earth = bpy.context.active_object
-        earth.name = "Earth"
-        
         # Earth material
-        earth_mat = bpy.data.materials.new(name="Earth_Material")
-        earth_mat.use_nodes = True
-        
-        principled = earth_mat.node_tree.nodes['Principled BSDF']
-        principled.inputs['Base Color'].default_value = (0.2, 0.4, 0.8, 1.0)
+        earth_mat = material_library.principled_material(
+            "Orbital_Earth_Material",
+            base_color=(0.2, 0.4, 0.8, 1.0)
+        )
         
-        earth.data.materials.append(earth_mat)
+        material_library.assign(earth, earth_mat)
         
         return {'path': orbit_path, 'earth': earth}
     
@@ -191,31 +179,42 @@ class OrbitalMechanicsVisualizer:
         # Blender scale (visibility için büyütülmüş)
         radius = (diameter_km / 1000.0) * self.asteroid_scale_factor
         
-        bpy.ops.mesh.primitive_ico_sphere_add(
-            radius=max(radius, 0.005),  # Minimum size
-            location=(0, 0, 0)
+        asteroid = scene_builder.mesh_object(
+            f"Asteroid_{asteroid_data.get('name', 'Unknown')}",
+            scene_builder.primitive_mesh('ico_sphere'),
+            location=(0, 0, 0),
+            scale=max(radius, 0.005)  # Minimum size
         )
         
-        asteroid = bpy.context.active_object
-        asteroid.name = f"Asteroid_{asteroid_data.get('name', 'Unknown')}"
-        
         # Asteroid material
         spectral_type = asteroid_data.get('spectral_type', 'S')[0]
-        asteroid_mat = self._create_asteroid_material(spectral_type)
-        asteroid.data.materials.append(asteroid_mat)
+        asteroid_mat = self._create_asteroid_material(asteroid, spectral_type)
+        material_library.assign(asteroid, asteroid_mat)
         
         return asteroid
     
-    def _create_asteroid_material(self, spectral_type):
+    def _create_asteroid_material(self, asteroid, spectral_type):
         """
         Spectral type'a göre asteroid materyali
+        Materyal tüm asteroidler için ortak, renk obje attribute'u olarak verilir
         """
-        mat_name = f"Asteroid_Material_{spectral_type}"
-        mat = bpy.data.materials.new(name=mat_name)
-        mat.use_nodes = True
-        
-        nodes = mat.node_tree.nodes
-        principled = nodes['Principled BSDF']
+        mat = material_library.get_material("Orbital_Asteroid_Material", {
+            'nodes': {
+                'output': {'type': 'ShaderNodeOutputMaterial', 'location': (300, 0)},
+                'principled': {
+                    'type': 'ShaderNodeBsdfPrincipled',
+                    'location': (0, 0),
+                    'inputs': {'Roughness': 0.9},
+                },
+                'base_color': object_attribute_node('impactsim_base_color', (-300, 0)),
+                'metallic': object_attribute_node('impactsim_metallic', (-300, -200)),
+            },
+            'links': [
+                ('base_color', 'Color', 'principled', 'Base Color'),
+                ('metallic', 'Fac', 'principled', 'Metallic'),
+                ('principled', 'BSDF', 'output', 'Surface'),
+            ],
+        })
         
         # Spectral type colors
         colors = {
@@ -227,9 +226,8 @@ class OrbitalMechanicsVisualizer:
         }
         
         color = colors.get(spectral_type, colors['S'])
-        principled.inputs['Base Color'].default_value = color
-        principled.inputs['Roughness'].default_value = 0.9
-        principled.inputs['Metallic'].default_value = 1.0 if spectral_type == 'M' else 0.0
+        set_object_attribute(asteroid, 'impactsim_base_color', color)
+        set_object_attribute(asteroid, 'impactsim_metallic', 1.0 if spectral_type == 'M' else 0.0)
         
         return mat
     
@@ -291,17 +289,15 @@ class OrbitalMechanicsVisualizer:
         spline.use_cyclic_u = True  # Close the orbit
         
         # Create object
-        orbit_obj = bpy.data.objects.new('Asteroid_Orbit', curve_data)
-        bpy.context.collection.objects.link(orbit_obj)
+        orbit_obj = scene_builder.curve_object('Asteroid_Orbit', curve_data)
         
         # Orbit material
-        orbit_mat = bpy.data.materials.new(name="Asteroid_Orbit_Material")
-        orbit_mat.use_nodes = True
-        
-        principled = orbit_mat.node_tree.nodes['Principled BSDF']
-        principled.inputs['Base Color'].default_value = (1.0, 0.5, 0.0, 1.0)
-        principled.inputs['Emission'].default_value = (1.0, 0.5, 0.0, 1.0)
-        principled.inputs['Emission Strength'].default_value = 1.0
+        orbit_mat = material_library.principled_material(
+            "Asteroid_Orbit_Material",
+            base_color=(1.0, 0.5, 0.0, 1.0),
+            emission=(1.0, 0.5, 0.0, 1.0),
+            emission_strength=1.0
+        )
         
         curve_data.materials.append(orbit_mat)
         curve_data.bevel_depth = 0.002
@@ -448,33 +444,29 @@ class OrbitalMechanicsVisualizer:
         # Perihelion position
         pos_perihelion = self._transform_orbital_to_3d(perihelion_dist, 0, 0, omega, w, i)
         
-        bpy.ops.mesh.primitive_ico_sphere_add(
-            radius=0.01,
-            location=pos_perihelion
+        perihelion_marker = scene_builder.mesh_object(
+            "Perihelion_Marker",
+            scene_builder.primitive_mesh('ico_sphere'),
+            location=pos_perihelion,
+            scale=0.01
         )
         
-        perihelion_marker = bpy.context.active_object
-        perihelion_marker.name = "Perihelion_Marker"
-        
         # Marker material
-        marker_mat = bpy.data.materials.new(name="Perihelion_Material")
-        marker_mat.use_nodes = True
-        
-        principled = marker_mat.node_tree.nodes['Principled BSDF']
-        principled.inputs['Base Color'].default_value = (1.0, 0.0, 0.0, 1.0)
-        principled.inputs['Emission'].default_value = (1.0, 0.0, 0.0, 1.0)
-        principled.inputs['Emission Strength'].default_value = 3.0
+        marker_mat = material_library.principled_material(
+            "Perihelion_Material",
+            base_color=(1.0, 0.0, 0.0, 1.0),
+            emission=(1.0, 0.0, 0.0, 1.0),
+            emission_strength=3.0
+        )
         
-        perihelion_marker.data.materials.append(marker_mat)
+        material_library.assign(perihelion_marker, marker_mat)
     
     def _create_orbital_info_panels(self, asteroid_data, orbital_elements):
         """
         Orbital bilgi panelleri oluşturur
         """
         # Text object for orbital info
-        bpy.ops.object.text_add(location=(2, 2, 1))
-        text_obj = bpy.context.active_object
-        text_obj.name = "Orbital_Info"
+        text_obj = scene_builder.text("Orbital_Info", "", location=(2, 2, 1))
         
         # Orbital info text
         info_text = f"""Asteroid: {asteroid_data.get('name', 'Unknown')}
@@ -489,15 +481,14 @@ Spectral Type: {asteroid_data.get('spectral_type', 'S')}"""
         text_obj.data.size = 0.3
         
         # Text material
-        text_mat = bpy.data.materials.new(name="Info_Text_Material")
-        text_mat.use_nodes = True
-        
-        principled = text_mat.node_tree.nodes['Principled BSDF']
-        principled.inputs['Base Color'].default_value = (1.0, 1.0, 1.0, 1.0)
-        principled.inputs['Emission'].default_value = (0.8, 0.8, 1.0, 1.0)
-        principled.inputs['Emission Strength'].default_value = 2.0
+        text_mat = material_library.principled_material(
+            "Info_Text_Material",
+            base_color=(1.0, 1.0, 1.0, 1.0),
+            emission=(0.8, 0.8, 1.0, 1.0),
+            emission_strength=2.0
+        )
         
-        text_obj.data.materials.append(text_mat)
+        material_library.assign(text_obj, text_mat)
 
 # Main execution
 def main():
@@ -0,0 +1,270 @@
+import math
+import numpy as np
+
+from geodesy import unit_vectors
+
+# Küp yüzleri: (normal ekseni, işaret, u ekseni, v ekseni); u ekseni işaretle çarpılır, (u, v) dışarıdan saat yönü tersine
+CUBE_FACES = (
+    (0, 1, 1, 2), (0, -1, 1, 2),
+    (1, 1, 2, 0), (1, -1, 2, 0),
+    (2, 1, 0, 1), (2, -1, 0, 1),
+)
+
+class PlanetMeshBuilder:
+    """
+    Quadtree cube-sphere gezegen mesh'i
+    Altı küp yüzü taban seviyeye kadar düzgün, sonra odak noktası (çarpma yeri) ve kamera görüş alanında inceltilir
+    Köşeler küp üzerindeki global tamsayı kafes anahtarlarıyla paylaşılır, seviye geçişlerindeki T-birleşimleri
+    kenar orta noktalarıyla üçgenlenir (çatlak yok)
+    bpy kullanmaz
+    """
+
+    def __init__(self, base_depth=4, max_depth=11, focus_extent=3.0, target_node_pixels=24.0):
+        self.base_depth = base_depth  # Tüm yüzeyin ulaştığı seviye (6 x 4^base_depth dörtgen)
+        self.max_depth = max_depth
+        self.focus_extent = focus_extent  # Odağa bu kadar düğüm boyu yakın düğümler bölünür
+        self.target_node_pixels = target_node_pixels  # Kamerada bir düğümün kaplayacağı en fazla piksel
+
+    def build(self, radius, focus=None, views=(), max_depth=None):
+        """
+        Gezegen mesh'ini üretir
+
+        focus: (lat, lon) derece, views: [(location, forward, fov_rad, width_px)] gezegen merkezli koordinatlarda
+        Döndürür: vertices (N, 3), faces (F, 3), uvs (F * 3, 2) equirect loop UV'leri
+        """
+        max_depth = self.max_depth if max_depth is None else max_depth
+        leaves = self._refine(radius, focus, views, max_depth)
+        leaves = self._balance(leaves, max_depth)
+
+        keys, faces = self._triangulate(leaves, max_depth)
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        faces = inverse.reshape(faces.shape).astype(np.int32)
+
+        directions = self._spherify(self._decode(unique_keys, max_depth))
+        vertices = directions * radius
+        uvs = self._equirect_uvs(directions, faces)
+
+        print(f"Planet mesh: {len(leaves)} quadtree leaves, {len(faces)} triangles")
+        return vertices, faces, uvs
+
+    def _refine(self, radius, focus, views, max_depth):
+        """
+        Seviye seviye vektörel bölme; (yüz, seviye, i, j) yaprak dizisi döndürür
+        """
+        focus_direction = None
+        if focus is not None:
+            focus_direction = unit_vectors(*focus)
+
+        nodes = np.array([(face, 0, 0, 0) for face in range(len(CUBE_FACES))], dtype=np.int64)
+        leaves = []
+        for level in range(max_depth + 1):
+            if level < self.base_depth:
+                split = np.ones(len(nodes), dtype=bool)
+            elif level == max_depth:
+                split = np.zeros(len(nodes), dtype=bool)
+            else:
+                split = self._split_mask(nodes, level, radius, focus_direction, views)
+
+            leaves.append(nodes[~split])
+            nodes = self._children(nodes[split])
+            if len(nodes) == 0:
+                break
+
+        return np.concatenate(leaves)
+
+    def _split_mask(self, nodes, level, radius, focus_direction, views):
+        """
+        Odağa yakın ya da kamerada hedef pikselden büyük görünen düğümler
+        """
+        centers = self._node_centers(nodes, level)
+        node_angle = 0.5 * math.pi / (2 ** level)  # Düğümün yaklaşık açısal boyu
+        split = np.zeros(len(nodes), dtype=bool)
+
+        if focus_direction is not None:
+            distance = np.arccos(np.clip(centers @ focus_direction, -1.0, 1.0))
+            split |= distance < node_angle * self.focus_extent
+
+        node_size = node_angle * radius
+        points = centers * radius
+        for location, forward, fov, width_px in views:
+            location = np.asarray(location, dtype=np.float64)
+            forward = np.asarray(forward, dtype=np.float64)
+            forward = forward / np.linalg.norm(forward)
+
+            offsets = points - location
+            distance = np.maximum(np.linalg.norm(offsets, axis=1), 1e-9)
+
+            # Ufuk: kameradan görülen yarım kürenin (düğüm payı ile) dışı
+            camera_distance = np.linalg.norm(location)
+            horizon = radius / max(camera_distance, radius)
+            facing = centers @ (location / max(camera_distance, 1e-9)) > horizon - node_angle
+
+            # Görüş konisi: düğümün açısal yarıçapı kadar pay
+            angle = np.arccos(np.clip((offsets @ forward) / distance, -1.0, 1.0))
+            in_view = angle < 0.5 * fov + node_size / distance
+
+            pixels = node_size / distance / fov * width_px
+            split |= facing & in_view & (pixels > self.target_node_pixels)
+
+        return split
+
+    def _balance(self, leaves, max_depth):
+        """
+        Komşu yapraklar arasında en fazla bir seviye fark (2:1) kalana kadar kaba yaprakları böler
+        Bir kenarın çeyrek noktası köşe olarak varsa komşu iki seviye incedir
+        """
+        while True:
+            corner_keys = np.unique(self._corner_keys(leaves, max_depth).ravel())
+            quarter_keys = self._edge_point_keys(leaves, max_depth, (0.25, 0.75))
+            violating = np.isin(quarter_keys, corner_keys).reshape(len(leaves), -1).any(axis=1)
+            violating &= leaves[:, 1] < max_depth - 1
+            if not violating.any():
+                return leaves
+            leaves = np.concatenate((leaves[~violating], self._children(leaves[violating])))
+
+    def _triangulate(self, leaves, max_depth):
+        """
+        Yaprakları üçgenler; kenarında daha ince komşunun orta noktası olan yapraklar merkezden fan ile
+        Döndürür: kafes anahtarları ve bu anahtarlara göre (F, 3) üçgenler
+        """
+        corners = self._corner_keys(leaves, max_depth)  # (L, 4): (0,0) (1,0) (1,1) (0,1)
+        corner_set = np.unique(corners.ravel())
+        midpoints = self._edge_point_keys(leaves, max_depth, (0.5,)).reshape(len(leaves), 4)
+        has_mid = np.isin(midpoints, corner_set)
+
+        plain = ~has_mid.any(axis=1)
+        c = corners[plain]
+        triangles = [np.stack((c[:, 0], c[:, 1], c[:, 2]), axis=1), np.stack((c[:, 0], c[:, 2], c[:, 3]), axis=1)]
+
+        fan = ~plain
+        c = corners[fan]
+        m = np.where(has_mid[fan], midpoints[fan], -1)
+        centers = self._lattice_keys(leaves[fan], max_depth, 0.5, 0.5)
+        for edge in range(4):
+            start, end = c[:, edge], c[:, (edge + 1) % 4]
+            mid = m[:, edge]
+            split = mid >= 0
+            # Orta noktasız kenar tek üçgen, orta noktalı kenar iki üçgen
+            triangles.append(np.stack((start[~split], end[~split], centers[~split]), axis=1))
+            triangles.append(np.stack((start[split], mid[split], centers[split]), axis=1))
+            triangles.append(np.stack((mid[split], end[split], centers[split]), axis=1))
+
+        faces = np.concatenate(triangles)
+        return faces.ravel(), faces
+
+    def _children(self, nodes):
+        """
+        Her düğümün dört çocuğu
+        """
+        if len(nodes) == 0:
+            return nodes.reshape(0, 4)
+        children = np.repeat(nodes, 4, axis=0)
+        children[:, 1] += 1
+        children[:, 2] = children[:, 2] * 2 + np.tile((0, 1, 0, 1), len(nodes))
+        children[:, 3] = children[:, 3] * 2 + np.tile((0, 0, 1, 1), len(nodes))
+        return children
+
+    def _node_centers(self, nodes, level):
+        """
+        Düğüm merkezlerinin küre üzerindeki birim yönleri
+        """
+        cells = 2 ** level
+        u = (nodes[:, 2] + 0.5) / cells * 2.0 - 1.0
+        v = (nodes[:, 3] + 0.5) / cells * 2.0 - 1.0
+        return self._spherify(self._cube_points(nodes[:, 0], u, v))
+
+    def _corner_keys(self, leaves, max_depth):
+        """
+        Yaprak köşelerinin kafes anahtarları, (L, 4) saat yönü tersine
+        """
+        return np.stack([
+            self._lattice_keys(leaves, max_depth, du, dv)
+            for du, dv in ((0, 0), (1, 0), (1, 1), (0, 1))
+        ], axis=1)
+
+    def _edge_point_keys(self, leaves, max_depth, fractions):
+        """
+        Dört kenar boyunca verilen oranlardaki noktaların anahtarları, (L, 4 * len(fractions))
+        """
+        keys = []
+        for start, end in (((0, 0), (1, 0)), ((1, 0), (1, 1)), ((1, 1), (0, 1)), ((0, 1), (0, 0))):
+            for t in fractions:
+                du = start[0] + (end[0] - start[0]) * t
+                dv = start[1] + (end[1] - start[1]) * t
+                keys.append(self._lattice_keys(leaves, max_depth, du, dv))
+        return np.stack(keys, axis=1)
+
+    def _lattice_keys(self, nodes, max_depth, du, dv):
+        """
+        Düğüm içindeki (du, dv) noktasının global kafes anahtarı
+        Kafes çözünürlüğü 2^(max_depth + 2): en ince düğümün çeyrek noktaları da tamsayı, küp kenarları yüzler arasında ortak
+        """
+        resolution = 2 ** (max_depth + 2)
+        size = resolution // (2 ** nodes[:, 1])
+        i = nodes[:, 2] * size + np.round(du * size).astype(np.int64)
+        j = nodes[:, 3] * size + np.round(dv * size).astype(np.int64)
+
+        # Küp üzerindeki 3D tamsayı koordinatlar [0, resolution]
+        lattice = np.zeros((len(nodes), 3), dtype=np.int64)
+        for face, (axis, sign, u_axis, v_axis) in enumerate(CUBE_FACES):
+            mask = nodes[:, 0] == face
+            lattice[mask, axis] = resolution if sign > 0 else 0
+            lattice[mask, u_axis] = i[mask] if sign > 0 else resolution - i[mask]
+            lattice[mask, v_axis] = j[mask]
+
+        bits = resolution.bit_length()
+        return (lattice[:, 0] << (2 * bits)) | (lattice[:, 1] << bits) | lattice[:, 2]
+
+    def _decode(self, keys, max_depth):
+        """
+        Kafes anahtarlarını [-1, 1] küp koordinatlarına çevirir
+        """
+        resolution = 2 ** (max_depth + 2)
+        bits = resolution.bit_length()
+        mask = (1 << bits) - 1
+        lattice = np.stack(((keys >> (2 * bits)) & mask, (keys >> bits) & mask, keys & mask), axis=1)
+        return lattice / resolution * 2.0 - 1.0
+
+    def _cube_points(self, faces, u, v):
+        """
+        Yüz indeksi ve [-1, 1] (u, v) -> küp yüzeyindeki nokta
+        """
+        points = np.zeros((len(faces), 3))
+        for face, (axis, sign, u_axis, v_axis) in enumerate(CUBE_FACES):
+            mask = faces == face
+            points[mask, axis] = sign
+            points[mask, u_axis] = u[mask] * sign
+            points[mask, v_axis] = v[mask]
+        return points
+
+    def _spherify(self, points):
+        """
+        Küpten küreye eşit alana yakın izdüşüm (normalize etmeye göre daha düzgün üçgen boyutları)
+        """
+        x2, y2, z2 = points[:, 0] ** 2, points[:, 1] ** 2, points[:, 2] ** 2
+        return np.column_stack((
+            points[:, 0] * np.sqrt(np.maximum(1.0 - y2 / 2.0 - z2 / 2.0 + y2 * z2 / 3.0, 0.0)),
+            points[:, 1] * np.sqrt(np.maximum(1.0 - z2 / 2.0 - x2 / 2.0 + z2 * x2 / 3.0, 0.0)),
+            points[:, 2] * np.sqrt(np.maximum(1.0 - x2 / 2.0 - y2 / 2.0 + x2 * y2 / 3.0, 0.0)),
+        ))
+
+    def _equirect_uvs(self, directions, faces):
+        """
+        Loop başına equirectangular UV; 180. meridyeni kesen üçgenler ve kutup köşeleri düzeltilir
+        """
+        lon = np.arctan2(directions[:, 1], directions[:, 0])
+        lat = np.arcsin(np.clip(directions[:, 2], -1.0, 1.0))
+        u = (lon / (2.0 * math.pi) + 0.5)[faces]
+        v = (lat / math.pi + 0.5)[faces]
+
+        # Meridyen dikişi: u farkı 0.5'ten büyükse küçük taraf bir tur kaydırılır
+        wraps = (u.max(axis=1) - u.min(axis=1)) > 0.5
+        u[wraps] = np.where(u[wraps] < 0.5, u[wraps] + 1.0, u[wraps])
+
+        # Kutup köşesinde boylam tanımsız: üçgenin diğer köşelerinin ortalaması
+        pole = np.abs(directions[:, 2])[faces] > 1.0 - 1e-9
+        if pole.any():
+            others = np.where(pole, 0.0, u).sum(axis=1) / np.maximum((~pole).sum(axis=1), 1)
+            u = np.where(pole, others[:, None], u)
+
+        return np.stack((u, v), axis=-1).reshape(-1, 2)
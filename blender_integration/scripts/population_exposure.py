@@ -0,0 +1,292 @@
+import os
+import json
+import math
+import numpy as np
+
+from dem_terrain import GeoTIFFRaster
+from geodesy import MEAN_EARTH_RADIUS_M
+
+POPULATION_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'assets', 'population')
+EXPOSURE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cache', 'population')
+SOURCE_EXTENSIONS = ('.tif', '.tiff', '.npy')
+
+# Hasar halkaları: 1 Mt için yarıçap (km) ve enerji ölçek üssü
+# Aşırı basınç halkaları W^(1/3) (Glasstone & Dolan), termal radyasyon W^0.41
+DAMAGE_RINGS = {
+    'severe_blast': (2.2, 1.0 / 3.0),    # 20 psi: betonarme binalar yıkılır
+    'moderate_blast': (4.7, 1.0 / 3.0),  # 5 psi: konutların çoğu yıkılır
+    'thermal': (10.0, 0.41),             # 3. derece yanık
+    'light_blast': (11.6, 1.0 / 3.0),    # 1 psi: camlar kırılır
+}
+
+def damage_radii_km(tnt_tons, crater_diameter_km=0.0):
+    """
+    TNT eşdeğerinden (ton) hasar halkası yarıçapları (km); krater varsa 'crater' halkası eklenir
+    """
+    megatons = max(tnt_tons, 0.0) / 1e6
+    radii = {name: reference * megatons ** exponent for name, (reference, exponent) in DAMAGE_RINGS.items()}
+    if crater_diameter_km > 0:
+        radii['crater'] = crater_diameter_km / 2.0
+    return radii
+
+class PopulationExposure:
+    """
+    Gridlenmiş nüfus sayım rasterından (GPW / WorldPop / GHS-POP) daire içi nüfus sorguları
+    Raster bir kez karo başına prefix sum (summed-area table) deposuna çevrilir ve memmap ile açılır:
+    her sorgu diski sabit sayıda enlem bandına böler, her bant 4 köşe okumasıyla toplanır
+    Monte Carlo toplu sorguları raster'ı tekrar taramaz
+    bpy kullanmaz
+    """
+
+    def __init__(self, source_root=POPULATION_ROOT, root=EXPOSURE_ROOT, tile_size=1024, bands=48):
+        self.source_root = os.path.normpath(source_root)
+        self.root = os.path.normpath(root)
+        self.tile_size = tile_size
+        self.bands = bands  # Disk başına enlem bandı (sorgu maliyeti raster çözünürlüğünden bağımsız)
+        self._tables = None
+
+    def find_source(self):
+        """
+        assets/population altındaki ilk raster (yoksa None)
+        GeoTIFF: hücre başına kişi sayısı; .npy: ilk satırı kuzey, ilk sütunu -180° olan global (H, W) grid
+        """
+        if not os.path.isdir(self.source_root):
+            return None
+        for filename in sorted(os.listdir(self.source_root)):
+            if os.path.splitext(filename)[1].lower() in SOURCE_EXTENSIONS:
+                return os.path.join(self.source_root, filename)
+        return None
+
+    def available(self):
+        return self._load() is not None
+
+    def build_tables(self, source_path):
+        """
+        Karo başına yerel SAT (float32) + karo kenar şeritleri ve karo toplamları (float64)
+        Kaynak değişmediyse mevcut depo kullanılır; her adımda bir karo satırı bandı bellekte tutulur
+        """
+        stat = os.stat(source_path)
+        signature = [os.path.basename(source_path), stat.st_size, int(stat.st_mtime), self.tile_size]
+        meta = self._read_meta()
+        if meta is not None and meta['signature'] == signature:
+            return meta
+
+        source = _open_source(source_path)
+        size = self.tile_size
+        tile_rows = -(-source.rows // size)
+        tile_cols = -(-source.cols // size)
+        os.makedirs(self.root, exist_ok=True)
+
+        local = np.lib.format.open_memmap(
+            os.path.join(self.root, 'local.npy'), mode='w+', dtype=np.float32,
+            shape=(tile_rows, tile_cols, size + 1, size + 1)
+        )
+        row_strips = np.zeros((tile_rows, tile_cols, size + 1))
+        column_full = np.zeros((tile_rows, tile_cols, size + 1))
+        totals = np.zeros((tile_rows, tile_cols))
+
+        for tile_row in range(tile_rows):
+            row0 = tile_row * size
+            row1 = min(row0 + size, source.rows)
+            band = np.zeros((size, tile_cols * size))
+            band[:row1 - row0, :source.cols] = np.nan_to_num(source.read(row0, row1, 0, source.cols), nan=0.0)
+            band = np.maximum(band, 0.0)
+
+            tiles = band.reshape(size, tile_cols, size).swapaxes(0, 1)
+            table = np.zeros((tile_cols, size + 1, size + 1))
+            table[:, 1:, 1:] = tiles.cumsum(axis=1).cumsum(axis=2)
+            local[tile_row] = table
+
+            # Aynı banttaki soldaki karoların ilk lr satırı (tam genişlik)
+            full_rows = table[:, :, size]
+            row_strips[tile_row] = np.cumsum(full_rows, axis=0) - full_rows
+            column_full[tile_row] = table[:, size, :]
+            totals[tile_row] = table[:, size, size]
+        local.flush()
+
+        # Aynı sütundaki üstteki karoların ilk lc sütunu (tam yükseklik) ve üst-sol karoların toplamı
+        column_strips = np.cumsum(column_full, axis=0) - column_full
+        tile_prefix = np.zeros((tile_rows + 1, tile_cols + 1))
+        tile_prefix[1:, 1:] = totals.cumsum(axis=0).cumsum(axis=1)
+        np.save(os.path.join(self.root, 'row_strips.npy'), row_strips)
+        np.save(os.path.join(self.root, 'column_strips.npy'), column_strips)
+        np.save(os.path.join(self.root, 'tile_prefix.npy'), tile_prefix[:-1, :-1])
+
+        meta = {
+            'signature': signature,
+            'tile_size': size,
+            'rows': source.rows,
+            'cols': source.cols,
+            'north_edge': source.north + 0.5 * source.dlat,
+            'west_edge': source.west - 0.5 * source.dlon,
+            'dlat': source.dlat,
+            'dlon': source.dlon,
+            'total': float(totals.sum()),
+        }
+        temp_path = os.path.join(self.root, 'meta.json.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(temp_path, os.path.join(self.root, 'meta.json'))
+        print(f"Population tables: {source.cols}x{source.rows} cells, {meta['total']:.3e} people")
+        return meta
+
+    def population_within(self, latitudes, longitudes, radii_km):
+        """
+        (lat, lon) merkezli, radii_km yarıçaplı küresel diskteki nüfus; girdiler yayınlanabilir diziler
+        Raster yoksa None
+        """
+        if self._load() is None:
+            return None
+
+        latitudes, longitudes, radii_km = np.broadcast_arrays(
+            np.asarray(latitudes, dtype=np.float64),
+            np.asarray(longitudes, dtype=np.float64),
+            np.asarray(radii_km, dtype=np.float64)
+        )
+        shape = latitudes.shape
+        lat0 = np.radians(latitudes.reshape(-1, 1))
+        angular = np.minimum(radii_km.reshape(-1, 1) * 1000.0 / MEAN_EARTH_RADIUS_M, math.pi)
+
+        # Disk enlem bantlarına bölünür, bant genişliği Simpson ortalamasıyla
+        fractions = np.linspace(0.0, 1.0, self.bands + 1)
+        south = np.maximum(lat0 - angular, -0.5 * math.pi)
+        north = np.minimum(lat0 + angular, 0.5 * math.pi)
+        edges = south + (north - south) * fractions
+        lower, upper = edges[:, :-1], edges[:, 1:]
+        half_width = (self._half_width(lat0, angular, lower)
+                      + 4.0 * self._half_width(lat0, angular, 0.5 * (lower + upper))
+                      + self._half_width(lat0, angular, upper)) / 6.0
+
+        center = longitudes.reshape(-1, 1)
+        counts = self._rectangle_sums(
+            np.degrees(upper), np.degrees(lower),
+            center - np.degrees(half_width), 2.0 * np.degrees(half_width)
+        )
+        return counts.sum(axis=1).reshape(shape)
+
+    def exposure(self, latitude, longitude, radii_km):
+        """
+        Hasar halkaları sözlüğü {isim: yarıçap km} için {isim: halka içindeki nüfus}; raster yoksa None
+        """
+        names = list(radii_km)
+        counts = self.population_within(latitude, longitude, [radii_km[name] for name in names])
+        if counts is None:
+            return None
+        return {name: float(count) for name, count in zip(names, counts)}
+
+    def _half_width(self, lat0, angular, lat):
+        """
+        Disk sınırının verilen enlemdeki boylam yarı genişliği (radyan), kutbu kapsıyorsa π
+        """
+        denominator = np.cos(lat0) * np.cos(lat)
+        cosine = (np.cos(angular) - np.sin(lat0) * np.sin(lat)) / np.maximum(denominator, 1e-12)
+        return np.arccos(np.clip(cosine, -1.0, 1.0))
+
+    def _rectangle_sums(self, north, south, west, width):
+        """
+        Enlem / boylam dikdörtgenlerinin (derece) nüfusu; global rasterda tarih çizgisi sarılır
+        """
+        meta = self._tables['meta']
+        rows, cols = meta['rows'], meta['cols']
+        top = np.clip((meta['north_edge'] - north) / meta['dlat'], 0.0, rows)
+        bottom = np.clip((meta['north_edge'] - south) / meta['dlat'], 0.0, rows)
+
+        span = cols * meta['dlon']
+        if span >= 360.0 - 1e-6:
+            start = ((west - meta['west_edge']) % 360.0) / meta['dlon']
+            end = start + np.minimum(width, 360.0) / meta['dlon']
+            wrapped = np.clip(end - cols, 0.0, cols)
+            end = np.minimum(end, cols)
+            total = self._box(top, bottom, start, end)
+            return total + np.where(wrapped > 0.0, self._box(top, bottom, np.zeros_like(wrapped), wrapped), 0.0)
+
+        offset = (west - meta['west_edge'] - 0.5 * span + 180.0) % 360.0 - 180.0 + 0.5 * span
+        start = np.clip(offset / meta['dlon'], 0.0, cols)
+        end = np.clip((offset + width) / meta['dlon'], 0.0, cols)
+        return self._box(top, bottom, start, end)
+
+    def _box(self, top, bottom, left, right):
+        """
+        Kesirli hücre koordinatlı kutu toplamı
+        """
+        return (self._integral(bottom, right) - self._integral(top, right)
+                - self._integral(bottom, left) + self._integral(top, left))
+
+    def _integral(self, rows, cols):
+        """
+        [0, rows) x [0, cols) toplamı; hücre içinde uniform yoğunluk varsayımıyla bilineer (kesirli kenarlar tam)
+        """
+        meta = self._tables['meta']
+        row0 = np.minimum(np.floor(rows), meta['rows'] - 1).astype(np.int64)
+        col0 = np.minimum(np.floor(cols), meta['cols'] - 1).astype(np.int64)
+        fr = rows - row0
+        fc = cols - col0
+
+        top = self._corner(row0, col0) * (1.0 - fc) + self._corner(row0, col0 + 1) * fc
+        bottom = self._corner(row0 + 1, col0) * (1.0 - fc) + self._corner(row0 + 1, col0 + 1) * fc
+        return top * (1.0 - fr) + bottom * fr
+
+    def _corner(self, rows, cols):
+        """
+        Tam sayı köşede integral: üst-sol karolar + üst şerit + sol şerit + yerel SAT
+        """
+        size = self._tables['meta']['tile_size']
+        tile_prefix = self._tables['tile_prefix']
+        tile_row = np.minimum(rows // size, tile_prefix.shape[0] - 1)
+        tile_col = np.minimum(cols // size, tile_prefix.shape[1] - 1)
+        local_row = rows - tile_row * size
+        local_col = cols - tile_col * size
+
+        return (tile_prefix[tile_row, tile_col]
+                + self._tables['column_strips'][tile_row, tile_col, local_col]
+                + self._tables['row_strips'][tile_row, tile_col, local_row]
+                + self._tables['local'][tile_row, tile_col, local_row, local_col])
+
+    def _load(self):
+        """
+        Tabloları bir kez açar (gerekirse kurar); raster yoksa None
+        """
+        if self._tables is None:
+            source_path = self.find_source()
+            if source_path is None:
+                self._tables = False
+            else:
+                meta = self.build_tables(source_path)
+                self._tables = {
+                    'meta': meta,
+                    'local': np.load(os.path.join(self.root, 'local.npy'), mmap_mode='r'),
+                    'row_strips': np.load(os.path.join(self.root, 'row_strips.npy')),
+                    'column_strips': np.load(os.path.join(self.root, 'column_strips.npy')),
+                    'tile_prefix': np.load(os.path.join(self.root, 'tile_prefix.npy')),
+                }
+        return self._tables or None
+
+    def _read_meta(self):
+        path = os.path.join(self.root, 'meta.json')
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as f:
+            return json.load(f)
+
+class _GlobalGrid:
+    """
+    Global equirectangular .npy nüfus grid'i, dem_terrain raster arayüzüyle (piksel merkezleri)
+    """
+
+    def __init__(self, path):
+        self._data = np.load(path, mmap_mode='r')
+        if self._data.ndim != 2:
+            raise ValueError("population grid must be a 2D (H, W) array")
+        self.rows, self.cols = self._data.shape
+        self.dlat = 180.0 / self.rows
+        self.dlon = 360.0 / self.cols
+        self.north = 90.0 - 0.5 * self.dlat
+        self.west = -180.0 + 0.5 * self.dlon
+
+    def read(self, row0, row1, col0, col1):
+        return np.asarray(self._data[row0:row1, col0:col1], dtype=np.float64)
+
+def _open_source(path):
+    if path.lower().endswith('.npy'):
+        return _GlobalGrid(path)
+    return GeoTIFFRaster(path)
@@ -0,0 +1,74 @@
+import numpy as np
+
+# Perlin'in 12 kenar gradyanı
+GRADIENTS = np.array([
+    (1, 1, 0), (-1, 1, 0), (1, -1, 0), (-1, -1, 0),
+    (1, 0, 1), (-1, 0, 1), (1, 0, -1), (-1, 0, -1),
+    (0, 1, 1), (0, -1, 1), (0, 1, -1), (0, -1, -1),
+], dtype=np.float64)
+
+class GradientNoise:
+    """
+    NumPy ile vektörel 3D gradient (Perlin) noise ve fBm
+    Tüm noktalar tek seferde değerlendirilir, vertex başına Python çağrısı yok
+    """
+
+    def __init__(self, seed=0):
+        permutation = np.random.default_rng(seed).permutation(256)
+        self.permutation = np.concatenate((permutation, permutation))
+
+    def noise(self, points):
+        """
+        (N, 3) noktalar için yaklaşık [-1, 1] aralığında gradient noise
+        """
+        points = np.asarray(points, dtype=np.float64)
+        cell = np.floor(points)
+        local = points - cell
+        cell = cell.astype(np.int64) & 255
+
+        # Quintic fade eğrisi
+        fade = local * local * local * (local * (local * 6.0 - 15.0) + 10.0)
+
+        perm = self.permutation
+        x, y, z = cell[:, 0], cell[:, 1], cell[:, 2]
+
+        corners = []
+        for dx in (0, 1):
+            hx = perm[x + dx]
+            for dy in (0, 1):
+                hy = perm[hx + y + dy]
+                for dz in (0, 1):
+                    gradient = GRADIENTS[perm[hy + z + dz] % 12]
+                    offset = local - (dx, dy, dz)
+                    corners.append(np.einsum('ij,ij->i', gradient, offset))
+
+        # Trilinear karışım: corners sırası (x, y, z) bitleri
+        u, v, w = fade[:, 0], fade[:, 1], fade[:, 2]
+        c00 = corners[0] + w * (corners[1] - corners[0])
+        c01 = corners[2] + w * (corners[3] - corners[2])
+        c10 = corners[4] + w * (corners[5] - corners[4])
+        c11 = corners[6] + w * (corners[7] - corners[6])
+        c0 = c00 + v * (c01 - c00)
+        c1 = c10 + v * (c11 - c10)
+        return c0 + u * (c1 - c0)
+
+    def fbm(self, points, octaves=5, lacunarity=2.0, gain=0.5, normalize_octaves=None):
+        """
+        Çok oktavlı fractional Brownian motion, genlik toplamı ile normalize edilir
+        normalize_octaves: toplam bu kadar oktavın genlik toplamına bölünür (varsayılan octaves);
+        oktav sayısı değişen seviyelerde ortak oktavlar aynı kalır
+        """
+        points = np.asarray(points, dtype=np.float64)
+        total = np.zeros(len(points))
+        amplitude = 1.0
+        frequency = 1.0
+
+        for octave in range(octaves):
+            # Oktavlar arası kaydırma, kafes hizalanmasını önler
+            total += amplitude * self.noise(points * frequency + octave * 17.31)
+            amplitude *= gain
+            frequency *= lacunarity
+
+        normalize_octaves = octaves if normalize_octaves is None else normalize_octaves
+        amplitude_sum = sum(gain ** octave for octave in range(normalize_octaves))
+        return total / amplitude_sum
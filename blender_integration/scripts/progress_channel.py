@@ -0,0 +1,201 @@
+import os
+import json
+import time
+from datetime import datetime, timezone
+
+OUTPUT_ROOT = "blender_integration/output"
+
+# İşin son hali bu durumlardan biri olunca olay akışı biter
+FINAL_STATUSES = ('completed', 'failed', 'cancelled')
+
+# Blender'ın script'ten sonra render başlatan argümanları
+RENDER_ARGUMENTS = ('-a', '--render-anim', '-f', '--render-frame')
+
+class ProgressChannel:
+    """
+    Bir simülasyonun ilerleme kanalı
+      progress_<id>.ndjson  satır başına bir olay (faz, yüzde, frame, geçen süre, ETA); sadece sona eklenir
+      status_<id>.json      son durumun anlık görüntüsü, geçici dosya + rename ile atomik
+    İstemci olay dosyasını kaldığı bayttan okur, büyüyen bir JSON'u baştan ayrıştırmaz
+    bpy kullanmaz (render handler'ları attach_render_handlers ile bağlanır)
+    """
+
+    def __init__(self, simulation_id, root=OUTPUT_ROOT, blender_version=None):
+        self.simulation_id = simulation_id
+        self.root = root
+        self.blender_version = blender_version
+        self.status_path = os.path.join(root, f"status_{simulation_id}.json")
+        self.events_path = os.path.join(root, f"progress_{simulation_id}.ndjson")
+        self.started = time.monotonic()
+        self._state = {'status': 'running', 'phase': None, 'percent': 0.0, 'frame': None, 'eta_s': None}
+        self._data = {}
+        self._render_started = None
+        self._render_range = None
+        self._render_frames_done = 0
+        self._render_share = 0.0
+
+    def expect_render(self, share=80.0):
+        """
+        Sahne kurulumundan sonra aynı süreçte render gelecek: yüzdelerin son share kısmı render'a ayrılır,
+        kurulum fazları 0 ile 100 - share arasına ölçeklenir
+        """
+        self._render_share = float(share)
+
+    def restart(self):
+        """
+        Aynı id ile yeni çalıştırma (kuyruğa alınma / worker'ın sahiplenmesi): önceki çalıştırmanın olayları silinir,
+        istemci eski son durumu tekrar okuyup akışı erken kapatmaz
+        """
+        os.makedirs(self.root, exist_ok=True)
+        open(self.events_path, 'w').close()
+        self.started = time.monotonic()
+
+    def status(self, status, data=None):
+        """
+        İş durumunu değiştirir (queued / running / completed / failed / cancelled)
+        """
+        self._state['status'] = status
+        if status == 'completed':
+            self._state['percent'] = 100.0
+            self._state['eta_s'] = 0.0
+        if data is not None:
+            self._data = data
+        self._emit('status')
+
+    def phase(self, name, percent=None):
+        """
+        Yeni fazın başladığını bildirir; percent işin tamamına göre (0-100)
+        """
+        self._state['phase'] = name
+        if percent is not None:
+            percent = float(percent) * (100.0 - self._render_share) / 100.0
+            self._state['percent'] = percent
+            self._state['eta_s'] = self._eta(percent)
+        self._emit('phase')
+
+    def scene_built(self, data=None):
+        """
+        Render bekleyen işte sahne kurulumu bitti: son durum değil, iş 'running' kalır
+        'completed' / 'cancelled' render_complete / render_cancel handler'larından yazılır
+        """
+        if data is not None:
+            self._data = data
+        self.phase('scene_built', 100)
+
+    def render_started(self, frame_start, frame_end, percent_start=None):
+        """
+        Render başlangıcı: frame ilerlemesi percent_start (varsayılan mevcut yüzde) ile 100 arasına yayılır
+        Sahne kurulumu 'completed' yazdıktan sonra başlayan render işi yeniden 'running' yapar
+        """
+        if percent_start is None:
+            percent_start = self._state['percent'] if self._state['status'] == 'running' else 0.0
+        self._state['status'] = 'running'
+        self._render_started = time.monotonic()
+        self._render_range = (frame_start, frame_end, percent_start)
+        self._render_frames_done = 0
+        # Render aralığı zaten işin tamamına göre, kurulum ölçeği uygulanmaz
+        self._render_share = 0.0
+        self.phase('render', percent_start)
+
+    def frame(self, frame):
+        """
+        Bir frame'in render'ı bitti: ETA ortalama frame süresinden
+        """
+        if self._render_started is None:
+            return
+        frame_start, frame_end, percent_start = self._render_range
+        total = max(frame_end - frame_start + 1, 1)
+        self._render_frames_done += 1
+
+        seconds_per_frame = (time.monotonic() - self._render_started) / self._render_frames_done
+        self._state['frame'] = frame
+        self._state['percent'] = percent_start + (100.0 - percent_start) * min(self._render_frames_done / total, 1.0)
+        self._state['eta_s'] = round(seconds_per_frame * max(total - self._render_frames_done, 0), 2)
+        self._emit('frame')
+
+    def snapshot(self):
+        """
+        status_<id>.json içeriği
+        """
+        return {
+            'simulation_id': self.simulation_id,
+            'status': self._state['status'],
+            'phase': self._state['phase'],
+            'percent': round(self._state['percent'], 2),
+            'frame': self._state['frame'],
+            'elapsed_s': round(time.monotonic() - self.started, 3),
+            'eta_s': self._state['eta_s'],
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'blender_version': self.blender_version,
+            'data': self._data
+        }
+
+    def _eta(self, percent):
+        """
+        Faz yüzdesinden doğrusal ETA (ilk faz başında bilinmez)
+        """
+        if not percent:
+            return None
+        elapsed = time.monotonic() - self.started
+        return round(elapsed * (100.0 - percent) / percent, 2)
+
+    def _emit(self, event):
+        """
+        Olayı NDJSON'a ekler ve anlık görüntüyü yeniler
+        Olay tek write ile eklenir: okuyucu yalnızca satır sonu gelmiş satırları işler
+        """
+        snapshot = self.snapshot()
+        os.makedirs(self.root, exist_ok=True)
+
+        record = {key: snapshot[key] for key in ('status', 'phase', 'percent', 'frame', 'elapsed_s', 'eta_s', 'timestamp')}
+        record['event'] = event
+        if event == 'status' and snapshot['status'] in FINAL_STATUSES:
+            record['data'] = snapshot['data']
+        with open(self.events_path, 'a') as f:
+            f.write(json.dumps(record, separators=(',', ':'), default=str) + '\n')
+
+        temp_path = self.status_path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(snapshot, f, separators=(',', ':'), default=str)
+        os.replace(temp_path, self.status_path)
+
+def render_follows(argv):
+    """
+    Blender komut satırında script'ten sonra render isteniyor mu (-a / -f, '--' öncesi)
+    Blender argümanları sırayla işlediği için render bu süreçte, sahne kurulduktan sonra çalışır
+    """
+    if '--' in argv:
+        argv = argv[:argv.index('--')]
+    return any(argument in RENDER_ARGUMENTS for argument in argv)
+
+def attach_render_handlers(channel):
+    """
+    Render handler'larını kanala bağlar (önceki işin handler'ları çıkarılır)
+    render_init: render başlangıcı, render_post: frame bitti, render_complete / render_cancel: son durum
+    """
+    import bpy
+
+    handlers = bpy.app.handlers
+    for handler_list in (handlers.render_init, handlers.render_post, handlers.render_complete, handlers.render_cancel):
+        for handler in list(handler_list):
+            if getattr(handler, '_progress_channel', False):
+                handler_list.remove(handler)
+
+    def on_render_init(scene, *args):
+        channel.render_started(scene.frame_start, scene.frame_end)
+
+    def on_render_post(scene, *args):
+        channel.frame(scene.frame_current)
+
+    def on_render_complete(scene, *args):
+        channel.status('completed')
+
+    def on_render_cancel(scene, *args):
+        channel.status('cancelled', {'error': 'Render cancelled'})
+
+    for handler_list, handler in ((handlers.render_init, on_render_init),
+                                  (handlers.render_post, on_render_post),
+                                  (handlers.render_complete, on_render_complete),
+                                  (handlers.render_cancel, on_render_cancel)):
+        handler._progress_channel = True
+        handler_list.append(handler)
@@ -3,9 +3,14 @@ import bmesh
 import mathutils
 import math
 import json
+import random
 import sys
 from mathutils import Vector, Euler
 
+from material_system import material_library, object_attribute_node, set_object_attribute
+from scene_builder import scene_builder
+from starfield import starfield
+
 class RocketSimulation3D:
     """
     LEO (Low Earth Orbit) roket simülasyonu için Blender 3D sistemi
@@ -72,8 +77,7 @@ class RocketSimulation3D:
         Uzay ortamı kurar
         """
         # Scene temizle
-        bpy.ops.object.select_all(action='SELECT')
-        bpy.ops.object.delete(use_global=False)
+        scene_builder.clear_scene()
         
         # Space background
         world = bpy.context.scene.world
@@ -86,6 +90,12 @@ class RocketSimulation3D:
         background = nodes.new('ShaderNodeBackground')
         background.inputs['Color'].default_value = (0.001, 0.001, 0.008, 1.0)
         background.inputs['Strength'].default_value = 0.3
+        output = nodes.new('ShaderNodeOutputWorld')
+        
+        # Yıldız kataloğu varsa tek nokta mesh'i, yoksa procedurel yıldız dokusu
+        if starfield.create() is not None:
+            world.node_tree.links.new(background.outputs['Background'], output.inputs['Surface'])
+            return
         
         # Star field texture
         tex_coord = nodes.new('ShaderNodeTexCoord')
@@ -103,8 +113,6 @@ class RocketSimulation3D:
         mix.blend_type = 'ADD'
         mix.inputs['Fac'].default_value = 0.3
         
-        output = nodes.new('ShaderNodeOutputWorld')
-        
         # Bağlantılar
         world.node_tree.links.new(tex_coord.outputs['Generated'], noise_tex.inputs['Vector'])
         world.node_tree.links.new(noise_tex.outputs['Fac'], color_ramp.inputs['Fac'])
@@ -116,46 +124,42 @@ class RocketSimulation3D:
         """
         LEO perspektifi için Dünya modeli
         """
-        # Dünya küresi
-        bpy.ops.mesh.primitive_uv_sphere_add(
-            radius=self.earth_radius,
-            location=(0, 0, -self.earth_radius - 0.4),  # LEO yüksekliği
-            segments=64,
-            rings=32
+        # Dünya küresi: roketin altı (Dünya'ya göre kuzey kutbu) ince, ufuk ötesi kaba
+        earth = scene_builder.mesh_object(
+            "Earth_LEO",
+            scene_builder.planet_mesh("Earth_LEO", self.earth_radius, focus=(90.0, 0.0), max_depth=9),
+            location=(0, 0, -self.earth_radius - 0.4)  # LEO yüksekliği
         )
         
-        earth = bpy.context.active_object
-        earth.name = "Earth_LEO"
-        
         # Earth material
-        earth_mat = bpy.data.materials.new(name="Earth_LEO_Material")
-        earth_mat.use_nodes = True
-        
-        nodes = earth_mat.node_tree.nodes
-        principled = nodes['Principled BSDF']
-        
-        # Earth colors
-        principled.inputs['Base Color'].default_value = (0.2, 0.4, 0.8, 1.0)
-        principled.inputs['Roughness'].default_value = 0.7
-        
-        # City lights for night side
-        emission = nodes.new('ShaderNodeEmission')
-        emission.inputs['Color'].default_value = (1.0, 0.8, 0.3, 1.0)
-        emission.inputs['Strength'].default_value = 0.5
-        
-        # Mix for day/night
-        mix_shader = nodes.new('ShaderNodeMixShader')
-        fresnel = nodes.new('ShaderNodeFresnel')
-        fresnel.inputs['IOR'].default_value = 1.45
-        
-        earth_mat.node_tree.links.new(fresnel.outputs['Fac'], mix_shader.inputs['Fac'])
-        earth_mat.node_tree.links.new(principled.outputs['BSDF'], mix_shader.inputs[1])
-        earth_mat.node_tree.links.new(emission.outputs['Emission'], mix_shader.inputs[2])
-        
-        output = nodes['Material Output']
-        earth_mat.node_tree.links.new(mix_shader.outputs['Shader'], output.inputs['Surface'])
+        earth_mat = material_library.get_material("Earth_LEO_Material", {
+            'nodes': {
+                'output': {'type': 'ShaderNodeOutputMaterial', 'location': (600, 0)},
+                # Earth colors
+                'principled': {
+                    'type': 'ShaderNodeBsdfPrincipled',
+                    'location': (0, 0),
+                    'inputs': {'Base Color': (0.2, 0.4, 0.8, 1.0), 'Roughness': 0.7},
+                },
+                # City lights for night side
+                'emission': {
+                    'type': 'ShaderNodeEmission',
+                    'location': (0, -300),
+                    'inputs': {'Color': (1.0, 0.8, 0.3, 1.0), 'Strength': 0.5},
+                },
+                # Mix for day/night
+                'mix_shader': {'type': 'ShaderNodeMixShader', 'location': (300, 0)},
+                'fresnel': {'type': 'ShaderNodeFresnel', 'location': (0, 200), 'inputs': {'IOR': 1.45}},
+            },
+            'links': [
+                ('fresnel', 'Fac', 'mix_shader', 'Fac'),
+                ('principled', 'BSDF', 'mix_shader', 1),
+                ('emission', 'Emission', 'mix_shader', 2),
+                ('mix_shader', 'Shader', 'output', 'Surface'),
+            ],
+        })
         
-        earth.data.materials.append(earth_mat)
+        material_library.assign(earth, earth_mat)
         
         # Earth rotation animation
         earth.rotation_euler = (0, 0, 0)
@@ -172,6 +176,18 @@ class RocketSimulation3D:
         """
         layers = {}
         
+        layer_mat = material_library.get_material("Atmosphere_Layer_Material", {
+            'nodes': {
+                'output': {'type': 'ShaderNodeOutputMaterial', 'location': (300, 0)},
+                'transparent': {'type': 'ShaderNodeBsdfTransparent', 'location': (0, 0)},
+                'color': object_attribute_node('impactsim_color', (-300, 0)),
+            },
+            'links': [
+                ('color', 'Color', 'transparent', 'Color'),
+                ('transparent', 'BSDF', 'output', 'Surface'),
+            ],
+        }, settings={'blend_method': 'BLEND'})
+        
         colors = {
             'troposphere': (0.5, 0.7, 1.0, 0.3),
             'stratosphere': (0.4, 0.6, 0.9, 0.2),
@@ -182,33 +198,15 @@ class RocketSimulation3D:
         for layer_name, height in self.atmosphere_layers.items():
             layer_radius = self.earth_radius + height
             
-            bpy.ops.mesh.primitive_uv_sphere_add(
-                radius=layer_radius,
-                location=(0, 0, -self.earth_radius - 0.4),
-                segments=32,
-                rings=16
+            layer_obj = scene_builder.mesh_object(
+                f"Atmosphere_{layer_name}",
+                scene_builder.primitive_mesh('uv_sphere', radius=layer_radius, segments=32, rings=16),
+                location=(0, 0, -self.earth_radius - 0.4)
             )
             
-            layer_obj = bpy.context.active_object
-            layer_obj.name = f"Atmosphere_{layer_name}"
-            
-            # Atmosphere material
-            layer_mat = bpy.data.materials.new(name=f"Atmosphere_{layer_name}_Material")
-            layer_mat.use_nodes = True
-            layer_mat.blend_method = 'BLEND'
-            
-            nodes = layer_mat.node_tree.nodes
-            nodes.clear()
-            
-            output = nodes.new('ShaderNodeOutputMaterial')
-            transparent = nodes.new('ShaderNodeBsdfTransparent')
-            
-            color = colors[layer_name]
-            transparent.inputs['Color'].default_value = color
-            
-            layer_mat.node_tree.links.new(transparent.outputs['BSDF'], output.inputs['Surface'])
-            
-            layer_obj.data.materials.append(layer_mat)
+            # Atmosphere material (tüm katmanlar paylaşır, renk obje attribute'undan)
+            material_library.assign(layer_obj, layer_mat)
+            set_object_attribute(layer_obj, 'impactsim_color', colors[layer_name])
             layers[layer_name] = layer_obj
             
         return layers
@@ -217,33 +215,26 @@ class RocketSimulation3D:
         """
         Detaylı roket modeli oluşturur
         """
-        # Main rocket body
-        bpy.ops.mesh.primitive_cylinder_add(
-            radius=0.05,
-            depth=0.5,
+        # Main rocket body (boyut mesh'te, çocuk objeler ölçek miras almasın)
+        rocket_body = scene_builder.mesh_object(
+            "Rocket_Body",
+            scene_builder.primitive_mesh('cylinder', radius=0.05, depth=0.5),
             location=(0, 0, 0)
         )
         
-        rocket_body = bpy.context.active_object
-        rocket_body.name = "Rocket_Body"
-        
         # Rocket nose cone
-        bpy.ops.mesh.primitive_cone_add(
-            radius1=0.05,
-            radius2=0.01,
-            depth=0.15,
+        nose_cone = scene_builder.mesh_object(
+            "Rocket_Nose",
+            scene_builder.primitive_mesh('cone', radius1=0.05, radius2=0.01, depth=0.15),
             location=(0, 0, 0.325)
         )
-        
-        nose_cone = bpy.context.active_object
-        nose_cone.name = "Rocket_Nose"
         nose_cone.parent = rocket_body
         
         # Rocket fins
         self._add_rocket_fins(rocket_body)
         
         # Engine nozzles
-        self._add_engine_nozzles(rocket_body)
+        self._add_engine_nozzles(rocket_body, rocket_data)
         
         # Solar panels (for satellites)
         if rocket_data.get('has_solar_panels', True):
@@ -263,44 +254,33 @@ class RocketSimulation3D:
             x = 0.07 * math.cos(angle)
             y = 0.07 * math.sin(angle)
             
-            bpy.ops.mesh.primitive_cube_add(
-                size=0.02,
-                location=(x, y, -0.2)
+            fin = scene_builder.mesh_object(
+                f"Rocket_Fin_{i}",
+                scene_builder.primitive_mesh('cube', size=0.02),
+                location=(x, y, -0.2),
+                scale=(0.5, 3.0, 5.0)
             )
-            
-            fin = bpy.context.active_object
-            fin.name = f"Rocket_Fin_{i}"
-            fin.scale = (0.5, 3.0, 5.0)
             fin.parent = rocket_body
     
-    def _add_engine_nozzles(self, rocket_body):
+    def _add_engine_nozzles(self, rocket_body, rocket_data):
         """
         Motor nozulları ekler
         """
         for i in range(rocket_data.get('engine_count', 1)):
             if i == 0:
                 # Main engine
-                bpy.ops.mesh.primitive_cone_add(
-                    radius1=0.04,
-                    radius2=0.02,
-                    depth=0.08,
-                    location=(0, 0, -0.29)
-                )
+                nozzle_mesh = scene_builder.primitive_mesh('cone', radius1=0.04, radius2=0.02, depth=0.08)
+                location = (0, 0, -0.29)
             else:
-                # Additional engines
+                # Additional engines (aynı mesh'i paylaşır)
                 angle = (i * 60) * math.pi / 180
                 x = 0.03 * math.cos(angle)
                 y = 0.03 * math.sin(angle)
                 
-                bpy.ops.mesh.primitive_cone_add(
-                    radius1=0.02,
-                    radius2=0.01,
-                    depth=0.06,
-                    location=(x, y, -0.29)
-                )
+                nozzle_mesh = scene_builder.primitive_mesh('cone', radius1=0.02, radius2=0.01, depth=0.06)
+                location = (x, y, -0.29)
             
-            nozzle = bpy.context.active_object
-            nozzle.name = f"Engine_Nozzle_{i}"
+            nozzle = scene_builder.mesh_object(f"Engine_Nozzle_{i}", nozzle_mesh, location=location)
             nozzle.parent = rocket_body
     
     def _add_solar_panels(self, rocket_body):
@@ -310,50 +290,48 @@ class RocketSimulation3D:
         for i in range(2):
             side = 1 if i == 0 else -1
             
-            bpy.ops.mesh.primitive_cube_add(
-                location=(side * 0.2, 0, 0.1)
+            panel = scene_builder.mesh_object(
+                f"Solar_Panel_{i}",
+                scene_builder.primitive_mesh('cube'),
+                location=(side * 0.2, 0, 0.1),
+                scale=(0.05, 0.3, 0.2)
             )
-            
-            panel = bpy.context.active_object
-            panel.name = f"Solar_Panel_{i}"
-            panel.scale = (0.05, 0.3, 0.2)
             panel.parent = rocket_body
             
             # Solar panel material
-            panel_mat = bpy.data.materials.new(name=f"Solar_Panel_Material_{i}")
-            panel_mat.use_nodes = True
-            
-            principled = panel_mat.node_tree.nodes['Principled BSDF']
-            principled.inputs['Base Color'].default_value = (0.1, 0.1, 0.4, 1.0)
-            principled.inputs['Metallic'].default_value = 0.8
-            principled.inputs['Roughness'].default_value = 0.1
+            panel_mat = material_library.principled_material(
+                "Solar_Panel_Material",
+                base_color=(0.1, 0.1, 0.4, 1.0),
+                metallic=0.8,
+                roughness=0.1
+            )
             
-            panel.data.materials.append(panel_mat)
+            material_library.assign(panel, panel_mat)
     
     def _apply_rocket_materials(self, rocket_body, rocket_data):
         """
         Roket materyallerini uygular
         """
-        # Main body material
-        rocket_mat = bpy.data.materials.new(name="Rocket_Material")
-        rocket_mat.use_nodes = True
-        
-        nodes = rocket_mat.node_tree.nodes
-        principled = nodes['Principled BSDF']
-        
-        # Metallic white rocket
-        principled.inputs['Base Color'].default_value = (0.9, 0.9, 0.9, 1.0)
-        principled.inputs['Metallic'].default_value = 0.7
-        principled.inputs['Roughness'].default_value = 0.3
-        
         # Heat effects based on temperature
         temperature = rocket_data.get('temperature', 20)  # Celsius
+        emission = None
+        emission_strength = None
         if temperature > 100:
             # Hot glow
-            principled.inputs['Emission'].default_value = (1.0, 0.5, 0.2, 1.0)
-            principled.inputs['Emission Strength'].default_value = (temperature - 100) / 1000
+            emission = (1.0, 0.5, 0.2, 1.0)
+            emission_strength = (temperature - 100) / 1000
+        
+        # Main body material (metallic white rocket)
+        rocket_mat = material_library.principled_material(
+            "Rocket_Material",
+            base_color=(0.9, 0.9, 0.9, 1.0),
+            metallic=0.7,
+            roughness=0.3,
+            emission=emission,
+            emission_strength=emission_strength
+        )
         
-        rocket_body.data.materials.append(rocket_mat)
+        material_library.assign(rocket_body, rocket_mat)
     
     def _create_rocket_trajectory(self, rocket_obj, flight_profile, telemetry_data):
         """
@@ -407,16 +385,14 @@ class RocketSimulation3D:
             spline.bezier_points[i].handle_right_type = 'AUTO'
         
         # Create curve object
-        trajectory_obj = bpy.data.objects.new('Launch_Trajectory', curve_data)
-        bpy.context.collection.objects.link(trajectory_obj)
+        trajectory_obj = scene_builder.curve_object('Launch_Trajectory', curve_data)
         
         # Trajectory material
-        traj_mat = bpy.data.materials.new(name="Trajectory_Material")
-        traj_mat.use_nodes = True
-        
-        principled = traj_mat.node_tree.nodes['Principled BSDF']
-        principled.inputs['Emission'].default_value = (0.0, 1.0, 0.5, 1.0)
-        principled.inputs['Emission Strength'].default_value = 2.0
+        traj_mat = material_library.principled_material(
+            "Launch_Trajectory_Material",
+            emission=(0.0, 1.0, 0.5, 1.0),
+            emission_strength=2.0
+        )
         
         curve_data.materials.append(traj_mat)
         curve_data.bevel_depth = 0.002
@@ -482,13 +458,12 @@ class RocketSimulation3D:
         Motor exhaust efekti
         """
         # Exhaust emitter
-        bpy.ops.mesh.primitive_ico_sphere_add(
-            radius=0.01,
-            location=(0, 0, -0.35)
+        exhaust_emitter = scene_builder.mesh_object(
+            "Exhaust_Emitter",
+            scene_builder.primitive_mesh('ico_sphere'),
+            location=(0, 0, -0.35),
+            scale=0.01
         )
-        
-        exhaust_emitter = bpy.context.active_object
-        exhaust_emitter.name = "Exhaust_Emitter"
         exhaust_emitter.parent = rocket_obj
         
         # Particle system for exhaust
@@ -511,14 +486,24 @@ class RocketSimulation3D:
         psettings.particle_size = 0.05
         psettings.size_random = 0.5
         
-        # Material
-        exhaust_mat = bpy.data.materials.new(name="Exhaust_Material")
-        exhaust_mat.use_nodes = True
-        
-        nodes = exhaust_mat.node_tree.nodes
-        principled = nodes['Principled BSDF']
-        principled.inputs['Emission'].default_value = (1.0, 0.5, 0.1, 1.0)
-        principled.inputs['Emission Strength'].default_value = 5.0
+        # Material: emission gücü obje attribute'undan okunur
+        exhaust_mat = material_library.get_material("Exhaust_Material", {
+            'nodes': {
+                'output': {'type': 'ShaderNodeOutputMaterial', 'location': (300, 0)},
+                'principled': {
+                    'type': 'ShaderNodeBsdfPrincipled',
+                    'location': (0, 0),
+                    'inputs': {'Emission': (1.0, 0.5, 0.1, 1.0)},
+                },
+                'strength': object_attribute_node('impactsim_emission_strength', (-300, 0)),
+            },
+            'links': [
+                ('strength', 'Fac', 'principled', 'Emission Strength'),
+                ('principled', 'BSDF', 'output', 'Surface'),
+            ],
+        })
+        material_library.assign(exhaust_emitter, exhaust_mat)
+        set_object_attribute(exhaust_emitter, 'impactsim_emission_strength', 5.0)
         
         # Animate exhaust based on thrust
         for frame_i, data_point in enumerate(telemetry_data or []):
@@ -526,8 +511,7 @@ class RocketSimulation3D:
             thrust_percent = data_point.get('thrust_percent', 100) / 100.0
             
             # Adjust emission strength based on thrust
-            principled.inputs['Emission Strength'].default_value = thrust_percent * 5.0
-            principled.keyframe_insert(data_path='inputs[1].default_value', frame=frame)
+            set_object_attribute(exhaust_emitter, 'impactsim_emission_strength', thrust_percent * 5.0, frame=frame)
         
         return exhaust_emitter
     
@@ -536,13 +520,12 @@ class RocketSimulation3D:
         Vapor trail efekti
         """
         # Trail emitter
-        bpy.ops.mesh.primitive_ico_sphere_add(
-            radius=0.005,
-            location=(0, 0, 0)
+        trail_emitter = scene_builder.mesh_object(
+            "Vapor_Trail_Emitter",
+            scene_builder.primitive_mesh('ico_sphere'),
+            location=(0, 0, 0),
+            scale=0.005
         )
-        
-        trail_emitter = bpy.context.active_object
-        trail_emitter.name = "Vapor_Trail_Emitter"
         trail_emitter.parent = rocket_obj
         
         # Particle system
@@ -571,14 +554,13 @@ class RocketSimulation3D:
                 frame = frame_i + 1
                 
                 # Separation debris
-                bpy.ops.mesh.primitive_ico_sphere_add(
-                    radius=0.02,
-                    location=rocket_obj.location
+                debris = scene_builder.mesh_object(
+                    f"Stage_Debris_{frame}",
+                    scene_builder.primitive_mesh('ico_sphere'),
+                    location=rocket_obj.location,
+                    scale=0.02
                 )
                 
-                debris = bpy.context.active_object
-                debris.name = f"Stage_Debris_{frame}"
-                
                 # Animate debris separation
                 debris.location = rocket_obj.location
                 debris.keyframe_insert(data_path="location", frame=frame)
@@ -602,9 +584,7 @@ class RocketSimulation3D:
         cameras = {}
         
         # Chase camera
-        bpy.ops.object.camera_add(location=(0, -2, 0.5))
-        chase_cam = bpy.context.active_object
-        chase_cam.name = "Rocket_Chase_Camera"
+        chase_cam = scene_builder.camera("Rocket_Chase_Camera", location=(0, -2, 0.5))
         
         # Track to rocket
         constraint = chase_cam.constraints.new('TRACK_TO')
@@ -617,9 +597,7 @@ class RocketSimulation3D:
         cameras['chase'] = chase_cam
         
         # Ground view camera
-        bpy.ops.object.camera_add(location=(0, -5, -self.earth_radius - 0.3))
-        ground_cam = bpy.context.active_object
-        ground_cam.name = "Ground_View_Camera"
+        ground_cam = scene_builder.camera("Ground_View_Camera", location=(0, -5, -self.earth_radius - 0.3))
         
         # Track rocket from ground
         constraint = ground_cam.constraints.new('TRACK_TO')
@@ -627,9 +605,7 @@ class RocketSimulation3D:
         cameras['ground'] = ground_cam
         
         # Orbital overview camera
-        bpy.ops.object.camera_add(location=(2, -3, 1))
-        orbital_cam = bpy.context.active_object
-        orbital_cam.name = "Orbital_Overview_Camera"
+        orbital_cam = scene_builder.camera("Orbital_Overview_Camera", location=(2, -3, 1))
         cameras['orbital'] = orbital_cam
         
         return cameras
@@ -641,11 +617,7 @@ class RocketSimulation3D:
         hud_elements = {}
         
         # Velocity indicator
-        bpy.ops.object.text_add(location=(1.5, 1.0, 0.8))
-        velocity_text = bpy.context.active_object
-        velocity_text.name = "Velocity_HUD"
-        velocity_text.data.body = "Hız: 0 m/s"
-        velocity_text.data.size = 0.15
+        velocity_text = scene_builder.text("Velocity_HUD", "Hız: 0 m/s", location=(1.5, 1.0, 0.8), size=0.15)
         
         # Animate velocity text
         for frame_i, data_point in enumerate(telemetry_data or []):
@@ -657,25 +629,13 @@ class RocketSimulation3D:
         hud_elements['velocity'] = velocity_text
         
         # Altitude indicator
-        bpy.ops.object.text_add(location=(1.5, 1.0, 0.6))
-        altitude_text = bpy.context.active_object
-        altitude_text.name = "Altitude_HUD"
-        altitude_text.data.body = "Yükseklik: 0 m"
-        altitude_text.data.size = 0.15
+        altitude_text = scene_builder.text("Altitude_HUD", "Yükseklik: 0 m", location=(1.5, 1.0, 0.6), size=0.15)
         
         # Temperature indicator
-        bpy.ops.object.text_add(location=(1.5, 1.0, 0.4))
-        temp_text = bpy.context.active_object
-        temp_text.name = "Temperature_HUD"
-        temp_text.data.body = "Sıcaklık: 20°C"
-        temp_text.data.size = 0.15
+        temp_text = scene_builder.text("Temperature_HUD", "Sıcaklık: 20°C", location=(1.5, 1.0, 0.4), size=0.15)
         
         # Fuel indicator
-        bpy.ops.object.text_add(location=(1.5, 1.0, 0.2))
-        fuel_text = bpy.context.active_object
-        fuel_text.name = "Fuel_HUD"
-        fuel_text.data.body = "Yakıt: 100%"
-        fuel_text.data.size = 0.15
+        fuel_text = scene_builder.text("Fuel_HUD", "Yakıt: 100%", location=(1.5, 1.0, 0.2), size=0.15)
         
         hud_elements['altitude'] = altitude_text
         hud_elements['temperature'] = temp_text
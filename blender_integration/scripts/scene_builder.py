@@ -0,0 +1,400 @@
+import bpy
+import bmesh
+import math
+import mathutils
+import numpy as np
+from contextlib import contextmanager
+
+from planet_mesh import PlanetMeshBuilder
+from lod_switcher import lod_switcher
+
+class SceneBuilder:
+    """
+    bpy.ops kullanmadan doğrudan bpy.data üzerinden mesh, obje, kamera, ışık ve text oluşturur
+    Operator çağrılarının context, undo ve depsgraph maliyetinden kaçınır
+    Primitive mesh verileri önbelleğe alınır ve linked duplicate olarak paylaşılır
+    """
+
+    def __init__(self):
+        self._primitive_meshes = {}
+        self._collection = None
+        self.planet_mesh_builder = PlanetMeshBuilder()
+
+    @property
+    def collection(self):
+        """
+        Yeni objelerin bağlandığı collection
+        """
+        if self._collection is not None:
+            return self._collection
+        return bpy.context.scene.collection
+
+    @contextmanager
+    def building_into(self, collection):
+        """
+        Blok içinde oluşturulan objeleri verilen collection'a bağlar
+        """
+        previous = self._collection
+        self._collection = collection
+        try:
+            yield collection
+        finally:
+            self._collection = previous
+
+    def new_collection(self, name, hidden=False):
+        """
+        Sahneye bağlı yeni collection
+        hidden=True ise view layer'lardan hariç tutulur: sadece collection instance kaynağı olarak render edilir
+        """
+        scene = bpy.context.scene
+        collection = bpy.data.collections.new(name)
+        scene.collection.children.link(collection)
+        if hidden:
+            for view_layer in scene.view_layers:
+                view_layer.layer_collection.children[collection.name].exclude = True
+        return collection
+
+    def collection_instance(self, name, collection, location=(0, 0, 0)):
+        """
+        Collection'ı geometri kopyalamadan yerleştiren instance empty'si
+        """
+        empty = bpy.data.objects.new(name, None)
+        empty.instance_type = 'COLLECTION'
+        empty.instance_collection = collection
+        empty.location = location
+        return self.link_object(empty)
+
+    def link_object(self, obj):
+        """
+        Objeyi aktif hedef collection'a bağlar
+        """
+        self.collection.objects.link(obj)
+        return obj
+
+    def primitive_mesh(self, kind, shared=True, smooth=False, **params):
+        """
+        Primitive mesh datablock'u döndürür
+        shared=True ise aynı parametreli mesh tekrar kullanılır (linked duplicate)
+        Parametre verilmezse birim boyutlu mesh oluşur, boyut obje ölçeğiyle verilir
+
+        kind: 'ico_sphere', 'uv_sphere', 'cube', 'cylinder', 'cone', 'circle'
+        """
+        key = (kind, smooth, tuple(sorted(params.items())))
+
+        if shared:
+            mesh = self._primitive_meshes.get(key)
+            if mesh is not None:
+                try:
+                    mesh.name
+                    return mesh
+                except ReferenceError:
+                    del self._primitive_meshes[key]
+
+        mesh = bpy.data.meshes.new(self._primitive_name(kind, params))
+        bm = bmesh.new()
+        self._fill_primitive(bm, kind, params)
+        bm.to_mesh(mesh)
+        bm.free()
+
+        if smooth:
+            mesh.polygons.foreach_set('use_smooth', [True] * len(mesh.polygons))
+        mesh.update()
+
+        if shared:
+            self._primitive_meshes[key] = mesh
+        return mesh
+
+    def mesh_object(self, name, mesh, location=(0, 0, 0), scale=None, rotation=None):
+        """
+        Verilen mesh ile obje oluşturur (scale tek sayı ise uniform ölçek)
+        """
+        obj = bpy.data.objects.new(name, mesh)
+        obj.location = location
+        if scale is not None:
+            obj.scale = (scale, scale, scale) if isinstance(scale, (int, float)) else scale
+        if rotation is not None:
+            obj.rotation_euler = rotation
+        return self.link_object(obj)
+
+    def mesh_from_arrays(self, name, vertices, faces, uvs=None, smooth=False):
+        """
+        NumPy dizilerinden mesh datablock'u oluşturur (foreach_set, Python döngüsü yok)
+        vertices: (N, 3), faces: (F, k) sabit köşe sayılı, uvs: (F * k, 2) loop başına
+        """
+        vertices = np.asarray(vertices, dtype=np.float32)
+        faces = np.asarray(faces, dtype=np.int32)
+        face_count, corners = faces.shape
+
+        mesh = bpy.data.meshes.new(name)
+        mesh.vertices.add(len(vertices))
+        mesh.vertices.foreach_set('co', vertices.ravel())
+
+        mesh.loops.add(face_count * corners)
+        mesh.loops.foreach_set('vertex_index', faces.ravel())
+        mesh.polygons.add(face_count)
+        mesh.polygons.foreach_set('loop_start', np.arange(face_count, dtype=np.int32) * corners)
+        mesh.polygons.foreach_set('loop_total', np.full(face_count, corners, dtype=np.int32))
+
+        if uvs is not None:
+            uv_layer = mesh.uv_layers.new(name='UVMap')
+            uv_layer.data.foreach_set('uv', np.asarray(uvs, dtype=np.float32).ravel())
+
+        if smooth:
+            mesh.polygons.foreach_set('use_smooth', np.ones(face_count, dtype=bool))
+
+        mesh.update(calc_edges=True)
+        mesh.validate()
+        return mesh
+
+    def planet_mesh(self, name, radius, focus=None, cameras=(), center=(0, 0, 0), max_depth=None):
+        """
+        Quadtree cube-sphere gezegen mesh'i (smooth, equirect UV)
+        focus: (lat, lon) etrafında, cameras: görüş alanındaki bölgeler inceltilir; center gezegenin dünya konumu
+        """
+        views = [self.camera_view(camera, center) for camera in cameras]
+        vertices, faces, uvs = self.planet_mesh_builder.build(radius, focus=focus, views=views, max_depth=max_depth)
+        return self.mesh_from_arrays(name, vertices, faces, uvs=uvs, smooth=True)
+
+    def camera_view(self, camera, center=(0, 0, 0), frame=None):
+        """
+        Kameranın (konum, bakış yönü, yatay görüş açısı, piksel genişliği), center'a göre
+        frame verilirse konum / rotasyon F-curve'lerden okunur (frame_set ve sahne değerlendirmesi yok)
+        """
+        render = bpy.context.scene.render
+        width_px = render.resolution_x * render.resolution_percentage / 100.0
+
+        if frame is None:
+            matrix = camera.matrix_world
+            location = matrix.translation.copy()
+            forward = -matrix.col[2].xyz
+        else:
+            location = mathutils.Vector(self._evaluate_channel(camera, 'location', frame))
+            # Quaternion / axis-angle kameralarda Euler eğrileri yok sayılır
+            order = camera.rotation_mode if len(camera.rotation_mode) == 3 else 'XYZ'
+            rotation = mathutils.Euler(self._evaluate_channel(camera, 'rotation_euler', frame), order)
+            forward = rotation.to_matrix() @ mathutils.Vector((0.0, 0.0, -1.0))
+
+        # Track To hedefi varsa bakış yönü hedefe doğru
+        for constraint in camera.constraints:
+            if constraint.type == 'TRACK_TO' and constraint.target is not None and not constraint.mute:
+                forward = constraint.target.matrix_world.translation - location
+                break
+
+        return tuple(location - mathutils.Vector(center)), tuple(forward.normalized()), camera.data.angle, width_px
+
+    def camera_views(self, camera, frames, center=(0, 0, 0)):
+        """
+        Frame listesi boyunca görüşler; animasyonsuz kamera için tek görüş
+        """
+        action = camera.animation_data.action if camera.animation_data else None
+        if action is None:
+            return [self.camera_view(camera, center)]
+        return [self.camera_view(camera, center, frame) for frame in frames]
+
+    def _evaluate_channel(self, obj, data_path, frame):
+        """
+        Vektör property'sini F-curve'lerden değerlendirir, eğrisi olmayan bileşenler mevcut değerde kalır
+        """
+        values = list(getattr(obj, data_path))
+        action = obj.animation_data.action if obj.animation_data else None
+        if action is not None:
+            for index in range(len(values)):
+                fcurve = action.fcurves.find(data_path, index=index)
+                if fcurve is not None:
+                    values[index] = fcurve.evaluate(frame)
+        return values
+
+    def curve_object(self, name, curve_data, location=(0, 0, 0)):
+        """
+        Curve datablock'undan obje oluşturur
+        """
+        obj = bpy.data.objects.new(name, curve_data)
+        obj.location = location
+        return self.link_object(obj)
+
+    def circle_curve(self, name, radius, vertices=64, location=(0, 0, 0)):
+        """
+        XY düzleminde kapalı poly curve çember
+        """
+        curve_data = bpy.data.curves.new(name=name, type='CURVE')
+        curve_data.dimensions = '3D'
+
+        spline = curve_data.splines.new(type='POLY')
+        spline.points.add(vertices - 1)
+
+        coords = []
+        for i in range(vertices):
+            angle = 2 * math.pi * i / vertices
+            coords.extend((radius * math.cos(angle), radius * math.sin(angle), 0.0, 1.0))
+        spline.points.foreach_set('co', coords)
+        spline.use_cyclic_u = True
+
+        return self.curve_object(name, curve_data, location)
+
+    def camera(self, name, location=(0, 0, 0), rotation=None, lens=None):
+        """
+        Kamera objesi oluşturur
+        """
+        camera_data = bpy.data.cameras.new(name)
+        if lens is not None:
+            camera_data.lens = lens
+
+        camera = bpy.data.objects.new(name, camera_data)
+        camera.location = location
+        if rotation is not None:
+            camera.rotation_euler = rotation
+        return self.link_object(camera)
+
+    def light(self, name, light_type='POINT', location=(0, 0, 0), energy=None, color=None):
+        """
+        Işık objesi oluşturur
+        """
+        light_data = bpy.data.lights.new(name, type=light_type)
+        if energy is not None:
+            light_data.energy = energy
+        if color is not None:
+            light_data.color = color
+
+        light = bpy.data.objects.new(name, light_data)
+        light.location = location
+        return self.link_object(light)
+
+    def text(self, name, body, location=(0, 0, 0), size=None):
+        """
+        Text objesi oluşturur
+        """
+        text_data = bpy.data.curves.new(name, type='FONT')
+        text_data.body = body
+        if size is not None:
+            text_data.size = size
+
+        text = bpy.data.objects.new(name, text_data)
+        text.location = location
+        return self.link_object(text)
+
+    def empty(self, name, location=(0, 0, 0), display_type='PLAIN_AXES'):
+        """
+        Empty objesi oluşturur
+        """
+        empty = bpy.data.objects.new(name, None)
+        empty.empty_display_type = display_type
+        empty.location = location
+        return self.link_object(empty)
+
+    def clear_scene(self, scene=None):
+        """
+        Sahnedeki tüm objeleri operator kullanmadan siler
+        Mesh/materyal datablock'ları önbellekte tekrar kullanılmak üzere kalır
+        """
+        scene = scene or bpy.context.scene
+        for obj in list(scene.objects):
+            bpy.data.objects.remove(obj, do_unlink=True)
+
+    def reset_scene(self, scene=None):
+        """
+        Kalıcı worker'da iki iş arasında sahneyi boş hale getirir
+        Objeler, collection'lar ve sahipsiz datablock'lar (kamera, ışık, curve, action, particle, doku, mesh, materyal,
+        görüntü) silinir; node grupları ve paylaşılan primitive mesh'ler sonraki işte tekrar kullanılır
+        """
+        scene = scene or bpy.context.scene
+        self._collection = None
+        self.clear_scene(scene)
+
+        for collection in list(scene.collection.children_recursive):
+            bpy.data.collections.remove(collection)
+        self.purge_orphans()
+
+        scene.timeline_markers.clear()
+        scene.frame_start = 1
+        scene.frame_end = 250
+        scene.frame_set(1)
+
+    def remove_collection(self, collection):
+        """
+        Collection'ı içindeki objeler ve alt collection'larla birlikte siler (incremental yeniden kurulum)
+        """
+        for obj in list(collection.all_objects):
+            bpy.data.objects.remove(obj, do_unlink=True)
+        for child in list(collection.children_recursive):
+            bpy.data.collections.remove(child)
+        bpy.data.collections.remove(collection)
+        self.purge_orphans()
+
+    def purge_orphans(self):
+        """
+        Hiçbir objenin kullanmadığı datablock'ları siler (node grupları ve paylaşılan primitive mesh'ler korunur)
+        Kullanılmayan materyaller ve görüntüler de silinir: odak başına yüklenen doku parçaları kalıcı worker'da
+        birikmez, material_library gerektiğinde yeniden kurar
+        Silinen objelerin LOD zincirleri fake user'larından önce serbest bırakılır
+        """
+        lod_switcher.release_orphaned_levels()
+        for datablocks in (bpy.data.cameras, bpy.data.lights, bpy.data.curves, bpy.data.actions,
+                           bpy.data.particles, bpy.data.textures, bpy.data.materials):
+            for block in list(datablocks):
+                if block.users == 0:
+                    datablocks.remove(block)
+
+        # Materyaller silindikten sonra dokuları sahipsiz kalan görüntüler (Render Result / Viewer hariç)
+        for image in list(bpy.data.images):
+            if image.users == 0 and image.type == 'IMAGE':
+                bpy.data.images.remove(image)
+
+        shared = set()
+        for mesh in self._primitive_meshes.values():
+            try:
+                shared.add(mesh.as_pointer())
+            except ReferenceError:
+                pass
+        for mesh in list(bpy.data.meshes):
+            if mesh.users == 0 and mesh.as_pointer() not in shared:
+                bpy.data.meshes.remove(mesh)
+
+    def _fill_primitive(self, bm, kind, params):
+        """
+        bmesh içine primitive geometri üretir
+        """
+        radius = params.get('radius', 1.0)
+
+        if kind == 'ico_sphere':
+            bmesh.ops.create_icosphere(bm, subdivisions=params.get('subdivisions', 2), radius=radius)
+        elif kind == 'uv_sphere':
+            bmesh.ops.create_uvsphere(
+                bm,
+                u_segments=params.get('segments', 32),
+                v_segments=params.get('rings', 16),
+                radius=radius
+            )
+        elif kind == 'cube':
+            bmesh.ops.create_cube(bm, size=params.get('size', 2.0))
+        elif kind == 'cylinder':
+            bmesh.ops.create_cone(
+                bm,
+                cap_ends=True,
+                segments=params.get('vertices', 32),
+                radius1=radius,
+                radius2=radius,
+                depth=params.get('depth', 2.0)
+            )
+        elif kind == 'cone':
+            bmesh.ops.create_cone(
+                bm,
+                cap_ends=True,
+                segments=params.get('vertices', 32),
+                radius1=params.get('radius1', 1.0),
+                radius2=params.get('radius2', 0.0),
+                depth=params.get('depth', 2.0)
+            )
+        elif kind == 'circle':
+            bmesh.ops.create_circle(bm, segments=params.get('vertices', 32), radius=radius)
+        else:
+            raise ValueError(f"Unknown primitive: {kind}")
+
+    def _primitive_name(self, kind, params):
+        """
+        Önbellekteki mesh için okunabilir isim
+        """
+        suffix = '_'.join(f"{k}{v}" for k, v in sorted(params.items()))
+        return f"Primitive_{kind}_{suffix}" if suffix else f"Primitive_{kind}"
+
+# Tüm script'lerin paylaştığı builder
+scene_builder = SceneBuilder()
@@ -0,0 +1,208 @@
+import os
+import re
+import sys
+import json
+import glob
+import types
+import hashlib
+
+import bpy
+
+from material_system import MATERIAL_HASH_PROPERTY
+from scene_builder import scene_builder
+
+TEMPLATE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cache', 'templates')
+SCRIPTS_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+TEMPLATE_ROLE_PROPERTY = 'impactsim_template_role'
+
+class SceneTemplateLibrary:
+    """
+    İşten işe değişmeyen sahne parçalarını (Dünya sistemi, yıldız arka planı) .blend şablonlarında saklar
+    İlk işte parça normal şekilde kurulup tek bir collection olarak diske yazılır, sonraki işler dosyadan append eder
+    Şablon anahtarı: üretici modüllerin (ve yerel bağımlılıklarının) kaynak hash'i + parametreler
+    Aynı kaynaktan farklı parametreli (çarpma yeri, tarih) şablonlar LRU olarak max_variants adete kadar tutulur
+    Append edilen materyal / görüntü / node grubu kopyaları bellekteki eşleriyle değiştirilir
+    """
+
+    def __init__(self, root=TEMPLATE_ROOT):
+        self.root = os.path.normpath(root)
+        self.max_variants = 8
+        self._source_hashes = {}
+
+    def instantiate(self, name, build, params=None, modules=()):
+        """
+        Şablonu aktif collection'a ekler ve {rol: obje} döndürür
+        build(): parçayı aktif collection'a kurar ve {rol: obje} döndürür (sadece şablon yoksa çağrılır)
+        params: sonucu etkileyen JSON uyumlu değerler, modules: kaynağı anahtara giren üretici modüller
+        """
+        key = self.template_key(name, params, modules)
+        path = os.path.join(self.root, f"{name}_{key}.blend")
+
+        if os.path.exists(path):
+            try:
+                objects = self._append(path)
+                # LRU: son kullanım zamanı dosyanın mtime'ı
+                os.utime(path)
+                print(f"Scene template '{name}' loaded")
+                return objects
+            except (OSError, RuntimeError) as e:
+                # Yarım / bozuk dosya: yeniden kurulur
+                print(f"Scene template '{name}' unreadable ({e}), rebuilding")
+                os.remove(path)
+
+        collection = bpy.data.collections.new(f"Template_{name}")
+        scene_builder.collection.children.link(collection)
+        with scene_builder.building_into(collection):
+            objects = build()
+
+        for role, obj in objects.items():
+            obj[TEMPLATE_ROLE_PROPERTY] = role
+        self._write(name, path, collection)
+        print(f"Scene template '{name}' built and saved")
+        return objects
+
+    def template_key(self, name, params=None, modules=()):
+        """
+        Blender sürümü, kaynak hash'i ve parametrelerden kararlı şablon anahtarı: '<kaynak>_<parametre>'
+        Kaynak kısmı aynı olan dosyalar aynı kodun farklı parametreli varyantlarıdır
+        """
+        source = json.dumps([name, bpy.app.version_string, self.source_hash(modules)], separators=(',', ':'))
+        variant = json.dumps(params, sort_keys=True, separators=(',', ':'), default=str)
+        return (hashlib.sha1(source.encode('utf-8')).hexdigest()[:12] + '_' +
+                hashlib.sha1(variant.encode('utf-8')).hexdigest()[:12])
+
+    def source_hash(self, modules):
+        """
+        Modüllerin ve scripts dizinindeki bütün (dolaylı) bağımlılıklarının kaynak dosyalarının hash'i
+        """
+        cache_key = tuple(sorted(module.__name__ for module in modules))
+        if cache_key in self._source_hashes:
+            return self._source_hashes[cache_key]
+
+        pending = list(modules)
+        seen = {}
+        while pending:
+            module = pending.pop()
+            path = getattr(module, '__file__', None)
+            if module.__name__ in seen or not path or os.path.dirname(os.path.abspath(path)) != SCRIPTS_ROOT:
+                continue
+            seen[module.__name__] = path
+
+            # Modül olarak ya da from-import ile alınmış yerel isimler
+            for value in vars(module).values():
+                if isinstance(value, types.ModuleType):
+                    pending.append(value)
+                elif getattr(value, '__module__', None) in sys.modules:
+                    pending.append(sys.modules[value.__module__])
+
+        digest = hashlib.sha1()
+        for module_name in sorted(seen):
+            with open(seen[module_name], 'rb') as f:
+                digest.update(module_name.encode('utf-8'))
+                digest.update(f.read())
+        self._source_hashes[cache_key] = digest.hexdigest()
+        return self._source_hashes[cache_key]
+
+    def _write(self, name, path, collection):
+        """
+        Collection'ı bağımlılıklarıyla birlikte .blend'e yazar
+        Eski kaynaktan kalan şablonlar ve en uzun süre kullanılmamış fazla varyantlar silinir
+        """
+        os.makedirs(self.root, exist_ok=True)
+        temp_path = path + '.tmp.blend'
+        # fake_user=False: append edilen mesh'ler iş bitince sahipsiz kalır ve purge_orphans ile silinir
+        bpy.data.libraries.write(temp_path, {collection}, path_remap='ABSOLUTE', fake_user=False)
+        os.replace(temp_path, path)
+
+        source = os.path.basename(path)[len(name) + 1:].split('_')[0]
+        variants = []
+        for other_path in glob.glob(os.path.join(self.root, f"{name}_*.blend")):
+            other_key = os.path.basename(other_path)[len(name) + 1:-len('.blend')]
+            # Eski biçimli (tek parçalı) anahtarlar da eski kaynaktan sayılır, geçici dosyalar atlanır
+            if not re.fullmatch(r'[0-9a-f]{12}_[0-9a-f]{12}|[0-9a-f]{16}', other_key):
+                continue
+            if not other_key.startswith(source + '_'):
+                os.remove(other_path)
+            else:
+                variants.append(other_path)
+
+        variants.sort(key=os.path.getmtime, reverse=True)
+        for old_path in variants[self.max_variants:]:
+            os.remove(old_path)
+
+    def _append(self, path):
+        """
+        Şablon collection'ını append eder, paylaşılabilir datablock kopyalarını mevcut eşlerine yönlendirir
+        """
+        existing_materials = {
+            material[MATERIAL_HASH_PROPERTY]: material
+            for material in bpy.data.materials if MATERIAL_HASH_PROPERTY in material
+        }
+        existing_images = {_image_path(image): image for image in bpy.data.images if image.filepath}
+        existing_groups = {group.name: group for group in bpy.data.node_groups}
+        before = {
+            'materials': set(material.as_pointer() for material in bpy.data.materials),
+            'images': set(image.as_pointer() for image in bpy.data.images),
+            'node_groups': set(group.as_pointer() for group in bpy.data.node_groups),
+        }
+
+        with bpy.data.libraries.load(path, link=False) as (data_from, data_to):
+            data_to.collections = list(data_from.collections)
+        collection = data_to.collections[0]
+
+        # Şablonun başvurduğu önbellek dokuları silinmişse şablon geçersiz
+        for image in bpy.data.images:
+            if image.as_pointer() not in before['images'] and image.source == 'FILE' \
+                    and not os.path.exists(_image_path(image)):
+                for obj in list(collection.all_objects):
+                    bpy.data.objects.remove(obj, do_unlink=True)
+                bpy.data.collections.remove(collection)
+                raise OSError(f"missing image {image.filepath}")
+
+        scene_builder.collection.children.link(collection)
+
+        for material in [m for m in bpy.data.materials if m.as_pointer() not in before['materials']]:
+            original = existing_materials.get(material.get(MATERIAL_HASH_PROPERTY))
+            if original is not None:
+                material.user_remap(original)
+                bpy.data.materials.remove(material)
+
+        for image in [i for i in bpy.data.images if i.as_pointer() not in before['images']]:
+            original = existing_images.get(_image_path(image))
+            if original is not None:
+                image.user_remap(original)
+                bpy.data.images.remove(image)
+
+        for group in [g for g in bpy.data.node_groups if g.as_pointer() not in before['node_groups']]:
+            # Append edilen kopya 'Ad.001' olur
+            base, _, suffix = group.name.rpartition('.')
+            original = existing_groups.get(base if suffix.isdigit() else group.name)
+            if original is not None:
+                group.user_remap(original)
+                bpy.data.node_groups.remove(group)
+
+        return {
+            obj[TEMPLATE_ROLE_PROPERTY]: obj
+            for obj in collection.all_objects if TEMPLATE_ROLE_PROPERTY in obj
+        }
+
+def _image_path(image):
+    return os.path.normpath(bpy.path.abspath(image.filepath))
+
+def directory_signature(path):
+    """
+    Dizindeki dosyaların (ad, boyut, mtime) listesi: şablon parametrelerinde asset değişikliğini yakalar
+    """
+    if not os.path.isdir(path):
+        return []
+    signature = []
+    for filename in sorted(os.listdir(path)):
+        file_path = os.path.join(path, filename)
+        if os.path.isfile(file_path):
+            stat = os.stat(file_path)
+            signature.append([filename, stat.st_size, int(stat.st_mtime)])
+    return signature
+
+# Tüm script'lerin paylaştığı şablon kütüphanesi
+scene_templates = SceneTemplateLibrary()
@@ -0,0 +1,397 @@
+import os
+import math
+import numpy as np
+
+SHAPE_MODEL_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'assets', 'shape_models')
+SHAPE_MODEL_EXTENSIONS = ('.obj', '.ply', '.icq')
+
+PLY_TYPES = {
+    'char': 'i1', 'int8': 'i1', 'uchar': 'u1', 'uint8': 'u1',
+    'short': 'i2', 'int16': 'i2', 'ushort': 'u2', 'uint16': 'u2',
+    'int': 'i4', 'int32': 'i4', 'uint': 'u4', 'uint32': 'u4',
+    'float': 'f4', 'float32': 'f4', 'double': 'f8', 'float64': 'f8',
+}
+
+class ShapeModelLoader:
+    """
+    Radar / uzay aracı şekil modellerini (OBJ, PLY, ICQ) NumPy dizilerine okur
+    Dosyalar parça parça bayt dizisi olarak işlenir, satır ya da vertex başına Python objesi oluşturulmaz
+    Vertex clustering ile hedef üçgen sayısına indirgenir ve diameter_km'ye ölçeklenir
+    """
+
+    def __init__(self, root=SHAPE_MODEL_ROOT, chunk_bytes=64 * 1024 * 1024):
+        self.root = os.path.normpath(root)
+        self.chunk_bytes = chunk_bytes
+
+    def find_model(self, asteroid_data):
+        """
+        assets/shape_models altında asteroid id'si veya adıyla eşleşen model dosyası
+        """
+        if not os.path.isdir(self.root):
+            return None
+
+        candidates = []
+        for key in ('id', 'name', 'full_name'):
+            value = asteroid_data.get(key)
+            if value:
+                candidates.append(str(value).strip().lower().replace(' ', '_'))
+
+        files = {}
+        for filename in os.listdir(self.root):
+            stem, extension = os.path.splitext(filename)
+            if extension.lower() in SHAPE_MODEL_EXTENSIONS:
+                files.setdefault(stem.lower(), os.path.join(self.root, filename))
+
+        for candidate in candidates:
+            if candidate in files:
+                return files[candidate]
+        return None
+
+    def load(self, path):
+        """
+        Model dosyasını (vertices (N, 3) float64, faces (F, 3) int64) olarak okur
+        """
+        extension = os.path.splitext(path)[1].lower()
+        if extension == '.obj':
+            return self._load_obj(path)
+        if extension == '.ply':
+            return self._load_ply(path)
+        if extension == '.icq':
+            return self._load_icq(path)
+        raise ValueError(f"Unsupported shape model format: {extension}")
+
+    def decimate(self, vertices, faces, target_faces):
+        """
+        Vertex clustering ile indirgeme: hücre boyutu yüzey alanından hedef üçgen sayısına göre seçilir
+        """
+        if len(faces) <= target_faces:
+            return vertices, faces
+
+        # Kapalı yüzeyde üçgen sayısı ~ 2 x vertex (küme) sayısı
+        area = self._surface_area(vertices, faces)
+        cell = math.sqrt(area / max(target_faces / 2.0, 1.0))
+
+        for _ in range(4):
+            clustered_vertices, clustered_faces = self._cluster(vertices, faces, cell)
+            # Hedefin çok altına düştüyse hücreyi küçült
+            if len(clustered_faces) >= 0.7 * target_faces:
+                break
+            cell *= math.sqrt(len(clustered_faces) / float(target_faces))
+
+        return clustered_vertices, clustered_faces
+
+    def scale_to_diameter(self, vertices, faces, diameter_km, units_per_km=1.0 / 1000.0):
+        """
+        Hacim eşdeğeri çapı diameter_km olacak şekilde ölçekler ve hacim merkezine taşır
+        """
+        volume, centroid = self._volume_and_centroid(vertices, faces)
+        centered = vertices - centroid
+        if volume <= 0:
+            # Açık / tutarsız yönlü mesh: sınır kutusu çapını kullan
+            extent = np.ptp(centered, axis=0).max()
+            scale = diameter_km * units_per_km / max(extent, 1e-12)
+            return centered * scale
+
+        target_radius = diameter_km * units_per_km / 2.0
+        target_volume = 4.0 / 3.0 * math.pi * target_radius ** 3
+        scale = (target_volume / volume) ** (1.0 / 3.0)
+        return centered * scale
+
+    def _load_obj(self, path):
+        """
+        OBJ 'v' ve 'f' kayıtlarını bayt parçaları üzerinde vektörel ayrıştırır
+        """
+        vertex_chunks = []
+        face_chunks = []
+        vertex_total = 0
+        remainder = b''
+
+        with open(path, 'rb') as f:
+            while True:
+                block = f.read(self.chunk_bytes)
+                if not block:
+                    data = remainder
+                else:
+                    data = remainder + block
+                    cut = data.rfind(b'\n') + 1
+                    data, remainder = data[:cut], data[cut:]
+                if data:
+                    vertices, faces = self._parse_obj_block(data, vertex_total)
+                    vertex_chunks.append(vertices)
+                    face_chunks.append(faces)
+                    vertex_total += len(vertices)
+                if not block:
+                    break
+
+        vertices = np.concatenate(vertex_chunks) if vertex_chunks else np.zeros((0, 3))
+        faces = np.concatenate(face_chunks) if face_chunks else np.zeros((0, 3), dtype=np.int64)
+        return vertices, faces
+
+    def _parse_obj_block(self, data, vertex_offset):
+        """
+        Tam satırlardan oluşan bir OBJ parçasını ayrıştırır
+        Satır tipleri bayt dizisi üzerinden sınıflandırılır, sayılar np.fromstring ile okunur
+        """
+        if not data.endswith(b'\n'):
+            data += b'\n'
+        raw = np.frombuffer(data, dtype=np.uint8)
+
+        newlines = np.flatnonzero(raw == 10)
+        starts = np.concatenate(([0], newlines[:-1] + 1))
+        ends = newlines + 1
+        lengths = ends - starts
+
+        # Satır başı 'v ' ve 'f ' (vn / vt / vp hariç)
+        first = raw[starts]
+        second = raw[np.minimum(starts + 1, len(raw) - 1)]
+        separator = (second == 32) | (second == 9)
+        is_vertex = (first == ord('v')) & separator
+        is_face = (first == ord('f')) & separator
+
+        # Vertex'ler
+        vertex_bytes = raw.copy()
+        vertex_bytes[starts] = 32  # kayıt harfini boşluğa çevir
+        vertex_mask = np.repeat(is_vertex, lengths)
+        vertex_count = int(is_vertex.sum())
+        vertices = np.zeros((0, 3))
+        if vertex_count:
+            values = np.fromstring(vertex_bytes[vertex_mask].tobytes().decode('ascii'), sep=' ')
+            per_vertex = len(values) // vertex_count
+            vertices = values[:vertex_count * per_vertex].reshape(vertex_count, per_vertex)[:, :3]
+
+        # Yüzler: 'a/b/c' token'larında ilk '/' sonrası atılır
+        faces = np.zeros((0, 3), dtype=np.int64)
+        if is_face.any():
+            face_mask = np.repeat(is_face, lengths)
+            face_bytes = vertex_bytes[face_mask]
+            face_lengths = lengths[is_face]
+
+            index = np.arange(len(face_bytes))
+            whitespace = (face_bytes == 32) | (face_bytes == 9) | (face_bytes == 10) | (face_bytes == 13)
+            last_space = np.maximum.accumulate(np.where(whitespace, index, -1))
+            last_slash = np.maximum.accumulate(np.where(face_bytes == 47, index, -1))
+            face_bytes = np.where(last_slash > last_space, 32, face_bytes).astype(np.uint8)
+
+            # Satır başına token sayısı (çokgenler fan olarak üçgenlenir)
+            token_start = ~whitespace & np.concatenate(([True], whitespace[:-1]))
+            line_offsets = np.concatenate(([0], np.cumsum(face_lengths)[:-1]))
+            counts = np.add.reduceat(token_start.astype(np.int64), line_offsets)
+
+            indices = np.fromstring(face_bytes.tobytes().decode('ascii'), sep=' ').astype(np.int64)
+
+            # Negatif indeksler: satıra kadar okunan vertex sayısına göre
+            if (indices < 0).any():
+                vertices_before = vertex_offset + np.cumsum(is_vertex)[is_face]
+                base = np.repeat(vertices_before, counts)
+                indices = np.where(indices < 0, base + indices + 1, indices)
+
+            faces = self._fan_triangulate(indices - 1, counts)
+
+        return vertices, faces
+
+    def _load_ply(self, path):
+        """
+        ASCII ve binary PLY; binary vertex bloğu memmap ile okunur
+        """
+        with open(path, 'rb') as f:
+            if f.readline().strip() != b'ply':
+                raise ValueError("Not a PLY file")
+
+            file_format = None
+            elements = []
+            while True:
+                line = f.readline()
+                if not line:
+                    raise ValueError("PLY header not terminated")
+                parts = line.decode('ascii').split()
+                if not parts or parts[0] in ('comment', 'obj_info'):
+                    continue
+                if parts[0] == 'format':
+                    file_format = parts[1]
+                elif parts[0] == 'element':
+                    elements.append({'name': parts[1], 'count': int(parts[2]), 'properties': []})
+                elif parts[0] == 'property':
+                    if parts[1] == 'list':
+                        elements[-1]['properties'].append((parts[4], 'list', PLY_TYPES[parts[2]], PLY_TYPES[parts[3]]))
+                    else:
+                        elements[-1]['properties'].append((parts[2], PLY_TYPES[parts[1]]))
+                elif parts[0] == 'end_header':
+                    break
+            header_bytes = f.tell()
+
+            if file_format == 'ascii':
+                return self._read_ply_ascii(f, elements)
+
+        endian = '<' if file_format == 'binary_little_endian' else '>'
+        return self._read_ply_binary(path, header_bytes, elements, endian)
+
+    def _read_ply_ascii(self, f, elements):
+        vertices = np.zeros((0, 3))
+        faces = np.zeros((0, 3), dtype=np.int64)
+
+        for element in elements:
+            if element['count'] == 0:
+                continue
+            if element['name'] == 'vertex':
+                names = [prop[0] for prop in element['properties']]
+                columns = [names.index(axis) for axis in ('x', 'y', 'z')]
+                data = np.loadtxt(f, max_rows=element['count'], ndmin=2)
+                vertices = data[:, columns]
+            elif element['name'] == 'face':
+                data = np.loadtxt(f, max_rows=element['count'], dtype=np.int64, ndmin=2)
+                counts = data[:, 0]
+                if not (counts == counts[0]).all():
+                    raise ValueError("Mixed polygon sizes in ASCII PLY are not supported")
+                faces = self._fan_triangulate(data[:, 1:counts[0] + 1].ravel(), counts)
+            else:
+                np.loadtxt(f, max_rows=element['count'], ndmin=2)
+
+        return vertices, faces
+
+    def _read_ply_binary(self, path, offset, elements, endian):
+        vertices = np.zeros((0, 3))
+        faces = np.zeros((0, 3), dtype=np.int64)
+
+        for element in elements:
+            count = element['count']
+            properties = element['properties']
+            has_list = any(prop[1] == 'list' for prop in properties)
+
+            if not has_list:
+                dtype = np.dtype([(prop[0], endian + prop[1]) for prop in properties])
+                if element['name'] == 'vertex' and count:
+                    block = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(count,))
+                    vertices = np.stack([block[axis].astype(np.float64) for axis in ('x', 'y', 'z')], axis=1)
+                    del block
+                offset += dtype.itemsize * count
+                continue
+
+            if element['name'] != 'face' or len(properties) != 1:
+                raise ValueError(f"Unsupported PLY element layout: {element['name']}")
+
+            _, _, count_type, index_type = properties[0]
+            count_dtype = np.dtype(endian + count_type)
+            first_count = int(np.memmap(path, dtype=count_dtype, mode='r', offset=offset, shape=(1,))[0])
+
+            # Sabit boyutlu çokgenler tek memmap ile okunur
+            record = np.dtype([('n', count_dtype), ('i', endian + index_type, (first_count,))])
+            if count:
+                block = np.memmap(path, dtype=record, mode='r', offset=offset, shape=(count,))
+                if not (block['n'] == first_count).all():
+                    raise ValueError("Mixed polygon sizes in binary PLY are not supported")
+                faces = self._fan_triangulate(
+                    block['i'].astype(np.int64).ravel(),
+                    np.full(count, first_count, dtype=np.int64)
+                )
+                del block
+            offset += record.itemsize * count
+
+        return vertices, faces
+
+    def _load_icq(self, path):
+        """
+        ICQ (implicitly connected quadrilateral) formatı: q değeri ve 6 x (q+1)^2 vertex
+        Yüz kenarlarındaki tekrar eden vertex'ler birleştirilir
+        """
+        with open(path, 'r') as f:
+            q = int(f.readline().split()[0])
+            points = np.loadtxt(f, max_rows=6 * (q + 1) ** 2, ndmin=2)[:, :3]
+
+        side = q + 1
+        grid = np.arange(6 * side * side).reshape(6, side, side)
+        a = grid[:, :-1, :-1].ravel()
+        b = grid[:, 1:, :-1].ravel()
+        c = grid[:, 1:, 1:].ravel()
+        d = grid[:, :-1, 1:].ravel()
+        faces = np.concatenate((np.stack((a, b, c), axis=1), np.stack((a, c, d), axis=1)))
+
+        vertices, faces = self._weld(points, faces)
+        return vertices, self._orient_outward(vertices, faces)
+
+    def _fan_triangulate(self, indices, counts):
+        """
+        Düz indeks listesi ve çokgen başına köşe sayısından üçgen listesi (v0, vi, vi+1)
+        """
+        counts = np.asarray(counts, dtype=np.int64)
+        if len(counts) == 0:
+            return np.zeros((0, 3), dtype=np.int64)
+        if (counts == 3).all():
+            return indices.reshape(-1, 3)
+
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        triangles_per_polygon = np.maximum(counts - 2, 0)
+        polygon = np.repeat(np.arange(len(counts)), triangles_per_polygon)
+        local = np.arange(len(polygon)) - np.repeat(np.cumsum(triangles_per_polygon) - triangles_per_polygon, triangles_per_polygon)
+        base = offsets[polygon]
+        return np.stack((indices[base], indices[base + local + 1], indices[base + local + 2]), axis=1)
+
+    def _cluster(self, vertices, faces, cell):
+        """
+        Aynı grid hücresindeki vertex'leri ortalamalarında birleştirir, dejenere üçgenleri atar
+        """
+        origin = vertices.min(axis=0)
+        keys = np.floor((vertices - origin) / cell).astype(np.int64)
+        dims = keys.max(axis=0) + 1
+        flat = (keys[:, 0] * dims[1] + keys[:, 1]) * dims[2] + keys[:, 2]
+
+        unique_keys, cluster = np.unique(flat, return_inverse=True)
+        cluster_count = len(unique_keys)
+        members = np.bincount(cluster, minlength=cluster_count).astype(np.float64)
+        clustered = np.stack([
+            np.bincount(cluster, weights=vertices[:, axis], minlength=cluster_count) / members
+            for axis in range(3)
+        ], axis=1)
+
+        remapped = cluster[faces]
+        valid = (
+            (remapped[:, 0] != remapped[:, 1]) &
+            (remapped[:, 1] != remapped[:, 2]) &
+            (remapped[:, 0] != remapped[:, 2])
+        )
+        remapped = remapped[valid]
+
+        # Aynı üç vertex'e düşen tekrar üçgenleri at (yön korunur)
+        _, unique_rows = np.unique(np.sort(remapped, axis=1), axis=0, return_index=True)
+        remapped = remapped[np.sort(unique_rows)]
+
+        # Kullanılmayan kümeleri at
+        used, compact = np.unique(remapped, return_inverse=True)
+        return clustered[used], compact.reshape(-1, 3)
+
+    def _weld(self, vertices, faces, tolerance=1e-9):
+        """
+        Çakışan vertex'leri birleştirir
+        """
+        scale = max(np.ptp(vertices, axis=0).max(), 1e-12)
+        keys = np.round(vertices / (scale * tolerance)).astype(np.int64)
+        _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+        return vertices[first], inverse.reshape(-1)[faces]
+
+    def _orient_outward(self, vertices, faces):
+        """
+        Yıldız biçimli gövdeler için üçgen normallerini merkezden dışa çevirir
+        """
+        corners = vertices[faces]
+        normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        centers = corners.mean(axis=1) - vertices.mean(axis=0)
+        flip = np.einsum('ij,ij->i', normals, centers) < 0
+        faces = faces.copy()
+        faces[flip] = faces[flip][:, ::-1]
+        return faces
+
+    def _surface_area(self, vertices, faces):
+        corners = vertices[faces]
+        cross = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        return 0.5 * float(np.linalg.norm(cross, axis=1).sum())
+
+    def _volume_and_centroid(self, vertices, faces):
+        """
+        Kapalı mesh için işaretli tetrahedron toplamıyla hacim ve hacim merkezi
+        """
+        corners = vertices[faces]
+        signed = np.einsum('ij,ij->i', corners[:, 0], np.cross(corners[:, 1], corners[:, 2])) / 6.0
+        volume = float(signed.sum())
+        if abs(volume) < 1e-30:
+            return 0.0, vertices.mean(axis=0)
+        centroid = (signed[:, None] * corners.sum(axis=1)).sum(axis=0) / (4.0 * volume)
+        return abs(volume), centroid
@@ -0,0 +1,181 @@
+import os
+import math
+import numpy as np
+
+from geodesy import unit_vectors, eci_to_ecef
+
+CATALOG_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'assets', 'star_catalog')
+CATALOG_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cache', 'stars')
+
+# Ekliptik eğikliği (J2000)
+OBLIQUITY_J2000 = math.radians(23.4392911)
+
+class StarCatalog:
+    """
+    Yerel parlak yıldız kataloğunu NumPy dizilerine okur ve gök küresi noktalarına çevirir
+    Desteklenen dosyalar: Hipparcos hip_main.dat ('|' ayrılmış), Yale Bright Star (BSC5 sabit genişlik),
+    başlıklı CSV (ra saat ya da ra_deg derece, dec, mag, isteğe bağlı bv / ci)
+    Ayrıştırılan katalog .npz olarak önbelleğe alınır
+    bpy kullanmaz
+    """
+
+    def __init__(self, root=CATALOG_ROOT, cache_root=CATALOG_CACHE):
+        self.root = os.path.normpath(root)
+        self.cache_root = os.path.normpath(cache_root)
+
+    def find_source(self):
+        """
+        assets/star_catalog altındaki ilk dosya (yoksa None)
+        """
+        if not os.path.isdir(self.root):
+            return None
+        for filename in sorted(os.listdir(self.root)):
+            path = os.path.join(self.root, filename)
+            if os.path.isfile(path) and not filename.startswith('.'):
+                return path
+        return None
+
+    def load(self):
+        """
+        {'ra', 'dec' (derece), 'mag', 'bv'} dizileri, kataloğu yoksa None
+        Konumu ya da parlaklığı olmayan kayıtlar atılır, B-V yoksa 0.65 (Güneş benzeri) kabul edilir
+        """
+        path = self.find_source()
+        if path is None:
+            return None
+
+        stat = os.stat(path)
+        signature = np.array([stat.st_size, int(stat.st_mtime)], dtype=np.int64)
+        cache_path = os.path.join(self.cache_root, os.path.basename(path) + '.npz')
+        if os.path.exists(cache_path):
+            with np.load(cache_path) as cached:
+                if np.array_equal(cached['signature'], signature):
+                    return {key: cached[key] for key in ('ra', 'dec', 'mag', 'bv')}
+
+        stars = self._parse(path)
+        valid = np.isfinite(stars['ra']) & np.isfinite(stars['dec']) & np.isfinite(stars['mag'])
+        stars = {key: values[valid] for key, values in stars.items()}
+        stars['bv'] = np.where(np.isfinite(stars['bv']), stars['bv'], 0.65)
+
+        os.makedirs(self.cache_root, exist_ok=True)
+        np.savez(cache_path, signature=signature, **stars)
+        print(f"Star catalog: {len(stars['mag'])} stars from {os.path.basename(path)}")
+        return stars
+
+    def sky_points(self, radius, max_magnitude=7.0, frame='equatorial', julian_date=None,
+                   base_angle=4e-4, max_scale=4.0):
+        """
+        Gök küresinde yıldız noktaları ve nokta başına öznitelikler, kataloğu yoksa None
+        frame: 'equatorial' (ICRS ~ J2000), 'ecliptic' ya da 'earth_fixed' (julian_date ile, Dünya sabit sahne)
+        base_angle: sınır kadirdeki yıldızın açısal yarıçapı (radyan), parlaklar akının 4. kökü kadar büyür
+        Döndürür: {'positions' (N, 3), 'sizes' (N,), 'brightness' (N,), 'colors' (N, 4)}
+        """
+        stars = self.load()
+        if stars is None:
+            return None
+
+        visible = stars['mag'] <= max_magnitude
+        ra, dec, mag, bv = (stars[key][visible] for key in ('ra', 'dec', 'mag', 'bv'))
+
+        directions = unit_vectors(dec, ra)
+        if frame == 'ecliptic':
+            cos_e, sin_e = math.cos(OBLIQUITY_J2000), math.sin(OBLIQUITY_J2000)
+            directions = np.stack((
+                directions[:, 0],
+                cos_e * directions[:, 1] + sin_e * directions[:, 2],
+                -sin_e * directions[:, 1] + cos_e * directions[:, 2]
+            ), axis=-1)
+        elif frame == 'earth_fixed':
+            directions = eci_to_ecef(directions, julian_date)
+        elif frame != 'equatorial':
+            raise ValueError(f"Unknown sky frame: {frame}")
+
+        # Sınır kadire göre akı (>= 1)
+        flux = 10.0 ** (-0.4 * (mag - max_magnitude))
+        # Toplam ışık akıyla orantılı: emisyon yoğunluğu alanın büyümesine bölünür
+        return {
+            'positions': directions * radius,
+            'sizes': radius * base_angle * np.minimum(flux ** 0.25, max_scale),
+            'brightness': flux / np.minimum(flux ** 0.5, max_scale ** 2),
+            'colors': bv_to_rgb(bv),
+        }
+
+    def _parse(self, path):
+        """
+        Dosya biçimini ilk satırdan tanıyıp ayrıştırır
+        """
+        with open(path, 'r', encoding='ascii', errors='replace') as f:
+            first = f.readline()
+
+        if '|' in first:
+            # Hipparcos: H5 Vmag, H8 RAdeg, H9 DEdeg, H37 B-V
+            columns = np.genfromtxt(path, delimiter='|', usecols=(5, 8, 9, 37), dtype=np.float64,
+                                    invalid_raise=False, encoding='ascii').reshape(-1, 4)
+            return {'mag': columns[:, 0], 'ra': columns[:, 1], 'dec': columns[:, 2], 'bv': columns[:, 3]}
+        if ',' in first:
+            return self._parse_csv(path, first)
+        return self._parse_bsc5(path)
+
+    def _parse_csv(self, path, header):
+        """
+        Başlıklı CSV (HYG benzeri): ra saat cinsinden, ra_deg / dec derece
+        """
+        names = [name.strip().lower() for name in header.split(',')]
+
+        def index(*candidates):
+            for candidate in candidates:
+                if candidate in names:
+                    return names.index(candidate)
+            return None
+
+        ra_deg_index = index('ra_deg', 'radeg')
+        ra_index = ra_deg_index if ra_deg_index is not None else index('ra')
+        columns = [ra_index, index('dec', 'dec_deg', 'dedeg'), index('mag', 'vmag'), index('bv', 'b-v', 'ci')]
+        if None in columns[:3]:
+            raise ValueError(f"Star catalog CSV needs ra, dec and mag columns: {path}")
+
+        used = [column for column in columns if column is not None]
+        values = np.genfromtxt(path, delimiter=',', skip_header=1, usecols=used, dtype=np.float64,
+                               invalid_raise=False, encoding='ascii')
+        values = values.reshape(-1, len(used))
+        ra = values[:, 0] * (1.0 if ra_deg_index is not None else 15.0)
+        bv = values[:, 3] if columns[3] is not None else np.full(len(values), np.nan)
+        return {'ra': ra, 'dec': values[:, 1], 'mag': values[:, 2], 'bv': bv}
+
+    def _parse_bsc5(self, path):
+        """
+        Yale Bright Star Catalog 5 'catalog' dosyası (J2000 konum, bayt 76-90; Vmag 103-107; B-V 110-114)
+        """
+        with open(path, 'r', encoding='ascii', errors='replace') as f:
+            lines = [line.rstrip('\n').ljust(114) for line in f]
+
+        def column(start, end):
+            values = np.array([line[start - 1:end].strip() for line in lines])
+            return np.where(values == '', 'nan', values).astype(np.float64)
+
+        ra = 15.0 * (column(76, 77) + column(78, 79) / 60.0 + column(80, 83) / 3600.0)
+        sign = np.where(np.array([line[83] for line in lines]) == '-', -1.0, 1.0)
+        dec = sign * (column(85, 86) + column(87, 88) / 60.0 + column(89, 90) / 3600.0)
+        return {'ra': ra, 'dec': dec, 'mag': column(103, 107), 'bv': column(110, 114)}
+
+def bv_to_rgb(bv):
+    """
+    B-V renk indeksinden doğrusal RGBA (Ballesteros sıcaklığı + kara cisim yaklaşımı), en parlak kanal 1
+    """
+    bv = np.clip(np.asarray(bv, dtype=np.float64), -0.4, 2.0)
+    temperature = 4600.0 * (1.0 / (0.92 * bv + 1.7) + 1.0 / (0.92 * bv + 0.62)) / 100.0
+
+    # Tanner Helland yaklaşımı (sRGB 0-255), sonra doğrusal
+    red = np.where(temperature <= 66.0, 255.0, 329.698727446 * np.maximum(temperature - 60.0, 1e-6) ** -0.1332047592)
+    green = np.where(
+        temperature <= 66.0,
+        99.4708025861 * np.log(temperature) - 161.1195681661,
+        288.1221695283 * np.maximum(temperature - 60.0, 1e-6) ** -0.0755148492
+    )
+    blue = np.where(
+        temperature >= 66.0, 255.0,
+        np.where(temperature <= 19.0, 0.0, 138.5177312231 * np.log(np.maximum(temperature - 10.0, 1e-6)) - 305.0447927307)
+    )
+    rgb = np.clip(np.stack((red, green, blue), axis=-1) / 255.0, 0.0, 1.0) ** 2.2
+    rgb /= np.maximum(rgb.max(axis=-1, keepdims=True), 1e-6)
+    return np.concatenate((rgb, np.ones((len(rgb), 1))), axis=-1)
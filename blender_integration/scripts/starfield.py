@@ -0,0 +1,171 @@
+import os
+import sys
+import bpy
+import numpy as np
+
+from material_system import material_library
+from scene_builder import scene_builder
+from scene_templates import scene_templates
+from star_catalog import StarCatalog
+
+class StarfieldBuilder:
+    """
+    Yıldız kataloğunu tek bir nokta mesh'i olarak sahneye ekler
+    Nokta başına boyut / parlaklık / renk attribute'ları, geometry nodes ile her noktaya paylaşılan
+    küçük bir küre instance'lanır: 100k yıldız için tek obje, tek mesh datablock'u
+    """
+
+    def __init__(self):
+        self.catalog = StarCatalog()
+        self.radius = 90.0  # Kamera clip_end (varsayılan 100) içinde kalır
+        self.max_magnitude = 7.0
+        self.emission_strength = 4.0
+
+    def create(self, name="Starfield", follow=None, frame='equatorial', julian_date=None):
+        """
+        Gök küresini oluşturur; katalog yoksa None (düz world rengi kalır)
+        follow verilirse küre o objenin (kamera) konumunu izler, yıldızlarda paralaks olmaz
+        Nokta mesh'i .blend şablonundan yüklenir, katalog ya da ayarlar değişince yeniden kurulur
+        """
+        source = self.catalog.find_source()
+        if source is None:
+            print("No star catalog found, keeping flat space background")
+            return None
+
+        stat = os.stat(source)
+        params = {
+            'name': name,
+            'catalog': [os.path.basename(source), stat.st_size, int(stat.st_mtime)],
+            'frame': frame,
+            'julian_date': julian_date,
+            'settings': [self.radius, self.max_magnitude, self.emission_strength],
+        }
+        starfield = scene_templates.instantiate(
+            f'starfield_{frame}', lambda: {'starfield': self._build(name, frame, julian_date)}, params,
+            modules=(sys.modules[__name__],)
+        )['starfield']
+
+        if follow is not None:
+            constraint = starfield.constraints.new('COPY_LOCATION')
+            constraint.target = follow
+        return starfield
+
+    def _build(self, name, frame, julian_date):
+        """
+        Katalogdan nokta mesh'ini ve instancer modifier'ını kurar
+        """
+        points = self.catalog.sky_points(self.radius, self.max_magnitude, frame=frame, julian_date=julian_date)
+
+        count = len(points['positions'])
+        mesh = bpy.data.meshes.new(name)
+        mesh.vertices.add(count)
+        mesh.vertices.foreach_set('co', points['positions'].astype(np.float32).ravel())
+
+        mesh.attributes.new('star_size', 'FLOAT', 'POINT').data.foreach_set(
+            'value', points['sizes'].astype(np.float32)
+        )
+        mesh.attributes.new('star_brightness', 'FLOAT', 'POINT').data.foreach_set(
+            'value', points['brightness'].astype(np.float32)
+        )
+        mesh.attributes.new('star_color', 'FLOAT_COLOR', 'POINT').data.foreach_set(
+            'color', points['colors'].astype(np.float32).ravel()
+        )
+        mesh.update()
+
+        starfield = scene_builder.mesh_object(name, mesh)
+        modifier = starfield.modifiers.new(name="Star_Instances", type='NODES')
+        modifier.node_group = self._instancer_group()
+
+        # Yıldızlar sahneyi aydınlatmaz ve gölge düşürmez
+        starfield.visible_shadow = False
+        starfield.visible_diffuse = False
+        starfield.visible_glossy = False
+
+        print(f"Starfield: {count} stars (V <= {self.max_magnitude})")
+        return starfield
+
+    def _instancer_group(self):
+        """
+        Noktalara ico-sphere instance'layan node grubu (bir kez oluşturulur)
+        """
+        group = bpy.data.node_groups.get("Starfield_Instancer")
+        if group is not None:
+            return group
+
+        group = bpy.data.node_groups.new("Starfield_Instancer", 'GeometryNodeTree')
+        group.inputs.new('NodeSocketGeometry', "Geometry")
+        group.outputs.new('NodeSocketGeometry', "Geometry")
+
+        nodes = group.nodes
+        links = group.links
+        group_input = nodes.new('NodeGroupInput')
+        group_input.location = (-600, 0)
+        group_output = nodes.new('NodeGroupOutput')
+        group_output.location = (400, 0)
+
+        sphere = nodes.new('GeometryNodeMeshIcoSphere')
+        sphere.location = (-400, -200)
+        sphere.inputs['Radius'].default_value = 1.0
+        sphere.inputs['Subdivisions'].default_value = 1
+
+        size = nodes.new('GeometryNodeInputNamedAttribute')
+        size.location = (-400, -400)
+        size.data_type = 'FLOAT'
+        size.inputs['Name'].default_value = 'star_size'
+
+        # Nokta attribute'ları instance'lara aktarılır, materyal INSTANCER attribute olarak okur
+        instance = nodes.new('GeometryNodeInstanceOnPoints')
+        instance.location = (-100, 0)
+
+        set_material = nodes.new('GeometryNodeSetMaterial')
+        set_material.location = (150, 0)
+        set_material.inputs['Material'].default_value = self._star_material()
+
+        links.new(group_input.outputs['Geometry'], instance.inputs['Points'])
+        links.new(sphere.outputs['Mesh'], instance.inputs['Instance'])
+        links.new(_enabled_output(size, 'Attribute'), instance.inputs['Scale'])
+        links.new(instance.outputs['Instances'], set_material.inputs['Geometry'])
+        links.new(set_material.outputs['Geometry'], group_output.inputs['Geometry'])
+        return group
+
+    def _star_material(self):
+        """
+        Renk ve parlaklığı instance attribute'larından okuyan emisyon materyali
+        """
+        return material_library.get_material("Star_Material", {
+            'nodes': {
+                'output': {'type': 'ShaderNodeOutputMaterial', 'location': (400, 0)},
+                'emission': {'type': 'ShaderNodeEmission', 'location': (200, 0)},
+                'color': {
+                    'type': 'ShaderNodeAttribute',
+                    'location': (-200, 100),
+                    'properties': {'attribute_type': 'INSTANCER', 'attribute_name': 'star_color'},
+                },
+                'brightness': {
+                    'type': 'ShaderNodeAttribute',
+                    'location': (-200, -100),
+                    'properties': {'attribute_type': 'INSTANCER', 'attribute_name': 'star_brightness'},
+                },
+                'strength': {
+                    'type': 'ShaderNodeMath',
+                    'location': (0, -100),
+                    'properties': {'operation': 'MULTIPLY'},
+                    'inputs': {1: self.emission_strength},
+                },
+            },
+            'links': [
+                ('color', 'Color', 'emission', 'Color'),
+                ('brightness', 'Fac', 'strength', 0),
+                ('strength', 'Value', 'emission', 'Strength'),
+                ('emission', 'Emission', 'output', 'Surface'),
+            ],
+        })
+
+def _enabled_output(node, name):
+    """
+    Veri tipine göre değişen aynı isimli çıkışlardan etkin olanı
+    """
+    return next(socket for socket in node.outputs if socket.name == name and socket.enabled)
+
+# Tüm script'lerin paylaştığı builder
+starfield = StarfieldBuilder()
@@ -0,0 +1,119 @@
+import os
+import json
+import math
+import numpy as np
+
+from image_io import write_png16
+
+BAKE_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cache', 'bakes')
+
+class SurfaceBaker:
+    """
+    Yüzey detayını (noise + kraterler) equirectangular displacement ve object-space normal haritalarına yazar
+    Düşük poligonlu taban mesh detayı materyal üzerinden taşır, haritalar asteroid başına diskte önbelleğe alınır
+    bpy kullanmaz
+    """
+
+    def __init__(self, root=BAKE_ROOT, height=1024):
+        self.root = os.path.normpath(root)
+        self.height = height  # Genişlik = 2 x yükseklik
+
+    def texel_subdivisions(self):
+        """
+        Harita çözünürlüğüne karşılık gelen ico subdivision seviyesi (texel ~ kenar uzunluğu)
+        """
+        texel_angle = math.pi / self.height
+        return int(math.ceil(math.log2(1.05 / texel_angle)))
+
+    def equirect_directions(self):
+        """
+        Texel merkezlerinin birim yönleri, (H, W, 3); ilk satır kuzey, u = 0 boylam -180
+        """
+        height, width = self.height, 2 * self.height
+        lat = math.pi / 2 - (np.arange(height) + 0.5) / height * math.pi
+        lon = (np.arange(width) + 0.5) / width * 2 * math.pi - math.pi
+        lat_grid, lon_grid = np.meshgrid(lat, lon, indexing='ij')
+        return np.stack((
+            np.cos(lat_grid) * np.cos(lon_grid),
+            np.cos(lat_grid) * np.sin(lon_grid),
+            np.sin(lat_grid)
+        ), axis=-1)
+
+    def cached(self, key):
+        """
+        Önbellekte tam bir bake varsa bilgilerini döndürür
+        """
+        meta_path = self._path(key, 'json')
+        if not os.path.exists(meta_path):
+            return None
+
+        with open(meta_path, 'r') as f:
+            info = json.load(f)
+        if not all(os.path.exists(info[name]) for name in ('height_path', 'normal_path')):
+            return None
+        return info
+
+    def bake(self, key, height_fn, base_height_fn=None):
+        """
+        Haritaları üretir ya da önbellekten döndürür
+
+        height_fn(directions) -> gövde yarıçapı oranında tam yükseklik
+        base_height_fn(directions) -> geometride zaten bulunan yükseklik, displacement haritası farkı taşır
+        """
+        info = self.cached(key)
+        if info is not None:
+            return info
+
+        directions = self.equirect_directions()
+        flat = directions.reshape(-1, 3)
+
+        heights = height_fn(flat).reshape(directions.shape[:2])
+        residual = heights
+        if base_height_fn is not None:
+            residual = heights - base_height_fn(flat).reshape(directions.shape[:2])
+
+        # Displacement: 0.5 orta seviye, [-max, +max] yarıçap oranı
+        residual_scale = max(float(np.abs(residual).max()), 1e-9)
+        encoded_height = 0.5 + residual / (2.0 * residual_scale)
+
+        normals = self._object_space_normals(heights, directions)
+        encoded_normal = normals * 0.5 + 0.5
+
+        os.makedirs(self.root, exist_ok=True)
+        info = {
+            'height_path': self._path(key, 'height.png'),
+            'normal_path': self._path(key, 'normal.png'),
+            'residual_scale': residual_scale,
+            'resolution': [2 * self.height, self.height],
+        }
+        write_png16(info['height_path'], encoded_height)
+        write_png16(info['normal_path'], encoded_normal)
+
+        # Meta en son yazılır: yarım kalan bake önbellekte görünmez
+        temp_path = self._path(key, 'json.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(info, f, indent=2)
+        os.replace(temp_path, self._path(key, 'json'))
+
+        print(f"Baked surface maps: {info['resolution'][0]}x{info['resolution'][1]}")
+        return info
+
+    def _object_space_normals(self, heights, directions):
+        """
+        Yükseklik alanından object-space yüzey normalleri (boylam yönünde sarmalı)
+        """
+        surface = directions * (1.0 + heights)[..., None]
+
+        # Boylam: sarmalı merkezi fark, enlem: kenarlarda tek taraflı (np.gradient)
+        d_lon = np.roll(surface, -1, axis=1) - np.roll(surface, 1, axis=1)
+        d_lat = -np.gradient(surface, axis=0)  # satırlar kuzeyden güneye
+        normals = np.cross(d_lon, d_lat)
+
+        length = np.linalg.norm(normals, axis=-1, keepdims=True)
+        # Kutuplarda boylam türevi sıfıra iner, radyal yön kullanılır
+        degenerate = length[..., 0] < 1e-12
+        normals = np.where(degenerate[..., None], directions, normals / np.maximum(length, 1e-12))
+        return normals
+
+    def _path(self, key, suffix):
+        return os.path.join(self.root, f"{key}_{suffix}")
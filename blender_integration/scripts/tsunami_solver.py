@@ -0,0 +1,435 @@
+import math
+import os
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+
+from image_io import write_png16
+from geodesy import haversine_distance
+
+EARTH_RADIUS_M = 6371000.0
+GRAVITY = 9.81
+
+class TsunamiSolver:
+    """
+    Okyanus çarpmaları için lineer sığ su (shallow-water) çözücü
+    Lat/lon C-grid üzerinde leapfrog sonlu farklar, kıyılar yansıtıcı, kenarlarda sünger katmanı
+    Satır şeritleri paylaşımlı bellek ve Barrier ile çekirdeklere bölünür, bpy kullanmaz
+    """
+
+    def __init__(self, center_lat, center_lon, extent_deg=20.0, cell_arcmin=4.0,
+                 default_depth_m=4000.0, bathymetry=None):
+        self.center_lat = center_lat
+        self.center_lon = center_lon
+        self.cell_deg = cell_arcmin / 60.0
+        self.default_depth_m = default_depth_m
+        self.sponge_cells = 20
+        self.courant = 0.5
+        self.min_cavity_cells = 3  # Başlangıç boşluğunun grid'de çözülebilmesi için minimum yarıçap
+
+        # Grid: merkezde kare pencere, boylam yönü enleme göre genişletilir
+        lat_min = max(center_lat - extent_deg, -80.0)
+        lat_max = min(center_lat + extent_deg, 80.0)
+        lon_extent = extent_deg / max(math.cos(math.radians(center_lat)), 0.2)
+
+        ny = max(int(round((lat_max - lat_min) / self.cell_deg)), 8)
+        nx = max(int(round(2 * lon_extent / self.cell_deg)), 8)
+
+        self.lat_edges = lat_min + np.arange(ny + 1) * self.cell_deg
+        self.lon_edges = center_lon - lon_extent + np.arange(nx + 1) * self.cell_deg
+        self.lat = 0.5 * (self.lat_edges[1:] + self.lat_edges[:-1])
+        self.lon = 0.5 * (self.lon_edges[1:] + self.lon_edges[:-1])
+
+        self.depth = self._grid_depth(bathymetry)
+
+    @property
+    def shape(self):
+        return self.depth.shape
+
+    def depth_at(self, latitude, longitude):
+        """
+        Grid üzerindeki en yakın hücrenin su derinliği (m, kara için 0)
+        """
+        row = int(np.clip(np.searchsorted(self.lat_edges, latitude) - 1, 0, self.shape[0] - 1))
+        col = int(np.clip(np.searchsorted(self.lon_edges, longitude) - 1, 0, self.shape[1] - 1))
+        return float(self.depth[row, col])
+
+    def initial_cavity(self, impact_params):
+        """
+        Ward & Asphaug (2000) su boşluğu: r <= R_D için eta = -D_C (1 - r^2 / R_C^2)
+        R_D = sqrt(2) R_C seçimi hacmi korur (yükselen kenar dahil)
+        """
+        transient_diameter_m = impact_params.get('crater_diameter_km', 0.0) * 1000.0 / 1.25
+        cavity_radius = transient_diameter_m / 2.0
+        if cavity_radius <= 0:
+            return np.zeros(self.shape)
+
+        # Derinlik/çap ~ 1/3, yerel su derinliği ile sınırlı
+        local_depth = self.depth_at(self.center_lat, self.center_lon)
+        cavity_depth = min(transient_diameter_m / 3.0, local_depth)
+
+        # Grid'in çözemediği boşluk sıfır dalga üretir: kaynak en az min_cavity_cells hücre yarıçapına yayılır,
+        # potansiyel enerji (~ D_C^2 R_C^2) korunacak şekilde derinlik küçültülür
+        dy = EARTH_RADIUS_M * math.radians(self.cell_deg)
+        cell_size = min(dy, dy * math.cos(math.radians(self.center_lat)))
+        min_radius = self.min_cavity_cells * cell_size
+        if cavity_radius < min_radius:
+            print(f"Warning: tsunami cavity radius {cavity_radius / 1000.0:.1f} km is below "
+                  f"{self.min_cavity_cells} grid cells of {cell_size / 1000.0:.1f} km, using an energy-preserving "
+                  f"{min_radius / 1000.0:.1f} km source")
+            cavity_depth = cavity_depth * cavity_radius / min_radius
+            cavity_radius = min_radius
+
+        lat_grid, lon_grid = np.meshgrid(self.lat, self.lon, indexing='ij')
+        distance = haversine_distance(self.center_lat, self.center_lon, lat_grid, lon_grid, radius_m=EARTH_RADIUS_M)
+
+        eta = np.where(
+            distance <= math.sqrt(2.0) * cavity_radius,
+            -cavity_depth * (1.0 - (distance / cavity_radius) ** 2),
+            0.0
+        )
+        return np.where(self.depth > 0, eta, 0.0)
+
+    def time_step(self):
+        """
+        CFL koşulundan zaman adımı (s)
+        """
+        max_speed = math.sqrt(GRAVITY * max(float(self.depth.max()), 1.0))
+        dy = EARTH_RADIUS_M * math.radians(self.cell_deg)
+        dx = dy * math.cos(math.radians(max(abs(self.lat_edges[0]), abs(self.lat_edges[-1]))))
+        return self.courant * min(dx, dy) / max_speed
+
+    def crossing_time(self):
+        """
+        Dalganın merkezden grid kenarına ulaşma süresi (s), varsayılan simülasyon süresi
+        """
+        ocean = self.depth[self.depth > 0]
+        mean_speed = math.sqrt(GRAVITY * (float(ocean.mean()) if ocean.size else self.default_depth_m))
+        half_span = EARTH_RADIUS_M * math.radians(0.5 * (self.lat_edges[-1] - self.lat_edges[0]))
+        return half_span / mean_speed
+
+    def run(self, impact_params, duration_s=None, frame_count=100, workers=None):
+        """
+        Çözücüyü çalıştırır ve dalga yüksekliği frame'lerini döndürür
+
+        workers: satır şeridi sayısı (None ise CPU sayısı), 1 ise aynı süreçte çalışır
+        """
+        duration_s = duration_s or self.crossing_time()
+        dt = self.time_step()
+        step_count = max(int(math.ceil(duration_s / dt)), 1)
+        frame_count = max(min(frame_count, step_count + 1), 1)
+        frame_steps = np.round(np.linspace(0, step_count, frame_count)).astype(int)
+
+        ny, nx = self.shape
+        workers = workers or os.cpu_count() or 1
+        workers = max(1, min(workers, ny // 4))
+
+        static = self._static_fields(dt)
+        initial_eta = self.initial_cavity(impact_params)
+
+        print(f"Tsunami solver: {ny}x{nx} grid, {step_count} steps (dt={dt:.1f} s), {workers} worker(s)")
+
+        layout = {
+            'eta': ((ny, nx), np.float64),
+            'flux_u': ((ny, nx + 1), np.float64),
+            'flux_v': ((ny + 1, nx), np.float64),
+            'frames': ((frame_count, ny, nx), np.float32),
+            'max_height': ((ny, nx), np.float32),
+        }
+        for name, array in static.items():
+            layout[name] = (array.shape, array.dtype)
+
+        arena = _SharedArena(layout)
+        try:
+            fields = arena.arrays()
+            for name, array in static.items():
+                fields[name][...] = array
+            fields['eta'][...] = initial_eta
+            fields['flux_u'][...] = 0.0
+            fields['flux_v'][...] = 0.0
+            fields['max_height'][...] = 0.0
+
+            strips = np.linspace(0, ny, workers + 1).astype(int)
+            if workers == 1:
+                _integrate_strip(fields, 0, ny, step_count, frame_steps, None)
+            else:
+                # Blender içinde fork güvenli değil, spawn kullanılır
+                context = multiprocessing.get_context('spawn')
+                barrier = context.Barrier(workers)
+                processes = [
+                    context.Process(
+                        target=_strip_worker,
+                        args=(arena.descriptor(), int(strips[i]), int(strips[i + 1]),
+                              step_count, frame_steps, barrier)
+                    )
+                    for i in range(workers)
+                ]
+                for process in processes:
+                    process.start()
+                for process in processes:
+                    process.join()
+                failed = [p.exitcode for p in processes if p.exitcode != 0]
+                if failed:
+                    raise RuntimeError(f"Tsunami worker failed with exit code {failed[0]}")
+
+            result = {
+                'frames': fields['frames'].copy(),
+                'max_height': fields['max_height'].copy(),
+                'frame_times_s': frame_steps * dt,
+                'lat_edges': self.lat_edges.copy(),
+                'lon_edges': self.lon_edges.copy(),
+                'depth': self.depth.copy(),
+                'dt': dt,
+            }
+        finally:
+            arena.close()
+
+        print(f"Tsunami solver finished: max wave height {float(result['max_height'].max()):.1f} m")
+        return result
+
+    def _grid_depth(self, bathymetry):
+        """
+        Bathymetry raster'ını grid'e bilinear örnekler, raster dışı sabit derinlik alır
+        """
+        ny, nx = len(self.lat), len(self.lon)
+        if bathymetry is None:
+            return np.full((ny, nx), self.default_depth_m)
+
+        src_lat, src_lon, src_depth = bathymetry['lat'], bathymetry['lon'], bathymetry['depth']
+        lat_grid, lon_grid = np.meshgrid(self.lat, self.lon, indexing='ij')
+
+        row = np.interp(lat_grid, src_lat, np.arange(len(src_lat)))
+        col = np.interp(lon_grid, src_lon, np.arange(len(src_lon)))
+        r0 = np.clip(np.floor(row).astype(int), 0, len(src_lat) - 2)
+        c0 = np.clip(np.floor(col).astype(int), 0, len(src_lon) - 2)
+        fr = row - r0
+        fc = col - c0
+
+        depth = (
+            src_depth[r0, c0] * (1 - fr) * (1 - fc) +
+            src_depth[r0 + 1, c0] * fr * (1 - fc) +
+            src_depth[r0, c0 + 1] * (1 - fr) * fc +
+            src_depth[r0 + 1, c0 + 1] * fr * fc
+        )
+
+        inside = (
+            (lat_grid >= src_lat[0]) & (lat_grid <= src_lat[-1]) &
+            (lon_grid >= src_lon[0]) & (lon_grid <= src_lon[-1])
+        )
+        depth = np.where(inside, depth, self.default_depth_m)
+        return np.maximum(depth, 0.0)
+
+    def _static_fields(self, dt):
+        """
+        Zaman adımı boyunca değişmeyen katsayı dizileri
+        """
+        ny, nx = self.shape
+        depth = self.depth
+        wet = depth > 0
+
+        d_lambda = math.radians(self.cell_deg)
+        d_phi = math.radians(self.cell_deg)
+        cos_center = np.cos(np.radians(self.lat))
+        cos_edge = np.cos(np.radians(self.lat_edges))
+
+        # Yüz derinlikleri: iki hücreden biri karaysa akı sıfır (yansıtıcı kıyı), dış kenarlar kapalı
+        depth_u = np.zeros((ny, nx + 1))
+        depth_u[:, 1:-1] = np.where(wet[:, 1:] & wet[:, :-1], np.minimum(depth[:, 1:], depth[:, :-1]), 0.0)
+        depth_v = np.zeros((ny + 1, nx))
+        depth_v[1:-1, :] = np.where(wet[1:, :] & wet[:-1, :], np.minimum(depth[1:, :], depth[:-1, :]), 0.0)
+
+        # Sünger katmanı: kenarlara yaklaştıkça sönümleme
+        width = min(self.sponge_cells, ny // 4, nx // 4)
+        rows = np.minimum(np.arange(ny), np.arange(ny)[::-1])
+        cols = np.minimum(np.arange(nx), np.arange(nx)[::-1])
+        edge_distance = np.minimum(rows[:, None], cols[None, :]).astype(float)
+        sponge = np.ones((ny, nx))
+        if width > 0:
+            ramp = np.clip((width - edge_distance) / width, 0.0, 1.0)
+            sponge = np.exp(-0.1 * ramp ** 2)
+
+        return {
+            'coef_u': (dt * GRAVITY * depth_u / (EARTH_RADIUS_M * cos_center[:, None] * d_lambda)),
+            'coef_v': (dt * GRAVITY * depth_v / (EARTH_RADIUS_M * d_phi)),
+            'div_u': np.repeat((dt / (EARTH_RADIUS_M * cos_center * d_lambda))[:, None], nx, axis=1),
+            'div_v': np.repeat((dt / (EARTH_RADIUS_M * cos_center * d_phi))[:, None], nx, axis=1),
+            'cos_edge': np.repeat(cos_edge[:, None], nx, axis=1),
+            'wet': wet.astype(np.float64),
+            'sponge': sponge,
+        }
+
+def load_bathymetry(path, bounds=None, elevation=True):
+    """
+    Bathymetry raster'ı okur (.asc ESRI ASCII grid veya .npy)
+    elevation=True ise değerler yükseklik kabul edilir (deniz tabanı negatif) ve derinliğe çevrilir
+    .npy için bounds=(lat_min, lat_max, lon_min, lon_max) gerekir, ilk satır kuzey
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == '.asc':
+        header = {}
+        with open(path, 'r') as f:
+            for _ in range(6):
+                position = f.tell()
+                parts = f.readline().split()
+                if len(parts) != 2 or parts[0][0].isdigit() or parts[0][0] == '-':
+                    f.seek(position)
+                    break
+                header[parts[0].lower()] = float(parts[1])
+            values = np.loadtxt(f)
+
+        rows, cols = values.shape
+        cell = header['cellsize']
+        x0 = header.get('xllcorner', header.get('xllcenter', 0.0) - cell / 2)
+        y0 = header.get('yllcorner', header.get('yllcenter', 0.0) - cell / 2)
+        if 'nodata_value' in header:
+            values = np.where(values == header['nodata_value'], np.nan, values)
+        lat_min, lat_max = y0, y0 + rows * cell
+        lon_min, lon_max = x0, x0 + cols * cell
+    elif extension == '.npy':
+        if bounds is None:
+            raise ValueError("bounds=(lat_min, lat_max, lon_min, lon_max) required for .npy bathymetry")
+        values = np.load(path, mmap_mode='r').astype(float)
+        rows, cols = values.shape
+        lat_min, lat_max, lon_min, lon_max = bounds
+    else:
+        raise ValueError(f"Unsupported bathymetry format: {extension}")
+
+    depth = -values if elevation else values
+    depth = np.nan_to_num(depth, nan=0.0)
+
+    # Güneyden kuzeye artan hücre merkezleri
+    lat_step = (lat_max - lat_min) / rows
+    lon_step = (lon_max - lon_min) / cols
+    return {
+        'lat': lat_min + (np.arange(rows) + 0.5) * lat_step,
+        'lon': lon_min + (np.arange(cols) + 0.5) * lon_step,
+        'depth': np.ascontiguousarray(depth[::-1]),
+    }
+
+def write_height_frames(frames, directory, prefix='tsunami_', max_height=None):
+    """
+    Dalga yüksekliği frame'lerini 16-bit gri PNG dizisi olarak yazar
+    Değer = 0.5 + eta / (2 * max_height), displacement mid level 0.5 ile okunur
+    """
+    os.makedirs(directory, exist_ok=True)
+    if max_height is None:
+        max_height = float(np.abs(frames).max()) or 1.0
+
+    paths = []
+    for index, frame in enumerate(frames):
+        encoded = np.clip(0.5 + frame / (2.0 * max_height), 0.0, 1.0)
+        # PNG'de ilk satır üst (kuzey)
+        path = os.path.join(directory, f"{prefix}{index + 1:04d}.png")
+        write_png16(path, encoded[::-1])
+        paths.append(path)
+
+    return paths, max_height
+
+def _integrate_strip(fields, row_start, row_end, step_count, frame_steps, barrier):
+    """
+    [row_start, row_end) satır şeridini integre eder
+    Aşama 1: akılar (komşu şeridin eta satırını okur), aşama 2: eta (komşunun akı yüzünü okur)
+    """
+    eta = fields['eta']
+    flux_u = fields['flux_u']
+    flux_v = fields['flux_v']
+    frames = fields['frames']
+    max_height = fields['max_height']
+
+    rows = slice(row_start, row_end)
+    # Bu şeridin sahip olduğu iç v-yüzleri (satır k-1 ile k arası)
+    face_start = max(row_start, 1)
+    faces = slice(face_start, row_end)
+
+    coef_u = fields['coef_u'][rows]
+    coef_v = fields['coef_v'][faces]
+    div_u = fields['div_u'][rows]
+    div_v = fields['div_v'][rows]
+    cos_north = fields['cos_edge'][row_start + 1:row_end + 1]
+    cos_south = fields['cos_edge'][row_start:row_end]
+    wet = fields['wet'][rows]
+    sponge = fields['sponge'][rows]
+    sponge_v = fields['sponge'][faces]
+    sponge_u = 0.5 * (sponge[:, 1:] + sponge[:, :-1])
+
+    frame_lookup = {int(step): index for index, step in enumerate(frame_steps)}
+
+    def record(step):
+        index = frame_lookup.get(step)
+        if index is not None:
+            frames[index, rows] = eta[rows]
+        np.maximum(max_height[rows], eta[rows], out=max_height[rows])
+
+    record(0)
+
+    for step in range(1, step_count + 1):
+        # Aşama 1: momentum
+        flux_u[rows, 1:-1] -= coef_u[:, 1:-1] * (eta[rows, 1:] - eta[rows, :-1])
+        flux_u[rows, 1:-1] *= sponge_u
+        if face_start < row_end:
+            flux_v[faces] -= coef_v * (eta[face_start:row_end] - eta[face_start - 1:row_end - 1])
+            flux_v[faces] *= sponge_v
+
+        if barrier is not None:
+            barrier.wait()
+
+        # Aşama 2: süreklilik
+        divergence = (
+            div_u * (flux_u[rows, 1:] - flux_u[rows, :-1]) +
+            div_v * (flux_v[row_start + 1:row_end + 1] * cos_north - flux_v[row_start:row_end] * cos_south)
+        )
+        eta[rows] = (eta[rows] - divergence) * wet * sponge
+        record(step)
+
+        if barrier is not None:
+            barrier.wait()
+
+def _strip_worker(descriptor, row_start, row_end, step_count, frame_steps, barrier):
+    """
+    Ayrı süreçte bir satır şeridini çalıştırır
+    """
+    arena = _SharedArena.attach(descriptor)
+    try:
+        _integrate_strip(arena.arrays(), row_start, row_end, step_count, frame_steps, barrier)
+    finally:
+        arena.close()
+
+class _SharedArena:
+    """
+    İsimli numpy dizileri için paylaşımlı bellek blokları
+    """
+
+    def __init__(self, layout, blocks=None):
+        self.layout = layout
+        self.owner = blocks is None
+        if blocks is None:
+            blocks = {}
+            for name, (shape, dtype) in layout.items():
+                size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+                blocks[name] = shared_memory.SharedMemory(create=True, size=size)
+        self.blocks = blocks
+
+    @classmethod
+    def attach(cls, descriptor):
+        layout = {name: (shape, np.dtype(dtype)) for name, (shape, dtype, _) in descriptor.items()}
+        blocks = {name: shared_memory.SharedMemory(name=block) for name, (_, _, block) in descriptor.items()}
+        return cls(layout, blocks)
+
+    def descriptor(self):
+        return {
+            name: (shape, np.dtype(dtype).str, self.blocks[name].name)
+            for name, (shape, dtype) in self.layout.items()
+        }
+
+    def arrays(self):
+        return {
+            name: np.ndarray(shape, dtype=dtype, buffer=self.blocks[name].buf)
+            for name, (shape, dtype) in self.layout.items()
+        }
+
+    def close(self):
+        for block in self.blocks.values():
+            block.close()
+            if self.owner:
+                block.unlink()
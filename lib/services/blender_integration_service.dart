@@ -9,6 +9,12 @@ import '../models/impactor_2025_scenario.dart';
 class BlenderIntegrationService {
   static const String _blenderExecutable = 'blender'; // PATH'de olmalı
   static const String _scriptsPath = 'blender_integration/scripts/';
+  static const String _spoolPath = 'blender_integration/spool/';
+  static const String _pythonExecutable = 'python3'; // Scheduler Blender gerektirmez
+  static const String _workerScript = 'complete_impact_simulation.py';
+  // blender_worker.py HEARTBEAT_TIMEOUT_S ile aynı
+  static const Duration _workerHeartbeatTimeout = Duration(seconds: 5);
+  static const Duration _workerPollInterval = Duration(milliseconds: 100);
   
   static BlenderIntegrationService? _instance;
   static BlenderIntegrationService get instance => _instance ??= BlenderIntegrationService._();
@@ -22,6 +28,7 @@ class BlenderIntegrationService {
     required double impactLongitude,
     required String outputPath,
     BlenderRenderSettings? renderSettings,
+    BlenderJobPriority priority = BlenderJobPriority.normal,
   }) async {
     try {
       print('Starting Blender impact simulation for ${asteroid.name}...');
@@ -51,6 +58,7 @@ class BlenderIntegrationService {
       final result = await _runBlenderSimulation(
         scriptName: 'complete_impact_simulation.py',
         configPath: configPath,
+        priority: priority,
       );
       
       return result;
@@ -217,23 +225,190 @@ class BlenderIntegrationService {
       }
       
       final statusData = jsonDecode(await statusFile.readAsString());
-      
-      switch (statusData['status']) {
-        case 'running':
-          return BlenderSimulationStatus.running;
-        case 'completed':
-          return BlenderSimulationStatus.completed;
-        case 'failed':
-          return BlenderSimulationStatus.failed;
-        default:
-          return BlenderSimulationStatus.unknown;
-      }
+      return _parseStatus(statusData['status']);
     } catch (e) {
       print('Status check error: $e');
       return BlenderSimulationStatus.unknown;
     }
   }
 
+  static BlenderSimulationStatus _parseStatus(Object? status) {
+    switch (status) {
+      case 'queued':
+        return BlenderSimulationStatus.queued;
+      case 'running':
+        return BlenderSimulationStatus.running;
+      case 'completed':
+        return BlenderSimulationStatus.completed;
+      case 'failed':
+        return BlenderSimulationStatus.failed;
+      case 'cancelled':
+        return BlenderSimulationStatus.cancelled;
+      default:
+        return BlenderSimulationStatus.unknown;
+    }
+  }
+
+  /// Simülasyonun ilerleme olaylarını (faz, yüzde, frame, ETA) akış olarak izle
+  /// progress_<id>.ndjson kaldığı bayttan okunur; iş bitince (completed / failed / cancelled) akış kapanır
+  /// Render'ı aynı süreçte izleyen işlerde sahne kurulumu 'scene_built' fazıyla (running) biter,
+  /// son durum render frame'lerinden sonra gelir
+  Stream<BlenderProgress> watchProgress(
+    String simulationId, {
+    Duration interval = const Duration(milliseconds: 250),
+  }) async* {
+    final eventsFile = File('blender_integration/output/progress_$simulationId.ndjson');
+    var offset = 0;
+    var pending = <int>[];
+
+    while (true) {
+      if (await eventsFile.exists()) {
+        final length = await eventsFile.length();
+        if (length < offset) {
+          // Aynı id yeniden çalıştırıldı: olay dosyası baştan yazılıyor
+          offset = 0;
+          pending = <int>[];
+        }
+        if (length > offset) {
+          final file = await eventsFile.open();
+          try {
+            await file.setPosition(offset);
+            pending.addAll(await file.read(length - offset));
+          } finally {
+            await file.close();
+          }
+          offset = length;
+
+          // Sadece satır sonu gelmiş olaylar işlenir, yarım satır bir sonraki okumayı bekler
+          final lineEnd = pending.lastIndexOf(10);
+          if (lineEnd >= 0) {
+            final lines = utf8.decode(pending.sublist(0, lineEnd)).split('\n');
+            pending = pending.sublist(lineEnd + 1);
+            for (final line in lines.where((line) => line.trim().isNotEmpty)) {
+              final progress = BlenderProgress.fromJson(jsonDecode(line));
+              yield progress;
+              if (progress.isFinished) return;
+            }
+          }
+        }
+      }
+      await Future.delayed(interval);
+    }
+  }
+
+  /// Kuyruktaki simülasyonun sırası (1 = sıradaki), kuyrukta değilse null
+  Future<int?> getQueuePosition(String simulationId) async {
+    try {
+      final statusFile = File('blender_integration/output/status_$simulationId.json');
+
+      if (!await statusFile.exists()) {
+        return null;
+      }
+
+      final statusData = jsonDecode(await statusFile.readAsString());
+      if (statusData['status'] != 'queued') {
+        return null;
+      }
+      return statusData['data']?['queue_position'] as int?;
+    } catch (e) {
+      return null;
+    }
+  }
+
+  /// Simülasyonu iptal et (scheduler kuyruktan çıkarır ya da çalışan worker'ı durdurur)
+  Future<void> cancelSimulation(String simulationId) async {
+    await File('${_spoolPath}cancel/$simulationId').create(recursive: true);
+  }
+
+  /// Worker havuzunu yöneten job scheduler'ı başlat (zaten çalışıyorsa yeniden başlatmaz)
+  /// Scheduler açıkken eşzamanlı Blender sayısı çekirdek / RAM ile sınırlanır
+  Future<bool> startScheduler({int? workers}) async {
+    if (await isSchedulerAlive()) {
+      return true;
+    }
+
+    final args = [
+      '${_scriptsPath}job_scheduler.py',
+      '--blender', _blenderExecutable,
+      if (workers != null) ...['--workers', workers.toString()],
+    ];
+
+    print('Starting job scheduler with args: $args');
+    await Process.start(_pythonExecutable, args, mode: ProcessStartMode.detached);
+
+    final deadline = DateTime.now().add(const Duration(seconds: 10));
+    while (DateTime.now().isBefore(deadline)) {
+      if (await isSchedulerAlive()) {
+        return true;
+      }
+      await Future.delayed(const Duration(milliseconds: 250));
+    }
+    return false;
+  }
+
+  /// Scheduler'a kuyruktakileri iptal edip kapanmasını söyle
+  Future<void> stopScheduler() async {
+    await File('${_spoolPath}stop_scheduler').create(recursive: true);
+  }
+
+  /// Heartbeat'i taze bir scheduler var mı
+  Future<bool> isSchedulerAlive() => _isHeartbeatFresh('${_spoolPath}scheduler.json');
+
+  /// Kalıcı Blender worker'ını başlat (zaten çalışıyorsa yeniden başlatmaz)
+  /// Worker açıkken complete_impact_simulation işleri yeni process yerine spool üzerinden çalışır
+  Future<bool> startWorker({Duration? idleTimeout}) async {
+    if (await isWorkerAlive()) {
+      return true;
+    }
+
+    final args = [
+      '--background',
+      '--python', '$_scriptsPath$_workerScript',
+      '--',
+      '--worker',
+      if (idleTimeout != null) ...['--idle-timeout', idleTimeout.inSeconds.toString()],
+    ];
+
+    print('Starting Blender worker with args: $args');
+    await Process.start(_blenderExecutable, args, mode: ProcessStartMode.detached);
+
+    // Blender açılıp modüller yüklenene kadar ilk heartbeat'i bekle
+    final deadline = DateTime.now().add(const Duration(seconds: 60));
+    while (DateTime.now().isBefore(deadline)) {
+      if (await isWorkerAlive()) {
+        return true;
+      }
+      await Future.delayed(const Duration(milliseconds: 250));
+    }
+    return false;
+  }
+
+  /// Worker'a mevcut işini bitirip kapanmasını söyle
+  Future<void> stopWorker() async {
+    await File('${_spoolPath}stop').create(recursive: true);
+  }
+
+  /// Heartbeat'i taze bir worker var mı
+  Future<bool> isWorkerAlive() => _isHeartbeatFresh('${_spoolPath}worker.json');
+
+  Future<bool> _isHeartbeatFresh(String path) async {
+    try {
+      final heartbeatFile = File(path);
+
+      if (!await heartbeatFile.exists()) {
+        return false;
+      }
+
+      final heartbeatData = jsonDecode(await heartbeatFile.readAsString());
+      final heartbeat = (heartbeatData['heartbeat'] as num).toDouble();
+      final age = DateTime.now().millisecondsSinceEpoch / 1000.0 - heartbeat;
+
+      return age < _workerHeartbeatTimeout.inMilliseconds / 1000.0;
+    } catch (e) {
+      return false;
+    }
+  }
+
   /// Render edilen dosyaları al
   Future<List<BlenderOutputFile>> getSimulationOutput(String simulationId) async {
     try {
@@ -353,9 +528,35 @@ class BlenderIntegrationService {
   Future<BlenderSimulationResult> _runBlenderSimulation({
     required String scriptName,
     required String configPath,
+    BlenderJobPriority priority = BlenderJobPriority.normal,
   }) async {
     final simulationId = DateTime.now().millisecondsSinceEpoch.toString();
     
+    // Scheduler açıksa iş öncelik kuyruğuna, değilse tek worker'a bırakılır; ikisi de yoksa yeni process
+    if (scriptName == _workerScript && await isSchedulerAlive()) {
+      final schedulerResult = await _runOnWorker(
+        configPath: configPath,
+        simulationId: simulationId,
+        priority: priority,
+        viaScheduler: true,
+      );
+      if (schedulerResult != null) {
+        return schedulerResult;
+      }
+      print('Job scheduler unavailable, falling back');
+    }
+    
+    if (scriptName == _workerScript && await isWorkerAlive()) {
+      final workerResult = await _runOnWorker(
+        configPath: configPath,
+        simulationId: simulationId,
+      );
+      if (workerResult != null) {
+        return workerResult;
+      }
+      print('Blender worker unavailable, falling back to a new process');
+    }
+    
     // Blender argumentları
     final args = [
       '--background', // Headless mode
@@ -401,6 +602,82 @@ class BlenderIntegrationService {
     }
   }
 
+  /// İşi çalışan worker'a (ya da scheduler kuyruğuna) verir ve durum dosyasını yoklar
+  /// Worker işi almadan kapanırsa iş geri çekilir ve null döner (yeni process'e düşülür)
+  Future<BlenderSimulationResult?> _runOnWorker({
+    required String configPath,
+    required String simulationId,
+    BlenderJobPriority priority = BlenderJobPriority.normal,
+    bool viaScheduler = false,
+  }) async {
+    final jobsDir = Directory('$_spoolPath${viaScheduler ? 'submit' : 'jobs'}');
+    await jobsDir.create(recursive: true);
+
+    // Aynı id'nin önceki çalıştırmasından kalan durum / olay dosyaları yeni işin sonucu sanılmasın
+    for (final name in ['status_$simulationId.json', 'progress_$simulationId.ndjson']) {
+      final staleFile = File('blender_integration/output/$name');
+      if (await staleFile.exists()) {
+        await staleFile.delete();
+      }
+    }
+
+    // Worker yarım yazılmış dosyayı görmesin: önce .tmp, sonra rename
+    final jobFile = File('${jobsDir.path}/$simulationId.json');
+    final tempFile = File('${jobFile.path}.tmp');
+    await tempFile.writeAsString(jsonEncode({
+      'simulation_id': simulationId,
+      'config_path': configPath,
+      'priority': priority.name,
+      'submitted_at': DateTime.now().toIso8601String(),
+    }));
+    await tempFile.rename(jobFile.path);
+
+    print('Submitted simulation $simulationId to ${viaScheduler ? 'job scheduler' : 'Blender worker'}');
+
+    while (true) {
+      await Future.delayed(_workerPollInterval);
+
+      final status = await checkSimulationStatus(simulationId);
+
+      if (status == BlenderSimulationStatus.completed) {
+        // Aynı config'li bir işin kopyasıysa çıktı asıl işin dizinindedir
+        final statusData = jsonDecode(
+          await File('blender_integration/output/status_$simulationId.json').readAsString(),
+        );
+        final outputId = statusData['data']?['duplicate_of'] ?? simulationId;
+        return BlenderSimulationResult.success(
+          simulationId: simulationId,
+          outputPath: 'blender_integration/output/$outputId',
+        );
+      }
+
+      if (status == BlenderSimulationStatus.cancelled) {
+        return BlenderSimulationResult.error('Simulation $simulationId was cancelled');
+      }
+
+      if (status == BlenderSimulationStatus.failed) {
+        final statusData = jsonDecode(
+          await File('blender_integration/output/status_$simulationId.json').readAsString(),
+        );
+        return BlenderSimulationResult.error(
+          'Blender worker failed: ${statusData['data']?['error'] ?? 'unknown error'}'
+        );
+      }
+
+      if (!await (viaScheduler ? isSchedulerAlive() : isWorkerAlive())) {
+        try {
+          // Henüz alınmamışsa geri çek
+          await jobFile.delete();
+          return null;
+        } on FileSystemException {
+          return BlenderSimulationResult.error(
+            'Blender worker stopped while running simulation $simulationId'
+          );
+        }
+      }
+    }
+  }
+
   BlenderOutputFileType _getFileType(String fileName) {
     final extension = fileName.split('.').last.toLowerCase();
     
@@ -512,15 +789,65 @@ class BlenderSimulationResult {
         stdout = null;
 }
 
+/// İlerleme olayı (progress_<id>.ndjson satırı)
+class BlenderProgress {
+  final BlenderSimulationStatus status;
+  final String event;
+  final String? phase;
+  final double percent;
+  final int? frame;
+  final double elapsedSeconds;
+  final double? etaSeconds;
+  final Map<String, dynamic> data;
+
+  BlenderProgress({
+    required this.status,
+    required this.event,
+    this.phase,
+    required this.percent,
+    this.frame,
+    required this.elapsedSeconds,
+    this.etaSeconds,
+    this.data = const {},
+  });
+
+  factory BlenderProgress.fromJson(Map<String, dynamic> json) {
+    return BlenderProgress(
+      status: BlenderIntegrationService._parseStatus(json['status']),
+      event: json['event'] as String? ?? 'status',
+      phase: json['phase'] as String?,
+      percent: (json['percent'] as num?)?.toDouble() ?? 0.0,
+      frame: json['frame'] as int?,
+      elapsedSeconds: (json['elapsed_s'] as num?)?.toDouble() ?? 0.0,
+      etaSeconds: (json['eta_s'] as num?)?.toDouble(),
+      data: (json['data'] as Map<String, dynamic>?) ?? const {},
+    );
+  }
+
+  bool get isFinished =>
+      status == BlenderSimulationStatus.completed ||
+      status == BlenderSimulationStatus.failed ||
+      status == BlenderSimulationStatus.cancelled;
+}
+
 /// Simülasyon durumu
 enum BlenderSimulationStatus {
+  queued,
   running,
   completed,
   failed,
+  cancelled,
   notFound,
   unknown,
 }
 
+/// Scheduler kuyruğunda öncelik: önizlemeler final render'ların (render) önüne geçer
+enum BlenderJobPriority {
+  preview,
+  normal,
+  render,
+}
+
 /// Output file türleri
 enum BlenderOutputFileType {
   image,